@@ -305,18 +305,14 @@ def AttributeRequest(theURL, outputShp):
             jData = json.dumps(dRequest)
 
             # Send request to SDA Tabular service
-            req = urllib2.Request(url, jData)
-            resp = urllib2.urlopen(req)
+            jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
             #PrintMsg(" \nImporting attribute data...", 0)
             #PrintMsg(" \nGot back requested data...", 0)
 
-            # Read the response from SDA into a string
-            jsonString = resp.read()
-
             #PrintMsg(" \njsonString: " + str(jsonString), 1)
             data = json.loads(jsonString)
-            del jsonString, resp, req
+            del jsonString
 
             if not "Table" in data:
                 raise MyError, "Query failed to select anything: \n " + sQuery
@@ -419,6 +415,7 @@ def AttributeRequest(theURL, outputShp):
 # Import modules
 import sys, string, os, locale, arcpy, traceback, urllib2, httplib, json
 from arcpy import env
+import SSURGO_SDAClient
 
 try:
     if __name__ == "__main__":
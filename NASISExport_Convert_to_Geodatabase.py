@@ -203,18 +203,14 @@ def GetSDMInfo(theURL, tblName):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         #PrintMsg(" \nImporting attribute data...", 0)
         #PrintMsg(" \nGot back requested data...", 0)
 
-        # Read the response from SDA into a string
-        jsonString = resp.read()
-
         #PrintMsg(" \njsonString: " + str(jsonString), 1)
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         if not "Table" in data:
             raise MyError, "Query failed to select anything: \n " + sQuery
@@ -779,7 +775,7 @@ def ImportMDTabular(newDB, tabularFolder, codePage):
 
                         # Use csv reader to read each line in the text file
                         #for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|'):
-                        for rowInFile in csv.reader(open(txtPath, 'r'), delimiter='|'):
+                        for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                             # , quotechar="'"
                             # replace all blank values with 'None' so that the values are properly inserted
                             # into integer values otherwise insertRow fails
@@ -982,7 +978,7 @@ def ImportTabular(newDB, tabularFolder, dbVersion, codePage, tblList, zipFileNam
                                 # Use csv reader to read each line in the text file
                                 time.sleep(0.5)  # trying to prevent error reading text file
 
-                                for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                                for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                                     # replace all blank values with 'None' so that the values are properly inserted
                                     # into integer values otherwise insertRow fails
                                     fixedRow = [x.decode(codePage) if x else None for x in rowInFile]  # handle non-utf8 characters
@@ -1013,7 +1009,7 @@ def ImportTabular(newDB, tabularFolder, dbVersion, codePage, tblList, zipFileNam
                                 # Use csv reader to read each line in the text file
                                 time.sleep(0.5)  # trying to prevent error reading text file
                                 
-                                for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                                for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                                     newRow = list()
                                     fldNo = 0
                                     fixedRow = [x.decode(codePage) for x in rowInFile]  # trying to workaround problem with version 1 SD613 recall
@@ -1082,7 +1078,7 @@ def ImportTabular(newDB, tabularFolder, dbVersion, codePage, tblList, zipFileNam
 
                 try:
                     # Use csv reader to read each line in the text file
-                    for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                    for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                         # replace all blank values with 'None' so that the values are properly inserted
                         # into integer values otherwise insertRow fails
                         newRow = [None if value == '' else value for value in rowInFile]
@@ -3094,6 +3090,8 @@ def GetFCType(fc):
 
 # Import system modules
 import arcpy, sys, string, os, traceback, locale, time, datetime, csv, zipfile
+import SSURGO_TabularReader
+import SSURGO_SDAClient
 from operator import itemgetter, attrgetter
 import xml.etree.cElementTree as ET
 from arcpy import env
@@ -256,14 +256,12 @@ def GetAreasymbols(attName, theTile):
         dRequest["query"] = sQuery
         jData = json.dumps(dRequest)
 
-        # Send request to SDA Tabular service using urllib2 library
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        # Send request to SDA Tabular service
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         # Convert the returned JSON string into a Python dictionary.
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         # Find data section (key='Table')
         valList = list()
@@ -312,6 +310,7 @@ def GetAreasymbols(attName, theTile):
 # Import system modules
 import sys, string, os, arcpy, locale, traceback, time
 from arcpy import env
+import SSURGO_SDAClient
 import subprocess
 
 # Create the Geoprocessor object
@@ -1708,17 +1708,14 @@ def AttributeRequest(theURL, mukeyList, outputShp, ratingField):
         dRequest["FORMAT"] = "JSON+COLUMNNAME+METADATA"
         dRequest["QUERY"] = sQuery
 
-        # Create SDM connection to service using HTTP
-        jData = json.dumps(dRequest)
+        def FormRequest(keys):
+            # Request for one chunk of mukeys
+            dChunk = dict(dRequest)
+            dChunk["QUERY"] = FormAttributeQuery(",".join(keys))
+            return json.dumps(dChunk)
 
-        # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
-
-        #PrintMsg(" \njsonString: " + str(jsonString), 1)
-        data = json.loads(jsonString)
-        del jsonString, resp, req
+        # Send request to SDA Tabular service in chunks of mukeys, several at a time
+        data = SSURGO_SDAClient.ChunkedRequest(url, mukeyList, FormRequest)
 
         dataList = data["Table"]     # Data as a list of lists. Service returns everything as string.
 
@@ -2155,17 +2152,7 @@ def RunSpatialQuery(theURL, spatialQuery, outputShp, clipPolygon, showStatus):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-
-        #try:
-        resp = urllib2.urlopen(req)  # A failure here will probably throw an HTTP exception
-
-        #except:
-        responseStatus = resp.getcode()
-        responseMsg = resp.msg
-
-        jsonString = resp.read()
-        resp.close()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         try:
             data = json.loads(jsonString)
@@ -2176,7 +2163,7 @@ def RunSpatialQuery(theURL, spatialQuery, outputShp, clipPolygon, showStatus):
 
         dataList = data["Table"]     # Data as a list of lists. Service returns everything as string.
 
-        del jsonString, resp, req
+        del jsonString
 
         # Get coordinate system information for input and output layers
         outputCS = arcpy.Describe(outputShp).spatialReference
@@ -2308,15 +2295,7 @@ def RunSpatialQueryXML(theURL, spatialQuery, outputShp, clipPolygon, showStatus)
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-
-        resp = urllib2.urlopen(req)  # A failure here will probably throw an HTTP exception
-
-        responseStatus = resp.getcode()
-        responseMsg = resp.msg
-
-        xmlString = resp.read()
-        resp.close()
+        xmlString = SSURGO_SDAClient.PostRequest(url, jData)
         #PrintMsg(" \n" + xmlString + " \n ", 1)
 
 
@@ -2868,6 +2847,7 @@ def Number_Format(num, places=0, bCommas=True):
 ## ====================================== Main Body ==================================
 # Import modules
 import sys, string, os, locale, arcpy, traceback, urllib2, httplib, json
+import SSURGO_SDAClient
 import xml.etree.cElementTree as ET
 from arcpy import env
 
@@ -744,6 +744,7 @@ def AttributeRequest(theURL, mukeyList, outputShp, sQuery):
         arcpy.SetProgressorLabel("Sending tabular request to Soil Data Access...")
 
         mukeys = ",".join(mukeyList)
+        queryTemplate = sQuery
 
         sQuery = FormAttributeQuery(sQuery, mukeys)  # Combine user query with list of mukeys from spatial layer.
         if sQuery == "":
@@ -765,19 +766,17 @@ def AttributeRequest(theURL, mukeyList, outputShp, sQuery):
             PrintMsg("format: " + str(dRequest["format"]))
             PrintMsg("query: " + sQuery)
 
-        # Create SDM connection to service using HTTP
-        jData = json.dumps(dRequest)
+        def FormRequest(keys):
+            # Request for one chunk of mukeys
+            dChunk = dict(dRequest)
+            dChunk["query"] = FormAttributeQuery(queryTemplate, ",".join(keys))
+            return json.dumps(dChunk)
 
-        # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        # Send request to SDA Tabular service in chunks of mukeys, several at a time
+        data = SSURGO_SDAClient.ChunkedRequest(url, mukeyList, FormRequest)
 
         if bVerbose:
-            PrintMsg(" \nSDA attribute data in JSON format: \n " + str(jsonString), 1)
-
-        data = json.loads(jsonString)
-        del jsonString, resp, req
+            PrintMsg(" \nSDA attribute data: \n " + str(data), 1)
 
         if not "Table" in data:
             raise MyError, "Query failed to select anything: \n " + sQuery
@@ -1126,17 +1125,7 @@ def RunSpatialQueryJSON(theURL, spatialQuery, outputSoils):
             PrintMsg("query: " + spatialQuery)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-
-        #try:
-        resp = urllib2.urlopen(req)  # A failure here will probably throw an HTTP exception
-
-        #except:
-        responseStatus = resp.getcode()
-        responseMsg = resp.msg
-
-        jsonString = resp.read()
-        resp.close()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         try:
             data = json.loads(jsonString)
@@ -1151,7 +1140,7 @@ def RunSpatialQueryJSON(theURL, spatialQuery, outputSoils):
         if bVerbose:
             PrintMsg(" \nGeometry in JSON format from SDA: \n " + str(data), 1 )
 
-        del jsonString, resp, req
+        del jsonString
 
         # Get coordinate system information for input and output layers
         outputCS = arcpy.Describe(outputSoils).spatialReference
@@ -1606,6 +1595,7 @@ def AddFieldMap(aoiPolys, mxd, df):
 
 # Import system modules
 import sys, string, os, arcpy, locale, traceback, urllib2, httplib, webbrowser, subprocess, json, collections
+import SSURGO_SDAClient
 
 from arcpy import env
 from copy import deepcopy
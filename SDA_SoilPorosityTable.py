@@ -140,12 +140,10 @@ def AttributeRequest(sdaURL, outputTable, sQuery):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         if not "Table" in data:
             raise MyError, "Query failed to select anything: \n " + sQuery
@@ -3091,6 +3089,7 @@ def CreateSoilsData(surveyList, db, sdaURL):
 ## ====================================== Main Body ==================================
 # Import modules
 import sys, string, os, locale, arcpy, traceback, urllib2, httplib, json
+import SSURGO_SDAClient
 import xml.etree.cElementTree as ET
 from arcpy import env
 from random import randint
@@ -520,9 +520,7 @@ def AttributeRequest(theURL, mukeyList, top, bot, outputShp):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         #PrintMsg(" \n" + jsonString, 1)
         data = json.loads(jsonString)
@@ -538,7 +536,7 @@ def AttributeRequest(theURL, mukeyList, top, bot, outputShp):
 
         #PrintMsg(" \n" + str(dataList[0]), 1)
 
-        del jsonString, resp, req
+        del jsonString
 
         # Create temporary table to contain results of SDA tabular query
         # areasymbol, areaname, mukey, muysm, cokey, comppct_r,compname,hzname,hzdept_r,hzdepb_r,awc_r
@@ -1255,16 +1253,7 @@ def RunSpatialQueryWKT(theURL, spatialQuery, outputShp, clipPolygon):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-
-        responseStatus = resp.getcode()
-        responseMsg = resp.msg
-
-        if responseStatus != 200 :
-            raise MyError, "HTTP Error: " + responseMsg
-
-        xmlString = resp.read()
+        xmlString = SSURGO_SDAClient.PostRequest(url, jData)
 
         # See if I can get an estimated polygon count from the XML string
 
@@ -1390,17 +1379,7 @@ def RunSpatialQuery(theURL, spatialQuery, outputShp, clipPolygon, showStatus):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-
-        #try:
-        resp = urllib2.urlopen(req)  # A failure here will probably throw an HTTP exception
-
-        #except:
-        responseStatus = resp.getcode()
-        responseMsg = resp.msg
-
-        jsonString = resp.read()
-        resp.close()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         try:
             data = json.loads(jsonString)
@@ -1413,7 +1392,7 @@ def RunSpatialQuery(theURL, spatialQuery, outputShp, clipPolygon, showStatus):
 
         #PrintMsg(" \nJSON from SDA: \n " + str(data), 1 )
 
-        del jsonString, resp, req
+        del jsonString
 
         # Get coordinate system information for input and output layers
         outputCS = arcpy.Describe(outputShp).spatialReference
@@ -2146,6 +2125,7 @@ def Number_Format(num, places=0, bCommas=True):
 ## ====================================== Main Body ==================================
 # Import modules
 import sys, string, os, locale, arcpy, traceback, urllib2, httplib, json
+import SSURGO_SDAClient
 import xml.etree.cElementTree as ET
 from arcpy import env
 
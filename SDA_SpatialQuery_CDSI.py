@@ -1155,13 +1155,11 @@ def AttributeRequest(theURL, mukeyList, outputShp, ratingField):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         #PrintMsg(" \njsonString: " + str(jsonString), 1)
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         dataList = data["Table"]     # Data as a list of lists. Service returns everything as string.
 
@@ -1604,17 +1602,7 @@ def RunSpatialQuery(theURL, spatialQuery, outputShp, clipPolygon, showStatus):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-
-        #try:
-        resp = urllib2.urlopen(req)  # A failure here will probably throw an HTTP exception
-
-        #except:
-        responseStatus = resp.getcode()
-        responseMsg = resp.msg
-
-        jsonString = resp.read()
-        resp.close()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         try:
             data = json.loads(jsonString)
@@ -1627,7 +1615,7 @@ def RunSpatialQuery(theURL, spatialQuery, outputShp, clipPolygon, showStatus):
 
         #PrintMsg(" \nJSON from SDA: \n " + str(data), 1 )
 
-        del jsonString, resp, req
+        del jsonString
 
         # Get coordinate system information for input and output layers
         outputCS = arcpy.Describe(outputShp).spatialReference
@@ -1760,15 +1748,7 @@ def RunSpatialQueryXML(theURL, spatialQuery, outputShp, clipPolygon, showStatus)
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-
-        resp = urllib2.urlopen(req)  # A failure here will probably throw an HTTP exception
-
-        responseStatus = resp.getcode()
-        responseMsg = resp.msg
-
-        xmlString = resp.read()
-        resp.close()
+        xmlString = SSURGO_SDAClient.PostRequest(url, jData)
         #PrintMsg(" \n" + xmlString + " \n ", 1)
 
 
@@ -2320,6 +2300,7 @@ def Number_Format(num, places=0, bCommas=True):
 ## ====================================== Main Body ==================================
 # Import modules
 import sys, string, os, locale, arcpy, traceback, urllib2, httplib, json
+import SSURGO_SDAClient
 import xml.etree.cElementTree as ET
 from arcpy import env
 
@@ -602,6 +602,7 @@ def AttributeRequest(theURL, mukeyList, outputShp, sQuery):
         arcpy.SetProgressorLabel("Sending tabular request to Soil Data Access...")
 
         mukeys = ",".join(mukeyList)
+        queryTemplate = sQuery
 
         sQuery = FormAttributeQuery(sQuery, mukeys)  # Combine user query with list of mukeys from spatial layer.
         if sQuery == "":
@@ -621,17 +622,14 @@ def AttributeRequest(theURL, mukeyList, outputShp, sQuery):
         PrintMsg("FORMAT: " + "JSON")
         PrintMsg("QUERY: " + sQuery)
 
-        # Create SDM connection to service using HTTP
-        jData = json.dumps(dRequest)
-
-        # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        def FormRequest(keys):
+            # Request for one chunk of mukeys
+            dChunk = dict(dRequest)
+            dChunk["QUERY"] = FormAttributeQuery(queryTemplate, ",".join(keys))
+            return json.dumps(dChunk)
 
-        #PrintMsg(" \njsonString: " + str(jsonString), 1)
-        data = json.loads(jsonString)
-        del jsonString, resp, req
+        # Send request to SDA Tabular service in chunks of mukeys, several at a time
+        data = SSURGO_SDAClient.ChunkedRequest(url, mukeyList, FormRequest)
 
         if not "Table" in data:
             raise MyError, "Query failed to select anything: \n " + sQuery
@@ -934,13 +932,11 @@ def GetSDVAtts(theURL, outputFields):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         #PrintMsg(" \njsonString: " + str(jsonString), 1)
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         if not "Table" in data:
             raise MyError, "Query failed to select anything: \n " + sdvQuery
@@ -1128,6 +1124,10 @@ def RunSpatialQuery(theURL, spatialQuery, outputShp, clipPolygon, showStatus):
     #
     # XML format returned. Converts WKT data to a polygon featureclass
     # The 2016 version of SDA has a limit on JSON formatted data, but the XML version does not.
+    #
+    # The XML response is parsed as it arrives (SSURGO_SDAClient.SpatialRecords) and each polygon
+    # is inserted as soon as it has been read, so the whole response is never held in memory.
+    # The polygon count is not known until the end, so the progressor only shows a running count.
 
     try:
         #PrintMsg(" \n\tProcessing spatial request on " + theURL)
@@ -1147,32 +1147,8 @@ def RunSpatialQuery(theURL, spatialQuery, outputShp, clipPolygon, showStatus):
         # Create SDM connection to service using HTTP
         jData = json.dumps(dRequest)
 
-        # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-
-        resp = urllib2.urlopen(req)  # A failure here will probably throw an HTTP exception
-
-        responseStatus = resp.getcode()
-        responseMsg = resp.msg
-
-        xmlString = resp.read()
-        resp.close()
-        #PrintMsg(" \n" + xmlString + " \n ", 1)
-
-
-        # See if I can get an estimated polygon count from the XML string
-
-        # Convert XML to tree format
-        root = ET.fromstring(xmlString)
-        #PrintMsg(" \n" + xmlString, 1)
-        polys = xmlString.count("POLYGON")
-
-        PrintMsg("\tRequest returned " + Number_Format(polys, 0, True) + " soil polygons...", 0)
-
-
         if showStatus:
-            step = 1
-            arcpy.SetProgressor("step", "Importing spatial data", 0, polys, step)
+            arcpy.SetProgressor("default", "Importing spatial data")
 
         desc = arcpy.Describe(outputShp)
         outputCS = desc.spatialReference
@@ -1185,42 +1161,31 @@ def RunSpatialQuery(theURL, spatialQuery, outputShp, clipPolygon, showStatus):
         tm = "WGS_1984_(ITRF00)_To_NAD_1983"
 
         #PrintMsg(" \n\tImporting spatial data...", 0)
-        #arcpy.SetProgressorLabel("Importing spatial data for polygon " + Number_Format(polys, 0, True))
 
         polyCnt = 0
 
         if inputCS.name != outputCS.name:
             # Project geometry
-            #arcpy.SetProgressor("step", "Importing spatial data", 0, polys, 1)
             with arcpy.da.InsertCursor(outputShp, outputFields) as cur:
 
-                for geog in root.iter():
-                    if geog.tag == "id":
-                        #PrintMsg("\tID: " + str(geog.text), 0)
-                        mukey = geog.text
-
-                    if geog.tag == "geog":
-                        #PrintMsg("\t" + str(id) + ", " + str(geog.text), 0)
-                        wktPoly = geog.text
-
-                        # immediately create polygon from WKT
-                        newPolygon = arcpy.FromWKT(wktPoly, inputCS)
+                for mukey, wktPoly in SSURGO_SDAClient.SpatialRecords(url, jData):
+                    # immediately create polygon from WKT
+                    newPolygon = arcpy.FromWKT(wktPoly, inputCS)
 
-                        # Try to clip newPolygon by clipPolygon
-                        clippedPolygon = newPolygon.intersect(clipPolygon, 4)
+                    # Try to clip newPolygon by clipPolygon
+                    clippedPolygon = newPolygon.intersect(clipPolygon, 4)
 
 
-                        outputPolygon = clippedPolygon.projectAs(outputCS, tm)
-                        if outputPolygon is None:
-                            PrintMsg(" \nFound null geometry...", 1)
+                    outputPolygon = clippedPolygon.projectAs(outputCS, tm)
+                    if outputPolygon is None:
+                        PrintMsg(" \nFound null geometry...", 1)
 
-                        rec = [outputPolygon, mukey]
-                        cur.insertRow(rec)
-                        polyCnt += 1
+                    rec = [outputPolygon, mukey]
+                    cur.insertRow(rec)
+                    polyCnt += 1
 
-                        if showStatus:
-                            arcpy.SetProgressorPosition()
-                            #arcpy.SetProgressorLabel("Polygon " + Number_Format(polyCnt, 0, True))
+                    if showStatus and polyCnt % 100 == 0:
+                        arcpy.SetProgressorLabel("Importing spatial data for polygon " + Number_Format(polyCnt, 0, True))
 
             arcpy.SetProgressorLabel("Completed spatial import")
             #PrintMsg("Completed spatial import", 1)
@@ -1228,54 +1193,33 @@ def RunSpatialQuery(theURL, spatialQuery, outputShp, clipPolygon, showStatus):
         else:
             # Input and output coordinate system is the same. No projection
             # from original GCS WGS 1984.
-            #arcpy.SetProgressor("step", "Importing spatial data", 0, polys, 1)
 
             with arcpy.da.InsertCursor(outputShp, outputFields) as cur:
 
-                for geog in root.iter():
-                    if geog.tag == "id":
-                        #PrintMsg("\tID: " + str(geog.text), 0)
-                        mukey = geog.text
-
-                    if geog.tag == "geog":
-                        #PrintMsg("\tGEOG: " + str(geog.text), 0)
-                        wktPoly = geog.text
-                        #PrintMsg(cString, 1)
-
-                        # immediately create polygon from WKT
-                        outputPolygon = arcpy.FromWKT(wktPoly, inputCS)
+                for mukey, wktPoly in SSURGO_SDAClient.SpatialRecords(url, jData):
+                    # immediately create polygon from WKT
+                    outputPolygon = arcpy.FromWKT(wktPoly, inputCS)
 
-                        if outputPolygon is None:
-                            PrintMsg(" \nFound null geometry...", 1)
+                    if outputPolygon is None:
+                        PrintMsg(" \nFound null geometry...", 1)
 
-                        rec = [outputPolygon, mukey]
-                        cur.insertRow(rec)
-                        polyCnt += 1
+                    rec = [outputPolygon, mukey]
+                    cur.insertRow(rec)
+                    polyCnt += 1
 
-                        if showStatus:
-                            arcpy.SetProgressorPosition()
-                            #arcpy.SetProgressorLabel("Polygon " + Number_Format(polyCnt, 0, True))
+                    if showStatus and polyCnt % 100 == 0:
+                        arcpy.SetProgressorLabel("Importing spatial data for polygon " + Number_Format(polyCnt, 0, True))
 
             arcpy.SetProgressorLabel("Completed spatial import")
             #PrintMsg("Completed spatial import", 1)
 
-        if polyCnt > 0:
-            # successful completion, return polyCnt here.
-            return polyCnt
+        PrintMsg("\tRequest returned " + Number_Format(polyCnt, 0, True) + " soil polygons...", 0)
 
-        else:
-            # Try to print messages
-            hasFault = False
-
-            for geog in root.iter():
-                if geog.tag.endswith("Fault"):
-                    hasFault = True
-
-                if geog.tag.endswith("Text") and hasFault:
-                    raise MyError, "Fault; " + geog.text
-
-            return 0
+        return polyCnt
 
+    except SSURGO_SDAClient.SDAFault, e:
+        PrintMsg(str(e), 2)
+        return 0
 
     except MyError, e:
         # Example: raise MyError, "This is an error message"
@@ -1315,17 +1259,7 @@ def RunSpatialQueryJSON(theURL, spatialQuery, outputShp, clipPolygon, showStatus
         PrintMsg("QUERY: " + spatialQuery)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-
-        #try:
-        resp = urllib2.urlopen(req)  # A failure here will probably throw an HTTP exception
-
-        #except:
-        responseStatus = resp.getcode()
-        responseMsg = resp.msg
-
-        jsonString = resp.read()
-        resp.close()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         try:
             data = json.loads(jsonString)
@@ -1338,7 +1272,7 @@ def RunSpatialQueryJSON(theURL, spatialQuery, outputShp, clipPolygon, showStatus
 
         #PrintMsg(" \nJSON from SDA: \n " + str(data), 1 )
 
-        del jsonString, resp, req
+        del jsonString
 
         # Get coordinate system information for input and output layers
         outputCS = arcpy.Describe(outputShp).spatialReference
@@ -2270,6 +2204,7 @@ def Number_Format(num, places=0, bCommas=True):
 ## ====================================== Main Body ==================================
 # Import modules
 import sys, string, os, locale, arcpy, traceback, urllib2, httplib, json
+import SSURGO_SDAClient
 import xml.etree.cElementTree as ET
 from arcpy import env
 from random import randint
@@ -149,12 +149,10 @@ def AttributeRequest(sdaURL, outputTable, sQuery):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         if not "Table" in data:
             return keyList
@@ -3529,6 +3527,7 @@ def CreateSoilsData(db, sdaURL):
 ## ====================================== Main Body ==================================
 # Import modules
 import sys, string, os, locale, arcpy, traceback, urllib2, httplib, json
+import SSURGO_SDAClient
 import xml.etree.cElementTree as ET
 from datetime import datetime
 from arcpy import env
@@ -0,0 +1,672 @@
+# SSURGO_AggregationBenchmark.py
+#
+# Benchmark for the map unit aggregation functions in gSSURGO_CreateSoilMap.py, run against a
+# synthetic database from SSURGO_SyntheticData.py. Does not need ArcGIS or a state database.
+#
+# Each benchmark case builds the SDV_Data initial table for one attribute with SQL, sets the
+# module globals that CreateSoilMap would set (dSDV, dFieldInfo, domainValues, dValues, tblName)
+# and times the Aggregate* function. The cases cover the component level (DCP, DCD, WTA,
+# MaxMin, PP_SUM), the month level (Mo_*) and the horizon level (Hz_*) functions, plus the
+# horizon overlap kernel used by CalcAWS and CalcSOC in gSSURGO_ValuTable.py.
+#
+# The aggregation functions read and write their tables through arcpy.da cursors. Here those
+# calls go to a SQLite scratch database (see the SQLite stand-in functions below), on every
+# machine, so the timings measure the aggregation code and are comparable from one run to the
+# next. They do not include file geodatabase I/O.
+#
+# Each case runs in a new process so that the peak memory belongs to that case alone. The
+# best time of --repeat runs is kept.
+#
+# Results are saved as JSON (--output). With --baseline, the results are compared with an
+# earlier run and the script exits with 1 when the throughput of a case drops, or its peak
+# memory grows, by more than --tolerance percent.
+#
+# Usage:
+#   python SSURGO_SyntheticData.py synthetic.sqlite --surveys 20 --mapunits 1000
+#   python SSURGO_AggregationBenchmark.py synthetic.sqlite --output baseline.json
+#   python SSURGO_AggregationBenchmark.py synthetic.sqlite --baseline baseline.json --output latest.json
+#
+
+## ===================================================================================
+class MyError(Exception):
+    pass
+
+## ===================================================================================
+def PrintMsg(msg, severity=0):
+    # Print a message to the console
+    #
+    if severity == 1:
+        msg = "Warning: " + msg
+
+    elif severity == 2:
+        msg = "Error: " + msg
+
+    print msg
+
+## ===================================================================================
+## SQLite stand-in for the arcpy functions used by the aggregation code. A table path is
+## [sqlite database]\[table name], the same way a table path is [geodatabase]\[table name].
+## ===================================================================================
+class Result(object):
+    # Return value of GetCount_management
+    def __init__(self, value):
+        self.value = value
+
+    def getOutput(self, index):
+        return str(self.value)
+
+## ===================================================================================
+class Field(object):
+    # Field object returned by ListFields and Describe
+    def __init__(self, name, fldType):
+        self.name = name
+        self.type = fldType
+        self.aliasName = name
+        self.length = 254 if fldType == "String" else 0
+        self.precision = 0
+        self.scale = 0
+
+## ===================================================================================
+class Description(object):
+    # Describe object for a table
+    def __init__(self, tbl):
+        self.catalogPath = tbl
+        self.dataType = "Table"
+        self.fields = ListFields(tbl)
+
+## ===================================================================================
+class SearchCursor(object):
+    # arcpy.da.SearchCursor. The where_clause and ORDER BY are passed to SQLite as they are.
+    def __init__(self, tbl, flds, where_clause=None, sql_clause=(None, None)):
+        db, tblName = SplitPath(tbl)
+
+        if isinstance(flds, basestring):
+            flds = [flds]
+
+        sql = "SELECT " + ", ".join(flds) + " FROM " + tblName
+
+        if where_clause:
+            sql += " WHERE " + where_clause
+
+        if sql_clause is not None and sql_clause[1]:
+            sql += " " + sql_clause[1]
+
+        self.cur = Connection(db).execute(sql)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cur.close()
+
+    def __iter__(self):
+        return iter(self.cur)
+
+    def reset(self):
+        raise MyError, "SearchCursor.reset is not supported by the benchmark"
+
+## ===================================================================================
+class InsertCursor(object):
+    # arcpy.da.InsertCursor. Rows are inserted in chunks.
+    def __init__(self, tbl, flds):
+        db, tblName = SplitPath(tbl)
+
+        if isinstance(flds, basestring):
+            flds = [flds]
+
+        self.conn = Connection(db)
+        self.sql = "INSERT INTO " + tblName + " (" + ", ".join(flds) + ") VALUES (" + ", ".join(["?"] * len(flds)) + ")"
+        self.rows = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+    def __del__(self):
+        self.flush()
+
+    def insertRow(self, row):
+        self.rows.append(tuple(row))
+
+        if len(self.rows) >= 10000:
+            self.flush()
+
+    def flush(self):
+        if len(self.rows) > 0:
+            self.conn.executemany(self.sql, self.rows)
+            self.rows = list()
+
+## ===================================================================================
+def SplitPath(tbl):
+    # Return the database and table name for a table path
+    #
+    return os.path.dirname(tbl), os.path.basename(tbl)
+
+## ===================================================================================
+def Connection(db):
+    # Open connection to a SQLite database, one per database
+    #
+    if not db in dConnections:
+        conn = sqlite3.connect(db, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        dConnections[db] = conn
+
+    return dConnections[db]
+
+## ===================================================================================
+def TableColumns(tbl):
+    # Return (name, declared type) for each column in a table
+    #
+    db, tblName = SplitPath(tbl)
+
+    return [(rec[1], rec[2]) for rec in Connection(db).execute("PRAGMA table_info(" + tblName + ")")]
+
+## ===================================================================================
+def Exists(tbl):
+    db, tblName = SplitPath(tbl)
+
+    if not db.lower().endswith(".sqlite") or not os.path.isfile(db):
+        return os.path.exists(tbl)
+
+    sql = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND lower(name) = ?"
+
+    return Connection(db).execute(sql, (tblName.lower(),)).fetchone()[0] > 0
+
+## ===================================================================================
+def Delete_management(tbl):
+    db, tblName = SplitPath(tbl)
+    Connection(db).execute("DROP TABLE IF EXISTS " + tblName)
+
+## ===================================================================================
+def CreateTable_management(db, tblName, template=None):
+    if template:
+        Connection(db).execute("CREATE TABLE " + tblName + " AS SELECT * FROM " + SplitPath(template)[1] + " WHERE 0")
+
+    else:
+        Connection(db).execute("CREATE TABLE " + tblName + " (OBJECTID INTEGER PRIMARY KEY)")
+
+## ===================================================================================
+def AddField_management(tbl, fldName, fldType, precision="", scale="", length="", alias="", *args):
+    db, tblName = SplitPath(tbl)
+    sqlType = {"TEXT": "TEXT", "SHORT": "INTEGER", "LONG": "INTEGER", "FLOAT": "REAL", "DOUBLE": "REAL"}.get(fldType.upper(), "TEXT")
+    Connection(db).execute("ALTER TABLE " + tblName + " ADD COLUMN " + fldName + " " + sqlType)
+
+## ===================================================================================
+def DeleteField_management(tbl, fldName):
+    # Older SQLite versions (ArcGIS Python) have no DROP COLUMN, so the table is copied
+    # without the column. A column that is not in the table is ignored.
+    #
+    db, tblName = SplitPath(tbl)
+    columns = TableColumns(tbl)
+    keepCols = [col for col, colType in columns if col.upper() != fldName.upper()]
+
+    if len(keepCols) == len(columns):
+        return
+
+    conn = Connection(db)
+    conn.execute("CREATE TABLE xx_" + tblName + " AS SELECT " + ", ".join(keepCols) + " FROM " + tblName)
+    conn.execute("DROP TABLE " + tblName)
+    conn.execute("ALTER TABLE xx_" + tblName + " RENAME TO " + tblName)
+
+## ===================================================================================
+def AddIndex_management(tbl, fldNames, indexName, *args):
+    db, tblName = SplitPath(tbl)
+    Connection(db).execute("CREATE INDEX IF NOT EXISTS " + indexName + " ON " + tblName + " (" + fldNames + ")")
+
+## ===================================================================================
+def GetCount_management(tbl):
+    db, tblName = SplitPath(tbl)
+
+    return Result(Connection(db).execute("SELECT COUNT(*) FROM " + tblName).fetchone()[0])
+
+## ===================================================================================
+def ListFields(tbl):
+    fieldTypes = {"TEXT": "String", "INT": "Integer", "INTEGER": "Integer", "REAL": "Double", "NUM": "Double", "": "String"}
+
+    return [Field(col, fieldTypes.get(colType.upper(), "String")) for col, colType in TableColumns(tbl)]
+
+## ===================================================================================
+def Describe(tbl):
+    return Description(tbl)
+
+## ===================================================================================
+def Message(msg):
+    # Errors from the aggregation code
+    sys.stderr.write(msg + "\n")
+
+## ===================================================================================
+def Ignore(*args, **kwargs):
+    # Progressor and message calls
+    return None
+
+## ===================================================================================
+def SQLiteArcpy():
+    # Return a module with the SQLite stand-in functions in place of arcpy
+    #
+    module = types.ModuleType("arcpy")
+    module.da = types.ModuleType("arcpy.da")
+    module.da.SearchCursor = SearchCursor
+    module.da.InsertCursor = InsertCursor
+    module.env = types.ModuleType("arcpy.env")
+    module.env.overwriteOutput = True
+    module.env.workspace = ""
+    module.env.scratchFolder = tempfile.gettempdir()
+
+    for name in ["Exists", "Delete_management", "CreateTable_management", "AddField_management", "DeleteField_management",
+                 "AddIndex_management", "GetCount_management", "ListFields", "Describe"]:
+        setattr(module, name, globals()[name])
+
+    # Some of the aggregation functions write a warning for every map unit
+    for name in ["SetProgressor", "SetProgressorLabel", "SetProgressorPosition", "ResetProgressor", "AddMessage", "AddWarning"]:
+        setattr(module, name, Ignore)
+
+    module.AddError = Message
+
+    return module
+
+## ===================================================================================
+def LoadCreateSoilMap():
+    # Load gSSURGO_CreateSoilMap.py with the SQLite stand-in as its arcpy module
+    #
+    realArcpy = sys.modules.get("arcpy")
+    sys.modules["arcpy"] = SQLiteArcpy()
+
+    try:
+        module = imp.load_source("gSSURGO_CreateSoilMap_Benchmark", os.path.join(scriptFolder, "gSSURGO_CreateSoilMap.py"))
+
+    finally:
+        if realArcpy is None:
+            del sys.modules["arcpy"]
+
+        else:
+            sys.modules["arcpy"] = realArcpy
+
+    module.bVerbose = False
+    module.bColumnCache = False
+    module.bRatingCache = False
+    module.bProfile = False
+
+    return module
+
+## ===================================================================================
+def InitialTableSQL(case):
+    # SQL for the SDV_Data initial table. Components without horizons or months are kept
+    # with Null values, the same as the initial table built by CreateSoilMap.
+    #
+    col = case["column"]
+    sql = "SELECT l.areasymbol AS AREASYMBOL, mu.mukey AS MUKEY, co.cokey AS COKEY, co.comppct_r AS COMPPCT_R"
+    joins = " FROM ssurgo.legend l JOIN ssurgo.mapunit mu ON mu.lkey = l.lkey JOIN ssurgo.component co ON co.mukey = mu.mukey"
+
+    if case["level"] == "component":
+        sql += ", co." + col + " AS " + col.upper()
+
+    elif case["level"] == "month":
+        sql += ", cm.comonthkey AS COMONTHKEY, cm.month AS MONTH, cm." + col + " AS " + col.upper()
+        joins += " LEFT JOIN ssurgo.comonth cm ON cm.cokey = co.cokey"
+
+    elif case["level"] == "horizon":
+        sql += ", ch.chkey AS CHKEY, ch.hzdept_r AS HZDEPT_R, ch.hzdepb_r AS HZDEPB_R, ch." + col + " AS " + col.upper()
+        joins += " LEFT JOIN ssurgo.chorizon ch ON ch.cokey = co.cokey"
+
+    else:
+        raise MyError, "Unknown benchmark level: " + case["level"]
+
+    return "CREATE TABLE SDV_Data AS " + sql + joins
+
+## ===================================================================================
+def SetGlobals(csm, case, scratchDB):
+    # Set the module globals that CreateSoilMap sets before calling an Aggregate function
+    #
+    resultColumn = case["column"].upper()
+    csm.gdb = scratchDB
+    csm.tblName = "SDV_" + resultColumn
+
+    dSDV = dict()
+    dSDV["attributename"] = case["name"]
+    dSDV["attributecolumnname"] = resultColumn
+    dSDV["resultcolumnname"] = resultColumn
+    dSDV["attributelogicaldatatype"] = case["datatype"]
+    dSDV["effectivelogicaldatatype"] = case["datatype"]
+    dSDV["attributeprecision"] = 2
+    dSDV["attributetype"] = "Property"
+    dSDV["algorithmname"] = case["name"]
+    dSDV["maplegendkey"] = 3
+    dSDV["nasisrulename"] = None
+    dSDV["notratedphrase"] = None
+    dSDV["nullratingreplacementvalue"] = None
+    dSDV["sqlwhereclause"] = case.get("sqlwhereclause")
+    dSDV["tiebreakdomainname"] = "domain" if len(case.get("domain", [])) > 0 else None
+    dSDV["tiebreakhighlabel"] = "Higher"
+    dSDV["tiebreaklowlabel"] = "Lower"
+    dSDV["tiebreakrule"] = 1
+    dSDV["ruledesign"] = None
+    csm.dSDV = dSDV
+
+    if case["datatype"].lower() in ["choice", "string"]:
+        csm.dFieldInfo = {resultColumn: ["TEXT", 254]}
+
+    else:
+        csm.dFieldInfo = {resultColumn: ["FLOAT", ""]}
+
+    # Rating domain, set up the same way as in CreateSoilMap
+    domainValues = list(case.get("domain", []))
+    csm.dValues = dict()
+
+    if len(domainValues) > 0:
+        domainValues.insert(0, None)
+
+        for i, val in enumerate(domainValues):
+            csm.dValues[str(val).upper()] = [i, val]
+
+    csm.domainValues = domainValues
+    csm.domainValuesUp = [str(val).upper() for val in domainValues if not val is None]
+    csm.dAreasymbols = dict()
+    csm.aggMethod = case["aggmethod"]
+    csm.nullRating = None
+    csm.bFuzzy = False
+
+    return True
+
+## ===================================================================================
+def RunCase(case, syntheticDB, scratchFolder):
+    # Run one benchmark case in this process. Returns a dictionary of results.
+    #
+    try:
+        csm = LoadCreateSoilMap()
+        scratchDB = os.path.join(scratchFolder, "benchmark_" + case["name"] + ".sqlite")
+
+        if os.path.isfile(scratchDB):
+            os.remove(scratchDB)
+
+        conn = Connection(scratchDB)
+        conn.execute("ATTACH DATABASE ? AS ssurgo", (syntheticDB,))
+
+        start = time.time()
+        conn.execute(InitialTableSQL(case))
+        setupSeconds = time.time() - start
+
+        initialTbl = os.path.join(scratchDB, "SDV_Data")
+        inputRows = int(GetCount_management(initialTbl).getOutput(0))
+        SetGlobals(csm, case, scratchDB)
+
+        function = getattr(csm, case["function"])
+        args = [scratchDB, case["name"], case["column"].upper(), initialTbl, True, 0, "Higher"]
+
+        if case["level"] == "horizon":
+            args.extend([case["top"], case["bot"], False])
+
+        elif case.get("bZero") is not None:
+            args.append(case["bZero"])
+
+        start = time.time()
+        outputTbl, outputValues = function(*args)
+        seconds = time.time() - start
+
+        if outputTbl == "" or not Exists(outputTbl):
+            raise MyError, case["function"] + " did not create an output table"
+
+        dResult = dict()
+        dResult["function"] = case["function"]
+        dResult["seconds"] = round(seconds, 4)
+        dResult["setupseconds"] = round(setupSeconds, 4)
+        dResult["rows"] = inputRows
+        dResult["outputrows"] = int(GetCount_management(outputTbl).getOutput(0))
+        dResult["rowspersecond"] = round(inputRows / max(seconds, 0.000001), 1)
+        dResult["peakmemory_mb"] = csm.PeakMemory()
+
+        conn.close()
+        del dConnections[scratchDB]
+        os.remove(scratchDB)
+
+        return dResult
+
+    except:
+        return {"function": case["function"], "error": str(sys.exc_info()[1])}
+
+## ===================================================================================
+def RunOverlapCase(case, syntheticDB, scratchFolder):
+    # Horizon overlap kernel used by CalcAWS and CalcSOC in gSSURGO_ValuTable.py: build the
+    # overlap matrix for the standard depth intervals and sum awc_r * thickness for each one.
+    #
+    try:
+        csm = LoadCreateSoilMap()
+        conn = sqlite3.connect(syntheticDB)
+        rows = conn.execute("SELECT hzdept_r, hzdepb_r, awc_r FROM chorizon ORDER BY cokey, hzdept_r").fetchall()
+        conn.close()
+
+        start = time.time()
+        hzdept = np.array([np.nan if rec[0] is None else rec[0] for rec in rows], dtype=np.float64)
+        hzdepb = np.array([np.nan if rec[1] is None else rec[1] for rec in rows], dtype=np.float64)
+        awc = np.array([np.nan if rec[2] is None else rec[2] for rec in rows], dtype=np.float64)
+        overlap = SSURGO_HorizonAggregation.OverlapMatrix(hzdept, hzdepb, SSURGO_HorizonAggregation.standardDepths)
+        aws = list()
+
+        for top, bot in SSURGO_HorizonAggregation.standardDepths:
+            hzRows, thickness = SSURGO_HorizonAggregation.OverlapColumn(overlap, top, bot)
+            aws.append(np.nansum(awc[hzRows] * thickness))
+
+        seconds = time.time() - start
+
+        dResult = dict()
+        dResult["function"] = case["function"]
+        dResult["seconds"] = round(seconds, 4)
+        dResult["setupseconds"] = 0.0
+        dResult["rows"] = len(rows)
+        dResult["outputrows"] = int(overlap["count"])
+        dResult["rowspersecond"] = round(len(rows) / max(seconds, 0.000001), 1)
+        dResult["peakmemory_mb"] = csm.PeakMemory()
+
+        return dResult
+
+    except:
+        return {"function": case["function"], "error": str(sys.exc_info()[1])}
+
+## ===================================================================================
+def BenchmarkCase(args):
+    # Process pool task. Runs a case repeat times and keeps the best time.
+    #
+    case, syntheticDB, scratchFolder = args
+
+    if case["function"] == "OverlapMatrix":
+        return RunOverlapCase(case, syntheticDB, scratchFolder)
+
+    return RunCase(case, syntheticDB, scratchFolder)
+
+## ===================================================================================
+def RunBenchmark(syntheticDB, caseNames, repeat, scratchFolder):
+    # Run the benchmark cases, each in a new process. Returns the results dictionary.
+    #
+    conn = sqlite3.connect(syntheticDB)
+    dCounts = dict()
+
+    for tbl in ["mapunit", "component", "comonth", "chorizon", "cointerp"]:
+        dCounts[tbl] = conn.execute("SELECT COUNT(*) FROM " + tbl).fetchone()[0]
+
+    conn.close()
+
+    dResults = dict()
+    dResults["database"] = os.path.abspath(syntheticDB)
+    dResults["records"] = dCounts
+    dResults["created"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    dResults["python"] = sys.version.split()[0]
+    dResults["platform"] = platform.platform()
+    dResults["repeat"] = repeat
+    dResults["cases"] = dict()
+
+    PrintMsg("Benchmark database: " + syntheticDB + " (" + ", ".join([tbl + " " + str(dCounts[tbl]) for tbl in sorted(dCounts)]) + ")")
+
+    for case in benchmarkCases:
+        if len(caseNames) > 0 and not case["name"] in caseNames:
+            continue
+
+        best = None
+
+        for i in range(repeat):
+            # One process per run, so that the peak memory is for this case only
+            pool = multiprocessing.Pool(1)
+
+            try:
+                dResult = pool.apply(BenchmarkCase, ((case, syntheticDB, scratchFolder),))
+
+            finally:
+                pool.close()
+                pool.join()
+
+            if "error" in dResult:
+                best = dResult
+                break
+
+            if best is None or dResult["seconds"] < best["seconds"]:
+                best = dResult
+
+        dResults["cases"][case["name"]] = best
+
+        if "error" in best:
+            PrintMsg(case["name"] + " (" + case["function"] + "): " + best["error"], 2)
+
+        else:
+            PrintMsg("{0:<16} {1:<26} {2:>9.3f} sec {3:>12,.0f} rows/sec {4:>9} MB".format(case["name"], case["function"], best["seconds"], best["rowspersecond"], best["peakmemory_mb"]))
+
+    return dResults
+
+## ===================================================================================
+def CompareResults(dResults, dBaseline, tolerance):
+    # Compare with a baseline run. Returns a list of regression messages.
+    #
+    regressions = list()
+
+    for name in sorted(dResults["cases"]):
+        dCase = dResults["cases"][name]
+        dBase = dBaseline.get("cases", dict()).get(name)
+
+        if dBase is None or "error" in dBase:
+            continue
+
+        if "error" in dCase:
+            regressions.append(name + ": " + dCase["error"])
+            continue
+
+        # Throughput, compared as rows per second so that a baseline from another database size still means something
+        change = 100.0 * (dCase["rowspersecond"] - dBase["rowspersecond"]) / max(dBase["rowspersecond"], 0.000001)
+
+        if change < -tolerance:
+            regressions.append(name + ": throughput " + str(round(change, 1)) + "% (" + str(dBase["rowspersecond"]) + " -> " + str(dCase["rowspersecond"]) + " rows/sec)")
+
+        if not dCase["peakmemory_mb"] is None and not dBase["peakmemory_mb"] is None:
+            change = 100.0 * (dCase["peakmemory_mb"] - dBase["peakmemory_mb"]) / max(dBase["peakmemory_mb"], 0.000001)
+
+            if change > tolerance:
+                regressions.append(name + ": peak memory +" + str(round(change, 1)) + "% (" + str(dBase["peakmemory_mb"]) + " -> " + str(dCase["peakmemory_mb"]) + " MB)")
+
+        if dCase["outputrows"] != dBase["outputrows"] and dResults["records"] == dBaseline.get("records"):
+            regressions.append(name + ": " + str(dCase["outputrows"]) + " output rows, baseline had " + str(dBase["outputrows"]))
+
+    return regressions
+
+## ===================================================================================
+## MAIN
+## ===================================================================================
+
+# Import system modules
+import sys, os, time, imp, types, json, sqlite3, tempfile, platform, multiprocessing, argparse
+import numpy as np
+
+scriptFolder = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, scriptFolder)
+import SSURGO_HorizonAggregation
+
+# Open SQLite connections for the stand-in functions
+dConnections = dict()
+
+# Benchmark cases. level is the SDV_Data level (component, month or horizon).
+drainageDomain = ["Excessively drained", "Somewhat excessively drained", "Well drained", "Moderately well drained", "Somewhat poorly drained", "Poorly drained", "Very poorly drained"]
+floodDomain = ["None", "Very rare", "Rare", "Occasional", "Frequent", "Very frequent"]
+kwfactDomain = [".02", ".05", ".10", ".15", ".17", ".20", ".24", ".28", ".32", ".37", ".43", ".49", ".55", ".64"]
+
+benchmarkCases = [
+    {"name": "DCP", "function": "AggregateCo_DCP", "aggmethod": "Dominant Component", "level": "component", "column": "hydgrp", "datatype": "Choice", "bZero": False},
+    {"name": "DCD", "function": "AggregateCo_DCD", "aggmethod": "Dominant Condition", "level": "component", "column": "taxorder", "datatype": "Choice", "bZero": False},
+    {"name": "DCP_Domain", "function": "AggregateCo_DCP_Domain", "aggmethod": "Dominant Component", "level": "component", "column": "drainagecl", "datatype": "Choice", "domain": drainageDomain},
+    {"name": "DCD_Domain", "function": "AggregateCo_DCD_Domain", "aggmethod": "Dominant Condition", "level": "component", "column": "drainagecl", "datatype": "Choice", "domain": drainageDomain},
+    {"name": "WTA", "function": "AggregateCo_WTA", "aggmethod": "Weighted Average", "level": "component", "column": "slope_r", "datatype": "Float", "bZero": False},
+    {"name": "MaxMin", "function": "AggregateCo_MaxMin", "aggmethod": "Minimum or Maximum", "level": "component", "column": "slope_r", "datatype": "Float", "bZero": False},
+    {"name": "PP_SUM", "function": "AggregateCo_PP_SUM", "aggmethod": "Percent Present", "level": "component", "column": "hydricrating", "datatype": "Choice", "sqlwhereclause": "hydricrating = 'Yes'"},
+    {"name": "Mo_DCD", "function": "AggregateCo_Mo_DCD", "aggmethod": "Dominant Condition", "level": "month", "column": "flodfreqcl", "datatype": "Choice"},
+    {"name": "Mo_DCD_Domain", "function": "AggregateCo_Mo_DCD_Domain", "aggmethod": "Dominant Condition", "level": "month", "column": "flodfreqcl", "datatype": "Choice", "domain": floodDomain},
+    {"name": "Mo_DCP_Domain", "function": "AggregateCo_Mo_DCP_Domain", "aggmethod": "Dominant Component", "level": "month", "column": "flodfreqcl", "datatype": "Choice", "domain": floodDomain},
+    {"name": "Mo_MaxMin", "function": "AggregateCo_Mo_MaxMin", "aggmethod": "Minimum or Maximum", "level": "month", "column": "flodfreqcl", "datatype": "Choice", "domain": floodDomain},
+    {"name": "Hz_WTA_SUM", "function": "AggregateHz_WTA_SUM", "aggmethod": "Weighted Average", "level": "horizon", "column": "awc_r", "datatype": "Float", "top": 0, "bot": 100},
+    {"name": "Hz_WTA_WTA", "function": "AggregateHz_WTA_WTA", "aggmethod": "Weighted Average", "level": "horizon", "column": "claytotal_r", "datatype": "Float", "top": 0, "bot": 100},
+    {"name": "Hz_DCP_WTA", "function": "AggregateHz_DCP_WTA", "aggmethod": "Dominant Component", "level": "horizon", "column": "om_r", "datatype": "Float", "top": 0, "bot": 20},
+    {"name": "Hz_MaxMin_WTA", "function": "AggregateHz_MaxMin_WTA", "aggmethod": "Minimum or Maximum", "level": "horizon", "column": "ph1to1h2o_r", "datatype": "Float", "top": 0, "bot": 50},
+    {"name": "Hz_MaxMin_DCD", "function": "AggregateHz_MaxMin_DCD", "aggmethod": "Minimum or Maximum", "level": "horizon", "column": "kwfact", "datatype": "Choice", "domain": kwfactDomain, "top": 0, "bot": 1},
+    {"name": "Hz_MaxMin_DCP", "function": "AggregateHz_MaxMin_DCP", "aggmethod": "Minimum or Maximum", "level": "horizon", "column": "kwfact", "datatype": "Choice", "domain": kwfactDomain, "top": 0, "bot": 1},
+    {"name": "ValuTable_AWS", "function": "OverlapMatrix", "aggmethod": "Weighted Average", "level": "horizon", "column": "awc_r", "datatype": "Float"},
+    ]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the gSSURGO_CreateSoilMap aggregation functions")
+    parser.add_argument("syntheticDB", help="SQLite database created by SSURGO_SyntheticData.py")
+    parser.add_argument("--cases", default="", help="comma-delimited list of case names (default is all): " + ", ".join([case["name"] for case in benchmarkCases]))
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs for each case, the best time is kept")
+    parser.add_argument("--output", default="", help="save the results to this JSON file")
+    parser.add_argument("--baseline", default="", help="compare with the results in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="percent change in throughput or peak memory reported as a regression")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.syntheticDB):
+        PrintMsg("Missing synthetic database " + args.syntheticDB, 2)
+        sys.exit(2)
+
+    caseNames = [name.strip() for name in args.cases.split(",") if name.strip() != ""]
+    scratchFolder = tempfile.mkdtemp(prefix="sdv_benchmark_")
+
+    try:
+        dResults = RunBenchmark(args.syntheticDB, caseNames, max(1, args.repeat), scratchFolder)
+
+    finally:
+        for fileName in os.listdir(scratchFolder):
+            os.remove(os.path.join(scratchFolder, fileName))
+
+        os.rmdir(scratchFolder)
+
+    if args.output != "":
+        fh = open(args.output, "w")
+
+        try:
+            json.dump(dResults, fh, indent=1, sort_keys=True)
+
+        finally:
+            fh.close()
+
+        PrintMsg("Results saved to " + args.output)
+
+    bFailed = len([name for name in dResults["cases"] if "error" in dResults["cases"][name]]) > 0
+
+    if args.baseline != "":
+        fh = open(args.baseline, "r")
+
+        try:
+            dBaseline = json.load(fh)
+
+        finally:
+            fh.close()
+
+        regressions = CompareResults(dResults, dBaseline, args.tolerance)
+
+        if len(regressions) > 0:
+            PrintMsg("Regressions compared with " + args.baseline + " (tolerance " + str(args.tolerance) + "%):", 1)
+
+            for msg in regressions:
+                PrintMsg("\t" + msg, 1)
+
+            bFailed = True
+
+        else:
+            PrintMsg("No regressions compared with " + args.baseline)
+
+    if bFailed:
+        sys.exit(1)
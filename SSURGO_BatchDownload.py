@@ -177,9 +177,9 @@ def SSURGOVersion(newDB, tabularFolder):
         if not arcpy.Exists(newDB):
             raise MyError, "Missing input database (" + newDB + ")"
 
-        if os.path.isfile(versionTxt):
+        if SSURGO_TabularReader.TextFileExists(versionTxt):
             # read just the first line of the version.txt file
-            fh = open(versionTxt, "r")
+            fh = SSURGO_TabularReader.OpenTextFile(versionTxt)
             txtVersion = fh.readline().split(".")[0]
             fh.close()
 
@@ -289,10 +289,10 @@ def GetTabularDate(newFolder):
         tabDate = 0
 
         # Try finding the text file in the tabular folder and reading SAVEREST from that file.
-        saCatalog = os.path.join(newFolder, r"tabular\sacatlog.txt")
+        saCatalog = os.path.join(SSURGO_TabularReader.GetTabularFolder(newFolder), "sacatlog.txt")
 
-        if arcpy.Exists(saCatalog):
-            fh = open(saCatalog, "r")
+        if SSURGO_TabularReader.TextFileExists(saCatalog):
+            fh = SSURGO_TabularReader.OpenTextFile(saCatalog)
             rec = fh.readline()
             fh.close()
             # Example date (which is index 3 in pipe-delimited file):  9/23/2014 6:49:27
@@ -383,7 +383,7 @@ def GetReason(responseCode):
         return "Unknown error"
 
 ## ===================================================================================
-def GetDownload(areasym, surveyDate, importDB, newFolder):
+def GetDownload(areasym, surveyDate, importDB, newFolder, bKeepZip=False):
     # download survey from Web Soil Survey URL and return name of the zip file
     # want to set this up so that download will retry several times in case of error
     # return empty string in case of complete failure. Allow main to skip a failed
@@ -392,6 +392,9 @@ def GetDownload(areasym, surveyDate, importDB, newFolder):
     # Only the version of zip file without a Template database is downloaded. The user
     # must have a locale copy of the Template database that has been modified to allow
     # automatic tabular imports.
+    #
+    # bKeepZip: extract only the spatial data. The zip file is moved to soil_[areasymbol]\tabular.zip
+    #           and the tabular text files are read from it without being extracted.
 
     # create URL string from survey string and WSS 3.0 cache URL
 
@@ -445,12 +448,10 @@ def GetDownload(areasym, surveyDate, importDB, newFolder):
         # Test replacement for owbs code for getting SSURGO download-zip file
         # The following code snippet seems to be a major improvement. Need to add status check though.
         zipDL = urllib2.urlopen(zipURL)
-        time.sleep(1)
 
         if zipDL is None:
             raise MyError, "Empty download from URL"
         
-        time.sleep(1)
         zipCode = zipDL.code
         zipMD = zipDL.info()
         zipType = zipMD.subtype
@@ -465,11 +466,11 @@ def GetDownload(areasym, surveyDate, importDB, newFolder):
             raise MyError, "Failed to get requested zipfile from Web Soil Survey"
 
         if os.path.isdir(outputFolder):
-            # Sometimes it appears that I'm losing connection to our network share
+            # Sometimes it appears that I'm losing connection to our network share.
+            # Opening the file is retried after an I/O error (see SSURGO_TabularReader.RetryFileAccess).
             
             try:
-                fh = open(local_zip, 'wb')  # Getting some IOErrors. No such file or directory (zipfile path)
-                time.sleep(1)
+                fh = SSURGO_TabularReader.RetryFileAccess(open, local_zip, 'wb')  # Getting some IOErrors. No such file or directory (zipfile path)
                 
             except IOError:
                 raise MyError, "\tUnable to write to " + local_zip
@@ -501,9 +502,7 @@ def GetDownload(areasym, surveyDate, importDB, newFolder):
                 PrintMsg("\tUnzipping " + zipName + " (" + Number_Format(zipSize, 3, True) + " MB) to " + outputFolder + "...", 0)
 
                 try:
-                    z = zipfile.ZipFile(local_zip, "r")
-                    z.extractall(outputFolder)
-                    z.close()
+                    SSURGO_TabularReader.ExtractZip(local_zip, outputFolder, not bKeepZip)
 
                 except zipfile.BadZipfile:
                     PrintMsg("Bad zip file?", 2)
@@ -514,20 +513,18 @@ def GetDownload(areasym, surveyDate, importDB, newFolder):
                     return False
 
                 # remove zip file after it has been extracted,
-                # allowing a little extra time for file lock to clear
-                sleep(3)
-                os.remove(local_zip)
+                # retrying until the file lock clears
+                if not bKeepZip:
+                    SSURGO_TabularReader.RetryFileAccess(os.remove, local_zip)
 
                 # rename output folder to NRCS Geodata Standard for Soils
                 if os.path.isdir(os.path.join(outputFolder, zipName[:-4])):
                     # this is an older zip file that has the 'wss_' directory structure
-                    time.sleep(1)
-                    os.rename(os.path.join(outputFolder, zipName[:-4]), newFolder)
+                    SSURGO_TabularReader.RetryFileAccess(os.rename, os.path.join(outputFolder, zipName[:-4]), newFolder)
 
                 elif os.path.isdir(os.path.join(outputFolder, areaSym.upper())):
                     # this must be a newer zip file using the uppercase AREASYMBOL directory
-                    time.sleep(1)
-                    os.rename(os.path.join(outputFolder, areaSym.upper()), newFolder)
+                    SSURGO_TabularReader.RetryFileAccess(os.rename, os.path.join(outputFolder, areaSym.upper()), newFolder)
 
                 elif os.path.isdir(newFolder):
                     # this is a future zip file using the correct field office naming convention (soil_ne109)
@@ -538,6 +535,10 @@ def GetDownload(areasym, surveyDate, importDB, newFolder):
                     # none of the subfolders within the zip file match any of the expected names
                     raise MyError, "Subfolder within the zip file does not match the standard naminig convention"
 
+                if bKeepZip:
+                    # The tabular text files will be read directly from the zip file
+                    SSURGO_TabularReader.RetryFileAccess(os.rename, local_zip, os.path.join(newFolder, "tabular.zip"))
+
             else:
                 # Downloaded a zero-byte zip file
                 # download for this survey failed, may try again
@@ -690,7 +691,7 @@ def CheckExistingDataset(areaSym, surveyDate, newFolder, newDB):
         return False
 
 ## ===================================================================================
-def ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iTotal):
+def ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iTotal, bKeepZip=False):
     # Download and import the specified SSURGO dataset
 
     try:
@@ -738,24 +739,24 @@ def ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iT
             PrintMsg(" \nProcessing survey " + areaSym + " (" + str(iGet) + " of " + str(iTotal) + "):  " + surveyName, 0)
 
             # First attempt to download zip file
-            zipName = GetDownload(areaSym, surveyDate, importDB, newFolder)
+            zipName = GetDownload(areaSym, surveyDate, importDB, newFolder, bKeepZip)
 
             if zipName == "":
                 # First download attempt failed, try downloading zip file a second time
                 sleep(5)
-                zipName = GetDownload(areaSym, surveyDate, importDB, newFolder)
+                zipName = GetDownload(areaSym, surveyDate, importDB, newFolder, bKeepZip)
 
                 if zipName == "":
                     # Failed second attempt to download zip file
                     # Give up on this survey
                     raise MyError, ""
 
-            #bZip = UnzipDownload(outputFolder, newFolder, importDB, zipName)
+            #bZip = UnzipDownload(outputFolder, newFolder, importDB, zipName, bKeepZip)
 
             #if not bZip:
                 # Try unzipping a second time
             #    sleep(1)
-            #    bZip = UnzipDownload(outputFolder, newFolder, importDB, zipName)
+            #    bZip = UnzipDownload(outputFolder, newFolder, importDB, zipName, bKeepZip)
 
             #    if not bZip:
                     # Failed second attempt to unzip
@@ -788,8 +789,10 @@ def ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iT
         return "Failed"
 
 ## ===================================================================================
-def UnzipDownload(outputFolder, newFolder, importDB, zipName ):
+def UnzipDownload(outputFolder, newFolder, importDB, zipName, bKeepZip=False):
     # Given zip file name, try to unzip it
+    #
+    # bKeepZip: extract only the spatial data and keep the zip file as soil_[areasymbol]\tabular.zip
 
     try:
         local_zip = os.path.join(outputFolder, zipName)
@@ -806,9 +809,7 @@ def UnzipDownload(outputFolder, newFolder, importDB, zipName ):
                 PrintMsg("\tUnzipping " + zipName + " (" + Number_Format(zipSize, 3, True) + " MB) to " + outputFolder + "...", 0)
 
                 try:
-                    z = zipfile.ZipFile(local_zip, "r")
-                    z.extractall(outputFolder)
-                    z.close()
+                    SSURGO_TabularReader.ExtractZip(local_zip, outputFolder, not bKeepZip)
 
                 except zipfile.BadZipfile:
                     PrintMsg("Bad zip file?", 2)
@@ -819,18 +820,18 @@ def UnzipDownload(outputFolder, newFolder, importDB, zipName ):
                     return False
 
                 # remove zip file after it has been extracted,
-                # allowing a little extra time for file lock to clear
-                sleep(3)
-                os.remove(local_zip)
+                # retrying until the file lock clears
+                if not bKeepZip:
+                    SSURGO_TabularReader.RetryFileAccess(os.remove, local_zip)
 
                 # rename output folder to NRCS Geodata Standard for Soils
                 if os.path.isdir(os.path.join(outputFolder, zipName[:-4])):
                     # this is an older zip file that has the 'wss_' directory structure
-                    os.rename(os.path.join(outputFolder, zipName[:-4]), newFolder)
+                    SSURGO_TabularReader.RetryFileAccess(os.rename, os.path.join(outputFolder, zipName[:-4]), newFolder)
 
                 elif os.path.isdir(os.path.join(outputFolder, areaSym.upper())):
                     # this must be a newer zip file using the uppercase AREASYMBOL directory
-                    os.rename(os.path.join(outputFolder, areaSym.upper()), newFolder)
+                    SSURGO_TabularReader.RetryFileAccess(os.rename, os.path.join(outputFolder, areaSym.upper()), newFolder)
 
                 elif os.path.isdir(newFolder):
                     # this is a future zip file using the correct field office naming convention (soil_ne109)
@@ -841,6 +842,10 @@ def UnzipDownload(outputFolder, newFolder, importDB, zipName ):
                     # none of the subfolders within the zip file match any of the expected names
                     raise MyError, "Subfolder within the zip file does not match the standard naminig convention"
 
+                if bKeepZip:
+                    # The tabular text files will be read directly from the zip file
+                    SSURGO_TabularReader.RetryFileAccess(os.rename, local_zip, os.path.join(newFolder, "tabular.zip"))
+
             else:
                 # Downloaded a zero-byte zip file
                 # download for this survey failed, may try again
@@ -1044,6 +1049,10 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
         # copy over master database and run tabular import
         PrintMsg("\tCopying selected master template database to tabular folder...", 0)
 
+        if not os.path.isdir(os.path.dirname(newDB)):
+            # tabular text files were left in the zip file
+            os.mkdir(os.path.dirname(newDB))
+
         # copy user specified database to the new folder
         shutil.copy2(importDB, newDB)
 
@@ -1051,10 +1060,10 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
         PrintMsg("\tImporting textfiles into new database " + os.path.basename(newDB) + "...", 0)
 
         # Using Adolfo's csv reader method to import tabular data from text files...
-        tabularFolder = os.path.join(newFolder, "tabular")
+        tabularFolder = SSURGO_TabularReader.GetTabularFolder(newFolder)
 
         # if the tabular directory is empty return False
-        if len(os.listdir(tabularFolder)) < 1:
+        if len(SSURGO_TabularReader.ListTextFiles(tabularFolder)) < 1:
             raise MyError, "No text files found in the tabular folder"
 
         # Compare SSURGO version number (version.txt) with version number in Access database.
@@ -1151,7 +1160,7 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
 
                     try:
                         # Use csv reader to read each line in the text file
-                        for row in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                        for row in SSURGO_TabularReader.ReadRawRows(txtPath):
                             # replace all blank values with 'None' so that the values are properly inserted
                             # into integer values otherwise insertRow fails
                             # truncate any string values that exceed the width of the target field
@@ -1187,7 +1196,7 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
 
         # Import feature description file
         # soilsf_t_al001.txt
-        spatialFolder = os.path.join(os.path.dirname(tabularFolder), "spatial")
+        spatialFolder = os.path.join(newFolder, "spatial")
         txtFile ="soilsf_t_" + areaSym
         txtPath = os.path.join(spatialFolder, txtFile + ".txt")
         tbl = "featdesc"
@@ -1200,7 +1209,7 @@ def ImportTabular(areaSym, newFolder, importDB, newDB, bRemoveTXT, bLast):
 
             try:
                 # Use csv reader to read each line in the text file
-                for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                     # replace all blank values with 'None' so that the values are properly inserted
                     # into integer values otherwise insertRow fails
                     newRow = [None if value == '' else value for value in rowInFile]
@@ -1439,6 +1448,7 @@ def AddMuName(newFolder, bLast, bMuName):
 # Import system modules
 import arcpy, sys, os, locale, string, traceback, urllib, urllib2, shutil, zipfile, subprocess, glob, socket, csv, re
 import httplib
+import SSURGO_TabularReader
 
 from arcpy import env
 from datetime import datetime
@@ -1456,6 +1466,12 @@ try:
     bRemoveTXT = arcpy.GetParameter(5)
     bMuName = arcpy.GetParameter(6)
 
+    if arcpy.GetArgumentCount() > 7:
+        bKeepZip = arcpy.GetParameter(7)    # leave tabular text files in soil_[areasymbol]\tabular.zip
+
+    else:
+        bKeepZip = False
+
     # Set tabular import to False if no Template database is specified
     if importDB == "":
         PrintMsg(" \nWarning! Tabular import turned off (no database specified)", 1)
@@ -1502,7 +1518,7 @@ try:
         # Run import process
         iTotal = len(asList)
         arcpy.SetProgressorLabel("Downloading survey " + areaSym + " from Web Soil Survey  (number " + str(iGet) + " of " + str(len(asList)) + " total)")
-        bProcessed = ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iTotal)
+        bProcessed = ProcessSurvey(outputFolder, importDB, areaSym, bImport, bRemoveTXT, iGet, iTotal, bKeepZip)
 
         if bProcessed == "Failed":
             failedList.append(areaSym)
@@ -1547,6 +1563,7 @@ try:
         else:
             PrintMsg(" \nAll " + Number_Format(len(asList), 0, True) + " surveys succcessfully downloaded (no tabular import) \n ", 0)
 
+    PrintMsg(SSURGO_TabularReader.RetryReport() + " \n ", 0)
 
     arcpy.SetProgressorLabel("Processing complete...")
     env.workspace = outputFolder
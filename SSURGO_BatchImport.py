@@ -14,6 +14,11 @@
 # Designed to create gSSURGO databases from the tabular text files and shapefiles.
 #
 # New datasets are unzipped and copied to a new location, leaving the original cache files untouched.
+#
+# Optionally the tabular text files can be left in the zip file. Only the spatial data is extracted
+# and a copy of the zip file is saved as soil_[Areasymbol]\tabular.zip. The gSSURGO conversion tools
+# read the text files directly from the zip file (see SSURGO_TabularReader.py), so there is no need
+# for scratch space to hold the uncompressed text files.
 
 # 2015-02-19
 
@@ -71,7 +76,7 @@ def Number_Format(num, places=0, bCommas=True):
 
 ## ===================================================================================
 # def ProcessSurvey(inputFolder, outputFolder, importDB, areaSym, bRemoveTXT):
-def ProcessSurvey(inputFolder, outputFolder, areaSym):
+def ProcessSurvey(inputFolder, outputFolder, areaSym, bKeepZip=False):
     # Download and import the specified SSURGO dataset
 
     try:
@@ -103,7 +108,7 @@ def ProcessSurvey(inputFolder, outputFolder, areaSym):
         #
         PrintMsg(" \nProcessing survey " + areaSym, 0)
 
-        bZip = UnzipDownload(inputFolder, outputFolder, newFolder, zipName, areaSym)
+        bZip = UnzipDownload(inputFolder, outputFolder, newFolder, zipName, areaSym, bKeepZip)
 
         if not bZip:
             return MyError, ""
@@ -121,9 +126,12 @@ def ProcessSurvey(inputFolder, outputFolder, areaSym):
         return False
 
 ## ===================================================================================
-def UnzipDownload(inputFolder, outputFolder, newFolder, zipName, areaSym ):
+def UnzipDownload(inputFolder, outputFolder, newFolder, zipName, areaSym, bKeepZip=False):
     # inputFolder, zipName, outputFolder, areaSym, newFolder
     # Given zip file name, try to unzip it
+    #
+    # bKeepZip: extract only the spatial data and leave the tabular text files in
+    #           a copy of the zip file (soil_[areasymbol]\tabular.zip)
 
     try:
         #local_zip = os.path.join(outputFolder, zipName)
@@ -140,19 +148,18 @@ def UnzipDownload(inputFolder, outputFolder, newFolder, zipName, areaSym ):
                 if os.path.isdir(newFolder):
                     shutil.rmtree(newFolder, True)
 
-                with zipfile.ZipFile(local_zip, "r") as z:
-                    # a bad zip file returns exception zipfile.BadZipfile
-                    z.extractall(outputFolder)
-                    time.sleep(0.2)   # Saw a Windows Error: 'Access denied' when renaming
+                # a bad zip file returns exception zipfile.BadZipfile
+                SSURGO_TabularReader.ExtractZip(local_zip, outputFolder, not bKeepZip)
 
                 # rename output folder to: soil_[areasymbol.lowercase]
+                # Saw a Windows Error: 'Access denied' when renaming, so the rename is retried
                 if os.path.isdir(os.path.join(outputFolder, zipName[:-4])):
                     # this is an older zip file that has the 'wss_' directory structure
-                    os.rename(os.path.join(outputFolder, zipName[:-4]), newFolder)
+                    SSURGO_TabularReader.RetryFileAccess(os.rename, os.path.join(outputFolder, zipName[:-4]), newFolder)
 
                 elif os.path.isdir(os.path.join(outputFolder, areaSym.upper())):
                     # this must be a newer zip file using the uppercase AREASYMBOL directory
-                    os.rename(os.path.join(outputFolder, areaSym.upper()), newFolder)
+                    SSURGO_TabularReader.RetryFileAccess(os.rename, os.path.join(outputFolder, areaSym.upper()), newFolder)
 
                 elif os.path.isdir(newFolder):
                     # this is a folder using the correct field office naming convention (soil_ne109)
@@ -163,6 +170,10 @@ def UnzipDownload(inputFolder, outputFolder, newFolder, zipName, areaSym ):
                     # none of the subfolders within the zip file match any of the expected names
                     raise MyError, "Subfolder within the zip file does not match any of the standard names"
 
+                if bKeepZip:
+                    # The tabular text files will be read directly from this copy of the zip file
+                    shutil.copy2(local_zip, os.path.join(newFolder, "tabular.zip"))
+
             else:
                 # Zero-byte zip file in WSS Cache
                 PrintMsg("\tEmpty zip file for " + areaSym + ": " + surveyName, 1)
@@ -192,6 +203,7 @@ def UnzipDownload(inputFolder, outputFolder, newFolder, zipName, areaSym ):
 # main
 # Import system modules
 import arcpy, sys, os, locale, string, traceback, shutil, zipfile
+import SSURGO_TabularReader
 from arcpy import env
 #from _winreg import *
 from time import sleep
@@ -205,6 +217,12 @@ try:
     asList = arcpy.GetParameter(2)              # list of Areasymbols to be processed
     outputFolder = arcpy.GetParameterAsText(3)  # folder where output SSURGO will be placed
 
+    if arcpy.GetArgumentCount() > 4:
+        bKeepZip = arcpy.GetParameter(4)        # leave tabular text files in soil_[areasymbol]\tabular.zip
+
+    else:
+        bKeepZip = False
+
     # initialize error and status trackers
     failedList = list()  # track list of failed downloads
     failedCnt = 0        # track consecutive failures
@@ -230,8 +248,7 @@ try:
         iGet += 1
 
         arcpy.SetProgressorLabel("Unzipping survey " + areaSym + " (number " + str(iGet) + " of " + str(len(asList)) + " total)")
-        time.sleep(1)
-        bProcessed = ProcessSurvey(inputFolder, outputFolder, areaSym)
+        bProcessed = ProcessSurvey(inputFolder, outputFolder, areaSym, bKeepZip)
 
         if bProcessed == False:
             failedList.append(areaSym)
@@ -251,6 +268,8 @@ try:
     else:
         PrintMsg(" \nThese surveys failed to be processed: " + ", ".join(failedList) + " \n ", 2)
 
+    PrintMsg(SSURGO_TabularReader.RetryReport() + " \n ", 0)
+
     arcpy.SetProgressorLabel("Processing complete...")
     env.workspace = outputFolder
 
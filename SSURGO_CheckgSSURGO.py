@@ -376,14 +376,12 @@ def QuerySDA(sQuery, tbl):
         dRequest["query"] = sQuery
         jData = json.dumps(dRequest)
 
-        # Send request to SDA Tabular service using urllib2 library
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        # Send request to SDA Tabular service
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         # Convert the returned JSON string into a Python dictionary.
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         # Find data section (key='Table')
         valList = list()
@@ -1394,6 +1392,7 @@ import string, os, sys, traceback, locale, arcpy, httplib
 from arcpy import env
 
 from urllib2 import urlopen, URLError, HTTPError
+import SSURGO_SDAClient
 import socket
 
 try:
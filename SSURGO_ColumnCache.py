@@ -0,0 +1,613 @@
+# SSURGO_ColumnCache.py
+#
+# Persistent columnar cache of the gSSURGO attribute tables used by gSSURGO_CreateSoilMap.py
+# (mapunit, component, chorizon and cointerp).
+#
+# Each cached column is saved as a NumPy .npy file in a folder next to the geodatabase, so
+# that the next map can memory-map the arrays instead of reading the table again with a
+# cursor:
+#
+#   C:\gSSURGO\gSSURGO_NE.gdb -> C:\gSSURGO\gSSURGO_NE_columns\
+#       cache.json                          fingerprint, record count and column list for each table
+#       component.compname.npy              int16 codes (int32 for more than 32766 values), -1 = Null
+#       component.compname.values.npy       sorted unicode values for the codes
+#       cointerp.rulekey.index.npy          rows grouped by value, with .offsets (see KeyIndex)
+#       component.comppct_r.npy             int64 values
+#       component.comppct_r.null.npy        Null mask for an integer column
+#       chorizon.awc_r.npy                  float64 values, NaN = Null
+#       chorizon._overlap.rows.npy          horizon overlap with the standard depth intervals
+#                                           (.indptr, .rows and .thickness, see SaveOverlap)
+#
+# String codes are numbered in sorted order, so sorting the codes sorts the strings. Each
+# distinct string is stored once, so the long rule and class names in cointerp cost two bytes
+# per record.
+#
+# All columns are saved in OBJECTID order. A column added later is read in the same order,
+# so it lines up with the columns already in the cache.
+#
+# The cache for a table is thrown away when the database fingerprint (built by the caller
+# from sacatalog.saverest) or the record count for the table changes.
+#
+# Several processes can share the cache (the CreateRatingTables worker processes). Changes to
+# cache.json and the .npy files are made while holding CacheLock, and a process that finds
+# something missing checks cache.json again once it has the lock, so each column is saved
+# once and never replaced while another process has it memory-mapped.
+#
+# This module does not import arcpy.
+#
+
+# Files for a cached overlap matrix
+overlapSuffixes = [".indptr", ".rows", ".thickness"]
+
+# Seconds to wait for another process to finish writing to the cache
+lockTimeout = 3600
+
+## ===================================================================================
+def CacheFolder(gdb):
+    # Return the path to the column cache for a geodatabase
+    # eg. C:\gSSURGO\gSSURGO_NE.gdb -> C:\gSSURGO\gSSURGO_NE_columns
+    #
+    return os.path.splitext(gdb)[0] + "_columns"
+
+## ===================================================================================
+def Fingerprint(items):
+    # Return a fingerprint for the database contents from a list of values
+    # such as (areasymbol, saverest) for each survey in the sacatalog table
+    #
+    md5 = hashlib.md5()
+
+    for item in sorted([str(item) for item in items]):
+        md5.update(item + "\n")
+
+    return md5.hexdigest()
+
+## ===================================================================================
+def ReadIndex(gdb):
+    # Read cache.json. Key = table name, value = dictionary with 'fingerprint',
+    # 'count' and 'columns' (key = column name, value = 'int', 'float' or 'text')
+    #
+    indexPath = os.path.join(CacheFolder(gdb), "cache.json")
+
+    if not os.path.isfile(indexPath):
+        return dict()
+
+    fh = open(indexPath, "rb")
+
+    try:
+        return json.load(fh)
+
+    except ValueError:
+        # cache.json was cut off by an interrupted write
+        return dict()
+
+    finally:
+        fh.close()
+
+## ===================================================================================
+def WriteIndex(gdb, dIndex):
+    # Replace cache.json. Written to a temporary file and renamed, so that an interrupted
+    # write never leaves a cache.json describing columns that were not saved. The temporary
+    # file name includes the process id for the CreateRatingTables worker processes.
+    #
+    indexPath = os.path.join(CacheFolder(gdb), "cache.json")
+    tmpPath = indexPath + "." + str(os.getpid()) + ".tmp"
+    fh = open(tmpPath, "wb")
+
+    try:
+        json.dump(dIndex, fh, sort_keys=True, indent=1)
+
+    finally:
+        fh.close()
+
+    if os.path.isfile(indexPath):
+        os.remove(indexPath)
+
+    os.rename(tmpPath, indexPath)
+
+    return True
+
+## ===================================================================================
+class CacheLock(object):
+    # Exclusive lock on the column cache for a geodatabase:
+    #
+    #   with SSURGO_ColumnCache.CacheLock(gdb):
+    #
+    # The lock is a byte range lock on cache.lock, which the operating system releases if
+    # the process ends. A process that already holds the lock can take it again.
+    # Raises IOError after waiting lockTimeout seconds.
+    #
+    def __init__(self, gdb):
+        self.lockPath = os.path.join(CacheFolder(gdb), "cache.lock")
+
+    def __enter__(self):
+        if self.lockPath in dLocks:
+            dLocks[self.lockPath][0] += 1
+            return self
+
+        cacheFolder = os.path.dirname(self.lockPath)
+
+        if not os.path.isdir(cacheFolder):
+            try:
+                os.makedirs(cacheFolder)
+
+            except OSError:
+                # created by another process
+                if not os.path.isdir(cacheFolder):
+                    raise
+
+        fh = open(self.lockPath, "a+b")
+        start = time.time()
+
+        while True:
+            try:
+                LockFile(fh, True)
+                break
+
+            except IOError:
+                if time.time() - start > lockTimeout:
+                    fh.close()
+                    raise
+
+                time.sleep(0.2)
+
+        dLocks[self.lockPath] = [1, fh]
+
+        return self
+
+    def __exit__(self, *args):
+        dLocks[self.lockPath][0] -= 1
+
+        if dLocks[self.lockPath][0] == 0:
+            fh = dLocks.pop(self.lockPath)[1]
+
+            try:
+                LockFile(fh, False)
+
+            finally:
+                fh.close()
+
+## ===================================================================================
+def LockFile(fh, bLock):
+    # Lock or unlock the first byte of an open file without waiting.
+    # Raises IOError when another process holds the lock.
+    #
+    fh.seek(0)
+
+    if os.name == "nt":
+        msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK if bLock else msvcrt.LK_UNLCK, 1)
+
+    elif bLock:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    else:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+## ===================================================================================
+def ColumnPath(gdb, tbl, col, suffix=""):
+    # Return the path to one of the .npy files for a cached column
+    #
+    return os.path.join(CacheFolder(gdb), tbl.lower() + "." + col.lower() + suffix + ".npy")
+
+## ===================================================================================
+def TableColumns(gdb, tbl, fingerprint, recCnt):
+    # Return the dictionary of cached columns for a table (key = column name, value = kind).
+    # If the cache was built from a different version of the database, the table is
+    # dropped from the cache and an empty dictionary is returned.
+    #
+    dTable = ReadIndex(gdb).get(tbl.lower())
+
+    if dTable is None:
+        return dict()
+
+    if dTable["fingerprint"] == fingerprint and dTable["count"] == recCnt:
+        return dTable["columns"]
+
+    with CacheLock(gdb):
+        # Another process may have rebuilt the table while this one waited for the lock
+        dIndex = ReadIndex(gdb)
+        dTable = dIndex.get(tbl.lower())
+
+        if dTable is None:
+            return dict()
+
+        if dTable["fingerprint"] == fingerprint and dTable["count"] == recCnt:
+            return dTable["columns"]
+
+        for col in dTable["columns"]:
+            for suffix in ["", ".values", ".null", ".index", ".offsets"]:
+                if os.path.isfile(ColumnPath(gdb, tbl, col, suffix)):
+                    os.remove(ColumnPath(gdb, tbl, col, suffix))
+
+        for suffix in overlapSuffixes:
+            if os.path.isfile(ColumnPath(gdb, tbl, "_overlap", suffix)):
+                os.remove(ColumnPath(gdb, tbl, "_overlap", suffix))
+
+        del dIndex[tbl.lower()]
+        WriteIndex(gdb, dIndex)
+
+    return dict()
+
+## ===================================================================================
+def BuildColumns(rows, kinds, chunkSize=500000):
+    # Convert cursor records to column arrays, one chunk of records at a time so that
+    # only chunkSize records are held as Python objects.
+    #
+    # kinds is a list with 'int', 'float' or 'text' for each field in the records.
+    # Returns a list of columns, see LoadColumn.
+    #
+    nCols = len(kinds)
+    chunks = [list() for i in range(nCols)]
+    masks = [list() for i in range(nCols)]
+    dCodes = [dict() for i in range(nCols)]
+    rowIter = iter(rows)
+
+    while True:
+        chunk = list(islice(rowIter, chunkSize))
+
+        if len(chunk) == 0:
+            break
+
+        for iCol, values in enumerate(zip(*chunk)):
+            kind = kinds[iCol]
+
+            if kind == "text":
+                dCode = dCodes[iCol]
+                codes = [-1 if val is None else dCode.setdefault(val, len(dCode)) for val in values]
+                chunks[iCol].append(np.array(codes, dtype=np.int32))
+
+            elif kind == "int":
+                nulls = np.array([val is None for val in values], dtype=bool)
+
+                if nulls.any():
+                    values = [0 if val is None else val for val in values]
+
+                chunks[iCol].append(np.array(values, dtype=np.int64))
+                masks[iCol].append(nulls)
+
+            else:
+                chunks[iCol].append(np.array(values, dtype=np.float64))
+
+        del chunk
+
+    columns = list()
+
+    for iCol in range(nCols):
+        kind = kinds[iCol]
+
+        if kind == "text":
+            codes = np.concatenate(chunks[iCol]) if chunks[iCol] else np.zeros(0, dtype=np.int32)
+
+            # Renumber the codes in sorted order of the strings
+            dCode = dCodes[iCol]
+            firstValues = sorted(dCode, key=dCode.get)
+            order = sorted(range(len(firstValues)), key=firstValues.__getitem__)
+            newCodes = np.zeros(len(firstValues) + 1, dtype=np.int32)
+            newCodes[np.array(order, dtype=np.intp) + 1] = np.arange(len(order), dtype=np.int32)
+            newCodes[0] = -1
+            codes = newCodes[codes + 1]
+            values = [firstValues[i] for i in order]
+
+            if len(values) < 32767:
+                codes = codes.astype(np.int16)
+
+            columns.append({"kind":kind, "data":codes, "values":values, "null":None})
+
+        elif kind == "int":
+            data = np.concatenate(chunks[iCol]) if chunks[iCol] else np.zeros(0, dtype=np.int64)
+            nulls = np.concatenate(masks[iCol]) if masks[iCol] else np.zeros(0, dtype=bool)
+
+            if not nulls.any():
+                nulls = None
+
+            columns.append({"kind":kind, "data":data, "values":None, "null":nulls})
+
+        else:
+            data = np.concatenate(chunks[iCol]) if chunks[iCol] else np.zeros(0, dtype=np.float64)
+            columns.append({"kind":kind, "data":data, "values":None, "null":None})
+
+    return columns
+
+## ===================================================================================
+def SaveColumns(gdb, tbl, fingerprint, recCnt, colNames, columns):
+    # Save columns from BuildColumns and add them to cache.json
+    #
+    cacheFolder = CacheFolder(gdb)
+
+    if not os.path.isdir(cacheFolder):
+        os.makedirs(cacheFolder)
+
+    with CacheLock(gdb):
+        dIndex = ReadIndex(gdb)
+        dTable = dIndex.get(tbl.lower())
+
+        if dTable is None or dTable["fingerprint"] != fingerprint or dTable["count"] != recCnt:
+            dTable = {"fingerprint":fingerprint, "count":recCnt, "columns":dict()}
+
+        for col, column in zip(colNames, columns):
+            if col.upper() in dTable["columns"]:
+                # saved by another process, which may have it memory-mapped
+                continue
+
+            np.save(ColumnPath(gdb, tbl, col), column["data"])
+
+            if column["kind"] == "text":
+                if len(column["values"]) > 0:
+                    np.save(ColumnPath(gdb, tbl, col, ".values"), np.array(column["values"], dtype=np.unicode_))
+
+                else:
+                    np.save(ColumnPath(gdb, tbl, col, ".values"), np.zeros(0, dtype="U1"))
+
+            if column["null"] is not None:
+                np.save(ColumnPath(gdb, tbl, col, ".null"), column["null"])
+
+            elif os.path.isfile(ColumnPath(gdb, tbl, col, ".null")):
+                os.remove(ColumnPath(gdb, tbl, col, ".null"))
+
+            dTable["columns"][col.upper()] = column["kind"]
+
+            if col.upper() in dTable.get("indexes", []):
+                # the key index was built for the old column
+                dTable["indexes"].remove(col.upper())
+
+        dIndex[tbl.lower()] = dTable
+        WriteIndex(gdb, dIndex)
+
+    return True
+
+## ===================================================================================
+def LoadColumn(gdb, tbl, col, kind):
+    # Memory-map a cached column. Returns a dictionary:
+    #   'kind'   - 'int', 'float' or 'text'
+    #   'data'   - values, or int32 codes for text (-1 = Null)
+    #   'values' - list of strings for the text codes
+    #   'null'   - Null mask for an integer column, None if there are no Nulls
+    #
+    column = {"kind":kind, "data":np.load(ColumnPath(gdb, tbl, col), mmap_mode="r"), "values":None, "null":None}
+
+    if kind == "text":
+        column["values"] = np.load(ColumnPath(gdb, tbl, col, ".values")).tolist()
+
+    elif kind == "int" and os.path.isfile(ColumnPath(gdb, tbl, col, ".null")):
+        column["null"] = np.load(ColumnPath(gdb, tbl, col, ".null"), mmap_mode="r")
+
+    return column
+
+## ===================================================================================
+def ColumnValues(column, index=None):
+    # Return a column as a list of Python values, the same as a cursor would return them,
+    # with None for Null. index is an optional array of the rows to return.
+    #
+    data = column["data"]
+    nulls = column["null"]
+
+    if index is not None:
+        data = data[index]
+
+        if nulls is not None:
+            nulls = nulls[index]
+
+    if column["kind"] == "text":
+        values = column["values"]
+        return [None if code < 0 else values[code] for code in data.tolist()]
+
+    elif column["kind"] == "int":
+        if nulls is None:
+            return data.tolist()
+
+        return [None if bNull else val for val, bNull in zip(data.tolist(), nulls.tolist())]
+
+    else:
+        return [None if val != val else val for val in data.tolist()]
+
+## ===================================================================================
+def FloatValues(column):
+    # Return a numeric column as a float64 array with NaN for Null
+    #
+    data = np.asarray(column["data"], dtype=np.float64)
+
+    if column["kind"] == "int" and column["null"] is not None:
+        data = data.copy()
+        data[np.asarray(column["null"])] = np.nan
+
+    return data
+
+## ===================================================================================
+def ColumnRows(column, keys):
+    # Return the row number of each key in a text column of unique keys (eg. CHKEY),
+    # -1 for a key that is not in the column
+    #
+    nKeys = len(keys)
+    values = np.array(column["values"], dtype=np.unicode_) if len(column["values"]) > 0 else np.zeros(0, dtype="U1")
+
+    if nKeys == 0 or len(values) == 0:
+        return np.zeros(nKeys, dtype=np.intp) - 1
+
+    # row number for each code
+    codes = np.asarray(column["data"])
+    bKey = codes >= 0
+    codeRows = np.zeros(len(values), dtype=np.intp) - 1
+    codeRows[codes[bKey]] = np.flatnonzero(bKey)
+
+    keyArray = np.array([u"" if key is None else unicode(key) for key in keys], dtype=np.unicode_)
+    pos = np.minimum(np.searchsorted(values, keyArray), len(values) - 1)
+    bFound = (values[pos] == keyArray) & (keyArray != u"")
+
+    return np.where(bFound, codeRows[pos], -1)
+
+## ===================================================================================
+def SaveOverlap(gdb, tbl, fingerprint, recCnt, overlap):
+    # Save a horizon overlap matrix (see SSURGO_HorizonAggregation.OverlapMatrix) built from
+    # the cached depth columns, and record its depth intervals in cache.json
+    #
+    cacheFolder = CacheFolder(gdb)
+
+    if not os.path.isdir(cacheFolder):
+        os.makedirs(cacheFolder)
+
+    with CacheLock(gdb):
+        dIndex = ReadIndex(gdb)
+        dTable = dIndex.get(tbl.lower())
+
+        if dTable is None or dTable["fingerprint"] != fingerprint or dTable["count"] != recCnt:
+            dTable = {"fingerprint":fingerprint, "count":recCnt, "columns":dict()}
+
+        elif [tuple(depth) for depth in dTable.get("overlap", [])] == [tuple(depth) for depth in overlap["depths"]]:
+            # saved by another process, which may have it memory-mapped
+            return True
+
+        for suffix in overlapSuffixes:
+            np.save(ColumnPath(gdb, tbl, "_overlap", suffix), overlap[suffix[1:]])
+
+        dTable["overlap"] = [list(depth) for depth in overlap["depths"]]
+        dIndex[tbl.lower()] = dTable
+        WriteIndex(gdb, dIndex)
+
+    return True
+
+## ===================================================================================
+def LoadOverlap(gdb, tbl, fingerprint, recCnt, depths):
+    # Memory-map the cached overlap matrix for a table. Returns None if there is no matrix
+    # for this version of the table or it was built for other depth intervals.
+    #
+    dTable = ReadIndex(gdb).get(tbl.lower())
+
+    if dTable is None or dTable["fingerprint"] != fingerprint or dTable["count"] != recCnt:
+        return None
+
+    if [tuple(depth) for depth in dTable.get("overlap", [])] != [tuple(depth) for depth in depths]:
+        return None
+
+    overlap = dict()
+    overlap["depths"] = [tuple(depth) for depth in depths]
+    overlap["count"] = recCnt
+
+    for suffix in overlapSuffixes:
+        overlap[suffix[1:]] = np.load(ColumnPath(gdb, tbl, "_overlap", suffix), mmap_mode="r")
+
+    return overlap
+
+## ===================================================================================
+def SortKey(column):
+    # Return a float array that sorts the same way as the column, with Null sorted
+    # before any value
+    #
+    data = column["data"]
+
+    if column["kind"] == "text":
+        return data.astype(np.float64)
+
+    key = data.astype(np.float64)
+
+    if column["kind"] == "int":
+        if column["null"] is not None:
+            key[np.asarray(column["null"])] = -np.inf
+
+    else:
+        key[np.isnan(key)] = -np.inf
+
+    return key
+
+## ===================================================================================
+def SortOrder(orderBy):
+    # Return the row index for an ORDER BY. orderBy is a list of (column, bDescending),
+    # most significant first. Rows that tie keep their OBJECTID order.
+    #
+    keys = list()
+
+    for column, bDesc in reversed(orderBy):
+        key = SortKey(column)
+
+        if bDesc:
+            key = -key
+
+        keys.append(key)
+
+    return np.lexsort(keys)
+
+## ===================================================================================
+def MatchRows(column, matchValues):
+    # Return the index of the rows in a text column that match any of the values,
+    # eg. the COINTERP records for a list of rulekeys
+    #
+    keyCodes = [code for code, val in enumerate(column["values"]) if val in matchValues]
+
+    return np.flatnonzero(np.in1d(column["data"], np.array(keyCodes, dtype=np.int32)))
+
+## ===================================================================================
+def KeyIndex(gdb, tbl, col, column):
+    # Return the key index for a cached text column, building and saving it the first time.
+    #
+    # The index is (rows, offsets): the row numbers sorted by code, in OBJECTID order within
+    # each code, and the position of the first row for each code. The rows for code c are
+    # rows[offsets[c]:offsets[c + 1]], so the records for one value (eg. one rulekey in
+    # COINTERP) are found without scanning the column.
+    #
+    if col.upper() in ReadIndex(gdb)[tbl.lower()].get("indexes", []):
+        return LoadKeyIndex(gdb, tbl, col)
+
+    with CacheLock(gdb):
+        # Another process may have built the index while this one waited for the lock
+        dIndex = ReadIndex(gdb)
+        dTable = dIndex[tbl.lower()]
+
+        if col.upper() in dTable.get("indexes", []):
+            return LoadKeyIndex(gdb, tbl, col)
+
+        codes = np.asarray(column["data"])
+        rows = np.argsort(codes, kind="mergesort")
+
+        if len(rows) < 2147483647:
+            rows = rows.astype(np.int32)
+
+        offsets = np.searchsorted(codes[rows], np.arange(len(column["values"]) + 1)).astype(np.int64)
+
+        np.save(ColumnPath(gdb, tbl, col, ".index"), rows)
+        np.save(ColumnPath(gdb, tbl, col, ".offsets"), offsets)
+        dTable.setdefault("indexes", list()).append(col.upper())
+        WriteIndex(gdb, dIndex)
+
+    return rows, offsets
+
+## ===================================================================================
+def LoadKeyIndex(gdb, tbl, col):
+    # Memory-map a saved key index (see KeyIndex)
+    #
+    rows = np.load(ColumnPath(gdb, tbl, col, ".index"), mmap_mode="r")
+    offsets = np.load(ColumnPath(gdb, tbl, col, ".offsets"))
+
+    return rows, offsets
+
+## ===================================================================================
+def KeyRows(column, keyIndex, matchValues):
+    # Same as MatchRows, using the key index from KeyIndex. Returns the rows in OBJECTID order.
+    #
+    rows, offsets = keyIndex
+    values = column["values"]
+    parts = list()
+
+    for val in set(matchValues):
+        code = bisect_left(values, val)
+
+        if code < len(values) and values[code] == val:
+            parts.append(np.asarray(rows[offsets[code]:offsets[code + 1]], dtype=np.intp))
+
+    if len(parts) == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    return np.sort(np.concatenate(parts))
+
+## ===================================================================================
+# Import system modules
+import os, json, hashlib, time
+from itertools import islice
+from bisect import bisect_left
+import numpy as np
+
+if os.name == "nt":
+    import msvcrt
+
+else:
+    import fcntl
+
+# Column cache locks held by this process. Key = lock file path, value = [count, file]
+dLocks = dict()
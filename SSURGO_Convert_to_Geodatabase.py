@@ -255,18 +255,14 @@ def GetSDMInfo(theURL, tblName):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         #PrintMsg(" \nImporting attribute data...", 0)
         #PrintMsg(" \nGot back requested data...", 0)
 
-        # Read the response from SDA into a string
-        jsonString = resp.read()
-
         #PrintMsg(" \njsonString: " + str(jsonString), 1)
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         if not "Table" in data:
             raise MyError, "Query failed to select anything: \n " + sQuery
@@ -491,6 +487,123 @@ def CreateSSURGO_DB(outputWS, inputXML, areasymbolList, aliasName):
         errorMsg()
         return False
 
+## ===================================================================================
+def DeleteSurveyAreas(outputWS, staleList):
+    # For an incremental update, delete all of the data for the listed survey areas from an
+    # existing gSSURGO database.
+    #
+    # The tabular delete cascades down the mdstatrshipdet relationships, starting with the
+    # legend, sacatalog and distmd tables (legend -> mapunit -> component -> chorizon ...).
+    # Key values for each parent table are collected in a set as its records are deleted
+    # and are then used to delete the matching records in each child table.
+    #
+    try:
+        env.workspace = outputWS
+        areaSyms = set([areaSym.upper() for areaSym in staleList])
+        sqlAreasym = "AREASYMBOL IN ('" + "', '".join(sorted(areaSyms)) + "')"
+
+        PrintMsg(" \nDeleting existing data for " + Number_Format(len(areaSyms), 0, True) + " survey areas...", 0)
+
+        # Featureclasses and the featdesc table all have an AREASYMBOL column
+        for tbl in ["MUPOLYGON", "MULINE", "MUPOINT", "FEATLINE", "FEATPOINT", "SAPOLYGON", "featdesc"]:
+            arcpy.SetProgressorLabel("Deleting " + tbl + " records...")
+
+            with arcpy.da.UpdateCursor(os.path.join(outputWS, tbl), ["AREASYMBOL"], where_clause=sqlAreasym) as cur:
+                for rec in cur:
+                    cur.deleteRow()
+
+        # Relationships between tables. key = parent table, value = list of (parent column, child table, child column)
+        dRelationships = dict()
+
+        with arcpy.da.SearchCursor(os.path.join(outputWS, "mdstatrshipdet"), ["ltabphyname", "rtabphyname", "ltabcolphyname", "rtabcolphyname"]) as cur:
+            for ltab, rtab, lcol, rcol in cur:
+                if ltab.lower() in dRelationships:
+                    dRelationships[ltab.lower()].append((lcol.lower(), rtab.lower(), rcol.lower()))
+
+                else:
+                    dRelationships[ltab.lower()] = [(lcol.lower(), rtab.lower(), rcol.lower())]
+
+        # distmd is only linked to the survey areas through the distlmd table
+        distmdKeys = set()
+
+        with arcpy.da.SearchCursor(os.path.join(outputWS, "distlmd"), ["AREASYMBOL", "distmdkey"], where_clause=sqlAreasym) as cur:
+            for rec in cur:
+                distmdKeys.add(rec[1])
+
+        # Each item is (table, column, set of values to delete)
+        deleteList = [("legend", "areasymbol", areaSyms), ("sacatalog", "areasymbol", areaSyms), ("distmd", "distmdkey", distmdKeys)]
+        dCounts = dict()
+
+        while len(deleteList) > 0:
+            tbl, keyCol, keyVals = deleteList.pop(0)
+
+            if len(keyVals) == 0 or not arcpy.Exists(os.path.join(outputWS, tbl)):
+                continue
+
+            arcpy.SetProgressorLabel("Deleting " + tbl + " records...")
+            childList = dRelationships.get(tbl, [])
+
+            # parent columns needed by the child tables
+            parentCols = list()
+
+            for lcol, rtab, rcol in childList:
+                if not lcol in parentCols and lcol != keyCol:
+                    parentCols.append(lcol)
+
+            dParentVals = dict()
+
+            for lcol in parentCols:
+                dParentVals[lcol] = set()
+
+            iDeleted = 0
+
+            if keyCol == "areasymbol":
+                # legend and sacatalog
+                whereClause = sqlAreasym
+
+            else:
+                whereClause = None
+
+            with arcpy.da.UpdateCursor(os.path.join(outputWS, tbl), [keyCol] + parentCols, where_clause=whereClause) as cur:
+                for rec in cur:
+                    if keyCol == "areasymbol":
+                        keyVal = rec[0].upper()
+
+                    else:
+                        keyVal = rec[0]
+
+                    if keyVal in keyVals:
+                        for i, lcol in enumerate(parentCols):
+                            dParentVals[lcol].add(rec[i + 1])
+
+                        cur.deleteRow()
+                        iDeleted += 1
+
+            dCounts[tbl] = dCounts.get(tbl, 0) + iDeleted
+
+            for lcol, rtab, rcol in childList:
+                if lcol == keyCol:
+                    childVals = keyVals
+
+                else:
+                    childVals = dParentVals[lcol]
+
+                deleteList.append((rtab, rcol, childVals))
+
+        for tbl in sorted(dCounts):
+            if dCounts[tbl] > 0:
+                PrintMsg("\tDeleted " + Number_Format(dCounts[tbl], 0, True) + " " + tbl + " records", 0)
+
+        return True
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return False
+
+    except:
+        errorMsg()
+        return False
+
 ## ===================================================================================
 def GetTableList(outputWS):
     # Query mdstattabs table to get list of input text files (tabular) and output tables
@@ -591,6 +704,96 @@ def GetTemplateDate(newDB, areaSym):
         errorMsg()
         return 0
 
+## ===================================================================================
+def GetTabularDate(tabularFolder):
+    # Get SAVEREST date from the tabular/sacatlog.txt file of an input survey area.
+    # The original string looks like this: 12/05/2013 23:44:00
+    #
+    # Returns a datetime object or None
+    #
+    try:
+        saCatalog = os.path.join(tabularFolder, "sacatlog.txt")
+
+        if not SSURGO_TabularReader.TextFileExists(saCatalog):
+            return None
+
+        fh = SSURGO_TabularReader.OpenTextFile(saCatalog)
+        rec = fh.readline()
+        fh.close()
+
+        # SAVEREST is index 3 in the pipe-delimited file
+        recDate = rec.split("|")[3]
+
+        return datetime.datetime.strptime(recDate, "%m/%d/%Y %H:%M:%S")
+
+    except:
+        errorMsg()
+        return None
+
+## ===================================================================================
+def GetChangedSurveys(inputFolder, outputWS, areasymbolList):
+    # For an incremental update of an existing gSSURGO database. Compare SACATALOG.SAVEREST in
+    # the existing database with the sacatlog.txt date for each input survey area.
+    #
+    # Returns a tuple: (importList, staleList)
+    #   importList: areasymbols for surveys that are new or have a newer SAVEREST date
+    #   staleList:  areasymbols for surveys that are in the database and must be deleted first
+    #
+    try:
+        dbDates = dict()
+
+        with arcpy.da.SearchCursor(os.path.join(outputWS, "sacatalog"), ["AREASYMBOL", "SAVEREST"]) as cur:
+            for areaSym, saveRest in cur:
+                dbDates[areaSym.upper()] = saveRest
+
+        importList = list()
+        staleList = list()
+        currentList = list()
+
+        for areaSym in areasymbolList:
+            tabularFolder = SSURGO_TabularReader.GetTabularFolder(os.path.join(inputFolder, "soil_" + areaSym.lower()))
+            txtDate = GetTabularDate(tabularFolder)
+
+            if txtDate is None:
+                # No text files, try the Template database
+                templateDB = os.path.join(inputFolder, "soil_" + areaSym.lower(), "tabular", "soil_d_" + areaSym.lower() + ".mdb")
+
+                if arcpy.Exists(os.path.join(templateDB, "SACATALOG")):
+                    with arcpy.da.SearchCursor(os.path.join(templateDB, "SACATALOG"), ["SAVEREST"]) as cur:
+                        for rec in cur:
+                            txtDate = rec[0]
+
+            if txtDate is None:
+                raise MyError, "Unable to get SAVEREST date from " + os.path.join(tabularFolder, "sacatlog.txt")
+
+            if not areaSym.upper() in dbDates:
+                # New survey area
+                importList.append(areaSym)
+
+            elif txtDate > dbDates[areaSym.upper()]:
+                # Input survey area is newer than the database copy
+                importList.append(areaSym)
+                staleList.append(areaSym.upper())
+
+            else:
+                if txtDate < dbDates[areaSym.upper()]:
+                    PrintMsg("\tExisting data for " + areaSym.upper() + " is newer (" + str(dbDates[areaSym.upper()]).split()[0] + ") than the input survey", 1)
+
+                currentList.append(areaSym.upper())
+
+        PrintMsg(" \nIncremental update: " + Number_Format(len(importList) - len(staleList), 0, True) + " new, " + \
+        Number_Format(len(staleList), 0, True) + " updated and " + Number_Format(len(currentList), 0, True) + " current survey areas", 0)
+
+        return (importList, staleList)
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return (None, None)
+
+    except:
+        errorMsg()
+        return (None, None)
+
 ## ===================================================================================
 def SSURGOVersionTxt(tabularFolder):
     # For future use. Should really create a new table for gSSURGO in order to implement properly.
@@ -604,9 +807,9 @@ def SSURGOVersionTxt(tabularFolder):
         # Get SSURGOversion number from version.txt
         versionTxt = os.path.join(tabularFolder, "version.txt")
 
-        if arcpy.Exists(versionTxt):
+        if SSURGO_TabularReader.TextFileExists(versionTxt):
             # read just the first line of the version.txt file
-            fh = open(versionTxt, "r")
+            fh = SSURGO_TabularReader.OpenTextFile(versionTxt)
             txtVersion = int(fh.readline().split(".")[0])
             fh.close()
             return txtVersion
@@ -722,6 +925,137 @@ def GetTableInfo(newDB):
         errorMsg()
         return dict()
 
+## ===============================================================================================================
+def GetPrimaryKeys(newDB):
+    # Get the primary key column(s) for each table from the mdstatidxdet and mdstatidxmas tables.
+    # Returns a dictionary: key = table name, value = list of key columns in idxcolsequence order
+    #
+    try:
+        dPrimaryKeys = dict()
+        idxDet = os.path.join(newDB, "mdstatidxdet")
+        idxMas = os.path.join(newDB, "mdstatidxmas")
+
+        if not arcpy.Exists(idxDet):
+            raise MyError, "Missing mdstatidxdet table"
+
+        # Skip any index that is not flagged as unique in mdstatidxmas
+        nonUnique = list()
+
+        if arcpy.Exists(idxMas):
+            with arcpy.da.SearchCursor(idxMas, ["idxphyname", "uniqueindex"], where_clause="idxphyname LIKE 'PK_%'") as rows:
+                for idxName, uniqueIndex in rows:
+                    if not str(uniqueIndex).lower() in ("yes", "1", "true"):
+                        nonUnique.append(idxName)
+
+        with arcpy.da.SearchCursor(idxDet, ["tabphyname", "idxphyname", "colphyname"], where_clause="idxphyname LIKE 'PK_%'", sql_clause=(None, "ORDER BY tabphyname, idxcolsequence")) as rows:
+            for tblName, indexName, columnName in rows:
+                if not indexName in nonUnique:
+                    if tblName in dPrimaryKeys:
+                        dPrimaryKeys[tblName].append(columnName)
+
+                    else:
+                        dPrimaryKeys[tblName] = [columnName]
+
+        return dPrimaryKeys
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return dict()
+
+    except:
+        errorMsg()
+        return dict()
+
+## ===============================================================================================================
+def GetUniqueKeys(newDB, dFldNames, uniqueTables):
+    # Get the primary key field position(s) for each table in uniqueTables, so that duplicate
+    # records can be skipped during the import (see SSURGO_TabularReader.UniqueKeyRows).
+    #
+    # dFldNames: key = table name, value = list of field names (no OBJECTID) in import order
+    #
+    # Returns a dictionary: key = table name, value = list of field positions
+    #
+    try:
+        dPrimaryKeys = GetPrimaryKeys(newDB)
+
+        # The SDV tables must always have unique keys, so use these if they are not in the metadata
+        keyFields = dict()
+        keyFields['sdvfolderattribute'] = ["attributekey"]
+        keyFields['sdvattribute'] = ["attributekey"]
+        keyFields['sdvfolder'] = ["folderkey"]
+        keyFields['sdvalgorithm'] = ["algorithmsequence"]
+
+        dUniqueKeys = dict()
+
+        for tbl in uniqueTables:
+            if tbl in dPrimaryKeys:
+                keyCols = dPrimaryKeys[tbl]
+
+            elif tbl in keyFields:
+                keyCols = keyFields[tbl]
+
+            else:
+                # no primary key for this table
+                continue
+
+            fldNames = [fld.lower() for fld in dFldNames[tbl]]
+
+            if len([keyCol for keyCol in keyCols if keyCol.lower() in fldNames]) == len(keyCols):
+                dUniqueKeys[tbl] = [fldNames.index(keyCol.lower()) for keyCol in keyCols]
+
+            else:
+                PrintMsg("\tPrimary key (" + ", ".join(keyCols) + ") not found in " + tbl + " table", 1)
+
+        return dUniqueKeys
+
+    except:
+        errorMsg()
+        return dict()
+
+## ===============================================================================================================
+def GetColumnInfo(newDB):
+    # Get the column metadata used to build the text file converters from the mdstattabcols
+    # and mdstatdomdet tables (see SSURGO_TabularReader.GetColumnSpecs).
+    #
+    # Returns two dictionaries:
+    #   dColumnInfo: key = (table name, column name), value = (logicaldatatype, fieldsize, bNotNull, domainname)
+    #   dDomains:    key = domain name, value = list of choices in choicesequence order
+    #
+    # If the metadata is missing, the text files are still parsed using just the field types.
+    #
+    try:
+        dColumnInfo = dict()
+        dDomains = dict()
+        colTable = os.path.join(newDB, "mdstattabcols")
+        domTable = os.path.join(newDB, "mdstatdomdet")
+
+        if not arcpy.Exists(colTable):
+            raise MyError, "Missing mdstattabcols table, unable to validate text file columns"
+
+        with arcpy.da.SearchCursor(colTable, ["tabphyname", "colphyname", "logicaldatatype", "fieldsize", "notnull", "domainname"]) as rows:
+            for tblName, colName, dataType, fieldSize, notNull, domainName in rows:
+                bNotNull = str(notNull).lower() in ("yes", "1", "true")
+                dColumnInfo[(tblName.lower(), colName.lower())] = (dataType, fieldSize, bNotNull, domainName)
+
+        if arcpy.Exists(domTable):
+            with arcpy.da.SearchCursor(domTable, ["domainname", "choice"], sql_clause=(None, "ORDER BY domainname, choicesequence")) as rows:
+                for domainName, choice in rows:
+                    if domainName in dDomains:
+                        dDomains[domainName].append(choice)
+
+                    else:
+                        dDomains[domainName] = [choice]
+
+        return dColumnInfo, dDomains
+
+    except MyError, e:
+        PrintMsg(str(e), 1)
+        return dict(), dict()
+
+    except:
+        errorMsg()
+        return dict(), dict()
+
 ## ===================================================================================
 def ImportMDTables(newDB, dbList):
     # Import as single set of metadata tables from first survey area's Access database
@@ -892,10 +1226,10 @@ def ImportMDTabular(newDB, tabularFolder, codePage):
                     # counter for current record number
                     iRows = 1  # input textfile line number
 
-                    if os.path.isfile(txtPath):
+                    if SSURGO_TabularReader.TextFileExists(txtPath):
 
                         # Use csv reader to read each line in the text file
-                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|'):
+                        for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                             # , quotechar="'"
                             # replace all blank values with 'None' so that the values are properly inserted
                             # into integer values otherwise insertRow fails
@@ -950,7 +1284,7 @@ def ImportMDTabular(newDB, tabularFolder, codePage):
         return False
 
 ## ===================================================================================
-def ImportTables(outputWS, dbList, dbVersion):
+def ImportTables(outputWS, dbList, dbVersion, bIncremental=False):
     #
     # Import tables from an Access Template database. Does not require text files, but
     # the Access database must be populated and it must reside in the tabular folder and
@@ -975,7 +1309,7 @@ def ImportTables(outputWS, dbList, dbVersion):
         # Set up enforcement of unique keys for SDV tables
         #
         dIndex = dict()  # dictionary storing field index for primary key of each SDV table
-        dKeys = dict()  # dictionary containing a list of key values for each SDV table
+        dKeys = dict()  # dictionary containing a set of key values for each SDV table
         dFields = dict() # dictionary containing list of fields for eacha SDV table
 
         keyIndx = dict()  # dictionary containing key field index number for each SDV table
@@ -999,7 +1333,13 @@ def ImportTables(outputWS, dbList, dbVersion):
 
             #dFields[sdvTbl] = fldNames                 # store list of fields for this SDV table
             dIndex[sdvTbl] = fldNames.index(keyField)  # store field index for primary key in this SDV table
-            dKeys[sdvTbl] = []                         # initialize key values list for this SDV table
+            dKeys[sdvTbl] = set()                      # initialize key values set for this SDV table
+
+            if bIncremental:
+                # Existing database, don't import SDV records that are already there
+                with arcpy.da.SearchCursor(os.path.join(outputWS, sdvTbl), [keyField]) as cur:
+                    for rec in cur:
+                        dKeys[sdvTbl].add(rec[0])
 
         # End of enforce unique keys setup...
 
@@ -1087,7 +1427,7 @@ def ImportTables(outputWS, dbList, dbVersion):
                                         keyVal = inRow[dIndex[tblName]]
 
                                         if not keyVal in dKeys[tblName]:
-                                            dKeys[tblName].append(keyVal)
+                                            dKeys[tblName].add(keyVal)
                                             outCursor.insertRow(inRow)
 
                             if inputTbl == "sdvattribute":
@@ -1132,13 +1472,90 @@ def ImportTables(outputWS, dbList, dbVersion):
         return False
 
 ## ===================================================================================
-def ImportTabular(newDB, dbList, dbVersion, codePage):
+def GetLastOIDs(newDB, tblList):
+    # Get the highest OBJECTID in each table. Recorded in the import manifest when a survey
+    # area is started, so that a partial import can be removed (see RemovePartialSurvey).
+    #
+    dLastOID = dict()
+
+    for tbl in tblList:
+        dLastOID[tbl] = 0
+
+        with arcpy.da.SearchCursor(os.path.join(newDB, tbl), ["OID@"], sql_clause=(None, "ORDER BY OBJECTID DESC")) as cur:
+            for rec in cur:
+                dLastOID[tbl] = rec[0]
+                break
+
+    return dLastOID
+
+## ===================================================================================
+def RemovePartialSurvey(newDB, areaSym, dMarks):
+    # Delete the records written for a survey area that was interrupted in a previous run
+    #
+    # dMarks: key = table name, value = highest OBJECTID in the table before the survey area was started
+    #
+    try:
+        PrintMsg(" \nRemoving partial import of " + areaSym + " from the previous run", 0)
+
+        for tbl, lastOID in sorted(dMarks.items()):
+            iDeleted = 0
+
+            with arcpy.da.UpdateCursor(os.path.join(newDB, tbl), ["OID@"], where_clause="OBJECTID > " + str(lastOID)) as cur:
+                for rec in cur:
+                    cur.deleteRow()
+                    iDeleted += 1
+
+            if iDeleted > 0:
+                PrintMsg("\tDeleted " + Number_Format(iDeleted, 0, True) + " " + tbl + " records", 0)
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def ParseSurveyAreas(jobList, iProcesses):
+    # Generator wrapping SSURGO_TabularReader.ParseSurveys so that text file parsing
+    # errors from the worker processes are raised here as MyError
+    #
+    parsedSurveys = SSURGO_TabularReader.ParseSurveys(jobList, iProcesses)
+
+    while True:
+        try:
+            parsedSurvey = parsedSurveys.next()
+
+        except StopIteration:
+            return
+
+        except SSURGO_TabularReader.MyError, e:
+            raise MyError, str(e)
+
+        yield parsedSurvey
+
+## ===================================================================================
+def ImportTabular(newDB, dbList, dbVersion, codePage, iProcesses=None, bUniqueKeys=False, bIncremental=False, manifestPath=None):
     # Use csv reader method of importing text files into geodatabase for those
     # that do not have a populated SSURGO database
     #
     # 2015-12-16 Need to eliminate duplicate records in sdv* tables. Also need to index primary keys
     # for each of these tables.
     #
+    # iProcesses: number of processes used to parse the text files. The surveys are parsed in
+    # parallel, but written by this process in dbList and txtFiles order.
+    # The default is one less than the number of cores.
+    #
+    # bUniqueKeys: skip any record whose primary key (mdstatidxdet) has already been imported,
+    # for every table. Use when merging surveys that may overlap. The SDV tables always have
+    # their unique keys enforced.
+    #
+    # bIncremental: appending survey areas to an existing database. The unique key sets are
+    # loaded from the records already in the database.
+    #
+    # manifestPath: import manifest (see SSURGO_TabularReader.ReadManifest). Survey areas recorded
+    # as complete by a previous run are skipped and any survey area that was interrupted is
+    # removed and imported again. Each survey area is recorded as it is completed.
+    #
     try:
         # new code from ImportTables
         #codePage = 'cp1252'
@@ -1153,62 +1570,135 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
         
         iCntr = 0
 
-        # Set up enforcement of unique keys for SDV tables
+        # Tables that always need enforcement of unique keys
         #
         sdvTables = ['sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm']
-        dIndex = dict()  # dictionary storing field index for primary key of each SDV table
-        dKeys = dict()  # dictionary containing a list of key values for each SDV table
-        dFields = dict() # dictionary containing list of fields for eacha SDV table
 
-        keyIndx = dict()  # dictionary containing key field index number for each SDV table
-        keyFields = dict() # dictionary containing a list of key field names for each SDV table
-        keyFields['sdvfolderattribute'] = "attributekey"
-        keyFields['sdvattribute'] = "attributekey"
-        keyFields['sdvfolder'] = "folderkey"
-        keyFields['sdvalgorithm'] = "algorithmsequence"
+        # Add SDV* table relationships. These aren't part of the XML workspace doc as of FY2018 gSSURGO
+        # Not normally necessary, but useful for diagnostics
 
-        for sdvTbl in sdvTables:
-            #sdvTbl = os.path.join(outputWS, "sdvfolderattribute")
-            #indx = keyIndx[sdvTbl]
-            keyField = keyFields[sdvTbl]
+        # Create a list of textfiles to be imported. The import process MUST follow the
+        # order in this list in order to maintain referential integrity. This list
+        # will need to be updated if the SSURGO data model is changed in the future.
+        #
+        txtFiles = ["distmd","legend","distimd","distlmd","lareao","ltext","mapunit", \
+        "comp","muaggatt","muareao","mucrpyd","mutext","chorizon","ccancov","ccrpyd", \
+        "cdfeat","cecoclas","ceplants","cerosnac","cfprod","cgeomord","chydcrit", \
+        "cinterp","cmonth", "cpmatgrp", "cpwndbrk","crstrcts","csfrags","ctxfmmin", \
+        "ctxmoicl","ctext","ctreestm","ctxfmoth","chaashto","chconsis","chdsuffx", \
+        "chfrags","chpores","chstrgrp","chtext","chtexgrp","chunifie","cfprodo","cpmat","csmoist", \
+        "cstemp","csmorgc","csmorhpp","csmormr","csmorss","chstr","chtextur", \
+        "chtexmod","sacatlog","sainterp","sdvalgorithm","sdvattribute","sdvfolder","sdvfolderattribute"]
+        # Need to add featdesc import as a separate item (ie. spatial\soilsf_t_al001.txt: featdesc)
+
+        # Create a dictionary with table information
+        tblInfo = GetTableInfo(newDB)
+
+        # Get the output fields and the column specs used to compile the text file converter
+        # for each table. Column types, lengths, nullability and domains come from mdstattabcols.
+        #
+        # For cointerp, adjust for missing columns
+        #  x = fldNames[0:7]
+        #  y = fldNames[12:14]
+        #  z = fldNames[16:20]
+        dColumnInfo, dDomains = GetColumnInfo(newDB)
+        dFldNames = dict()  # key = table name, value = list of field names
+        dSpecs = dict()     # key = text file name, value = list of column specs
+        dColumns = {"cinterp": range(0, 7) + range(11, 13) + range(15, 19)}  # text columns to keep
+        dFilters = {"cinterp": SSURGO_TabularReader.CointerpRow}              # rows to keep, applied by the parsing workers
+
+        for txtFile in txtFiles + ["featdesc"]:
+            if txtFile == "featdesc":
+                tbl = "featdesc"
+
+            elif txtFile in tblInfo:
+                tbl, aliasName = tblInfo[txtFile]
 
-            fldList = arcpy.Describe(os.path.join(newDB, sdvTbl)).fields
-            fldNames = list()
+            else:
+                raise MyError, "Textfile reference '" + txtFile + "' not found in 'mdstattabs table'"
 
-            for fld in fldList:
-                if fld.type != "OID":
-                    fldNames.append(fld.name.lower())
+            if not arcpy.Exists(os.path.join(newDB, tbl)):
+                raise MyError, "Required table '" + tbl + "' not found in " + newDB
 
-            dFields[sdvTbl] = fldNames                 # store list of fields for this SDV table
-            dIndex[sdvTbl] = fldNames.index(keyField)  # store field index for primary key in this SDV table
-            dKeys[sdvTbl] = []                         # initialize key values list for this SDV table
+            # For a geodatabase, I need to remove OBJECTID from the fields list
+            fldList = [(fld.name, fld.type) for fld in arcpy.Describe(os.path.join(newDB, tbl)).fields if fld.type != "OID"]
 
-        
-        # Add SDV* table relationships. These aren't part of the XML workspace doc as of FY2018 gSSURGO
-        # Not normally necessary, but useful for diagnostics
+            if len(fldList) == 0:
+                raise MyError, "Failed to get field names for " + tbl
 
-        for inputDB in dbList:
-            iCntr += 1
-            newFolder = os.path.dirname(os.path.dirname(inputDB)) # survey dataset folder
+            dFldNames[tbl] = [fldName for fldName, fldType in fldList]
+            dSpecs[txtFile] = SSURGO_TabularReader.GetColumnSpecs(tbl, fldList, dColumnInfo, dDomains)
+
+        # When resuming, find the survey areas completed by the previous run and remove the
+        # records for any survey area that it did not finish. The highest OBJECTID in each table
+        # is recorded when a survey area is started, so that it can be removed the same way.
+        #
+        dSurveys = dict()
+        dLastOID = dict()  # key = table name, value = highest OBJECTID written so far
+
+        if not manifestPath is None:
+            dSteps, dSurveys = SSURGO_TabularReader.ReadManifest(manifestPath)
+
+            for areaSym, dSurvey in dSurveys.items():
+                if dSurvey["status"] != "complete":
+                    if not RemovePartialSurvey(newDB, areaSym, dSurvey["marks"]):
+                        raise MyError, "Failed to remove partial import of " + areaSym
+
+            dLastOID = GetLastOIDs(newDB, [tblInfo[txtFile][0] for txtFile in txtFiles] + ["featdesc", "month"])
+
+        doneSurveys = [areaSym for areaSym in dSurveys if dSurveys[areaSym]["status"] == "complete"]
+
+        # Set up enforcement of unique keys using the primary keys from mdstatidxdet.
+        # Key values are kept in a set for each table (O(1) lookup for each record).
+        #
+        if bUniqueKeys:
+            dUniqueKeys = GetUniqueKeys(newDB, dFldNames, dFldNames.keys())
 
+        else:
+            dUniqueKeys = GetUniqueKeys(newDB, dFldNames, sdvTables)
+
+        dKeys = dict()  # dictionary containing a set of key values for each table in dUniqueKeys
+
+        for tbl in dUniqueKeys:
+            dKeys[tbl] = set()
+
+            if bIncremental or len(doneSurveys) > 0:
+                with arcpy.da.SearchCursor(os.path.join(newDB, tbl), dFldNames[tbl]) as cur:
+                    for rec in cur:
+                        dKeys[tbl].add(SSURGO_TabularReader.KeyValue(rec, dUniqueKeys[tbl]))
+
+        # Check each survey area and create the list of parsing jobs
+        jobList = list()
+
+        for inputDB in dbList:
             # parse Areasymbol from database name. If the geospatial naming convention isn't followed,
             # then this will not work.
             soilsFolder = os.path.dirname(os.path.dirname(inputDB))
-
             fnAreasymbol = soilsFolder[(soilsFolder.rfind("_") + 1):].upper()
-            newFolder = os.path.dirname(os.path.dirname(inputDB)) # survey dataset folder
 
-            # get database name from file listing in the new folder
-            env.workspace = newFolder
+            # Using Adolfo's csv reader method to import tabular data from text files...
+            tabularFolder = SSURGO_TabularReader.GetTabularFolder(soilsFolder)
+
+            # Import feature description file. Does this file exist in a NASIS-SSURGO download?
+            # soilsf_t_al001.txt
+            featPath = os.path.join(soilsFolder, "spatial", "soilsf_t_" + fnAreasymbol + ".txt")
+
+            if fnAreasymbol in doneSurveys:
+                # Already imported by the previous run. Make sure that the text files are the same size.
+                for txtFile, fileStats in dSurveys[fnAreasymbol]["tables"].items():
+                    if txtFile == "featdesc":
+                        txtPath = featPath
+
+                    else:
+                        txtPath = os.path.join(tabularFolder, txtFile + ".txt")
 
-            # move to tabular folder
-            env.workspace = os.path.join(newFolder, "tabular")
+                    if "size" in fileStats and SSURGO_TabularReader.TextFileSize(txtPath) != fileStats["size"]:
+                        raise MyError, txtPath + " has changed since it was imported. Unable to resume, start a new import."
 
-            # Using Adolfo's csv reader method to import tabular data from text files...
-            tabularFolder = os.path.join(newFolder, "tabular")
+                continue
 
             # if the tabular directory is empty return False
-            if len(os.listdir(tabularFolder)) < 1:
+            if len(SSURGO_TabularReader.ListTextFiles(tabularFolder)) < 1:
                 raise MyError, "No text files found in the tabular folder"
 
             # Make sure that input tabular data has the correct SSURGO version for this script
@@ -1217,220 +1707,58 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
             if ssurgoVersion <> dbVersion:
                 raise MyError, "Tabular data in " + tabularFolder + " (SSURGO Version " + str(ssurgoVersion) + ") is not supported"
 
-            # Create a dictionary with table information
-            tblInfo = GetTableInfo(newDB)
+            jobList.append((fnAreasymbol, tabularFolder, txtFiles, dSpecs, dColumns, codePage, featPath, dFilters))
 
-            # Create a list of textfiles to be imported. The import process MUST follow the
-            # order in this list in order to maintain referential integrity. This list
-            # will need to be updated if the SSURGO data model is changed in the future.
-            #
-            txtFiles = ["distmd","legend","distimd","distlmd","lareao","ltext","mapunit", \
-            "comp","muaggatt","muareao","mucrpyd","mutext","chorizon","ccancov","ccrpyd", \
-            "cdfeat","cecoclas","ceplants","cerosnac","cfprod","cgeomord","chydcrit", \
-            "cinterp","cmonth", "cpmatgrp", "cpwndbrk","crstrcts","csfrags","ctxfmmin", \
-            "ctxmoicl","ctext","ctreestm","ctxfmoth","chaashto","chconsis","chdsuffx", \
-            "chfrags","chpores","chstrgrp","chtext","chtexgrp","chunifie","cfprodo","cpmat","csmoist", \
-            "cstemp","csmorgc","csmorhpp","csmormr","csmorss","chstr","chtextur", \
-            "chtexmod","sacatlog","sainterp","sdvalgorithm","sdvattribute","sdvfolder","sdvfolderattribute"]
-            # Need to add featdesc import as a separate item (ie. spatial\soilsf_t_al001.txt: featdesc)
-
-            # Static Metadata Table that records the metadata for all columns of all tables
-            # that make up the tabular data set.
-            mdstattabsTable = os.path.join(env.workspace, "mdstattabs")
-
-            # set progressor object which allows progress information to be passed for every merge complete
-            #arcpy.SetProgressor("step", "Importing " +  fnAreasymbol + " tabular  (" + Number_Format(iCntr, 0, True) + " of " + Number_Format(len(dbList), 0, True) + ")" , 0, len(txtFiles) + 1, 1)
-
-            #csv.field_size_limit(sys.maxsize)
-            csv.field_size_limit(512000)
-
-            # For cointerp, adjust for missing columns
-            #  x = fldNames[0:7]
-            #  y = fldNames[12:14]
-            #  z = fldNames[16:20]
+        iDone = len(dbList) - len(jobList)
+
+        if iDone > 0:
+            PrintMsg("\tSkipping " + Number_Format(iDone, 0, True) + " survey areas imported by the previous run", 0)
+
+        # Parse the text files for each survey area in a pool of worker processes. The parsed
+        # surveys come back in dbList order and are written one at a time by this process, in
+        # txtFiles order, so that referential integrity is maintained.
+        #
+        for iCntr, (fnAreasymbol, dRows, dStats) in enumerate(ParseSurveyAreas(jobList, iProcesses), iDone + 1):
+            env.workspace = newDB
+
+            if not manifestPath is None:
+                SSURGO_TabularReader.WriteManifest(manifestPath, [{"survey":fnAreasymbol, "status":"started", "marks":dLastOID}])
 
             # Need to import text files in a specific order or the MS Access database will
             # return an error due to table relationships and key violations
             for txtFile in txtFiles:
-
-                # Get table name and alias from dictionary
-                if txtFile in tblInfo:
-                    tbl, aliasName = tblInfo[txtFile]
-
-                else:
-                    raise MyError, "Textfile reference '" + txtFile + "' not found in 'mdstattabs table'"
+                tbl, aliasName = tblInfo[txtFile]
+                txtPath = os.path.join(jobList[iCntr - iDone - 1][1], txtFile + ".txt")
+                fldNames = dFldNames[tbl]
 
                 arcpy.SetProgressorLabel("Importing " +  fnAreasymbol + " tabular data  (" + Number_Format(iCntr, 0, True) + " of " + Number_Format(len(dbList), 0, True) + ") :   " + tbl)
 
-                # Full path to SSURGO text file
-                txtPath = os.path.join(tabularFolder, txtFile + ".txt")
-
-                # continue if the target table exists
-                if arcpy.Exists(tbl):
-                    # Create cursor for all fields to populate the current table
-                    #
-                    # For a geodatabase, I need to remove OBJECTID from the fields list
-                    fldList = arcpy.Describe(tbl).fields
-                    fldNames = list()
-                    #fldLengths = list()
-
-                    for fld in fldList:
-                        if fld.type != "OID":
-                            fldNames.append(fld.name)
-
-                    if len(fldNames) == 0:
-                        raise MyError, "Failed to get field names for " + tbl
-
-                    if not tbl in ['sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm']:
-                        # Import all tables except SDV
-                        #
-                        time.sleep(0.05)  # Occasional write errors
-                        
-                        if tbl.endswith("text"):
-                            with arcpy.da.InsertCursor(os.path.join(newDB, tbl), fldNames) as cursor:
-                                # counter for current record number
-                                iRows = 1  # input textfile line number
-
-                                #if os.path.isfile(txtPath):
-                                if arcpy.Exists(txtPath):
-
-                                    try:
-                                        # Use csv reader to read each line in the text file
-                                        time.sleep(0.5)  # trying to prevent error reading text file
-
-                                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
-                                            # replace all blank values with 'None' so that the values are properly inserted
-                                            # into integer values otherwise insertRow fails
-                                            fixedRow = [x.decode(codePage) if x else None for x in rowInFile]  # handle non-utf8 characters
-                                            #fixedRow = [x if x else None for x in rowInFile]  # figure out which tables have non-utf8 characters
-                                            cursor.insertRow(fixedRow) # was fixedRow
-                                            iRows += 1
-
-                                    except:
-                                        PrintMsg(" \n" + str(fixedRow), 1)
-                                        err = "Error writing line " + Number_Format(iRows, 0, True) + " from " + txtPath
-                                        raise MyError, err
-
-                                else:
-                                    raise MyError, "Missing tabular data file (" + txtPath + ")"
-
-                        elif tbl == "cointerp":
-
-                            with arcpy.da.InsertCursor(os.path.join(newDB, tbl), fldNames) as cursor:
-                                # counter for current record number
-                                iRows = 1  # input textfile line number
-
-                                #if os.path.isfile(txtPath):
-                                if arcpy.Exists(txtPath):
-
-                                    try:
-                                        # Use csv reader to read each line in the text file
-                                        time.sleep(0.5)  # trying to prevent error reading text file
-
-                                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
-                                            # replace all blank values with 'None' so that the values are properly inserted
-                                            # into integer values otherwise insertRow fails
-                                            #fixedRow = [x.decode(codePage) if x else None for x in rowInFile]  # handle non-utf8 characters
-                                            r1 = rowInFile[0:7]
-                                            r2 = rowInFile[11:13]
-                                            r3 = rowInFile[15:19]
-                                            r1.extend(r2)
-                                            r1.extend(r3)
-                                            fixedRow = [x if x else None for x in r1]  # figure out which tables have non-utf8 characters
-                                            #mrulekey = fixedRow[1]
-                                            #ruledepth = fixedRow[6]
-                                            
-                                            if (fixedRow[6] == '0') or (fixedRow[1] == '54955'):
-                                                # NCCPI or ruledepth zero
-                                                # should I make the 54955 a dynamic variable?
-                                                cursor.insertRow(fixedRow) # was fixedRow
-                                                #PrintMsg("\t" + str(fixedRow[1]) + ";\t" + str(fixedRow[2]) + ";\t" + str(fixedRow[6]), 1)
-                                            iRows += 1
-
-                                    except:
-                                        #PrintMsg(" \n" + ", ".join(fldNames), 1)
-                                        PrintMsg(str(fixedRow), 1)
-                                        err = "Error writing line " + Number_Format(iRows, 0, True) + " from " + txtPath
-                                        raise MyError, err
-
-                                else:
-                                    raise MyError, "Missing tabular data file (" + txtPath + ")"
-
-                        
-                        else:
-                            with arcpy.da.InsertCursor(os.path.join(newDB, tbl), fldNames) as cursor:
-                                # counter for current record number
-                                iRows = 1  # input textfile line number
-
-                                #if os.path.isfile(txtPath):
-                                if arcpy.Exists(txtPath):
-
-                                    try:
-                                        # Use csv reader to read each line in the text file
-                                        time.sleep(0.5)  # trying to prevent error reading text file
-
-                                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
-                                            # replace all blank values with 'None' so that the values are properly inserted
-                                            # into integer values otherwise insertRow fails
-                                            #fixedRow = [x.decode(codePage) if x else None for x in rowInFile]  # handle non-utf8 characters
-                                            fixedRow = [x if x else None for x in rowInFile]  # figure out which tables have non-utf8 characters
-                                            cursor.insertRow(fixedRow) # was fixedRow
-                                            iRows += 1
-
-                                    except:
-                                        PrintMsg(" \n" + str(fixedRow), 1)
-                                        err = "Error writing line " + Number_Format(iRows, 0, True) + " from " + txtPath
-                                        raise MyError, err
+                with arcpy.da.InsertCursor(os.path.join(newDB, tbl), fldNames) as cursor:
+                    # counter for current record number
+                    iRows = 1  # input textfile line number
+                    fixedRow = None
 
-                                else:
-                                    raise MyError, "Missing tabular data file (" + txtPath + ")"
+                    rowIter = dRows[txtFile]
 
-                    else:
-                        # Import SDV tables while enforcing unique key constraints
-                        # 'sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm'
-                        #
-                        with arcpy.da.InsertCursor(os.path.join(newDB, tbl), fldNames) as cursor:
-                            # counter for current record number
-                            iRows = 1
-
-                            if os.path.isfile(txtPath):
-
-                                try:
-                                    # Use csv reader to read each line in the text file
-                                    time.sleep(0.5)  # trying to prevent error reading text file
-                                    
-                                    for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
-                                        newRow = list()
-                                        fldNo = 0
-                                        keyVal = int(rowInFile[dIndex[tbl]])
-
-                                        if not keyVal in dKeys[tbl]:
-                                            # write new record to SDV table
-                                            dKeys[tbl].append(keyVal)
-                                            newRow = [x if x else None for x in rowInFile]
-                                            cursor.insertRow(newRow)  # was newRow
-                                        iRows += 1
-
-                                except:
-                                    err = "Error importing line " + Number_Format(iRows, 0, True) + " from " + txtPath + " \n " + str(newRow)
-                                    PrintMsg(err, 1)
-                                    #errorMsg()
-                                    raise MyError, "Error writing line " + Number_Format(iRows, 0, True) + " of " + txtPath
-
-                            else:
-                                raise MyError, "Missing tabular data file (" + txtPath + ")"
-
-                    # Check table count
-                    # This isn't correct. May need to look at accumulating total table count in a dictionary
-                    #if int(arcpy.GetCount_management(os.path.join(newDB, tbl)).getOutput(0)) != iRows:
-                    #    raise MyError, tbl + ": Failed to import all " + Number_Format(iRows, 0, True) + " records into "
-                    #
+                    if tbl in dUniqueKeys:
+                        # Skip any record whose primary key has already been imported
+                        # eg. 'sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm'
+                        rowIter = SSURGO_TabularReader.UniqueKeyRows(rowIter, dUniqueKeys[tbl], dKeys[tbl])
 
-                else:
-                    raise MyError, "Required table '" + tbl + "' not found in " + newDB
+                    try:
+                        # cointerp rows were already reduced to NCCPI or ruledepth zero by the
+                        # parsing workers (SSURGO_TabularReader.CointerpRow)
+                        for fixedRow in rowIter:
+                            dLastOID[tbl] = cursor.insertRow(fixedRow)
+                            iRows += 1
 
-            #arcpy.SetProgressorPosition()
+                    except:
+                        PrintMsg(" \n" + str(fixedRow), 1)
+                        err = "Error writing line " + Number_Format(iRows, 0, True) + " from " + txtPath
+                        raise MyError, err
 
+                # Release the parsed rows for this table
+                del dRows[txtFile]
 
             # Populate the month table (pre-populated in the Access Template database, no text file)
             #
@@ -1443,52 +1771,37 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
                 with arcpy.da.InsertCursor(monthTbl, ["monthseq", "monthname"]) as cur:
                     for seq, month in enumerate(monthList):
                         rec = [(seq + 1), month]
-                        cur.insertRow(rec)
-            
-            # Import feature description file. Does this file exist in a NASIS-SSURGO download?
-            # soilsf_t_al001.txt
-            spatialFolder = os.path.join(os.path.dirname(tabularFolder), "spatial")
-            txtFile ="soilsf_t_" + fnAreasymbol
-            txtPath = os.path.join(spatialFolder, txtFile + ".txt")
-            tbl = "featdesc"
+                        dLastOID["month"] = cur.insertRow(rec)
 
-            if arcpy.Exists(txtPath):
-                # For a geodatabase, I need to remove OBJECTID from the fields list
-                fldList = arcpy.Describe(tbl).fields
-                fldNames = list()
-                for fld in fldList:
-                    if fld.type != "OID":
-                        fldNames.append(fld.name)
-
-                if len(fldNames) == 0:
-                    raise MyError, "Failed to get field names for " + tbl
+            # Import feature description file, if there was one for this survey area
+            tbl = "featdesc"
 
+            if tbl in dRows:
                 # Create cursor for all fields to populate the featdesc table
-                with arcpy.da.InsertCursor(tbl, fldNames) as cursor:
+                with arcpy.da.InsertCursor(os.path.join(newDB, tbl), dFldNames[tbl]) as cursor:
                     # counter for current record number
                     iRows = 1
                     arcpy.SetProgressorLabel("Importing " +  fnAreasymbol + "  (" + Number_Format(iCntr, 0, True) + " of " + Number_Format(len(dbList), 0, True) + "):   " + tbl)
 
                     try:
-                        # Use csv reader to read each line in the text file
-                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
-                            # replace all blank values with 'None' so that the values are properly inserted
-                            # into integer values otherwise insertRow fails
-                            newRow = [None if value == '' else value for value in rowInFile]
-                            cursor.insertRow(newRow)
+                        rowIter = dRows[tbl]
+
+                        if tbl in dUniqueKeys:
+                            rowIter = SSURGO_TabularReader.UniqueKeyRows(rowIter, dUniqueKeys[tbl], dKeys[tbl])
+
+                        for newRow in rowIter:
+                            dLastOID[tbl] = cursor.insertRow(newRow)
                             iRows += 1
 
                     except:
                         errorMsg()
-                        raise MyError, "Error loading line no. " + Number_Format(iRows, 0, True) + " of " + txtFile + ".txt"
+                        raise MyError, "Error loading line no. " + Number_Format(iRows, 0, True) + " of soilsf_t_" + fnAreasymbol + ".txt"
 
                 arcpy.SetProgressorPosition()  # for featdesc table
-                time.sleep(1.0)
 
             #else:
                 # featdesc.txt file does not exist. NASIS-SSURGO download:
             #    PrintMsg("\tMissing file " + txtPath, 1)
-
             # Check the database to make sure that it completed properly, with at least the
             # SAVEREST date populated in the SACATALOG table. Featdesc is the last table, but not
             # a good test because often it is not populated.
@@ -1498,9 +1811,23 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
                 # With this error, it would be best to bailout and fix the problem before proceeding
                 raise MyError, "Failed to get Template Date for " + fnAreasymbol
 
+            if not manifestPath is None:
+                # All tables for this survey area have been committed
+                recordList = list()
+
+                for txtFile in sorted(dStats):
+                    record = {"survey":fnAreasymbol, "table":txtFile}
+                    record.update(dStats[txtFile])
+                    recordList.append(record)
+
+                recordList.append({"survey":fnAreasymbol, "status":"complete"})
+                SSURGO_TabularReader.WriteManifest(manifestPath, recordList)
+
             # Set the Progressor to show completed status
             arcpy.ResetProgressor()
 
+        PrintMsg(" \n" + SSURGO_TabularReader.RetryReport(), 0)
+
         # Check mapunit and sdvattribute tables. Get rid of certain records if there is no data available.
         # iacornsr IS NOT NULL OR nhiforsoigrp IS NOT NULL OR vtsepticsyscl IS NOT NULL
 
@@ -1674,10 +2001,12 @@ def IdentifyNewInterps(outputWS):
         return False
         
 ## ===================================================================================
-def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineList, sfpointList, sapolyList, featCnt):
+def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineList, sfpointList, sapolyList, featCnt, bIncremental=False):
     # Merge all spatial layers into a set of file geodatabase featureclasses
     # Compare shapefile feature count to GDB feature count
     # featCnt:  0 mupoly, 1 muline, 2 mupoint, 3 sfline, 4 sfpoint, 5 sapoly
+    # bIncremental: appending to an existing database. featCnt includes the existing features
+    # and the spatial and attribute indexes are already in place.
     try:
         # Set output workspace
         env.workspace = outputWS
@@ -1713,9 +2042,10 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
                 raise MyError, "MUPOLYGON imported only " + Number_Format(mupolyCnt, 0, True) + " polygons, should be " + Number_Format(featCnt[0], 0, True)
             #PrintMsg(" \nMUPOLYGON imported only " + Number_Format(mupolyCnt, 0, True) + " polygons, should be " + Number_Format(featCnt[0], 0, True), 1)
 
-            # Add spatial index
-            arcpy.AddSpatialIndex_management (os.path.join(outputWS, "MUPOLYGON"))
-            arcpy.AddIndex_management(os.path.join(outputWS, "MUPOLYGON"), "AREASYMBOL", "Indx_MupolyAreasymbol")
+            if not bIncremental:
+                # Add spatial index
+                arcpy.AddSpatialIndex_management (os.path.join(outputWS, "MUPOLYGON"))
+                arcpy.AddIndex_management(os.path.join(outputWS, "MUPOLYGON"), "AREASYMBOL", "Indx_MupolyAreasymbol")
 
         #PrintMsg(" \nSkipping import for other featureclasses until problem with shapefile primary key is fixed", 0)
         #return True
@@ -1730,11 +2060,12 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
             if mulineCnt != featCnt[1]:
                 raise MyError, "MULINE short count"
 
-            # Add spatial index
-            arcpy.AddSpatialIndex_management (os.path.join(outputWS, "MULINE"))
+            if not bIncremental:
+                # Add spatial index
+                arcpy.AddSpatialIndex_management (os.path.join(outputWS, "MULINE"))
 
-            # Add attribute indexes
-            arcpy.AddIndex_management(os.path.join(outputWS, "MULINE"), "AREASYMBOL", "Indx_MulineAreasymbol")
+                # Add attribute indexes
+                arcpy.AddIndex_management(os.path.join(outputWS, "MULINE"), "AREASYMBOL", "Indx_MulineAreasymbol")
 
         # Merge process MUPOINT
         if len(mupointList) > 0:
@@ -1746,11 +2077,12 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
             if mupointCnt != featCnt[2]:
                 raise MyError, "MUPOINT short count"
 
-            # Add spatial index
-            arcpy.AddSpatialIndex_management (os.path.join(outputWS, "MUPOINT"))
+            if not bIncremental:
+                # Add spatial index
+                arcpy.AddSpatialIndex_management (os.path.join(outputWS, "MUPOINT"))
 
-            # Add attribute indexes
-            arcpy.AddIndex_management(os.path.join(outputWS, "MUPOINT"), "AREASYMBOL", "Indx_MupointAreasymbol")
+                # Add attribute indexes
+                arcpy.AddIndex_management(os.path.join(outputWS, "MUPOINT"), "AREASYMBOL", "Indx_MupointAreasymbol")
 
         # Merge process FEATLINE
         if len(sflineList) > 0:
@@ -1762,11 +2094,12 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
             if sflineCnt != featCnt[3]:
                 raise MyError, "FEATLINE short count"
 
-            # Add spatial index
-            arcpy.AddSpatialIndex_management (os.path.join(outputWS, "FEATLINE"))
+            if not bIncremental:
+                # Add spatial index
+                arcpy.AddSpatialIndex_management (os.path.join(outputWS, "FEATLINE"))
 
-            # Add attribute indexes
-            arcpy.AddIndex_management(os.path.join(outputWS, "FEATLINE"), "AREASYMBOL", "Indx_SFLineAreasymbol")
+                # Add attribute indexes
+                arcpy.AddIndex_management(os.path.join(outputWS, "FEATLINE"), "AREASYMBOL", "Indx_SFLineAreasymbol")
 
         # Merge process FEATPOINT
         if len(sfpointList) > 0:
@@ -1781,11 +2114,12 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
                 PrintMsg(" \nExported " + str(sfpointCnt) + " points to geodatabase", 1)
                 raise MyError, "FEATPOINT short count"
 
-            # Add spatial index
-            arcpy.AddSpatialIndex_management (os.path.join(outputWS, "FEATPOINT"))
+            if not bIncremental:
+                # Add spatial index
+                arcpy.AddSpatialIndex_management (os.path.join(outputWS, "FEATPOINT"))
 
-            # Add attribute indexes
-            arcpy.AddIndex_management(os.path.join(outputWS, "FEATPOINT"), "AREASYMBOL", "Indx_SFPointAreasymbol")
+                # Add attribute indexes
+                arcpy.AddIndex_management(os.path.join(outputWS, "FEATPOINT"), "AREASYMBOL", "Indx_SFPointAreasymbol")
 
         # Merge process SAPOLYGON
         if len(sapolyList) > 0:
@@ -1797,8 +2131,9 @@ def AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineLis
             if sapolyCnt != featCnt[5]:
                 raise MyError, "SAPOLYGON short count"
 
-            # Add spatial index
-            arcpy.AddSpatialIndex_management (os.path.join(outputWS, "SAPOLYGON"))
+            if not bIncremental:
+                # Add spatial index
+                arcpy.AddSpatialIndex_management (os.path.join(outputWS, "SAPOLYGON"))
 
 
         arcpy.RefreshCatalog(outputWS)
@@ -2160,8 +2495,16 @@ def UpdateMetadata(outputWS, target, surveyInfo, description, remove_gp_history_
         False
 
 ## ===================================================================================
-def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bClipped, areasymbolList):
+def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bClipped, areasymbolList, bIncremental=False, bResume=False):
     # main function
+    #
+    # bIncremental: update an existing output geodatabase. Only survey areas that are new or have
+    # a newer SAVEREST date than the existing data are imported. Older versions of the updated
+    # surveys are deleted first.
+    #
+    # bResume: continue a text file import that failed or was stopped, using the import manifest
+    # (gSSURGO_xx_manifest.json) next to the output geodatabase. Steps and survey areas that
+    # were completed by the previous run are skipped.
 
     try:
         # Creating the file geodatabase uses the ImportXMLWorkspaceDocument command which requires
@@ -2334,6 +2677,24 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bCli
         else:
             # Spatial sort has already been handled using the soil survey boundary layer.
             pass
+
+        if bIncremental and arcpy.Exists(outputWS):
+            # Reduce the list of survey areas to those that are new or have changed
+            areasymbolList, staleList = GetChangedSurveys(inputFolder, outputWS, areasymbolList)
+
+            if areasymbolList is None:
+                raise MyError, ""
+
+            if len(areasymbolList) == 0:
+                PrintMsg(" \nAll survey areas in " + outputWS + " are already current \n ", 0)
+                return True
+
+            # Existing soil maps can be updated for just these survey areas (gSSURGO_CreateSoilMaps)
+            PrintMsg(" \nUpdated survey areas: " + " ".join([areaSym.upper() for areaSym in areasymbolList]), 0)
+
+        else:
+            bIncremental = False
+            staleList = list()
         
         # Save the total featurecount for all input shapefiles
         mupolyCnt = 0
@@ -2497,15 +2858,52 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bCli
             outputWS = os.path.join(outFolder, gdbName)
             featCnt = (mupolyCnt, mulineCnt, mupointCnt, sflineCnt, sfpointCnt, sapolyCnt)  # 0 mupoly, 1 muline, 2 mupoint, 3 sfline, 4 sfpoint, 5 sapoly
 
-            bGeodatabase = CreateSSURGO_DB(outputWS, inputXML, areasymbolList, aliasName)
+            # Import manifest used to resume a text file import
+            dSteps = dict()
+
+            if useTextFiles and not bIncremental:
+                manifestPath = SSURGO_TabularReader.ManifestPath(outputWS)
+
+                if bResume and arcpy.Exists(outputWS) and os.path.isfile(manifestPath):
+                    dSteps, dSurveys = SSURGO_TabularReader.ReadManifest(manifestPath)
+
+                elif bResume:
+                    PrintMsg(" \nNo previous import found for " + outputWS + ", starting a new import", 1)
+
+            else:
+                manifestPath = None
+
+            if bIncremental:
+                # Remove the old versions of the updated surveys from the existing geodatabase.
+                # Final feature counts will include the features that are already there.
+                bGeodatabase = DeleteSurveyAreas(outputWS, staleList)
+                fcList = ["MUPOLYGON", "MULINE", "MUPOINT", "FEATLINE", "FEATPOINT", "SAPOLYGON"]
+                featCnt = tuple([featCnt[i] + int(arcpy.GetCount_management(os.path.join(outputWS, fc)).getOutput(0)) for i, fc in enumerate(fcList)])
+
+            elif "spatial" in dSteps:
+                PrintMsg(" \nResuming import into " + outputWS + " (" + Number_Format(len(dSurveys), 0, True) + " survey areas started by the previous run)", 0)
+                bGeodatabase = True
+
+            else:
+                bGeodatabase = CreateSSURGO_DB(outputWS, inputXML, areasymbolList, aliasName)
+
+                if bGeodatabase and not manifestPath is None:
+                    SSURGO_TabularReader.NewManifest(manifestPath)
 
             if bGeodatabase:
                 # Successfully created a new geodatabase
                 # Merge all existing shapefiles to file geodatabase featureclasses
                 #
                 env.workspace = outputWS  # attempted metadata-workspace conflict fix
-                
-                bSpatial = AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineList, sfpointList, sapolyList, featCnt)
+
+                if "spatial" in dSteps:
+                    bSpatial = True
+
+                else:
+                    bSpatial = AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineList, sfpointList, sapolyList, featCnt, bIncremental)
+
+                    if bSpatial == True and not manifestPath is None:
+                        SSURGO_TabularReader.WriteManifest(manifestPath, [{"step":"spatial"}])
 
                 # Append tabular data to the file geodatabase
                 #
@@ -2513,14 +2911,36 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bCli
                     if not arcpy.Exists(outputWS):
                         raise MyError, "Could not find " + outputWS + " to append tables to"
 
-                    if useTextFiles:
-                        bMD = ImportMDTabular(outputWS, dbPath, codePage)  # new, import md tables from text files of last survey area
+                    if useTextFiles and bIncremental:
+                        # metadata tables are already populated
+                        bTabular = ImportTabular(outputWS, dbList, dbVersion, codePage, bIncremental=True)
 
-                        if bMD == False:
-                            raise MyError, ""
+                    elif bIncremental:
+                        bTabular = ImportTables(outputWS, dbList, dbVersion, True)
+
+                    elif useTextFiles:
+                        if "metadata" in dSteps:
+                            # metadata tables were imported by the previous run
+                            tableIndexes = [tuple(indexInfo) for indexInfo in dSteps["metadata"]["indexes"]]
+
+                        else:
+                            bMD = ImportMDTabular(outputWS, SSURGO_TabularReader.GetTabularFolder(os.path.dirname(dbPath)), codePage)  # new, import md tables from text files of last survey area
+
+                            if bMD == False:
+                                raise MyError, ""
+
+                            # Remove table indexes for the bulk load, they are rebuilt after the import
+                            tableIndexes = RemoveTableIndexes(outputWS, GetTableList(outputWS))
+                            SSURGO_TabularReader.WriteManifest(manifestPath, [{"step":"metadata", "indexes":tableIndexes}])
 
                         # import attribute data from text files in tabular folder
-                        bTabular = ImportTabular(outputWS, dbList, dbVersion, codePage)
+                        bTabular = ImportTabular(outputWS, dbList, dbVersion, codePage, manifestPath=manifestPath)
+
+                        if bTabular == True and not "indexes" in dSteps:
+                            bTabular = RebuildTableIndexes(outputWS, tableIndexes)
+
+                            if bTabular == True:
+                                SSURGO_TabularReader.WriteManifest(manifestPath, [{"step":"indexes"}])
 
                     else:
                         bMD = ImportMDTables(outputWS, dbList)
@@ -2551,7 +2971,8 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, useTextFiles, bCli
             #bFixed = IdentifyNewInterps(outputWS)
 
             # Create table relationships and indexes
-            bRL = CreateTableRelationships(outputWS)
+            if not bIncremental:
+                bRL = CreateTableRelationships(outputWS)
 
             # Query the output SACATALOG table to get list of surveys that were exported to the gSSURGO
             #
@@ -2818,6 +3239,87 @@ def CreateTableRelationships(wksp):
         errorMsg()
         return False
 
+## ===================================================================================
+def RemoveTableIndexes(wksp, tblList):
+    # Remove the attribute indexes created by the XML workspace document from the standalone
+    # tables before the tabular import, so that they are not updated for every inserted record.
+    #
+    # Returns a list of (table, index name, field names, unique, ascending) for RebuildTableIndexes
+    #
+    try:
+        indexList = list()
+        arcpy.SetProgressor("step", "Removing table indexes...", 0, len(tblList), 1)
+
+        for tblName in tblList:
+            tbl = os.path.join(wksp, tblName)
+            arcpy.SetProgressorLabel("Removing indexes for " + tblName)
+
+            if arcpy.Exists(tbl):
+                for indx in arcpy.ListIndexes(tbl):
+                    fldNames = [fld.name for fld in indx.fields]
+
+                    if not "OBJECTID" in [fldName.upper() for fldName in fldNames]:
+                        arcpy.RemoveIndex_management(tbl, indx.name)
+                        indexList.append((tblName, indx.name, fldNames, indx.isUnique, indx.isAscending))
+
+            arcpy.SetProgressorPosition()
+
+        arcpy.ResetProgressor()
+
+        if len(indexList) > 0:
+            PrintMsg(" \nRemoved " + str(len(indexList)) + " table indexes, these will be rebuilt after the tabular import", 0)
+
+        return indexList
+
+    except:
+        errorMsg()
+        return []
+
+## ===================================================================================
+def RebuildTableIndexes(wksp, indexList):
+    # Add back the attribute indexes removed by RemoveTableIndexes, now that the tables are fully
+    # loaded. Each index is built in one pass over its table. A file geodatabase table has to be
+    # locked to add an index, so the indexes are built one at a time.
+    #
+    try:
+        PrintMsg(" \nBuilding " + str(len(indexList)) + " table indexes (seconds):", 0)
+        arcpy.SetProgressor("step", "Building table indexes...", 0, len(indexList), 1)
+        totalTime = time.time()
+
+        for tblName, indexName, fldNames, bUnique, bAscending in sorted(indexList):
+            arcpy.SetProgressorLabel("Building index " + indexName + " on " + tblName + " table")
+            startTime = time.time()
+
+            if bUnique:
+                unique = "UNIQUE"
+
+            else:
+                unique = "NON_UNIQUE"
+
+            if bAscending:
+                ascending = "ASCENDING"
+
+            else:
+                ascending = "NON_ASCENDING"
+
+            try:
+                arcpy.AddIndex_management(os.path.join(wksp, tblName), fldNames, indexName, unique, ascending)
+                PrintMsg("\t" + tblName + "." + indexName + ": " + Number_Format((time.time() - startTime), 1, True), 0)
+
+            except:
+                PrintMsg("\tUnable to create index " + indexName + " on " + tblName + " table", 1)
+
+            arcpy.SetProgressorPosition()
+
+        PrintMsg("\tTotal: " + Number_Format((time.time() - totalTime), 1, True), 0)
+        arcpy.ResetProgressor()
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
 ## ===================================================================================
 def GetFCType(fc):
     # Determine featureclass typefeaturetype and table fields
@@ -2908,6 +3410,8 @@ import arcpy, sys, string, os, traceback, locale, time, datetime, csv
 from operator import itemgetter, attrgetter
 import xml.etree.cElementTree as ET
 from arcpy import env
+import SSURGO_TabularReader
+import SSURGO_SDAClient
 
 try:
     if __name__ == "__main__":
@@ -2921,6 +3425,18 @@ try:
         aliasName = arcpy.GetParameterAsText(5)       # String to be appended to featureclass aliases
         useTextFiles = arcpy.GetParameter(6)
 
+        if arcpy.GetArgumentCount() > 7:
+            bIncremental = arcpy.GetParameter(7)      # update existing geodatabase with new or changed surveys only
+
+        else:
+            bIncremental = False
+
+        if arcpy.GetArgumentCount() > 8:
+            bResume = arcpy.GetParameter(8)           # resume a failed text file import using the import manifest
+
+        else:
+            bResume = False
+
         #dbVersion = 2  # This is the SSURGO version supported by this script and the gSSURGO schema (XML Workspace document)
 
         # Check to see if we got an ssaLayer
@@ -2933,7 +3449,7 @@ try:
         else:
             areasymbolList = list()
                                          
-        bGood = gSSURGO(inputFolder, surveyList, outputWS, AOI, aliasName, useTextFiles, False, areasymbolList)
+        bGood = gSSURGO(inputFolder, surveyList, outputWS, AOI, aliasName, useTextFiles, False, areasymbolList, bIncremental, bResume)
 
 except MyError, e:
     PrintMsg(str(e), 2)
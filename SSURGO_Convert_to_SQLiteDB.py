@@ -361,9 +361,9 @@ def SSURGOVersionTxt(tabularFolder):
         # Get SSURGOversion number from version.txt
         versionTxt = os.path.join(tabularFolder, "version.txt")
 
-        if arcpy.Exists(versionTxt):
+        if SSURGO_TabularReader.TextFileExists(versionTxt):
             # read just the first line of the version.txt file
-            fh = open(versionTxt, "r")
+            fh = SSURGO_TabularReader.OpenTextFile(versionTxt)
             txtVersion = int(fh.readline().split(".")[0])
             fh.close()
             return txtVersion
@@ -539,6 +539,137 @@ def GetTableIndexes(newDB):
         errorMsg()
         return dict()
                                        
+## ===============================================================================================================
+def GetPrimaryKeys(newDB):
+    # Get the primary key column(s) for each table from the mdstatidxdet and mdstatidxmas tables.
+    # Returns a dictionary: key = table name, value = list of key columns in idxcolsequence order
+    #
+    try:
+        dPrimaryKeys = dict()
+        idxDet = os.path.join(newDB, "mdstatidxdet")
+        idxMas = os.path.join(newDB, "mdstatidxmas")
+
+        if not arcpy.Exists(idxDet):
+            raise MyError, "Missing mdstatidxdet table"
+
+        # Skip any index that is not flagged as unique in mdstatidxmas
+        nonUnique = list()
+
+        if arcpy.Exists(idxMas):
+            with arcpy.da.SearchCursor(idxMas, ["idxphyname", "uniqueindex"], where_clause="idxphyname LIKE 'PK_%'") as rows:
+                for idxName, uniqueIndex in rows:
+                    if not str(uniqueIndex).lower() in ("yes", "1", "true"):
+                        nonUnique.append(idxName)
+
+        with arcpy.da.SearchCursor(idxDet, ["tabphyname", "idxphyname", "colphyname"], where_clause="idxphyname LIKE 'PK_%'", sql_clause=(None, "ORDER BY tabphyname, idxcolsequence")) as rows:
+            for tblName, indexName, columnName in rows:
+                if not indexName in nonUnique:
+                    if tblName in dPrimaryKeys:
+                        dPrimaryKeys[tblName].append(columnName)
+
+                    else:
+                        dPrimaryKeys[tblName] = [columnName]
+
+        return dPrimaryKeys
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return dict()
+
+    except:
+        errorMsg()
+        return dict()
+
+## ===============================================================================================================
+def GetUniqueKeys(newDB, dFldNames, uniqueTables):
+    # Get the primary key field position(s) for each table in uniqueTables, so that duplicate
+    # records can be skipped during the import (see SSURGO_TabularReader.UniqueKeyRows).
+    #
+    # dFldNames: key = table name, value = list of field names (no OBJECTID) in import order
+    #
+    # Returns a dictionary: key = table name, value = list of field positions
+    #
+    try:
+        dPrimaryKeys = GetPrimaryKeys(newDB)
+
+        # The SDV tables must always have unique keys, so use these if they are not in the metadata
+        keyFields = dict()
+        keyFields['sdvfolderattribute'] = ["attributekey"]
+        keyFields['sdvattribute'] = ["attributekey"]
+        keyFields['sdvfolder'] = ["folderkey"]
+        keyFields['sdvalgorithm'] = ["algorithmsequence"]
+
+        dUniqueKeys = dict()
+
+        for tbl in uniqueTables:
+            if tbl in dPrimaryKeys:
+                keyCols = dPrimaryKeys[tbl]
+
+            elif tbl in keyFields:
+                keyCols = keyFields[tbl]
+
+            else:
+                # no primary key for this table
+                continue
+
+            fldNames = [fld.lower() for fld in dFldNames[tbl]]
+
+            if len([keyCol for keyCol in keyCols if keyCol.lower() in fldNames]) == len(keyCols):
+                dUniqueKeys[tbl] = [fldNames.index(keyCol.lower()) for keyCol in keyCols]
+
+            else:
+                PrintMsg("\tPrimary key (" + ", ".join(keyCols) + ") not found in " + tbl + " table", 1)
+
+        return dUniqueKeys
+
+    except:
+        errorMsg()
+        return dict()
+
+## ===============================================================================================================
+def GetColumnInfo(newDB):
+    # Get the column metadata used to build the text file converters from the mdstattabcols
+    # and mdstatdomdet tables (see SSURGO_TabularReader.GetColumnSpecs).
+    #
+    # Returns two dictionaries:
+    #   dColumnInfo: key = (table name, column name), value = (logicaldatatype, fieldsize, bNotNull, domainname)
+    #   dDomains:    key = domain name, value = list of choices in choicesequence order
+    #
+    # If the metadata is missing, the text files are still parsed using just the field types.
+    #
+    try:
+        dColumnInfo = dict()
+        dDomains = dict()
+        colTable = os.path.join(newDB, "mdstattabcols")
+        domTable = os.path.join(newDB, "mdstatdomdet")
+
+        if not arcpy.Exists(colTable):
+            raise MyError, "Missing mdstattabcols table, unable to validate text file columns"
+
+        with arcpy.da.SearchCursor(colTable, ["tabphyname", "colphyname", "logicaldatatype", "fieldsize", "notnull", "domainname"]) as rows:
+            for tblName, colName, dataType, fieldSize, notNull, domainName in rows:
+                bNotNull = str(notNull).lower() in ("yes", "1", "true")
+                dColumnInfo[(tblName.lower(), colName.lower())] = (dataType, fieldSize, bNotNull, domainName)
+
+        if arcpy.Exists(domTable):
+            with arcpy.da.SearchCursor(domTable, ["domainname", "choice"], sql_clause=(None, "ORDER BY domainname, choicesequence")) as rows:
+                for domainName, choice in rows:
+                    if domainName in dDomains:
+                        dDomains[domainName].append(choice)
+
+                    else:
+                        dDomains[domainName] = [choice]
+
+        return dColumnInfo, dDomains
+
+    except MyError, e:
+        PrintMsg(str(e), 1)
+        return dict(), dict()
+
+    except:
+        errorMsg()
+        return dict(), dict()
+
 ## ===================================================================================
 def ImportMDTables(newDB, dbList):
     # Import as single set of metadata tables from first survey area's Access database
@@ -714,10 +845,10 @@ def ImportMDTabular(newDB, tabularFolder, codePage):
 
                     
 
-                    if os.path.isfile(txtPath):
+                    if SSURGO_TabularReader.TextFileExists(txtPath):
 
                         # Use csv reader to read each line in the text file
-                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|'):
+                        for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                             # , quotechar="'"
                             # replace all blank values with 'None' so that the values are properly inserted
                             # into integer values otherwise insertRow fails
@@ -793,7 +924,7 @@ def ImportTables(outputWS, dbList, dbVersion):
         # Set up enforcement of unique keys for SDV tables
         #
         dIndex = dict()  # dictionary storing field index for primary key of each SDV table
-        dKeys = dict()  # dictionary containing a list of key values for each SDV table
+        dKeys = dict()  # dictionary containing a set of key values for each SDV table
         dFields = dict() # dictionary containing list of fields for eacha SDV table
 
         keyIndx = dict()  # dictionary containing key field index number for each SDV table
@@ -817,7 +948,7 @@ def ImportTables(outputWS, dbList, dbVersion):
 
             #dFields[sdvTbl] = fldNames                 # store list of fields for this SDV table
             dIndex[sdvTbl] = fldNames.index(keyField)  # store field index for primary key in this SDV table
-            dKeys[sdvTbl] = []                         # initialize key values list for this SDV table
+            dKeys[sdvTbl] = set()                      # initialize key values set for this SDV table
 
         # End of enforce unique keys setup...
 
@@ -898,7 +1029,7 @@ def ImportTables(outputWS, dbList, dbVersion):
                                         keyVal = inRow[dIndex[tblName]]
 
                                         if not keyVal in dKeys[tblName]:
-                                            dKeys[tblName].append(keyVal)
+                                            dKeys[tblName].add(keyVal)
                                             outCursor.insertRow(inRow)
 
                             if inputTbl == "sdvattribute":
@@ -942,13 +1073,227 @@ def ImportTables(outputWS, dbList, dbVersion):
         return False
 
 ## ===================================================================================
-def ImportTabular(newDB, dbList, dbVersion, codePage):
+def SetLoadPragmas(liteCur, bLoad):
+    # Tune the SQLite connection for a bulk load (bLoad = True) or put it back
+    # to the normal, durable settings once the load is finished (bLoad = False).
+    #
+    # journal_mode MEMORY still allows a rollback of the current survey if an insert fails.
+    # A crash during the load will leave a bad database, but it would have to be rebuilt anyway.
+    #
+    try:
+        if bLoad:
+            liteCur.execute("PRAGMA journal_mode = MEMORY")
+            liteCur.execute("PRAGMA synchronous = OFF")
+            liteCur.execute("PRAGMA cache_size = -262144")  # negative value is in KiB (256MB)
+            liteCur.execute("PRAGMA temp_store = MEMORY")
+
+        else:
+            liteCur.execute("PRAGMA journal_mode = DELETE")
+            liteCur.execute("PRAGMA synchronous = FULL")
+            liteCur.execute("PRAGMA cache_size = -2000")    # SQLite default
+            liteCur.execute("PRAGMA temp_store = DEFAULT")
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def DescribeFields(tblPath, dColumnInfo, dDomains):
+    # Return a list of field names and a list of SSURGO_TabularReader column specs
+    # for all fields in the table except OBJECTID (see GetColumnInfo)
+    #
+    fldList = [(fld.name, fld.type) for fld in arcpy.Describe(tblPath).fields if fld.type != "OID"]
+    fldNames = [fldName for fldName, fldType in fldList]
+    colSpecs = SSURGO_TabularReader.GetColumnSpecs(os.path.basename(tblPath), fldList, dColumnInfo, dDomains)
+
+    return fldNames, colSpecs
+
+## ===================================================================================
+def BulkLoadTable(liteCur, tbl, fldNames, rowIter, chunkSize=10000):
+    # Insert all rows from rowIter into an SQLite table using executemany with a chunk
+    # of rows at a time. The caller is responsible for the transaction (commit/rollback).
+    #
+    # Returns the number of rows inserted.
+    #
+    sqlInsert = "INSERT INTO " + tbl + " (" + ", ".join(fldNames) + ") VALUES (" + ", ".join(["?"] * len(fldNames)) + ")"
+    iRows = 0
+
+    while True:
+        rowChunk = list(islice(rowIter, chunkSize))
+
+        if len(rowChunk) == 0:
+            break
+
+        liteCur.executemany(sqlInsert, rowChunk)
+        iRows += len(rowChunk)
+
+    return iRows
+
+## ===================================================================================
+def ReportLoadStats(dLoadStats):
+    # Print the number of records and the load rate for each table, slowest table first.
+    # dLoadStats: key = table name, value = [record count, seconds]
+    #
+    try:
+        PrintMsg(" \nBulk load statistics (records, seconds, records per second):", 0)
+        loadList = sorted(dLoadStats.items(), key=lambda x: x[1][1], reverse=True)
+
+        for tbl, loadStats in loadList:
+            iRows, loadTime = loadStats
+
+            if loadTime > 0:
+                rowRate = iRows / loadTime
+
+            else:
+                rowRate = 0
+
+            PrintMsg("\t" + tbl + ": " + Number_Format(iRows, 0, True) + ", " + Number_Format(loadTime, 1, True) + ", " + Number_Format(rowRate, 0, True), 0)
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def DropTableIndexes(liteCur, tblList):
+    # Drop any attribute indexes that the template database has on the tabular tables, so
+    # that the bulk load does not have to maintain them for every insert.
+    #
+    # Returns a list of (index name, table name, CREATE INDEX statement) used by BuildTableIndexes
+    #
+    try:
+        lowerTbls = [tblName.lower() for tblName in tblList]
+
+        # automatic indexes for PRIMARY KEY and UNIQUE constraints have no sql and cannot be dropped
+        liteCur.execute("SELECT name, tbl_name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")
+        indexList = [rec for rec in liteCur.fetchall() if rec[1].lower() in lowerTbls]
+
+        for indexName, tblName, sqlIndex in indexList:
+            liteCur.execute('DROP INDEX "' + indexName + '"')
+
+        if len(indexList) > 0:
+            PrintMsg(" \nDropped " + str(len(indexList)) + " table indexes, these will be rebuilt after the tabular import", 0)
+
+        return indexList
+
+    except:
+        errorMsg()
+        return []
+
+## ===================================================================================
+def BuildTableIndexes(conn, liteCur, tblList, tblIndexes, indexList):
+    # Build the table indexes after all of the tabular data has been loaded. Each index is
+    # created with a single sorted pass over its table. SQLite can use worker threads for
+    # the sort (PRAGMA threads) but only one index can be written at a time.
+    #
+    # tblIndexes: key = table name, value = [primaryKey, foreignKey] from GetTableIndexes
+    # indexList:  list of (index name, table name, CREATE INDEX statement) from DropTableIndexes
+    #
+    try:
+        buildList = list(indexList)
+        indexNames = [rec[0].lower() for rec in buildList]
+
+        # single column template indexes, so that the same column is not indexed twice
+        indexCols = list()
+
+        for indexName, tblName, sqlIndex in indexList:
+            indexCols.append((tblName.lower(), sqlIndex.lower().replace(" ", "").split("(")[-1]))
+
+        for tblName in tblList:
+            if tblName in tblIndexes:
+                primaryKey, foreignKey = tblIndexes[tblName]
+
+                if not primaryKey is None:
+                    indexName = "Indx_" + tblName + "_" + primaryKey
+
+                    if not indexName.lower() in indexNames and not (tblName.lower(), primaryKey.lower() + ")") in indexCols:
+                        buildList.append((indexName, tblName, "CREATE UNIQUE INDEX " + indexName + " ON " + tblName + "(" + primaryKey + ")"))
+
+                if not foreignKey is None:
+                    indexName = "Indx_" + tblName + "_" + foreignKey
+
+                    if not indexName.lower() in indexNames and not (tblName.lower(), foreignKey.lower() + ")") in indexCols:
+                        buildList.append((indexName, tblName, "CREATE INDEX " + indexName + " ON " + tblName + "(" + foreignKey + ")"))
+
+        # Add additional attribute index for cointerp table.
+        # Tried to add this Cointerp index to the XML workspace document, but slowed down data import.
+        if not "indx_cointerprulekey" in indexNames:
+            buildList.append(("Indx_CointerpRulekey", "cointerp", "CREATE INDEX Indx_CointerpRulekey ON cointerp(rulekey) WHERE ruledepth = 0"))
+
+        iThreads = max(1, multiprocessing.cpu_count() - 1)
+        liteCur.execute("PRAGMA threads = " + str(iThreads))
+
+        PrintMsg(" \nBuilding " + str(len(buildList)) + " table indexes (seconds):", 0)
+        arcpy.SetProgressor("step", "Building table indexes...", 0, len(buildList), 1)
+        totalTime = time.time()
+
+        for indexName, tblName, sqlIndex in buildList:
+            arcpy.SetProgressorLabel("Building index " + indexName + " on " + tblName + " table")
+            startTime = time.time()
+
+            try:
+                liteCur.execute(sqlIndex)
+                conn.commit()
+                PrintMsg("\t" + indexName + ": " + Number_Format((time.time() - startTime), 1, True), 0)
+
+            except sqlite3.Error, e:
+                PrintMsg("\tUnable to create index " + indexName + " on " + tblName + " table (" + str(e) + ")", 1)
+
+            arcpy.SetProgressorPosition()
+
+        PrintMsg("\tTotal: " + Number_Format((time.time() - totalTime), 1, True), 0)
+        arcpy.ResetProgressor()
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def ParseSurveyAreas(jobList, iProcesses):
+    # Generator wrapping SSURGO_TabularReader.ParseSurveys so that text file parsing
+    # errors from the worker processes are raised here as MyError
+    #
+    parsedSurveys = SSURGO_TabularReader.ParseSurveys(jobList, iProcesses)
+
+    while True:
+        try:
+            parsedSurvey = parsedSurveys.next()
+
+        except StopIteration:
+            return
+
+        except SSURGO_TabularReader.MyError, e:
+            raise MyError, str(e)
+
+        yield parsedSurvey
+
+## ===================================================================================
+def ImportTabular(newDB, dbList, dbVersion, codePage, bBulkLoad=True, iProcesses=None, bUniqueKeys=False, manifestPath=None):
     # Use csv reader method of importing text files into geodatabase for those
     # that do not have a populated SSURGO database
     #
     # 2015-12-16 Need to eliminate duplicate records in sdv* tables. Also need to index primary keys
     # for each of these tables.
     #
+    # bBulkLoad: write the text files directly to SQLite using executemany, with one transaction
+    # per survey area, instead of using an arcpy InsertCursor for each record.
+    #
+    # iProcesses: number of processes used to parse the text files in bulk load mode. The surveys
+    # are parsed in parallel, but written by this process in dbList and txtFiles order.
+    # The default is one less than the number of cores.
+    #
+    # bUniqueKeys: in bulk load mode, skip any record whose primary key (mdstatidxdet) has already
+    # been imported, for every table. The SDV tables always have their unique keys enforced.
+    #
+    # manifestPath: in bulk load mode, import manifest (see SSURGO_TabularReader.ReadManifest).
+    # Survey areas recorded as complete by a previous run are skipped. Each survey area is a
+    # single transaction, so an interrupted survey area has nothing to clean up.
+    #
     try:
         # new code from ImportTables
         #codePage = 'cp1252'
@@ -956,11 +1301,44 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
         conn = sqlite3.connect(newDB)
         liteCur = conn.cursor()
 
+        if bBulkLoad:
+            # Relax durability settings for the length of the tabular import
+            SetLoadPragmas(liteCur, True)
+
+        dLoadStats = dict()  # bulk load statistics. key = table name, value = [record count, seconds]
+        dFldNames = dict()   # list of field names for each table, so that Describe only runs once per table
+
         tblList = GetTableList(newDB)
 
         if len(tblList) == 0:
             raise MyError, "No tables found in " +  newDB
 
+        if not bBulkLoad:
+            manifestPath = None
+
+        if manifestPath is None:
+            dSteps, dSurveys = dict(), dict()
+
+        else:
+            dSteps, dSurveys = SSURGO_TabularReader.ReadManifest(manifestPath)
+
+        doneSurveys = [areaSym for areaSym in dSurveys if dSurveys[areaSym]["status"] == "complete"]
+
+        if "dropindexes" in dSteps:
+            # Indexes were dropped by the previous run
+            droppedIndexes = [tuple(indexInfo) for indexInfo in dSteps["dropindexes"]["indexes"]]
+
+        elif bBulkLoad:
+            # Indexes are rebuilt after all of the surveys have been loaded
+            droppedIndexes = DropTableIndexes(liteCur, tblList)
+            conn.commit()
+
+            if not manifestPath is None:
+                SSURGO_TabularReader.WriteManifest(manifestPath, [{"step":"dropindexes", "indexes":droppedIndexes}])
+
+        else:
+            droppedIndexes = list()
+
         #arcpy.SetProgressor("step", "Importing tabular data...",  0, len(dbList), 1)
         PrintMsg(" \nImporting tabular data...", 0)
         
@@ -970,7 +1348,7 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
         #
         sdvTables = ['sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm']
         dIndex = dict()  # dictionary storing field index for primary key of each SDV table
-        dKeys = dict()  # dictionary containing a list of key values for each SDV table
+        dKeys = dict()  # dictionary containing a set of key values for each SDV table
         dFields = dict() # dictionary containing list of fields for eacha SDV table
 
         keyIndx = dict()  # dictionary containing key field index number for each SDV table
@@ -994,7 +1372,7 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
 
             dFields[sdvTbl] = fldNames                 # store list of fields for this SDV table
             dIndex[sdvTbl] = fldNames.index(keyField)  # store field index for primary key in this SDV table
-            dKeys[sdvTbl] = []                         # initialize key values list for this SDV table
+            dKeys[sdvTbl] = set()                      # initialize key values set for this SDV table
 
         
         # Add SDV* table relationships. These aren't part of the XML workspace doc as of FY2018 gSSURGO
@@ -1017,7 +1395,75 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
         "chfrags","chpores","chstrgrp","chtext","chtexgrp","chunifie","cfprodo","cpmat","csmoist", \
         "cstemp","csmorgc","csmorhpp","csmormr","csmorss","chstr","chtextur", \
         "chtexmod","sacatlog","sainterp","sdvalgorithm","sdvattribute","sdvfolder","sdvfolderattribute"]
-            
+
+        if bBulkLoad:
+            # Start parsing the text files for all survey areas in a pool of worker processes.
+            # Results are returned in dbList order and only this process writes to the database.
+            #
+            # Each text file is converted using column specs from mdstattabcols and mdstatdomdet
+            #
+            tblInfo = GetTableInfo(newDB)
+            dColumnInfo, dDomains = GetColumnInfo(newDB)
+            dSpecs = dict()  # column specs for each text file
+
+            for txtFile in txtFiles:
+                if not txtFile in tblInfo:
+                    raise MyError, "Textfile reference '" + txtFile + "' not found in 'mdstattabs table'"
+
+                tbl = tblInfo[txtFile][0]
+                dFldNames[tbl], dSpecs[txtFile] = DescribeFields(os.path.join(newDB, tbl), dColumnInfo, dDomains)
+
+            dFldNames["featdesc"], dSpecs["featdesc"] = DescribeFields(os.path.join(newDB, "featdesc"), dColumnInfo, dDomains)
+
+            # Get primary key positions for the tables that need unique key enforcement
+            if bUniqueKeys:
+                dUniqueKeys = GetUniqueKeys(newDB, dFldNames, dFldNames.keys())
+
+            else:
+                dUniqueKeys = GetUniqueKeys(newDB, dFldNames, sdvTables)
+
+            for tbl in dUniqueKeys:
+                if not tbl in dKeys:
+                    dKeys[tbl] = set()
+
+                if len(doneSurveys) > 0:
+                    # Load the keys imported by the previous run
+                    liteCur.execute("SELECT " + ", ".join(dFldNames[tbl]) + " FROM " + tbl)
+
+                    for rec in liteCur:
+                        dKeys[tbl].add(SSURGO_TabularReader.KeyValue(rec, dUniqueKeys[tbl]))
+
+            jobList = list()
+
+            for inputDB in dbList:
+                soilsFolder = os.path.dirname(os.path.dirname(inputDB))
+                areaSym = soilsFolder[(soilsFolder.rfind("_") + 1):].upper()
+
+                featPath = os.path.join(soilsFolder, "spatial", "soilsf_t_" + areaSym + ".txt")
+
+                if areaSym in doneSurveys:
+                    # Already imported by the previous run. Make sure that the text files are the same size.
+                    tabularFolder = SSURGO_TabularReader.GetTabularFolder(soilsFolder)
+
+                    for txtFile, fileStats in dSurveys[areaSym]["tables"].items():
+                        if txtFile == "featdesc":
+                            txtPath = featPath
+
+                        else:
+                            txtPath = os.path.join(tabularFolder, txtFile + ".txt")
+
+                        if "size" in fileStats and SSURGO_TabularReader.TextFileSize(txtPath) != fileStats["size"]:
+                            raise MyError, txtPath + " has changed since it was imported. Unable to resume, start a new import."
+
+                    continue
+
+                jobList.append((areaSym, SSURGO_TabularReader.GetTabularFolder(soilsFolder), txtFiles, dSpecs, dict(), codePage, featPath, dict()))
+
+            parsedSurveys = ParseSurveyAreas(jobList, iProcesses)
+
+            if len(doneSurveys) > 0:
+                PrintMsg("\tSkipping " + Number_Format(len(dbList) - len(jobList), 0, True) + " survey areas imported by the previous run", 0)
+
         for inputDB in dbList:
             iCntr += 1
             newFolder = os.path.dirname(os.path.dirname(inputDB)) # survey dataset folder
@@ -1027,6 +1473,11 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
             soilsFolder = os.path.dirname(os.path.dirname(inputDB))
 
             fnAreasymbol = soilsFolder[(soilsFolder.rfind("_") + 1):].upper()
+
+            if fnAreasymbol in doneSurveys:
+                # committed by the previous run, text file sizes checked above
+                continue
+
             #PrintMsg(" \nParsing areasymbol from: " + inputDB, 1)
             #fnAreasymbol = inputDB[-9:][0:5].upper()  # arg0
             #PrintMsg(" \nParsed value: " + fnAreasymbol, 1)
@@ -1039,10 +1490,10 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
             env.workspace = os.path.join(newFolder, "tabular")
 
             # Using Adolfo's csv reader method to import tabular data from text files...
-            tabularFolder = os.path.join(newFolder, "tabular")
+            tabularFolder = SSURGO_TabularReader.GetTabularFolder(newFolder)
 
             # if the tabular directory is empty return False
-            if len(os.listdir(tabularFolder)) < 1:
+            if len(SSURGO_TabularReader.ListTextFiles(tabularFolder)) < 1:
                 raise MyError, "No text files found in the tabular folder"
 
             # Make sure that input tabular data has the correct SSURGO version for this script
@@ -1052,9 +1503,13 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
                 raise MyError, "Tabular data in " + tabularFolder + " (SSURGO Version " + str(ssurgoVersion) + ") is not supported"
 
             # Create a dictionary with table information
-            if iCntr == 1:
+            if iCntr == 1 and not bBulkLoad:
                 tblInfo = GetTableInfo(newDB)
 
+            if bBulkLoad:
+                # Get the parsed text files for this survey area from the worker processes
+                parsedArea, dRows, dStats = parsedSurveys.next()
+
             #tblOrder = list()
             
             # Need to add featdesc import as a separate item (ie. spatial\soilsf_t_al001.txt: featdesc)
@@ -1087,39 +1542,68 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
                 txtPath = os.path.join(tabularFolder, txtFile + ".txt")
 
                 # continue if the target table exists
-                if arcpy.Exists(os.path.join(newDB, tbl)):
+                if tbl in dFldNames or arcpy.Exists(os.path.join(newDB, tbl)):
                     # Create cursor for all fields to populate the current table
                     #
                     # For a geodatabase, I need to remove OBJECTID from the fields list
-                    fldList = arcpy.Describe(os.path.join(newDB, tbl)).fields
-                    fldNames = list()
-                    #fldLengths = list()
+                    if tbl in dFldNames:
+                        fldNames = dFldNames[tbl]
+
+                    else:
+                        fldList = arcpy.Describe(os.path.join(newDB, tbl)).fields
+                        fldNames = list()
+                        #fldLengths = list()
 
-                    for fld in fldList:
-                        if fld.type != "OID":
-                            fldNames.append(fld.name)
+                        for fld in fldList:
+                            if fld.type != "OID":
+                                fldNames.append(fld.name)
+
+                        dFldNames[tbl] = fldNames
 
                     if len(fldNames) == 0:
                         raise MyError, "Failed to get field names for " + tbl
 
-                    if not tbl in ['sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm']:
+                    if bBulkLoad:
+                        # Write the parsed text file directly to the SQLite table using executemany.
+                        # Nothing is committed until the whole survey area has been loaded.
+                        #
+                        startTime = time.time()
+                        rowIter = iter(dRows[txtFile])
+
+                        if tbl in dUniqueKeys:
+                            # Skip any record whose primary key has already been imported
+                            rowIter = SSURGO_TabularReader.UniqueKeyRows(rowIter, dUniqueKeys[tbl], dKeys[tbl])
+
+                        try:
+                            iRows = BulkLoadTable(liteCur, tbl, fldNames, rowIter)
+
+                        except:
+                            errorMsg()
+                            conn.rollback()
+                            raise MyError, "Error loading " + tbl + " table from " + txtPath
+
+                        if tbl in dLoadStats:
+                            dLoadStats[tbl][0] += iRows
+                            dLoadStats[tbl][1] += (time.time() - startTime)
+
+                        else:
+                            dLoadStats[tbl] = [iRows, (time.time() - startTime)]
+
+                    elif not tbl in ['sdvfolderattribute', 'sdvattribute', 'sdvfolder', 'sdvalgorithm']:
                         # Import all tables except SDV
                         #
-                        time.sleep(0.05)  # Occasional write errors
-                        
                         if tbl.endswith("text"):
                             with arcpy.da.InsertCursor(os.path.join(newDB, tbl), fldNames) as cursor:
                                 # counter for current record number
                                 iRows = 1  # input textfile line number
 
                                 #if os.path.isfile(txtPath):
-                                if arcpy.Exists(txtPath):
+                                if SSURGO_TabularReader.TextFileExists(txtPath):
 
                                     try:
-                                        # Use csv reader to read each line in the text file
-                                        time.sleep(0.5)  # trying to prevent error reading text file
-
-                                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                                        # Read each line in the text file. Opening the file is retried
+                                        # after an I/O error (see SSURGO_TabularReader.RetryFileAccess).
+                                        for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                                             # replace all blank values with 'None' so that the values are properly inserted
                                             # into integer values otherwise insertRow fails
                                             fixedRow = [x.decode(codePage) if x else None for x in rowInFile]  # handle non-utf8 characters
@@ -1141,13 +1625,12 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
                                 iRows = 1  # input textfile line number
 
                                 #if os.path.isfile(txtPath):
-                                if arcpy.Exists(txtPath):
+                                if SSURGO_TabularReader.TextFileExists(txtPath):
 
                                     try:
-                                        # Use csv reader to read each line in the text file
-                                        time.sleep(0.5)  # trying to prevent error reading text file
-
-                                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                                        # Read each line in the text file. Opening the file is retried
+                                        # after an I/O error (see SSURGO_TabularReader.RetryFileAccess).
+                                        for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                                             # replace all blank values with 'None' so that the values are properly inserted
                                             # into integer values otherwise insertRow fails
                                             #fixedRow = [x.decode(codePage) if x else None for x in rowInFile]  # handle non-utf8 characters
@@ -1171,20 +1654,19 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
                             # counter for current record number
                             iRows = 1
 
-                            if os.path.isfile(txtPath):
+                            if SSURGO_TabularReader.TextFileExists(txtPath):
 
                                 try:
-                                    # Use csv reader to read each line in the text file
-                                    time.sleep(0.5)  # trying to prevent error reading text file
-                                    
-                                    for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                                    # Read each line in the text file. Opening the file is retried
+                                    # after an I/O error (see SSURGO_TabularReader.RetryFileAccess).
+                                    for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                                         newRow = list()
                                         fldNo = 0
                                         keyVal = int(rowInFile[dIndex[tbl]])
 
                                         if not keyVal in dKeys[tbl]:
                                             # write new record to SDV table
-                                            dKeys[tbl].append(keyVal)
+                                            dKeys[tbl].add(keyVal)
                                             newRow = [x if x else None for x in rowInFile]
                                             cursor.insertRow(newRow)  # was newRow
                                         iRows += 1
@@ -1214,8 +1696,14 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
             #
             monthList = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
             monthTbl = os.path.join(newDB, "month")
-            
-            if int(arcpy.GetCount_management(monthTbl).getOutput(0)) < 12:
+
+            if bBulkLoad:
+                liteCur.execute("SELECT COUNT(*) FROM month")
+
+                if liteCur.fetchone()[0] < 12:
+                    liteCur.executemany("INSERT INTO month (monthseq, monthname) VALUES (?, ?)", [((seq + 1), month) for seq, month in enumerate(monthList)])
+
+            elif int(arcpy.GetCount_management(monthTbl).getOutput(0)) < 12:
                 arcpy.SetProgressorLabel("Importing " +  fnAreasymbol + " tabular  (" + Number_Format(iCntr, 0, True) + " of " + Number_Format(len(dbList), 0, True) + ") :   " + monthTbl)
                 
                 with arcpy.da.InsertCursor(monthTbl, ["monthseq", "monthname"]) as cur:
@@ -1231,7 +1719,35 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
             #tbl = os.path.join(newDB, "featdesc")
             tbl = "featdesc"
 
-            if arcpy.Exists(txtPath):
+            if bBulkLoad:
+                if tbl in dRows:
+                    arcpy.SetProgressorLabel("Importing " +  fnAreasymbol + "  (" + Number_Format(iCntr, 0, True) + " of " + Number_Format(len(dbList), 0, True) + "):   " + tbl)
+                    startTime = time.time()
+
+                    try:
+                        rowIter = iter(dRows[tbl])
+
+                        if tbl in dUniqueKeys:
+                            rowIter = SSURGO_TabularReader.UniqueKeyRows(rowIter, dUniqueKeys[tbl], dKeys[tbl])
+
+                        iRows = BulkLoadTable(liteCur, tbl, dFldNames[tbl], rowIter)
+
+                    except:
+                        errorMsg()
+                        conn.rollback()
+                        raise MyError, "Error loading " + tbl + " table from " + txtFile + ".txt"
+
+                    if tbl in dLoadStats:
+                        dLoadStats[tbl][0] += iRows
+                        dLoadStats[tbl][1] += (time.time() - startTime)
+
+                    else:
+                        dLoadStats[tbl] = [iRows, (time.time() - startTime)]
+
+                # Commit this survey area as a single transaction
+                conn.commit()
+
+            elif SSURGO_TabularReader.TextFileExists(txtPath):
                 # For a geodatabase, I need to remove OBJECTID from the fields list
                 fldList = arcpy.Describe(os.path.join(newDB, tbl)).fields
                 fldNames = list()
@@ -1250,7 +1766,7 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
 
                     try:
                         # Use csv reader to read each line in the text file
-                        for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                        for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                             # replace all blank values with 'None' so that the values are properly inserted
                             # into integer values otherwise insertRow fails
                             newRow = [None if value == '' else value for value in rowInFile]
@@ -1262,7 +1778,6 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
                         raise MyError, "Error loading line no. " + Number_Format(iRows, 0, True) + " of " + txtFile + ".txt"
 
                 arcpy.SetProgressorPosition()  # for featdesc table
-                time.sleep(1.0)
 
             #else:
                 # featdesc.txt file does not exist. NASIS-SSURGO download:
@@ -1277,9 +1792,26 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
                 # With this error, it would be best to bailout and fix the problem before proceeding
                 raise MyError, "Failed to get Template Date for " + fnAreasymbol
 
+            if not manifestPath is None:
+                # This survey area has been committed
+                recordList = list()
+
+                for txtFile in sorted(dStats):
+                    record = {"survey":fnAreasymbol, "table":txtFile}
+                    record.update(dStats[txtFile])
+                    recordList.append(record)
+
+                recordList.append({"survey":fnAreasymbol, "status":"complete"})
+                SSURGO_TabularReader.WriteManifest(manifestPath, [{"survey":fnAreasymbol, "status":"started"}] + recordList)
+
             # Set the Progressor to show completed status
             arcpy.ResetProgressor()
 
+        if bBulkLoad:
+            ReportLoadStats(dLoadStats)
+
+        PrintMsg(" \n" + SSURGO_TabularReader.RetryReport(), 0)
+
         # Check mapunit and sdvattribute tables. Get rid of certain records if there is no data available.
         # iacornsr IS NOT NULL OR nhiforsoigrp IS NOT NULL OR vtsepticsyscl IS NOT NULL
 
@@ -1346,51 +1878,13 @@ def ImportTabular(newDB, dbList, dbVersion, codePage):
         tblIndexes = GetTableIndexes(outputWS)
         PrintMsg(" \nNear the end of ImportTabular function...", 1)
 
-        PrintMsg(" \nAdding ArcGIS-type table indexes for " + str(len(tblList)) + " tables...", 1)
+        # Add ArcGIS-type table indexes (mdstatidxdet) plus any template indexes that were
+        # dropped for the bulk load. All are built now that the tables are fully loaded.
+        BuildTableIndexes(conn, liteCur, tblList, tblIndexes, droppedIndexes)
 
-        for tblName in tblList:
-            
-            arcpy.SetProgressorLabel("\tAdding attribute index for " + tblName)
-            #PrintMsg(" \nAdding attribute indexes for " + tblName + " table...", 1)
-            
-            tbl = os.path.join(newDB, tblName)
-            
-            if tblName in tblIndexes:
-                # found indexes for this table, go ahead and add them
-                primaryKey, foreignKey = tblIndexes[tblName]
-                
-            if not primaryKey is None:
-                indexName = "Indx_" + tblName + "_" + primaryKey
-                #arcpy.AddIndex_management(tbl, primaryKey, indexName, "UNIQUE")
-                queryIndx = "CREATE UNIQUE INDEX " + indexName + " ON " + tblName + "(" + primaryKey + ")"
-                liteCur.execute(queryIndx)
-                conn.commit
-
-            if not foreignKey is None:
-                indexName = "Indx_" + tblName + "_" + foreignKey
-                #arcpy.AddIndex_management(tbl, foreignKey, indexName, "NON_UNIQUE")
-                queryIndx = "CREATE INDEX " + indexName + " ON " + tblName + "(" + foreignKey + ")"
-                liteCur.execute(queryIndx)
-                conn.commit
- 
-        # Add additional attribute indexes for cointerp table.
-        # According to documentation, a file geodatabase does not use multi-column indexes
-        arcpy.SetProgressorLabel("Adding attribute index on rulekey for cointerp table")
-
-        try:
-            tblName = "cointerp"
-            indexName = "Indx_CointerpRulekey"
-            arcpy.SetProgressorLabel("\tAdding attribute index on rulekey for cointerp table")
-            # Tried to add this Cointerp index to the XML workspace document, but slowed down data import.
-            #arcpy.AddIndex_management(os.path.join(newDB, "cointerp"), "rulekey", indexName)
-            queryIndx = "CREATE INDEX " + indexName + " ON " + tblName + "(rulekey) WHERE ruledepth = 0"
-            liteCur.execute(queryIndx)
-            conn.commit
-            arcpy.SetProgressorPosition()
-
-        except:
-            errorMsg()
-            PrintMsg(" \nUnable to create new rulekey index on the cointerp table", 1)
+        if bBulkLoad:
+            # Tabular import and indexing are finished, go back to normal database settings
+            SetLoadPragmas(liteCur, False)
 
 
         PrintMsg(" \nCreating ArcGIS-type indexes in AppendFeatures function...", 1)
@@ -1848,8 +2342,12 @@ def GetXML(AOI):
         return ""
 
 ## ===================================================================================
-def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, bClipped, databaseType, areasymbolList):
+def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, bClipped, databaseType, areasymbolList, bResume=False):
     # main function
+    #
+    # bResume: continue an import that failed or was stopped, using the import manifest
+    # (gSSURGO_xx_manifest.json) next to the output database. Steps and survey areas that
+    # were committed by the previous run are skipped.
 
     try:
         # Creating the file geodatabase uses the ImportXMLWorkspaceDocument command which requires
@@ -2156,14 +2654,39 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, bClipped, database
             outputWS = os.path.join(outFolder, gdbName)
             featCnt = (mupolyCnt, mulineCnt, mupointCnt, sflineCnt, sfpointCnt, sapolyCnt)  # 0 mupoly, 1 muline, 2 mupoint, 3 sfline, 4 sfpoint, 5 sapoly
 
-            #PrintMsg(" \nHardcoding inputXML to: " + inputXML, 1)
-            bGeodatabase = CreateSSURGO_DB(outputWS,  areasymbolList, aliasName, databaseType)
+            # Import manifest used to resume the import
+            manifestPath = SSURGO_TabularReader.ManifestPath(outputWS)
+            dSteps = dict()
+
+            if bResume and arcpy.Exists(outputWS) and os.path.isfile(manifestPath):
+                dSteps, dSurveys = SSURGO_TabularReader.ReadManifest(manifestPath)
+
+            elif bResume:
+                PrintMsg(" \nNo previous import found for " + outputWS + ", starting a new import", 1)
+
+            if "spatial" in dSteps:
+                PrintMsg(" \nResuming import into " + outputWS + " (" + Number_Format(len(dSurveys), 0, True) + " survey areas committed by the previous run)", 0)
+                bGeodatabase = True
+
+            else:
+                #PrintMsg(" \nHardcoding inputXML to: " + inputXML, 1)
+                bGeodatabase = CreateSSURGO_DB(outputWS,  areasymbolList, aliasName, databaseType)
+
+                if bGeodatabase:
+                    SSURGO_TabularReader.NewManifest(manifestPath)
 
             if bGeodatabase:
                 # Successfully created a new geodatabase
                 # Merge all existing shapefiles to file geodatabase featureclasses
                 #
-                bSpatial = AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineList, sfpointList, sapolyList, featCnt)
+                if "spatial" in dSteps:
+                    bSpatial = True
+
+                else:
+                    bSpatial = AppendFeatures(outputWS, AOI, mupolyList, mulineList, mupointList, sflineList, sfpointList, sapolyList, featCnt)
+
+                    if bSpatial == True:
+                        SSURGO_TabularReader.WriteManifest(manifestPath, [{"step":"spatial"}])
 
                 # Append tabular data to the file geodatabase
                 #
@@ -2171,13 +2694,23 @@ def gSSURGO(inputFolder, surveyList, outputWS, AOI, tileInfo, bClipped, database
                     if not arcpy.Exists(outputWS):
                         raise MyError, "Could not find " + outputWS + " to append tables to"
 
-                    bMD = ImportMDTabular(outputWS, dbPath, codePage)  # new, import md tables from text files of last survey area
+                    if not "metadata" in dSteps:
+                        bMD = ImportMDTabular(outputWS, SSURGO_TabularReader.GetTabularFolder(os.path.dirname(dbPath)), codePage)  # new, import md tables from text files of last survey area
+
+                        if bMD == False:
+                            raise MyError, ""
 
-                    if bMD == False:
-                        raise MyError, ""
+                        SSURGO_TabularReader.WriteManifest(manifestPath, [{"step":"metadata"}])
 
                     # import attribute data from text files in tabular folder
-                    bTabular = ImportTabular(outputWS, dbList, dbVersion, codePage)
+                    if "tabular" in dSteps:
+                        bTabular = True
+
+                    else:
+                        bTabular = ImportTabular(outputWS, dbList, dbVersion, codePage, manifestPath=manifestPath)
+
+                        if bTabular == True:
+                            SSURGO_TabularReader.WriteManifest(manifestPath, [{"step":"tabular"}])
 
                     if bTabular == True:
                         # Successfully imported all tabular data (textfiles or Access database tables)
@@ -2418,8 +2951,10 @@ def GetFCType(fc):
 ## ===================================================================================
 
 # Import system modules
-import arcpy, sys, string, os, traceback, locale, time, datetime, csv, shutil, sqlite3
+import arcpy, sys, string, os, traceback, locale, time, datetime, csv, shutil, sqlite3, multiprocessing
 from operator import itemgetter, attrgetter
+from itertools import islice
+import SSURGO_TabularReader
 # import xml.etree.cElementTree as ET
 #from xml.dom import minidom
 from arcpy import env
@@ -2436,6 +2971,12 @@ try:
         aliasName = arcpy.GetParameterAsText(5)       # String to be appended to featureclass aliases
         databaseType = arcpy.GetParameterAsText(6)    # 
 
+        if arcpy.GetArgumentCount() > 7:
+            bResume = arcpy.GetParameter(7)           # resume a failed import using the import manifest
+
+        else:
+            bResume = False
+
         #dbVersion = 2  # This is the SSURGO version supported by this script and the gSSURGO schema (XML Workspace document)
 
         # Check to see if we got an ssaLayer
@@ -2448,7 +2989,7 @@ try:
         else:
             areasymbolList = list()
                                          
-        bGood = gSSURGO(inputFolder, surveyList, outputWS, AOI, aliasName, False, databaseType, areasymbolList)
+        bGood = gSSURGO(inputFolder, surveyList, outputWS, AOI, aliasName, False, databaseType, areasymbolList, bResume)
 
 except MyError, e:
     PrintMsg(str(e), 2)
@@ -91,18 +91,8 @@ def QuerySDA(sQuery):
         dHeaders["Content-Length"] = len(sXML)
         sURL = "SDMDataAccess.nrcs.usda.gov"
 
-        # Create SDM connection to service using HTTP
-        conn = httplib.HTTPConnection(sURL, 80)
-
-        # Send request in XML-Soap
-        conn.request("POST", "/Tabular/SDMTabularService.asmx", sXML, dHeaders)
-
-        # Get back XML response
-        response = conn.getresponse()
-        xmlString = response.read()
-
-        # Close connection to SDM
-        conn.close()
+        # Send request in XML-Soap on a pooled HTTPS connection and get back XML response
+        xmlString = SSURGO_SDAClient.PostRequest("https://" + sURL + "/Tabular/SDMTabularService.asmx", sXML, dHeaders)
 
         # Convert XML to tree format
         tree = ET.fromstring(xmlString)
@@ -621,6 +611,7 @@ def GetSDMCount(saLayer):
 ## ===================================================================================
 # main
 import string, os, sys, traceback, locale, arcpy
+import SSURGO_SDAClient
 from arcpy import env
 
 try:
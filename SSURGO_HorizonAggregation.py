@@ -0,0 +1,565 @@
+# SSURGO_HorizonAggregation.py
+#
+# NumPy kernels for the horizon-level aggregation methods in gSSURGO_CreateSoilMap.py
+# (AggregateHz_WTA_SUM, AggregateHz_WTA_WTA, AggregateHz_DCP_WTA and AggregateHz_MaxMin_*).
+#
+# The initial query table is read once, in the same sort order used by the original cursor
+# loops, into arrays of mapunit and component codes, comppct_r, horizon depths and rating
+# values (see HorizonArrays). The horizon thickness within the top-bottom depth range,
+# the component weighting and the reduction to the map unit level are then calculated on
+# whole arrays instead of one horizon at a time.
+#
+# Floating point sums are added in the same order as the original loops, so the results are
+# the same to the last bit and round the same way at attributeprecision. Horizons are added
+# in row order (see GroupSum) and components are added to the map unit in the iteration
+# order of the old component dictionary (see DictOrder). Rounding is left to the caller,
+# which uses the standard Python round().
+#
+# Null values are stored as NaN. A component whose rows all fail the depth range test does
+# not appear in the component arrays, just as it never made it into the old dComp dictionary.
+#
+# Horizon overlap with the standard depth intervals (see OverlapMatrix) can be precomputed
+# once for the chorizon table and attached to the arrays with AttachOverlap. The kernels
+# then look up the horizon thickness for a standard interval instead of calculating it.
+#
+# This module does not import arcpy.
+#
+
+# Standard depth intervals (cm) for the overlap matrix. These are the Valu table depth
+# ranges plus the other ranges commonly used for soil maps.
+standardDepths = [(0, 5), (5, 20), (20, 50), (50, 100), (100, 150), (150, 999), (0, 20), (0, 25), (0, 30), (0, 50), (0, 100), (0, 150), (0, 200), (0, 999)]
+
+## ===================================================================================
+def GroupStarts(codes):
+    # Return the index of the first row and the number of rows for each run of
+    # identical values in a sorted array of codes
+    #
+    if len(codes) == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+    bNew = np.ones(len(codes), dtype=bool)
+    bNew[1:] = codes[1:] != codes[:-1]
+    starts = np.flatnonzero(bNew)
+    lengths = np.diff(np.append(starts, len(codes)))
+
+    return starts, lengths
+
+## ===================================================================================
+def GroupSum(values, starts, lengths):
+    # Sum the values in each group, adding them one at a time from the first row to the last.
+    #
+    # np.add.reduceat would be faster, but it does not always add in the same order as the
+    # original Python loops and so the last bit of the sum (and occasionally the rounded
+    # rating) could be different. The groups are short (horizons in a component, components
+    # in a map unit), so this only loops as many times as there are rows in the longest group.
+    #
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    total = values[starts].astype(np.float64)
+
+    for iRow in xrange(1, lengths.max()):
+        bMore = lengths > iRow
+        total[bMore] = total[bMore] + values[starts[bMore] + iRow]
+
+    return total
+
+## ===================================================================================
+def FirstCodes(keys):
+    # Return an integer code for each key, numbered in order of first appearance.
+    # Only the first row of each run of the same key is looked up.
+    #
+    keyArray = np.array(keys, dtype=object)
+
+    if len(keyArray) == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    runStarts, runLengths = GroupStarts(keyArray)
+    dCodes = dict()
+    runCodes = [dCodes.setdefault(key, len(dCodes)) for key in keyArray[runStarts].tolist()]
+
+    return np.repeat(np.array(runCodes, dtype=np.intp), runLengths)
+
+## ===================================================================================
+def FloatArray(values):
+    # Convert a list of numbers to a float array, with None stored as NaN
+    #
+    return np.array(values, dtype=np.float64)
+
+## ===================================================================================
+def HorizonArrays(rows, bZero=False, domainValues=None):
+    # Load the mapunit-component-horizon records from the initial query table into arrays.
+    #
+    # rows:         cursor or list of (mukey, cokey, comppct_r, hzdept_r, hzdepb_r, value, areasymbol)
+    #               in the cursor sort order (ORDER BY MUKEY ASC, COMPPCT_R DESC, ...)
+    # bZero:        replace null rating values with 0
+    # domainValues: optional list of domain values. Each value is replaced by its index in the
+    #               list (eg. K Factor) and null values by -1.
+    #
+    # Returns a dictionary of arrays, one element per row:
+    #   mu:      mapunit code (index into 'mukeys')
+    #   co:      component code, numbered by first appearance
+    #   comppct: component percent
+    #   hzdept, hzdepb: horizon depths (NaN for null)
+    #   value:   rating value (NaN for null) or domain index (-1 for null)
+    # plus 'cokeys' (one per row) and 'mukeys' and 'areasymbols', the key and survey area
+    # for each mapunit code.
+    #
+    # If the rows have an eighth column (chkey), it is kept as 'chkeys' for AttachOverlap.
+    #
+    # The row and column tuples can not form reference cycles. Without this, the garbage
+    # collector repeatedly scans the new tuples while they are created.
+    bGC = gc.isenabled()
+    gc.disable()
+
+    try:
+        cols = zip(*rows)
+
+    finally:
+        if bGC:
+            gc.enable()
+
+    if len(cols) == 0:
+        cols = [[], [], [], [], [], [], []]
+
+    mukeys, cokeys, comppcts, hzdepts, hzdepbs, values, areasyms = cols[0:7]
+
+    mukeyArray = np.array(mukeys, dtype=object)
+    muCodes = np.zeros(len(mukeyArray), dtype=np.intp)
+
+    if len(mukeyArray) > 1:
+        # the rows are sorted by mukey
+        muCodes[1:] = np.cumsum(mukeyArray[1:] != mukeyArray[:-1])
+
+    muStarts, muLengths = GroupStarts(muCodes)
+
+    dHz = dict()
+    dHz["mu"] = muCodes
+    dHz["co"] = FirstCodes(cokeys)
+    dHz["cokeys"] = cokeys
+    dHz["comppct"] = FloatArray(comppcts)
+    dHz["hzdept"] = FloatArray(hzdepts)
+    dHz["hzdepb"] = FloatArray(hzdepbs)
+    dHz["mukeys"] = [mukeys[i] for i in muStarts]
+    dHz["areasymbols"] = [areasyms[i] for i in muStarts]
+
+    if len(cols) > 7:
+        dHz["chkeys"] = cols[7]
+
+    if domainValues is None:
+        dHz["value"] = FloatArray(values)
+
+        if bZero:
+            dHz["value"][np.isnan(dHz["value"])] = 0.0
+
+    else:
+        # -2 marks a value that is not in the domain (see ComponentMaxIndex)
+        dIndex = dict()
+
+        for val in set(values):
+            if val is None:
+                dIndex[val] = -1
+
+            elif val in domainValues:
+                dIndex[val] = domainValues.index(val)
+
+            else:
+                dIndex[val] = -2
+
+        dHz["value"] = np.array([dIndex[val] for val in values], dtype=np.intp)
+
+    return dHz
+
+## ===================================================================================
+def Thickness(dHz, top, bot, bTopNull=False):
+    # Horizon thickness within the top-bottom depth range: min(hzdepb, bot) - max(hzdept, top)
+    # NaN where a depth is null.
+    #
+    # bTopNull: a null hzdept is treated as the top of the range, as max(None, top) does
+    #
+    if bTopNull:
+        return np.minimum(dHz["hzdepb"], bot) - np.fmax(dHz["hzdept"], top)
+
+    return np.minimum(dHz["hzdepb"], bot) - np.maximum(dHz["hzdept"], top)
+
+## ===================================================================================
+def OverlapMatrix(hzdept, hzdepb, depths):
+    # Sparse horizon by depth interval matrix of the horizon thickness within each interval,
+    # min(hzdepb, bot) - max(hzdept, top). The matrix is stored by interval, and only the
+    # horizons with a positive thickness are stored, in row order.
+    #
+    # hzdept, hzdepb: horizon depths, NaN for null
+    # depths:         list of (top, bot) intervals, eg. standardDepths
+    #
+    # Returns a dictionary:
+    #   depths:    list of (top, bot)
+    #   count:     number of horizons (rows)
+    #   indptr:    the entries for interval i are indptr[i]:indptr[i + 1]
+    #   rows:      horizon row for each entry
+    #   thickness: thickness for each entry
+    #
+    # A depth-range sum such as AWS is then sum(thickness * value[rows]) for the interval.
+    #
+    hzdept = np.asarray(hzdept, dtype=np.float64)
+    hzdepb = np.asarray(hzdepb, dtype=np.float64)
+    indptr = [0]
+    rows = list()
+    thickness = list()
+
+    for top, bot in depths:
+        hzT = np.minimum(hzdepb, bot) - np.maximum(hzdept, top)
+        iRows = np.flatnonzero(Positive(hzT))
+        rows.append(iRows.astype(np.int64))
+        thickness.append(hzT[iRows])
+        indptr.append(indptr[-1] + len(iRows))
+
+    overlap = dict()
+    overlap["depths"] = [(top, bot) for top, bot in depths]
+    overlap["count"] = len(hzdept)
+    overlap["indptr"] = np.array(indptr, dtype=np.int64)
+    overlap["rows"] = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+    overlap["thickness"] = np.concatenate(thickness) if thickness else np.zeros(0, dtype=np.float64)
+
+    return overlap
+
+## ===================================================================================
+def OverlapColumn(overlap, top, bot):
+    # Return (rows, thickness) for the horizons that overlap one depth interval of the
+    # matrix, or None if the interval is not in the matrix
+    #
+    depths = [tuple(depth) for depth in overlap["depths"]]
+
+    if not (top, bot) in depths:
+        return None
+
+    iDepth = depths.index((top, bot))
+    first, last = overlap["indptr"][iDepth], overlap["indptr"][iDepth + 1]
+
+    return overlap["rows"][first:last], overlap["thickness"][first:last]
+
+## ===================================================================================
+def AttachOverlap(dHz, overlap, hzRows):
+    # Attach an overlap matrix built for another table (eg. the whole chorizon table) to the
+    # horizon arrays. hzRows is the matrix row for each row in dHz, -1 if there is none.
+    #
+    dHz["overlap"] = overlap
+    dHz["hzrow"] = np.asarray(hzRows, dtype=np.intp)
+
+    return dHz
+
+## ===================================================================================
+def RangeThickness(dHz, top, bot, bTopNull=False):
+    # Horizon thickness within the top-bottom depth range for the kernels that only use
+    # horizons with a positive thickness.
+    #
+    # When an overlap matrix is attached and the range is one of its intervals, the thickness
+    # is looked up in the matrix. Horizons that are not in the matrix for the interval get NaN,
+    # which fails the Positive test the same as a zero or negative thickness. Rows without a
+    # matrix row, and null hzdept when bTopNull is set, are calculated as in Thickness.
+    #
+    column = None
+
+    if "overlap" in dHz:
+        column = OverlapColumn(dHz["overlap"], top, bot)
+
+    if column is None:
+        return Thickness(dHz, top, bot, bTopNull)
+
+    rows, thickness = column
+
+    # the extra last element is NaN for hzrow = -1
+    hzT = np.empty(dHz["overlap"]["count"] + 1, dtype=np.float64)
+    hzT.fill(np.nan)
+    hzT[rows] = thickness
+    hzT = hzT[dHz["hzrow"]]
+
+    bDirect = dHz["hzrow"] < 0
+
+    if bTopNull:
+        bDirect = bDirect | np.isnan(dHz["hzdept"])
+
+    if bDirect.any():
+        hzT[bDirect] = Thickness(dHz, top, bot, bTopNull)[bDirect]
+
+    return hzT
+
+## ===================================================================================
+def Positive(values):
+    # values > 0, False for NaN (without the numpy warning for comparing NaN)
+    #
+    with np.errstate(invalid="ignore"):
+        return values > 0
+
+## ===================================================================================
+def ComponentRows(dHz, bKeep):
+    # Select the rows flagged in bKeep and group them by component. Rows keep their original
+    # order within each component, so horizons are still added from the top down.
+    #
+    # Returns (rows, starts, lengths) where rows indexes the original arrays and
+    # starts, lengths give the position of each component within rows.
+    #
+    keepRows = np.flatnonzero(bKeep)
+    keepRows = keepRows[np.argsort(dHz["co"][keepRows], kind="mergesort")]
+    starts, lengths = GroupStarts(dHz["co"][keepRows])
+
+    return keepRows, starts, lengths
+
+## ===================================================================================
+def DictOrder(dHz, rows, starts):
+    # Return the position of each component in the iteration order of the component
+    # dictionary (dComp) used by the cursor version.
+    #
+    # Components were added to dComp by their first selected row. A dictionary built by
+    # inserting the same keys in the same order iterates in the same order, and that is the
+    # order in which the components were added to their map unit.
+    #
+    firstRows = rows[starts]
+    dOrder = dict()
+
+    for iComp in np.argsort(firstRows, kind="mergesort").tolist():
+        dOrder[dHz["cokeys"][firstRows[iComp]]] = iComp
+
+    compRank = np.empty(len(starts), dtype=np.intp)
+    compRank[np.array(dOrder.values(), dtype=np.intp)] = np.arange(len(dOrder))
+
+    return compRank
+
+## ===================================================================================
+def WeightedSum(dHz, top, bot):
+    # Kernel for AggregateHz_WTA_SUM (eg. available water storage).
+    #
+    # The sum of thickness * value for each component is weighted by comppct_r / sum of
+    # comppct_r and summed to the map unit.
+    #
+    # Returns (muCodes, muPct, muValues), unrounded
+    #
+    hzT = RangeThickness(dHz, top, bot, True)
+    bKeep = ~np.isnan(dHz["value"]) & Positive(hzT)
+    rows, starts, lengths = ComponentRows(dHz, bKeep)
+
+    coSum = GroupSum(hzT[rows] * dHz["value"][rows], starts, lengths)
+
+    # put the components of each map unit in dictionary order
+    order = np.lexsort((DictOrder(dHz, rows, starts), dHz["mu"][rows[starts]]))
+    coSum = coSum[order]
+    coMu = dHz["mu"][rows[starts]][order]
+    coPct = dHz["comppct"][rows[starts]][order]
+
+    muStarts, muLengths = GroupStarts(coMu)
+    muPct = GroupSum(coPct, muStarts, muLengths)
+    bPct = np.repeat(muPct, muLengths) > 0
+
+    coVal = (coPct[bPct] / np.repeat(muPct, muLengths)[bPct]) * coSum[bPct]
+    muStarts, muLengths = GroupStarts(coMu[bPct])
+
+    return coMu[bPct][muStarts], GroupSum(coPct[bPct], muStarts, muLengths), GroupSum(coVal, muStarts, muLengths)
+
+## ===================================================================================
+def WeightedAverage(dHz, top, bot):
+    # Kernel for AggregateHz_WTA_WTA.
+    #
+    # For each component, sum(thickness * value * comppct_r) / (sum of comppct_r for the
+    # map unit * sum of thickness). These are summed to the map unit.
+    #
+    # Returns (muCodes, muPct, muValues), unrounded
+    #
+    hzT = RangeThickness(dHz, top, bot)
+    bKeep = ~np.isnan(dHz["value"]) & Positive(hzT)
+    rows, starts, lengths = ComponentRows(dHz, bKeep)
+
+    coSum = GroupSum((hzT[rows] * dHz["value"][rows]) * dHz["comppct"][rows], starts, lengths)
+    coHzT = GroupSum(hzT[rows], starts, lengths)
+
+    # put the components of each map unit in dictionary order
+    order = np.lexsort((DictOrder(dHz, rows, starts), dHz["mu"][rows[starts]]))
+    coSum = coSum[order]
+    coHzT = coHzT[order]
+    coMu = dHz["mu"][rows[starts]][order]
+    coPct = dHz["comppct"][rows[starts]][order]
+
+    muStarts, muLengths = GroupStarts(coMu)
+    muPct = GroupSum(coPct, muStarts, muLengths)
+    divisor = np.repeat(muPct, muLengths) * coHzT
+    coVal = np.zeros(len(coSum), dtype=np.float64)
+    coVal[divisor > 0] = coSum[divisor > 0] / divisor[divisor > 0]
+
+    return coMu[muStarts], muPct, GroupSum(coVal, muStarts, muLengths)
+
+## ===================================================================================
+def ComponentAverages(dHz, top, bot):
+    # Thickness-weighted average value for each component, used by the MaxMin kernel
+    #
+    # Returns (coMu, coPct, coVal)
+    #
+    hzT = RangeThickness(dHz, top, bot)
+    bKeep = ~np.isnan(dHz["value"]) & Positive(hzT)
+    rows, starts, lengths = ComponentRows(dHz, bKeep)
+
+    coSum = GroupSum(hzT[rows] * dHz["value"][rows], starts, lengths)
+    coHzT = GroupSum(hzT[rows], starts, lengths)
+
+    return dHz["mu"][rows[starts]], dHz["comppct"][rows[starts]], coSum / coHzT
+
+## ===================================================================================
+def PickComponents(coMu, coSortKeys):
+    # Return the index of the first component for each map unit after sorting the
+    # components within each map unit by coSortKeys (least significant key first, as
+    # in np.lexsort). The sort is stable, so remaining ties go to the first of the components.
+    #
+    order = np.lexsort(tuple(coSortKeys) + (coMu,))
+    muStarts, muLengths = GroupStarts(coMu[order])
+
+    return order[muStarts]
+
+## ===================================================================================
+def MaxMinAverage(dHz, top, bot, bHigh):
+    # Kernel for AggregateHz_MaxMin_WTA.
+    #
+    # The highest (bHigh) or lowest component average is assigned to the map unit. Ties go
+    # to the component with the higher comppct_r.
+    #
+    # Returns (muCodes, muPct, muValues), unrounded
+    #
+    coMu, coPct, coVal = ComponentAverages(dHz, top, bot)
+
+    if bHigh:
+        iComps = PickComponents(coMu, (-coPct, -coVal))
+
+    else:
+        iComps = PickComponents(coMu, (-coPct, coVal))
+
+    return coMu[iComps], coPct[iComps], coVal[iComps]
+
+## ===================================================================================
+def ComponentMaxIndex(dHz, top, bot):
+    # Highest domain index from the horizons within the depth range for each component
+    #
+    # Returns (coMu, coPct, coIndex, coFirstRow, coRank) where coRank is the dictionary order
+    #
+    hzT = RangeThickness(dHz, top, bot)
+    bKeep = (dHz["value"] != -1) & Positive(hzT)
+
+    if np.any(dHz["value"][bKeep] == -2):
+        # same error as domainValues.index in the cursor version
+        raise ValueError, "rating value is not in the domain list"
+
+    rows, starts, lengths = ComponentRows(dHz, bKeep)
+
+    if len(rows) == 0:
+        coIndex = np.zeros(0, dtype=np.intp)
+
+    else:
+        coIndex = np.maximum.reduceat(dHz["value"][rows], starts)
+
+    return dHz["mu"][rows[starts]], dHz["comppct"][rows[starts]], coIndex, rows[starts], DictOrder(dHz, rows, starts)
+
+## ===================================================================================
+def MaxIndexDCD(dHz, top, bot):
+    # Kernel for AggregateHz_MaxMin_DCD (eg. K Factor, dominant condition).
+    #
+    # The highest domain index of the component with the highest comppct_r. Ties go to the
+    # first component in dictionary order, as in SortData.
+    #
+    # Returns (muCodes, muPct, muIndexes)
+    #
+    coMu, coPct, coIndex, coFirstRow, coRank = ComponentMaxIndex(dHz, top, bot)
+    iComps = PickComponents(coMu, (coRank, -coPct))
+
+    return coMu[iComps], coPct[iComps], coIndex[iComps]
+
+## ===================================================================================
+def MaxIndexDCP(dHz, top, bot):
+    # Kernel for AggregateHz_MaxMin_DCP (eg. K Factor, dominant component).
+    #
+    # The highest domain index of the dominant component. The dominant component is the
+    # first component in the sort order with a horizon in the depth range.
+    #
+    # Returns (muCodes, muPct, muIndexes)
+    #
+    coMu, coPct, coIndex, coFirstRow, coRank = ComponentMaxIndex(dHz, top, bot)
+    iComps = PickComponents(coMu, (coFirstRow,))
+
+    return coMu[iComps], coPct[iComps], coIndex[iComps]
+
+## ===================================================================================
+def DominantAverage(dHz, top, bot, bHigh):
+    # Kernel for AggregateHz_DCP_WTA.
+    #
+    # Every component with the same comppct_r as the first component of the map unit is a
+    # dominant component. The thickness-weighted average is calculated for each one and the
+    # highest (bHigh) or lowest is assigned to the map unit.
+    #
+    # This reproduces the accumulation in the cursor version:
+    #  - the horizon thickness is not limited to positive values
+    #  - each horizon adds to max(0, running sum), and a null rating adds 0 except when it
+    #    is on the first horizon, which leaves the component rating null until the next horizon
+    #  - for the first component of the map unit, a first horizon with null depths is skipped
+    #
+    # Returns (muCodes, muPct, muValues). Map units without a rating have NaN. muPct is always the
+    # dominant comppct_r. For a map unit where no dominant component has a rating, the cursor
+    # version wrote the comppct_r left over from the previous map unit instead.
+    #
+    nMu = len(dHz["mukeys"])
+    muValues = np.empty(nMu, dtype=np.float64)
+    muValues.fill(np.nan)
+
+    if nMu == 0:
+        return np.arange(nMu), np.zeros(nMu), muValues
+
+    muStarts, muLengths = GroupStarts(dHz["mu"])
+    muPct = dHz["comppct"][muStarts]
+    bDominant = dHz["comppct"] >= np.repeat(muPct, muLengths)
+    rows, starts, lengths = ComponentRows(dHz, bDominant)
+
+    hzT = Thickness(dHz, top, bot)[rows]
+    bDepth = ~(np.isnan(dHz["hzdept"][rows]) | np.isnan(dHz["hzdepb"][rows]))
+    val = dHz["value"][rows]
+    aws = hzT * val
+    hzT[~bDepth] = np.nan
+
+    # The first row of each component starts the running sums. For the first component of
+    # each map unit that row must have depths, otherwise the second row starts them.
+    firstRow = starts.copy()
+    bFirstComp = np.in1d(rows[starts], muStarts)
+    bSkip = bFirstComp & ~bDepth[starts] & (lengths > 1)
+    bNone = bFirstComp & ~bDepth[starts] & (lengths == 1)
+    firstRow[bSkip] += 1
+
+    coHzT = hzT[firstRow]
+    coAWS = aws[firstRow]
+    lastRow = starts + lengths
+
+    for iRow in xrange(1, lengths.max()):
+        bMore = (firstRow + iRow) < lastRow
+        iRows = firstRow[bMore] + iRow
+        bAdd = bDepth[iRows]
+        rowAWS = np.where(np.isnan(val[iRows]), 0.0, aws[iRows])
+
+        sumHzT = coHzT[bMore]
+        sumAWS = coAWS[bMore]
+        sumHzT[bAdd] = np.fmax(0, sumHzT[bAdd]) + hzT[iRows][bAdd]
+        sumAWS[bAdd] = np.fmax(0, sumAWS[bAdd]) + rowAWS[bAdd]
+        coHzT[bMore] = sumHzT
+        coAWS[bMore] = sumAWS
+
+    coVal = np.empty(len(starts), dtype=np.float64)
+    coVal.fill(np.nan)
+    bVal = ~np.isnan(coAWS) & Positive(coHzT) & ~bNone
+    coVal[bVal] = coAWS[bVal] / coHzT[bVal]
+
+    coMu = dHz["mu"][rows[starts]]
+
+    if bHigh:
+        iComps = PickComponents(coMu[bVal], (-coVal[bVal],))
+
+    else:
+        iComps = PickComponents(coMu[bVal], (coVal[bVal],))
+
+    muValues[coMu[bVal][iComps]] = coVal[bVal][iComps]
+
+    return np.arange(nMu), muPct, muValues
+
+## ===================================================================================
+# Import system modules
+import gc
+import numpy as np
@@ -514,7 +514,7 @@ def ImportTabular(inputFolder, subFolder, newDB, areaSym, iCnt):
 
                         indx = keyIndx[tblName]
 
-                        for row in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                        for row in SSURGO_TabularReader.ReadRawRows(txtPath):
 
                             newRow = list()
                             fldNo = 0
@@ -545,7 +545,7 @@ def ImportTabular(inputFolder, subFolder, newDB, areaSym, iCnt):
                         # somehow the record is not unique and exception will be thrown.
                         try:
                             # Use csv reader to read each line in the text file
-                            for row in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                            for row in SSURGO_TabularReader.ReadRawRows(txtPath):
                                 # replace all blank values with 'None' so that the values are properly inserted
                                 # into integer values otherwise insertRow fails
 
@@ -591,7 +591,7 @@ def ImportTabular(inputFolder, subFolder, newDB, areaSym, iCnt):
 
                 try:
                     # Use csv reader to read each line in the text file
-                    for rowInFile in csv.reader(open(txtPath, 'rb'), delimiter='|', quotechar='"'):
+                    for rowInFile in SSURGO_TabularReader.ReadRawRows(txtPath):
                         # replace all blank values with 'None' so that the values are properly inserted
                         # into integer values otherwise insertRow fails
                         newRow = [None if value == '' else value for value in rowInFile]
@@ -775,6 +775,7 @@ def ImportTables(outputWS, dbList):
 
 # Import system modules
 import arcpy, sys, string, os, traceback, locale, tempfile, time, shutil, subprocess, csv, re
+import SSURGO_TabularReader
 
 # Create the Geoprocessor object
 from arcpy import env
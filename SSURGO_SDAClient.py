@@ -0,0 +1,445 @@
+# SSURGO_SDAClient.py
+#
+# Shared HTTPS client for Soil Data Access (SDA) requests, used by the SDA_* tools, WSS_ThematicMaps.py,
+# SSURGO_CheckgSSURGO.py, SSURGO_CountRecords.py and every other script that posts queries to the SDA tabular
+# service (post.rest), in place of urllib2.urlopen.
+#
+# urllib2 opens a new connection, with a new TLS handshake, for every request. Here each host has
+# a pool of keep-alive connections that are reused by the following requests:
+#
+#   jsonString = SSURGO_SDAClient.PostRequest(url, jData)
+#
+# Responses are requested with gzip compression and decompressed here. A request that fails with
+# a socket error or an HTTP 500, 502, 503 or 504 is sent again after a pause that doubles for each
+# retry (backoff, 2 x backoff, 4 x backoff ...). A connection that the server closed while it sat
+# in the pool is replaced without a pause. Any other HTTP error raises urllib2.HTTPError, the same
+# as urllib2.urlopen, with the SDA error message in e.read().
+#
+# The connections in a pool are shared safely by threads. An https proxy from the environment
+# (HTTPS_PROXY) or the Windows internet settings is used the same as urllib2.
+#
+# ChunkedRequest splits a long list of keys (mukeys) into chunks that are sent concurrently by
+# a small pool of threads, and merges the JSON tables:
+#
+#   data = SSURGO_SDAClient.ChunkedRequest(url, mukeyList, FormRequest)
+#
+# SpatialRecords reads an XML spatial response (mukey and WKT polygon) while it is still
+# arriving, with iterparse, and yields one (mukey, WKT) pair at a time. Elements are cleared
+# as they are read, so memory does not grow with the size of the response:
+#
+#   for mukey, wktPoly in SSURGO_SDAClient.SpatialRecords(url, jData):
+#
+#
+# This module does not import arcpy.
+#
+# 2026-10-18 Created
+#
+
+# Soil Data Access
+sdaURL = "https://sdmdataaccess.nrcs.usda.gov"
+
+# Idle keep-alive connections kept for each host
+poolSize = 4
+
+# Seconds to wait for the server to connect or send data
+timeout = 300
+
+# Number of times a failed request is sent again and the seconds to wait before the first retry
+retries = 3
+backoff = 2.0
+
+# HTTP status codes that are retried
+retryCodes = [500, 502, 503, 504]
+
+# ChunkedRequest. Maximum number of keys in one request, number of requests sent at the same
+# time and the number of times a failed chunk is split in half and sent again.
+chunkSize = 1000
+chunkWorkers = 4
+chunkSplits = 3
+
+## ===================================================================================
+def PoolKey(url):
+    # Return the scheme, host and port for a url
+    #
+    parts = urlparse.urlsplit(url)
+    scheme = parts.scheme.lower()
+
+    if parts.port is None:
+        port = 443 if scheme == "https" else 80
+
+    else:
+        port = parts.port
+
+    return scheme, parts.hostname, port
+
+## ===================================================================================
+def NewConnection(poolKey):
+    # Open a connection for a pool, through the proxy when there is one
+    #
+    scheme, host, port = poolKey
+
+    if scheme == "https":
+        connClass = httplib.HTTPSConnection
+
+    else:
+        connClass = httplib.HTTPConnection
+
+    proxy = urllib.getproxies().get(scheme)
+
+    if proxy is None or urllib.proxy_bypass(host):
+        return connClass(host, port, timeout=timeout)
+
+    proxyParts = urlparse.urlsplit(proxy if "://" in proxy else "http://" + proxy)
+    conn = connClass(proxyParts.hostname, proxyParts.port or 8080, timeout=timeout)
+    conn.set_tunnel(host, port)
+
+    return conn
+
+## ===================================================================================
+def GetConnection(poolKey):
+    # Return an idle connection from the pool, or a new one when the pool is empty.
+    # bReused is True for a connection from the pool.
+    #
+    with poolLock:
+        if not poolKey in dPools:
+            dPools[poolKey] = Queue.LifoQueue(poolSize)
+
+        pool = dPools[poolKey]
+
+    try:
+        return pool.get_nowait(), True
+
+    except Queue.Empty:
+        return NewConnection(poolKey), False
+
+## ===================================================================================
+def ReleaseConnection(poolKey, conn):
+    # Put a connection back in the pool after the whole response has been read.
+    # The connection is closed when the pool is already full.
+    #
+    try:
+        dPools[poolKey].put_nowait(conn)
+
+    except Queue.Full:
+        conn.close()
+
+## ===================================================================================
+def CloseConnections():
+    # Close all of the idle connections
+    #
+    with poolLock:
+        for pool in dPools.values():
+            while True:
+                try:
+                    pool.get_nowait().close()
+
+                except Queue.Empty:
+                    break
+
+        dPools.clear()
+
+## ===================================================================================
+def RequestHeaders(dHeaders):
+    # Default request headers plus any from the caller
+    #
+    dRequestHeaders = dict()
+    dRequestHeaders["Content-Type"] = "application/x-www-form-urlencoded"
+    dRequestHeaders["Accept-Encoding"] = "gzip"
+    dRequestHeaders["Connection"] = "keep-alive"
+
+    if not dHeaders is None:
+        dRequestHeaders.update(dHeaders)
+
+    return dRequestHeaders
+
+## ===================================================================================
+def Decompress(resp, body):
+    # Decompress a gzip response body
+    #
+    if (resp.getheader("content-encoding") or "").lower() == "gzip":
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+
+    return body
+
+## ===================================================================================
+class SDAFault(Exception):
+    # SOAP fault returned in an XML response
+    pass
+
+## ===================================================================================
+class StreamResponse(object):
+    # Response body that is read and decompressed a block at a time.
+    # The connection goes back to the pool after the last block has been read.
+    #
+    def __init__(self, poolKey, conn, resp):
+        self.poolKey = poolKey
+        self.conn = conn
+        self.resp = resp
+
+        if (resp.getheader("content-encoding") or "").lower() == "gzip":
+            self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        else:
+            self.decompressor = None
+
+    def read(self, size=65536):
+        # Return the next block of the response body. An empty string means the end.
+        #
+        while not self.conn is None:
+            block = self.resp.read(size)
+
+            if block == "":
+                # End of the response
+                if self.resp.will_close:
+                    self.conn.close()
+
+                else:
+                    ReleaseConnection(self.poolKey, self.conn)
+
+                self.conn = None
+
+                if self.decompressor is None:
+                    return ""
+
+                return self.decompressor.flush()
+
+            if self.decompressor is None:
+                return block
+
+            block = self.decompressor.decompress(block)
+
+            if block != "":
+                return block
+
+        return ""
+
+    def close(self):
+        # Close the connection when the response was not read to the end
+        #
+        if not self.conn is None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+## ===================================================================================
+def PostRequest(url, data, dHeaders=None):
+    # POST data (for SDA, a JSON or SOAP request string) to url on a pooled connection and
+    # return the response body. See the notes at the top for the retry rules.
+    #
+    return SendRequest(url, data, dHeaders, False)
+
+## ===================================================================================
+def OpenRequest(url, data, dHeaders=None):
+    # POST data to url and return a StreamResponse as soon as the response headers arrive.
+    # Errors before that are retried the same as PostRequest. An error while the body is
+    # being read is not, because the caller has already used part of it.
+    #
+    return SendRequest(url, data, dHeaders, True)
+
+## ===================================================================================
+def SendRequest(url, data, dHeaders, bStream):
+    # Retry loop for PostRequest and OpenRequest
+    #
+    poolKey = PoolKey(url)
+    parts = urlparse.urlsplit(url)
+    path = parts.path + ("?" + parts.query if parts.query else "")
+    headers = RequestHeaders(dHeaders)
+    attempt = 0
+
+    while True:
+        conn, bReused = GetConnection(poolKey)
+
+        try:
+            conn.request("POST", path, data, headers)
+            resp = conn.getresponse()
+
+            if bStream and resp.status < 300:
+                return StreamResponse(poolKey, conn, resp)
+
+            body = resp.read()
+
+        except (socket.error, httplib.HTTPException), e:
+            conn.close()
+
+            if bReused and not isinstance(e, socket.timeout):
+                # The server closed this connection while it was in the pool
+                continue
+
+            if attempt >= retries:
+                raise
+
+            time.sleep(backoff * 2 ** attempt)
+            attempt += 1
+            continue
+
+        if resp.will_close:
+            conn.close()
+
+        else:
+            ReleaseConnection(poolKey, conn)
+
+        body = Decompress(resp, body)
+
+        if resp.status in retryCodes and attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+            attempt += 1
+            continue
+
+        if resp.status >= 300:
+            raise urllib2.HTTPError(url, resp.status, resp.reason, resp.msg, StringIO.StringIO(body))
+
+        return body
+
+## ===================================================================================
+def SpatialRecords(url, data, keyTag="id", wktTag="geog"):
+    # Send an XML format spatial request and yield a (key, WKT) pair for each record as the
+    # response is parsed. keyTag and wktTag are the column names in the query.
+    #
+    # Each record is a child of the root element. It is cleared from the root after it has
+    # been read, so only one record at a time is held in memory.
+    #
+    resp = OpenRequest(url, data)
+
+    try:
+        root = None
+        depth = 0
+        key = None
+        bFault = False
+
+        for event, elem in ET.iterparse(resp, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+
+                elif elem.tag.endswith("Fault"):
+                    bFault = True
+
+                depth += 1
+                continue
+
+            depth -= 1
+            tag = elem.tag
+
+            if tag == keyTag:
+                key = elem.text
+
+            elif tag == wktTag:
+                yield key, elem.text
+
+            elif tag.endswith("Text") and bFault:
+                raise SDAFault("Fault; " + str(elem.text))
+
+            if depth == 1:
+                # End of a record
+                root.clear()
+
+    finally:
+        resp.close()
+
+## ===================================================================================
+def TabularQuery(sQuery, format="JSON"):
+    # Send a query to the SDA tabular service and return the JSON response as a dictionary
+    #
+    dRequest = dict()
+    dRequest["format"] = format
+    dRequest["query"] = sQuery
+
+    return json.loads(PostRequest(sdaURL + "/Tabular/SDMTabularService/post.rest", json.dumps(dRequest)))
+
+## ===================================================================================
+def ChunkedRequest(url, keyList, FormRequest):
+    # Send a tabular request for a long list of keys in chunks, chunkWorkers at a time, and
+    # return the merged JSON response as a dictionary, the same as json.loads would for one
+    # request. FormRequest(keys) returns the request data (JSON string) for a list of keys.
+    #
+    # Small lists are split evenly between the workers, up to chunkSize keys in a chunk.
+    # SDA answers a query that times out or returns too much data with a server (5xx) error,
+    # so a chunk that fails with a 5xx error, a socket error or a timeout is split in half and
+    # sent again, up to chunkSplits times. A 4xx error is a bad request and is raised as is.
+    #
+    # The JSON+COLUMNNAME+METADATA column names and metadata (the first two rows) are
+    # taken from the first chunk and only checked against the other chunks.
+    #
+    if len(keyList) == 0:
+        return dict()
+
+    size = max(1, min(chunkSize, int(math.ceil(len(keyList) / float(chunkWorkers)))))
+    chunks = [keyList[i:i + size] for i in range(0, len(keyList), size)]
+
+    if len(chunks) == 1:
+        results = [ChunkRequest((url, chunks[0], FormRequest, 0))]
+
+    else:
+        pool = ThreadPool(min(chunkWorkers, len(chunks)))
+
+        try:
+            # imap keeps the chunk order and raises the first error
+            results = list(pool.imap(ChunkRequest, [(url, chunk, FormRequest, 0) for chunk in chunks]))
+
+        finally:
+            pool.terminate()
+
+    data = dict()
+    header = None
+
+    for tables in results:
+        for table in tables:
+            if not "Table" in table:
+                # No records for this chunk
+                continue
+
+            if not "Table" in data:
+                data = table
+                header = table["Table"][0:2]
+                continue
+
+            rows = table["Table"]
+
+            if len(rows) > 1 and rows[0] == header[0]:
+                # Column names and metadata
+                if rows[0:2] != header:
+                    raise ValueError("Column metadata differs between chunks of the request")
+
+                rows = rows[2:]
+
+            data["Table"].extend(rows)
+
+    return data
+
+## ===================================================================================
+def ChunkRequest(args):
+    # Send the request for one chunk of keys and return a list of the JSON responses.
+    # A chunk that fails with a server error is split in half and each half is sent again.
+    # A client (4xx) error would fail the same way for any part of the chunk.
+    #
+    url, keys, FormRequest, splits = args
+
+    try:
+        return [json.loads(PostRequest(url, FormRequest(keys)))]
+
+    except urllib2.HTTPError, e:
+        if e.code < 500 or len(keys) == 1 or splits >= chunkSplits:
+            raise
+
+    except (socket.error, httplib.HTTPException):
+        if len(keys) == 1 or splits >= chunkSplits:
+            raise
+
+    half = len(keys) // 2
+
+    return ChunkRequest((url, keys[:half], FormRequest, splits + 1)) + ChunkRequest((url, keys[half:], FormRequest, splits + 1))
+
+## ===================================================================================
+# Import system modules
+import httplib, urllib, urllib2, urlparse, socket, zlib, json, time, math, threading, Queue, StringIO
+import xml.etree.cElementTree as ET
+from multiprocessing.pool import ThreadPool
+
+# Pools of idle connections. Key = (scheme, host, port)
+dPools = dict()
+poolLock = threading.Lock()
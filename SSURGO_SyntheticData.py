@@ -0,0 +1,369 @@
+# SSURGO_SyntheticData.py
+#
+# Creates a synthetic SSURGO-shaped database for benchmarking the soil map aggregation code
+# (see SSURGO_AggregationBenchmark.py) without a real state database or ArcGIS.
+#
+# The output is a SQLite database with the SSURGO table and column names used by
+# gSSURGO_CreateSoilMap.py. Optionally each table is also written to a CSV file.
+#
+#   sacatalog    areasymbol, areaname, saverest
+#   legend       lkey, areasymbol
+#   mapunit      lkey, mukey, musym, muname, mukind
+#   component    mukey, cokey, compname, comppct_r, compkind, majcompflag, slope_r, drainagecl,
+#                hydgrp, taxorder, hydricrating, nirrcapcl
+#   comonth      cokey, comonthkey, month, flodfreqcl, pondfreqcl
+#   chorizon     cokey, chkey, hzname, hzdept_r, hzdepb_r, awc_r, om_r, claytotal_r, sandtotal_r,
+#                ph1to1h2o_r, ksat_r, dbthirdbar_r, kwfact
+#   cointerp     cokey, mrulekey, mrulename, rulekey, rulename, ruledepth, interphr, interphrc
+#
+# Scale is set by the number of surveys, map units per survey, maximum components per map unit,
+# maximum horizons per component and number of interpretation rules. The same seed always
+# creates the same database.
+#
+# The values follow the SSURGO domains and the usual data problems: component percents that
+# add up to less than 100, miscellaneous areas without horizons, Null ratings (nullPct),
+# missing horizon depths and tied component percents.
+#
+# Usage:
+#   python SSURGO_SyntheticData.py synthetic.sqlite --surveys 10 --mapunits 500 --components 5 --horizons 7 --rules 20 [--csv folder]
+#
+
+## ===================================================================================
+class MyError(Exception):
+    pass
+
+## ===================================================================================
+def PrintMsg(msg, severity=0):
+    # Print a message to the console
+    #
+    if severity == 1:
+        msg = "Warning: " + msg
+
+    elif severity == 2:
+        msg = "Error: " + msg
+
+    print msg
+
+## ===================================================================================
+def Chance(rnd, pct):
+    # True for pct percent of the calls
+    #
+    return rnd.random() * 100.0 < pct
+
+## ===================================================================================
+def NullOr(rnd, nullPct, value):
+    # Return None for nullPct percent of the values
+    #
+    if Chance(rnd, nullPct):
+        return None
+
+    return value
+
+## ===================================================================================
+def ComponentPercents(rnd, coCnt):
+    # Split a map unit into coCnt component percents. The major component is listed first,
+    # some map units add up to less than 100 and some have tied percents.
+    #
+    if coCnt == 1:
+        return [rnd.choice([85, 90, 95, 100])]
+
+    majorPct = rnd.choice([40, 45, 50, 55, 60, 65, 70, 75, 80, 85])
+
+    if Chance(rnd, 15):
+        # Two co-dominant components
+        majorPct = rnd.choice([40, 45, 50])
+        pcts = [majorPct, majorPct]
+
+    else:
+        pcts = [majorPct]
+
+    remaining = max(100 - sum(pcts) - rnd.choice([0, 0, 0, 5, 10]), 0)
+
+    while len(pcts) < coCnt:
+        if remaining < 1:
+            # Take it from the major component so that the total stays at or under 100
+            pcts[0] -= 1
+            pcts.append(1)
+            continue
+
+        pct = max(1, min(remaining, rnd.choice([2, 3, 5, 5, 10, 10, 15, 20])))
+        pcts.append(pct)
+        remaining -= pct
+
+    pcts.sort(reverse=True)
+
+    return pcts
+
+## ===================================================================================
+def Horizons(rnd, cokey, chkey, hzCnt, nullPct):
+    # Return the chorizon records for one component, top down
+    #
+    rows = list()
+    top = 0
+    names = ["Ap", "A", "AB", "Bt1", "Bt2", "Bt3", "BC", "C1", "C2", "Cr", "R"]
+
+    for i in range(hzCnt):
+        if i == hzCnt - 1 and Chance(rnd, 30):
+            bot = rnd.choice([150, 152, 200, 203])
+
+        else:
+            bot = top + rnd.choice([5, 8, 10, 13, 15, 18, 20, 25, 30, 36, 41, 51])
+
+        clay = round(rnd.uniform(2.0, 60.0), 1)
+        sand = round(rnd.uniform(2.0, 95.0 - clay), 1)
+        om = round(max(0.05, rnd.expovariate(1.0 / max(0.5, 4.0 - i))), 2)
+
+        # Missing depths are rare, but they happen
+        hzTop = top if not Chance(rnd, nullPct / 4.0) else None
+        hzBot = bot if not Chance(rnd, nullPct / 4.0) else None
+
+        rows.append((cokey, str(chkey + i), names[min(i, len(names) - 1)], hzTop, hzBot,
+                     NullOr(rnd, nullPct, round(rnd.uniform(0.02, 0.25), 2)),
+                     NullOr(rnd, nullPct, om),
+                     NullOr(rnd, nullPct, clay),
+                     NullOr(rnd, nullPct, sand),
+                     NullOr(rnd, nullPct, round(rnd.uniform(4.0, 9.0), 1)),
+                     NullOr(rnd, nullPct, round(rnd.choice([0.42, 1.4, 4.23, 9.17, 14.11, 28.23, 42.34, 91.74]), 2)),
+                     NullOr(rnd, nullPct, round(rnd.uniform(1.1, 1.8), 2)),
+                     NullOr(rnd, nullPct, rnd.choice(kwfactValues))))
+        top = bot
+
+    return rows
+
+## ===================================================================================
+def CreateTables(conn):
+    # Create the empty SSURGO tables
+    #
+    cur = conn.cursor()
+
+    for tbl in tableOrder:
+        cur.execute("DROP TABLE IF EXISTS " + tbl)
+        cur.execute("CREATE TABLE " + tbl + " (" + ", ".join([fld + " " + fldType for fld, fldType in dTables[tbl]]) + ")")
+
+    conn.commit()
+
+    return True
+
+## ===================================================================================
+def CreateIndexes(conn):
+    # Index the key columns used by the joins in SSURGO_AggregationBenchmark.py
+    #
+    cur = conn.cursor()
+
+    for tbl, fld in [("legend", "lkey"), ("mapunit", "lkey"), ("mapunit", "mukey"), ("component", "mukey"), ("component", "cokey"),
+                     ("comonth", "cokey"), ("chorizon", "cokey"), ("cointerp", "cokey"), ("cointerp", "rulekey")]:
+        cur.execute("CREATE INDEX idx_" + tbl + "_" + fld + " ON " + tbl + " (" + fld + ")")
+
+    conn.commit()
+
+    return True
+
+## ===================================================================================
+def Records(rnd, surveyCnt, mapunitCnt, componentCnt, horizonCnt, ruleCnt, nullPct):
+    # Generate (table, record) for the whole database, one map unit at a time
+    #
+    mukey = 100000
+    chkey = 1000000
+    rules = [("{0:05d}".format(i + 1), ruleNames[i % len(ruleNames)] + ("" if i < len(ruleNames) else " " + str(i / len(ruleNames) + 1))) for i in range(ruleCnt)]
+
+    for s in range(surveyCnt):
+        areasymbol = "SY" + "{0:03d}".format(s + 1)
+        lkey = str(s + 1)
+        yield "sacatalog", (areasymbol, "Synthetic Survey Area " + str(s + 1), "2026-10-" + "{0:02d}".format(s % 28 + 1))
+        yield "legend", (lkey, areasymbol)
+
+        for m in range(mapunitCnt):
+            mukey += 1
+            coCnt = rnd.randint(1, componentCnt)
+            pcts = ComponentPercents(rnd, coCnt)
+            names = [rnd.choice(seriesNames) for pct in pcts]
+            slope = rnd.choice([(0, 2), (2, 6), (6, 12), (12, 20), (20, 45)])
+            yield "mapunit", (lkey, str(mukey), str(m + 1) + rnd.choice(["A", "B", "C", "D"]), "-".join(names[:2]) + " complex, " + str(slope[0]) + " to " + str(slope[1]) + " percent slopes", rnd.choice(["Consociation", "Complex", "Association"]))
+
+            for c, pct in enumerate(pcts):
+                cokey = str(mukey) + ":" + str(c + 1)
+
+                if c > 0 and Chance(rnd, 8):
+                    yield "component", (str(mukey), cokey, rnd.choice(["Rock outcrop", "Water", "Pits"]), pct, "Miscellaneous area", "No",
+                                        None, None, None, None, "Unranked", "8")
+                    continue
+
+                yield "component", (str(mukey), cokey, names[c], pct, rnd.choice(["Series", "Series", "Series", "Taxadjunct", "Variant"]), "Yes" if pct >= 15 else "No",
+                                    NullOr(rnd, nullPct, round(rnd.uniform(slope[0], slope[1]), 1)),
+                                    NullOr(rnd, nullPct, rnd.choice(drainageClasses)),
+                                    NullOr(rnd, nullPct, rnd.choice(hydrologicGroups)),
+                                    NullOr(rnd, nullPct, rnd.choice(taxOrders)),
+                                    NullOr(rnd, nullPct, rnd.choice(["Yes", "No", "No", "No"])),
+                                    NullOr(rnd, nullPct, str(rnd.randint(1, 8))))
+
+                bFloods = Chance(rnd, 20)
+
+                for mo, month in enumerate(months):
+                    yield "comonth", (cokey, cokey + ":" + str(mo + 1), month,
+                                      rnd.choice(floodClasses) if bFloods and 2 <= mo <= 7 else "None",
+                                      NullOr(rnd, nullPct, "None" if not Chance(rnd, 5) else rnd.choice(floodClasses)))
+
+                for rec in Horizons(rnd, cokey, chkey, rnd.randint(1, horizonCnt), nullPct):
+                    yield "chorizon", rec
+
+                chkey += horizonCnt
+
+                for rulekey, rulename in rules:
+                    interphr = round(rnd.choice([0.0, 0.0, 1.0, rnd.random()]), 2)
+
+                    if interphr >= 1.0:
+                        ratingClass = "Very limited"
+
+                    elif interphr > 0.0:
+                        ratingClass = "Somewhat limited"
+
+                    else:
+                        ratingClass = "Not limited"
+
+                    if Chance(rnd, nullPct):
+                        interphr = None
+                        ratingClass = "Not rated"
+
+                    yield "cointerp", (cokey, rulekey, rulename, rulekey, rulename, 0, interphr, ratingClass)
+
+## ===================================================================================
+def CreateSyntheticDB(outputDB, surveyCnt, mapunitCnt, componentCnt, horizonCnt, ruleCnt, nullPct=5.0, seed=1, chunkSize=50000):
+    # Create the synthetic database. Returns a dictionary of record counts by table.
+    #
+    try:
+        start = time.time()
+        rnd = random.Random(seed)
+
+        if os.path.isfile(outputDB):
+            os.remove(outputDB)
+
+        conn = sqlite3.connect(outputDB)
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        CreateTables(conn)
+
+        dSQL = dict()
+        dBuffer = dict()
+        dCounts = dict()
+
+        for tbl in tableOrder:
+            dSQL[tbl] = "INSERT INTO " + tbl + " VALUES (" + ", ".join(["?"] * len(dTables[tbl])) + ")"
+            dBuffer[tbl] = list()
+            dCounts[tbl] = 0
+
+        cur = conn.cursor()
+
+        for tbl, rec in Records(rnd, surveyCnt, mapunitCnt, componentCnt, horizonCnt, ruleCnt, nullPct):
+            dBuffer[tbl].append(rec)
+
+            if len(dBuffer[tbl]) >= chunkSize:
+                cur.executemany(dSQL[tbl], dBuffer[tbl])
+                dCounts[tbl] += len(dBuffer[tbl])
+                dBuffer[tbl] = list()
+
+        for tbl in tableOrder:
+            cur.executemany(dSQL[tbl], dBuffer[tbl])
+            dCounts[tbl] += len(dBuffer[tbl])
+
+        conn.commit()
+        CreateIndexes(conn)
+        conn.close()
+
+        PrintMsg("Created " + outputDB + " in " + str(round(time.time() - start, 1)) + " seconds")
+
+        for tbl in tableOrder:
+            PrintMsg("\t" + tbl + ": " + str(dCounts[tbl]) + " records")
+
+        return dCounts
+
+    except:
+        PrintMsg("Unable to create " + outputDB + ": " + str(sys.exc_info()[1]), 2)
+        return dict()
+
+## ===================================================================================
+def ExportCSV(inputDB, csvFolder):
+    # Write each table in the synthetic database to [table].csv with a header row
+    #
+    try:
+        if not os.path.isdir(csvFolder):
+            os.makedirs(csvFolder)
+
+        conn = sqlite3.connect(inputDB)
+
+        for tbl in tableOrder:
+            fh = open(os.path.join(csvFolder, tbl + ".csv"), "wb")
+
+            try:
+                writer = csv.writer(fh)
+                writer.writerow([fld for fld, fldType in dTables[tbl]])
+
+                for rec in conn.execute("SELECT * FROM " + tbl):
+                    writer.writerow(["" if val is None else val for val in rec])
+
+            finally:
+                fh.close()
+
+        conn.close()
+
+        return True
+
+    except:
+        PrintMsg("Unable to export " + inputDB + " to " + csvFolder + ": " + str(sys.exc_info()[1]), 2)
+        return False
+
+## ===================================================================================
+## MAIN
+## ===================================================================================
+
+# Import system modules
+import sys, os, time, random, sqlite3, csv, argparse
+
+# Table definitions, in load order
+tableOrder = ["sacatalog", "legend", "mapunit", "component", "comonth", "chorizon", "cointerp"]
+
+dTables = dict()
+dTables["sacatalog"] = [("areasymbol", "TEXT"), ("areaname", "TEXT"), ("saverest", "TEXT")]
+dTables["legend"] = [("lkey", "TEXT"), ("areasymbol", "TEXT")]
+dTables["mapunit"] = [("lkey", "TEXT"), ("mukey", "TEXT"), ("musym", "TEXT"), ("muname", "TEXT"), ("mukind", "TEXT")]
+dTables["component"] = [("mukey", "TEXT"), ("cokey", "TEXT"), ("compname", "TEXT"), ("comppct_r", "INTEGER"), ("compkind", "TEXT"), ("majcompflag", "TEXT"),
+                        ("slope_r", "REAL"), ("drainagecl", "TEXT"), ("hydgrp", "TEXT"), ("taxorder", "TEXT"), ("hydricrating", "TEXT"), ("nirrcapcl", "TEXT")]
+dTables["comonth"] = [("cokey", "TEXT"), ("comonthkey", "TEXT"), ("month", "TEXT"), ("flodfreqcl", "TEXT"), ("pondfreqcl", "TEXT")]
+dTables["chorizon"] = [("cokey", "TEXT"), ("chkey", "TEXT"), ("hzname", "TEXT"), ("hzdept_r", "INTEGER"), ("hzdepb_r", "INTEGER"), ("awc_r", "REAL"), ("om_r", "REAL"),
+                       ("claytotal_r", "REAL"), ("sandtotal_r", "REAL"), ("ph1to1h2o_r", "REAL"), ("ksat_r", "REAL"), ("dbthirdbar_r", "REAL"), ("kwfact", "TEXT")]
+dTables["cointerp"] = [("cokey", "TEXT"), ("mrulekey", "TEXT"), ("mrulename", "TEXT"), ("rulekey", "TEXT"), ("rulename", "TEXT"), ("ruledepth", "INTEGER"),
+                       ("interphr", "REAL"), ("interphrc", "TEXT")]
+
+# SSURGO domain values
+months = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+drainageClasses = ["Excessively drained", "Somewhat excessively drained", "Well drained", "Moderately well drained", "Somewhat poorly drained", "Poorly drained", "Very poorly drained"]
+hydrologicGroups = ["A", "B", "C", "D", "A/D", "B/D", "C/D"]
+taxOrders = ["Alfisols", "Aridisols", "Entisols", "Histosols", "Inceptisols", "Mollisols", "Spodosols", "Ultisols", "Vertisols"]
+floodClasses = ["Very rare", "Rare", "Occasional", "Frequent", "Very frequent"]
+kwfactValues = [".02", ".05", ".10", ".15", ".17", ".20", ".24", ".28", ".32", ".37", ".43", ".49", ".55", ".64"]
+seriesNames = ["Crete", "Hastings", "Holdrege", "Kennebec", "Moody", "Nora", "Sharpsburg", "Wymore", "Valentine", "Uly", "Coly", "Hobbs", "Judson", "Fillmore", "Butler"]
+ruleNames = ["Dwellings With Basements", "Dwellings Without Basements", "Small Commercial Buildings", "Local Roads and Streets", "Septic Tank Absorption Fields",
+             "Sewage Lagoons", "Shallow Excavations", "Lawns and Landscaping", "Paths and Trails", "Camp Areas", "Picnic Areas", "Playgrounds",
+             "Farmland of Statewide Importance", "Hydric Rating by Map Unit", "Manure and Food-Processing Waste", "Road Fill Source", "Sand Source",
+             "Gravel Source", "Topsoil Source", "Reclamation Source"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create a synthetic SSURGO database for benchmarking")
+    parser.add_argument("outputDB", help="output SQLite database")
+    parser.add_argument("--surveys", type=int, default=10, help="number of survey areas")
+    parser.add_argument("--mapunits", type=int, default=500, help="map units per survey area")
+    parser.add_argument("--components", type=int, default=5, help="maximum components per map unit")
+    parser.add_argument("--horizons", type=int, default=7, help="maximum horizons per component")
+    parser.add_argument("--rules", type=int, default=20, help="number of interpretation rules")
+    parser.add_argument("--nullpct", type=float, default=5.0, help="percent of Null rating values")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--csv", default="", help="also write each table to a CSV file in this folder")
+    args = parser.parse_args()
+
+    dCounts = CreateSyntheticDB(args.outputDB, args.surveys, args.mapunits, args.components, args.horizons, args.rules, args.nullpct, args.seed)
+
+    if len(dCounts) == 0:
+        sys.exit(1)
+
+    if args.csv != "":
+        if not ExportCSV(args.outputDB, args.csv):
+            sys.exit(1)
@@ -0,0 +1,1059 @@
+# SSURGO_TabularReader.py
+#
+# Shared reader for the pipe-delimited SSURGO tabular text files (tabular\*.txt).
+#
+# This module does not import arcpy so that it can be imported by the worker processes
+# used to parse survey areas in parallel. Parsed rows are handed back to the calling
+# script, which remains the only writer to the output database.
+#
+# Parallel per-survey parsing for ImportTabular (SSURGO_Convert_to_Geodatabase.py and
+# SSURGO_Convert_to_SQLiteDB.py). The surveys are parsed by a pool of processes but returned
+# in the original survey order, so the writer still imports each survey's tables in the
+# txtFiles order required for referential integrity.
+#
+# Type codes used to coerce text values (see GetTypeCode):
+#   'I' integer
+#   'F' floating point
+#   'S' string (decoded using the codepage)
+#   'C' choice, a string column with a domain in mdstatdomdet (see GetColumnSpecs)
+#
+# Each text file is converted by a function compiled once from the column specs for its
+# table (see CompileConverter). The specs combine the output field types with the column
+# metadata in mdstattabcols, so bad values (non-numeric, too long, missing required value)
+# are reported with the text file line number while parsing, rather than by insertRow.
+#
+# The text files can also be read straight out of a Web Soil Survey zip file without
+# extracting them. Any path that runs through a zip file is treated as a path to a member
+# of that archive (eg. C:\SSURGO\soil_ne109\tabular.zip\NE109\tabular\comp.txt). See
+# ExtractZip and GetTabularFolder.
+#
+# Long imports can be restarted using an import manifest, a journal kept next to the output
+# database with one JSON record per line. Each survey area is recorded as 'started' before
+# it is written and 'complete' (with the record count, file size and MD5 hash of every text
+# file) after it has been committed. See ReadManifest and WriteManifest.
+#
+# Reads and writes that can fail on a busy network share (or while antivirus software still
+# holds a file that was just extracted) go through RetryFileAccess, which only waits when an
+# I/O error actually occurs. The counters in dRetryStats show how often that happened.
+#
+# Rows that the writer would not import (eg. cointerp rules below ruledepth 0) are dropped by
+# a row filter in the worker process (see CointerpRow), before they are sent back to the writer.
+#
+
+## ===================================================================================
+class MyError(Exception):
+    pass
+
+# RetryFileAccess settings. With 6 tries the longest total wait is 3.1 seconds.
+retryTries = 6
+retryDelay = 0.1
+
+# RetryFileAccess counters for this process (see RetryReport)
+#   retries:   number of failed tries that were retried
+#   recovered: number of calls that succeeded after one or more retries
+#   failed:    number of calls that still failed after the last try
+#   wait:      total seconds spent waiting between tries
+dRetryStats = {"retries":0, "recovered":0, "failed":0, "wait":0.0}
+iRetryDepth = 0
+
+## ===================================================================================
+def GetTypeCode(fldType):
+    # Convert an arcpy field type (Field.type) to the type code used by ParseTextFile
+    #
+    if fldType in ("SmallInteger", "Integer"):
+        return "I"
+
+    elif fldType in ("Single", "Double"):
+        return "F"
+
+    else:
+        # String, Date and anything else is left as a string.
+        # InsertCursor and SQLite both accept the SSURGO date strings.
+        return "S"
+
+## ===================================================================================
+def GetColumnSpecs(tbl, fldList, dColumnInfo, dDomains):
+    # Combine the output fields for a table with the column metadata from mdstattabcols.
+    #
+    # fldList:     list of (field name, arcpy field type) in import order, without OBJECTID
+    # dColumnInfo: key = (table name, column name) in lowercase,
+    #              value = (logicaldatatype, fieldsize, bNotNull, domainname)
+    # dDomains:    key = domain name, value = list of choices from mdstatdomdet
+    #
+    # Returns a list of column specs: (column name, type code, field size, bNotNull, choices)
+    # Tables that are not in mdstattabcols (eg. featdesc) only get the type code.
+    #
+    colSpecs = list()
+
+    for fldName, fldType in fldList:
+        typeCode = GetTypeCode(fldType)
+        fieldSize = None
+        bNotNull = False
+        choices = None
+        colInfo = dColumnInfo.get((tbl.lower(), fldName.lower()), None)
+
+        if not colInfo is None:
+            dataType, colSize, bNotNull, domainName = colInfo
+
+            if typeCode == "S" and dataType != "Date/Time":
+                if colSize > 0:
+                    fieldSize = colSize
+
+                if domainName in dDomains:
+                    typeCode = "C"
+                    choices = tuple(dDomains[domainName])
+
+        colSpecs.append((fldName, typeCode, fieldSize, bNotNull, choices))
+
+    return colSpecs
+
+## ===================================================================================
+def ColumnConverter(colSpec, codePage, dChoices=None):
+    # Return the function that converts one raw text value for a column (see GetColumnSpecs).
+    # Blank values are returned as None so that they are properly inserted into numeric columns.
+    # Bad values raise ValueError.
+    #
+    # Choice values are decoded once and the same unicode object is returned for every
+    # record with that value. Values that are not in the domain are kept as well, they
+    # are not an error.
+    #
+    # dChoices: optional dictionary used to cache the decoded choice values
+    #           (key = raw text value, value = decoded value)
+    #
+    colName, typeCode, fieldSize, bNotNull, choices = colSpec
+
+    if typeCode == "I":
+        convert = int
+
+    elif typeCode == "F":
+        convert = float
+
+    elif typeCode == "C":
+        if dChoices is None:
+            dChoices = dict()
+
+        for choice in choices:
+            try:
+                dChoices[choice.encode(codePage)] = choice
+
+            except (UnicodeError, AttributeError):
+                pass
+
+        def convert(val):
+            try:
+                return dChoices[val]
+
+            except KeyError:
+                newVal = val.decode(codePage)
+
+                if fieldSize and len(newVal) > fieldSize:
+                    raise ValueError, "value is longer than " + str(fieldSize) + " characters"
+
+                dChoices[val] = newVal
+                return newVal
+
+    elif fieldSize:
+        def convert(val):
+            newVal = val.decode(codePage)
+
+            if len(newVal) > fieldSize:
+                raise ValueError, "value is longer than " + str(fieldSize) + " characters"
+
+            return newVal
+
+    else:
+        def convert(val):
+            return val.decode(codePage)
+
+    def ConvertValue(val):
+        if val == "":
+            if bNotNull:
+                raise ValueError, "missing value for required column " + str(colName)
+
+            return None
+
+        try:
+            return convert(val)
+
+        except ValueError, e:
+            raise ValueError, "bad value '" + val + "' for column " + str(colName) + " (" + str(e) + ")"
+
+    return ConvertValue
+
+## ===================================================================================
+def CompileConverter(colSpecs, codePage, colList=None):
+    # Build the row conversion function for one text file. All of the type, length, null and
+    # domain lookups are resolved here, once per table.
+    #
+    # The source for a function that converts every column of a row in a single expression is
+    # generated from the column specs and compiled, so there is no per-column function call
+    # for the common cases. When a row fails, it is converted again one column at a time
+    # (CheckRow) to raise a ValueError that names the column and the bad value.
+    #
+    # colSpecs: list of column specs (see GetColumnSpecs) or type codes, one per output column
+    # colList:  optional list of text column indexes to keep (eg. trimmed cointerp table)
+    #
+    # Returns a function that converts a list of raw text values to a tuple.
+    #
+    if colList is None:
+        colList = range(len(colSpecs))
+
+    # unicode() only has a fast path for the standard spelling of these codecs.
+    # The NASIS codepage 'iso-8859-1' decodes about 5 times faster as 'latin-1'.
+    codecName = codecs.lookup(codePage).name
+
+    if codecName == "iso8859-1":
+        codePage = "latin-1"
+
+    elif codecName == "utf-8":
+        codePage = "utf-8"
+
+    converters = list()
+    namespace = {"codePage":codePage}
+    srcLines = list()
+    srcValues = list()
+
+    for iCol, (i, colSpec) in enumerate(zip(colList, colSpecs)):
+        if isinstance(colSpec, basestring):
+            colSpec = (str(i + 1), colSpec, None, False, None)
+
+        colName, typeCode, fieldSize, bNotNull, choices = colSpec
+        dChoices = dict()
+        convert = ColumnConverter(colSpec, codePage, dChoices)
+        converters.append((i, convert))
+
+        val = "v" + str(iCol)
+        namespace["c" + str(iCol)] = convert
+        namespace["d" + str(iCol)] = dChoices
+        srcLines.append("        " + val + " = row[" + str(i) + "]")
+
+        if bNotNull:
+            nullValue = "c" + str(iCol) + "(" + val + ")"   # raises ValueError
+
+        else:
+            nullValue = "None"
+
+        if typeCode == "I":
+            expr = "int(" + val + ")"
+
+        elif typeCode == "F":
+            expr = "float(" + val + ")"
+
+        elif typeCode == "C":
+            expr = "(d" + str(iCol) + "[" + val + "] if " + val + " in d" + str(iCol) + " else c" + str(iCol) + "(" + val + "))"
+
+        elif fieldSize:
+            # the number of bytes is never less than the number of characters
+            expr = "(unicode(" + val + ", codePage) if len(" + val + ") <= " + str(fieldSize) + " else c" + str(iCol) + "(" + val + "))"
+
+        else:
+            expr = "unicode(" + val + ", codePage)"
+
+        srcValues.append("(" + expr + " if " + val + " else " + nullValue + ")")
+
+    if len(converters) > 0:
+        iCols = max([i for i, convert in converters]) + 1
+
+    else:
+        iCols = 0
+
+    def CheckRow(row):
+        if len(row) < iCols:
+            raise ValueError, "found " + str(len(row)) + " columns, expected " + str(iCols)
+
+        return tuple([convert(row[i]) for i, convert in converters])
+
+    namespace["CheckRow"] = CheckRow
+    src = "def ConvertRow(row):\n    try:\n" + "\n".join(srcLines) + "\n        return (" + ", ".join(srcValues) + ",)\n" \
+    + "    except (ValueError, IndexError):\n        return CheckRow(row)\n"
+
+    if len(converters) == 0:
+        return CheckRow
+
+    exec compile(src, "<" + str(len(converters)) + " column converter>", "exec") in namespace
+
+    return namespace["ConvertRow"]
+
+## ===================================================================================
+def HashReader(fh, fileStats):
+    # Return read and readline functions for fh that add everything read to the byte count
+    # and MD5 hash in fileStats
+    #
+    md5 = hashlib.md5()
+    fileStats["size"] = 0
+    fileStats["md5"] = md5.hexdigest()
+
+    def Update(data):
+        md5.update(data)
+        fileStats["size"] += len(data)
+        fileStats["md5"] = md5.hexdigest()
+        return data
+
+    def Read(size):
+        return Update(fh.read(size))
+
+    def ReadLine():
+        return Update(fh.readline())
+
+    return Read, ReadLine
+
+## ===================================================================================
+def SplitBlock(block, readline):
+    # Split a block of complete lines from a pipe-delimited SSURGO text file into a list of
+    # records, each a list of undecoded strings.
+    #
+    # A block without any quote characters is simply split into lines and then on the
+    # delimiter. A quoted value may contain delimiters, doubled quotes or line breaks, so in
+    # a block with quotes, a line that ends inside a quoted value (see QuoteOpen) is joined
+    # with the following lines until the value is closed (reading past the end of the block
+    # if necessary). Each line with quotes is parsed by csv.
+    #
+    if not '"' in block:
+        return [line.split("|") if line else [] for line in block.splitlines()]
+
+    rowList = list()
+    lineIter = iter(block.splitlines(True))
+
+    for line in lineIter:
+        if '"' in line:
+            while QuoteOpen(line):
+                nextLine = next(lineIter, None)
+
+                if nextLine is None:
+                    nextLine = readline()
+
+                if nextLine == "":
+                    break
+
+                line += nextLine
+
+            rowList.extend(csv.reader([line], delimiter='|', quotechar='"'))
+
+        else:
+            line = line.rstrip("\r\n")
+
+            if line:
+                rowList.append(line.split("|"))
+
+            else:
+                rowList.append([])
+
+    return rowList
+
+## ===================================================================================
+def QuoteOpen(line):
+    # Return True when a line ends inside a quoted value, following the csv.reader rules.
+    # A quote only starts a quoted value at the beginning of a value; anywhere else it is
+    # an ordinary character (eg. 12" pipe). In a quoted value a doubled quote is a quote
+    # character and a single quote ends the quoted part of the value.
+    #
+    if not (line.startswith('"') or '|"' in line):
+        return False
+
+    pos = 0
+
+    while pos < len(line):
+        if line[pos] == '"':
+            # quoted value
+            pos += 1
+
+            while True:
+                pos = line.find('"', pos)
+
+                if pos == -1:
+                    return True
+
+                if line[pos + 1:pos + 2] == '"':
+                    pos += 2
+
+                else:
+                    pos += 1
+                    break
+
+        # move to the start of the next value
+        pos = line.find("|", pos)
+
+        if pos == -1:
+            return False
+
+        pos += 1
+
+    return False
+
+## ===================================================================================
+def CheckSplitBlock():
+    # Compare SplitBlock with csv.reader for text containing quotes. Raises ValueError for
+    # the first text that parses differently.
+    #
+    textList = ['1|"a|b"|3\n4|5|6\n',
+                '1|"say ""hi"""|3\n',
+                '1|"two\nlines"|3\n4|5|6\n',
+                '1|12" pipe|3\n4|5|6\n',
+                '1|6" to 12"|"x|y"\n4|"5"|6\n',
+                '"a"b|c\n"|"\n',
+                '1||"open\n\nclosed"|\n2|3|4\n']
+
+    for text in textList:
+        csvRows = list(csv.reader(text.splitlines(True), delimiter='|', quotechar='"'))
+        blockRows = SplitBlock(text, lambda: "")
+
+        if blockRows != csvRows:
+            raise ValueError("SplitBlock " + repr(blockRows) + " does not match csv.reader " + repr(csvRows) + " for " + repr(text))
+
+    return True
+
+## ===================================================================================
+def ReadRecordBlocks(txtPath, fileStats=None, blockSize=4194304):
+    # Generator returning the records in a pipe-delimited SSURGO text file, one list of
+    # records for each block of about blockSize bytes (see SplitBlock).
+    #
+    # Ordinary files are memory-mapped and read straight from the page cache. Members of a
+    # zip file, empty files and files too large to map into a 32-bit process are read
+    # from the file handle instead.
+    #
+    # fileStats: optional dictionary. The file size and MD5 hash are added as the file is read.
+    #
+    fh = RetryFileAccess(OpenTextFile, txtPath)
+    mm = None
+
+    try:
+        if SplitZipPath(txtPath)[0] is None:
+            try:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+            except (EnvironmentError, ValueError, OverflowError):
+                mm = None
+
+        if mm is None:
+            if fileStats is None:
+                read, readline = fh.read, fh.readline
+
+            else:
+                read, readline = HashReader(fh, fileStats)
+
+        else:
+            read, readline = mm.read, mm.readline
+
+            if not fileStats is None:
+                fileStats["size"] = mm.size()
+                fileStats["md5"] = hashlib.md5(mm).hexdigest()
+
+        while True:
+            block = read(blockSize)
+
+            if block == "":
+                break
+
+            if not block.endswith("\n"):
+                # finish the last line in the block
+                block += readline()
+
+            yield SplitBlock(block, readline)
+
+    finally:
+        if not mm is None:
+            mm.close()
+
+        fh.close()
+
+## ===================================================================================
+def ReadRawRows(txtPath, fileStats=None):
+    # Generator returning each record in a pipe-delimited SSURGO text file as a list
+    # of undecoded strings
+    #
+    for rowList in ReadRecordBlocks(txtPath, fileStats):
+        for rowInFile in rowList:
+            yield rowInFile
+
+## ===================================================================================
+def ReadRowBatches(txtPath, batchSize=10000, fileStats=None):
+    # Generator returning the records in a pipe-delimited SSURGO text file in lists of
+    # batchSize records (see ReadRawRows). The last batch may be shorter.
+    #
+    rowIter = chain.from_iterable(ReadRecordBlocks(txtPath, fileStats))
+
+    while True:
+        rowBatch = list(islice(rowIter, batchSize))
+
+        if len(rowBatch) == 0:
+            break
+
+        yield rowBatch
+
+## ===================================================================================
+def ReadTextRows(txtPath, codePage):
+    # Generator returning each record in a pipe-delimited SSURGO text file as a list
+    # of unicode values. Blank values are returned as None so that they are properly
+    # inserted into numeric columns.
+    #
+    for rowInFile in ReadRawRows(txtPath):
+        yield [x.decode(codePage) if x else None for x in rowInFile]
+
+## ===================================================================================
+def SplitZipPath(txtPath):
+    # Split a path that runs through a zip file into the path of the zip file and the
+    # name of the archive member. Returns (None, None) for an ordinary file path.
+    #
+    txtPath = os.path.normpath(txtPath)
+    iPos = txtPath.lower().find(".zip" + os.sep)
+
+    if iPos == -1:
+        return (None, None)
+
+    zipPath = txtPath[0:(iPos + 4)]
+    memberName = txtPath[(iPos + 5):].replace(os.sep, "/")
+
+    return (zipPath, memberName)
+
+## ===================================================================================
+def FindZipMember(z, memberName):
+    # Return the name of the archive member matching memberName. Older WSS zip files
+    # are not consistent about case, so fall back to a case-insensitive match.
+    #
+    memberList = z.namelist()
+
+    if memberName in memberList:
+        return memberName
+
+    for zipMember in memberList:
+        if zipMember.lower() == memberName.lower():
+            return zipMember
+
+    return None
+
+## ===================================================================================
+def TextFileSize(txtPath):
+    # os.path.getsize for tabular text files that may be inside a zip file
+    #
+    zipPath, memberName = SplitZipPath(txtPath)
+
+    if zipPath is None:
+        return os.path.getsize(txtPath)
+
+    z = zipfile.ZipFile(zipPath, "r")
+
+    try:
+        zipMember = FindZipMember(z, memberName)
+
+        if zipMember is None:
+            raise IOError, "No such file in zip file: '" + txtPath + "'"
+
+        return z.getinfo(zipMember).file_size
+
+    finally:
+        z.close()
+
+## ===================================================================================
+def TextFileExists(txtPath):
+    # os.path.isfile for tabular text files that may be inside a zip file
+    #
+    zipPath, memberName = SplitZipPath(txtPath)
+
+    if zipPath is None:
+        return os.path.isfile(txtPath)
+
+    if not zipfile.is_zipfile(zipPath):
+        return False
+
+    z = zipfile.ZipFile(zipPath, "r")
+
+    try:
+        return not FindZipMember(z, memberName) is None
+
+    finally:
+        z.close()
+
+## ===================================================================================
+def OpenTextFile(txtPath):
+    # Open a tabular text file for reading in binary mode. A member of a zip file is
+    # decompressed as it is read, nothing is written to disk.
+    #
+    zipPath, memberName = SplitZipPath(txtPath)
+
+    if zipPath is None:
+        return open(txtPath, 'rb')
+
+    z = zipfile.ZipFile(zipPath, "r")
+
+    try:
+        zipMember = FindZipMember(z, memberName)
+
+        if zipMember is None:
+            raise IOError, "No such file in zip file: '" + txtPath + "'"
+
+        # The member opens its own handle to the zip file, so it remains readable
+        # after the ZipFile object is closed.
+        return z.open(zipMember, "r")
+
+    finally:
+        z.close()
+
+## ===================================================================================
+def RetryFileAccess(func, *args, **kwargs):
+    # Return func(*args, **kwargs), trying again after an I/O error (IOError, OSError or
+    # WindowsError). The wait starts at retryDelay seconds and doubles after each failed
+    # try, for at most retryTries tries. The error from the last try is raised.
+    #
+    # Calls made while another retried call is running (eg. OpenTextFile within a retried
+    # ParseTextFile) are not retried separately, so the number of tries stays bounded.
+    #
+    global iRetryDepth
+
+    if iRetryDepth > 0:
+        return func(*args, **kwargs)
+
+    iRetryDepth += 1
+
+    try:
+        waitTime = retryDelay
+        iTry = 1
+
+        while True:
+            try:
+                result = func(*args, **kwargs)
+                break
+
+            except EnvironmentError:
+                if iTry >= retryTries:
+                    dRetryStats["failed"] += 1
+                    raise
+
+                dRetryStats["retries"] += 1
+                dRetryStats["wait"] += waitTime
+                time.sleep(waitTime)
+                waitTime *= 2
+                iTry += 1
+
+        if iTry > 1:
+            dRetryStats["recovered"] += 1
+
+        return result
+
+    finally:
+        iRetryDepth -= 1
+
+## ===================================================================================
+def RetryReport():
+    # Return a message summarizing the RetryFileAccess counters for this process
+    #
+    if dRetryStats["retries"] == 0 and dRetryStats["failed"] == 0:
+        return "File access: no retries were needed"
+
+    return "File access: " + str(dRetryStats["retries"]) + " retries, " + str(dRetryStats["recovered"]) + " recovered, " \
+    + str(dRetryStats["failed"]) + " failed, " + ("%.1f" % dRetryStats["wait"]) + " seconds waiting"
+
+## ===================================================================================
+def ListTextFiles(tabularFolder):
+    # Return a list of the text file names in a tabular folder or in the
+    # tabular folder of a zip file.
+    #
+    zipPath, memberName = SplitZipPath(tabularFolder)
+
+    if zipPath is None:
+        if not os.path.isdir(tabularFolder):
+            return []
+
+        return [fileName for fileName in os.listdir(tabularFolder) if fileName.lower().endswith(".txt")]
+
+    if not zipfile.is_zipfile(zipPath):
+        return []
+
+    z = zipfile.ZipFile(zipPath, "r")
+
+    try:
+        prefix = memberName.lower() + "/"
+        txtList = list()
+
+        for zipMember in z.namelist():
+            if zipMember.lower().startswith(prefix) and zipMember.lower().endswith(".txt"):
+                fileName = zipMember[len(prefix):]
+
+                if not "/" in fileName:
+                    txtList.append(fileName)
+
+        return txtList
+
+    finally:
+        z.close()
+
+## ===================================================================================
+def ZipTabularFolder(zipPath):
+    # Return the path to the tabular folder inside a WSS zip file. Depending upon the age
+    # of the download the folder is wss_SSA_NE109_[date]/tabular, NE109/tabular or
+    # soil_ne109/tabular.
+    #
+    z = zipfile.ZipFile(zipPath, "r")
+
+    try:
+        for zipMember in z.namelist():
+            if zipMember.lower().endswith("tabular/version.txt"):
+                return os.path.join(zipPath, *zipMember.split("/")[0:-1])
+
+    finally:
+        z.close()
+
+    return os.path.join(zipPath, "tabular")
+
+## ===================================================================================
+def GetTabularFolder(soilsFolder):
+    # Return the tabular folder for a SSURGO dataset folder (soil_ne109). When the
+    # tabular text files were left in the WSS zip file (soil_ne109\tabular.zip), the
+    # tabular folder inside the zip file is returned instead.
+    #
+    tabularFolder = os.path.join(soilsFolder, "tabular")
+    zipPath = os.path.join(soilsFolder, "tabular.zip")
+
+    if not os.path.isfile(os.path.join(tabularFolder, "version.txt")) and zipfile.is_zipfile(zipPath):
+        return ZipTabularFolder(zipPath)
+
+    return tabularFolder
+
+## ===================================================================================
+def ExtractZip(zipPath, outputFolder, bTabular=True):
+    # Extract a WSS zip file to outputFolder.
+    #
+    # bTabular: False leaves the tabular text files in the zip file. Only the spatial data
+    #           and metadata are written to disk. The caller keeps the zip file as
+    #           soil_[areasymbol]\tabular.zip so that the text files can be read by OpenTextFile.
+    #
+    z = zipfile.ZipFile(zipPath, "r")
+
+    try:
+        if bTabular:
+            z.extractall(outputFolder)
+
+        else:
+            memberList = [zipMember for zipMember in z.namelist() if not "/tabular/" in "/" + zipMember.lower()]
+            z.extractall(outputFolder, memberList)
+
+    finally:
+        z.close()
+
+    return True
+
+## ===================================================================================
+def ParseTextFile(txtPath, codePage, colSpecs=None, colList=None, fileStats=None, rowFilter=None):
+    # Read a single text file and return a list of tuples with values converted
+    # using the column specs or type codes (one per output column).
+    #
+    # colList:   optional list of text column indexes to keep (eg. trimmed cointerp table)
+    # fileStats: optional dictionary, populated with the record count, file size and MD5 hash
+    #            of the text file for the import manifest
+    # rowFilter: optional function of a converted row. Rows for which it returns False are
+    #            left out of the list (eg. CointerpRow). The record count includes them.
+    #
+    rowList = list()
+    iRows = 0
+
+    if fileStats is None:
+        fileStats = dict()
+
+    if colSpecs is None:
+        for row in ReadTextRows(txtPath, codePage):
+            if not colList is None:
+                row = [row[i] for i in colList]
+
+            iRows += 1
+
+            if rowFilter is None or rowFilter(row):
+                rowList.append(tuple(row))
+
+        fileStats["rows"] = iRows
+        return rowList
+
+    convertRow = CompileConverter(colSpecs, codePage, colList)
+
+    # The parsed rows are tuples of strings and numbers that can not form reference cycles.
+    # Without this, the garbage collector repeatedly scans the growing row list.
+    bGC = gc.isenabled()
+    gc.disable()
+
+    try:
+        for rowBatch in ReadRowBatches(txtPath, 10000, fileStats):
+            try:
+                if rowFilter is None:
+                    rowList.extend([convertRow(row) for row in rowBatch])
+
+                else:
+                    rowList.extend([fixedRow for fixedRow in [convertRow(row) for row in rowBatch] if rowFilter(fixedRow)])
+
+            except (ValueError, IndexError):
+                # Find the bad record in this batch for the error message
+                for iLine, row in enumerate(rowBatch, iRows + 1):
+                    try:
+                        convertRow(row)
+
+                    except (ValueError, IndexError), e:
+                        raise MyError, "Error parsing line " + str(iLine) + " of " + txtPath + " (" + str(e) + ")"
+
+            iRows += len(rowBatch)
+
+    finally:
+        if bGC:
+            gc.enable()
+
+    fileStats["rows"] = iRows
+    return rowList
+
+## ===================================================================================
+def CointerpRow(row):
+    # Row filter for the trimmed cointerp table (cinterp.txt columns 0-6, 11-12 and 15-18,
+    # see dColumns in SSURGO_Convert_to_Geodatabase). Only the ruledepth 0 records and the
+    # NCCPI records (mrulekey 54955) are imported.
+    #
+    return str(row[6]) == '0' or str(row[1]) == '54955'
+
+## ===================================================================================
+def ParseSurvey(job):
+    # Worker function. Parse all of the tabular text files for one survey area.
+    #
+    # job is a tuple: (areaSym, tabularFolder, txtFiles, dSpecs, dColumns, codePage, featPath, dFilters)
+    #   txtFiles: list of text file names without the .txt extension
+    #   dSpecs:   key = text file name, value = list of column specs or type codes
+    #   dColumns: key = text file name, value = list of text column indexes to keep
+    #   featPath: optional path to the special feature description file (soilsf_t_*.txt)
+    #   dFilters: key = text file name, value = row filter function (see ParseTextFile)
+    #
+    # Returns a tuple: (areaSym, dRows, dStats) where dRows key = text file name, value = list of tuples
+    # and dStats key = text file name, value = dictionary of file statistics (see ParseTextFile).
+    # Special feature descriptions are returned under the 'featdesc' key when featPath exists.
+    #
+    # Each text file is read again from the start after an I/O error (see RetryFileAccess). The
+    # file statistics include 'retries' and 'retrywait' for any file that needed a retry, so the
+    # counters from a worker process can be added to the calling process (see ParseSurveys).
+    #
+    areaSym, tabularFolder, txtFiles, dSpecs, dColumns, codePage, featPath, dFilters = job
+    dRows = dict()
+    dStats = dict()
+
+    for txtFile in txtFiles:
+        txtPath = os.path.join(tabularFolder, txtFile + ".txt")
+
+        if not TextFileExists(txtPath):
+            raise MyError, "Missing tabular data file (" + txtPath + ")"
+
+        dStats[txtFile] = dict()
+        dRows[txtFile] = ParseRetry(txtPath, codePage, dSpecs.get(txtFile, None), dColumns.get(txtFile, None), dStats[txtFile], dFilters.get(txtFile, None))
+
+    if featPath and TextFileExists(featPath):
+        dStats["featdesc"] = dict()
+        dRows["featdesc"] = ParseRetry(featPath, codePage, dSpecs.get("featdesc", None), None, dStats["featdesc"])
+
+    return (areaSym, dRows, dStats)
+
+## ===================================================================================
+def ParseRetry(txtPath, codePage, colSpecs, colList, fileStats, rowFilter=None):
+    # ParseTextFile using RetryFileAccess. Any retries are added to fileStats.
+    #
+    iRetries = dRetryStats["retries"]
+    waitTime = dRetryStats["wait"]
+    rowList = RetryFileAccess(ParseTextFile, txtPath, codePage, colSpecs, colList, fileStats, rowFilter)
+
+    if dRetryStats["retries"] > iRetries:
+        fileStats["retries"] = dRetryStats["retries"] - iRetries
+        fileStats["retrywait"] = round(dRetryStats["wait"] - waitTime, 3)
+
+    return rowList
+
+## ===================================================================================
+def KeyValue(row, keyIndexes):
+    # Return the primary key value for a row. Numeric key strings are stored as integers
+    # because the key sets for a national database can hold tens of millions of values.
+    #
+    if len(keyIndexes) == 1:
+        keyVal = row[keyIndexes[0]]
+
+        if isinstance(keyVal, basestring) and keyVal.isdigit():
+            return int(keyVal)
+
+        return keyVal
+
+    return tuple([row[i] for i in keyIndexes])
+
+## ===================================================================================
+def UniqueKeyRows(rowIter, keyIndexes, keySet):
+    # Generator that only passes on records whose primary key value is not already in keySet.
+    # keySet is shared by all survey areas, so a record that is repeated in more than one
+    # survey (eg. sdvattribute) is only imported once. Each lookup is O(1).
+    #
+    # keyIndexes: list of primary key column positions in the row
+    #
+    for row in rowIter:
+        keyVal = KeyValue(row, keyIndexes)
+
+        if not keyVal in keySet:
+            keySet.add(keyVal)
+            yield row
+
+## ===================================================================================
+def SetPoolExecutable():
+    # When a script tool runs in-process, sys.executable is ArcMap.exe or ArcCatalog.exe.
+    # Point multiprocessing at the python interpreter that ships with ArcGIS instead.
+    #
+    if os.name == "nt":
+        pythonExe = os.path.join(sys.exec_prefix, "pythonw.exe")
+
+        if not os.path.basename(sys.executable).lower().startswith("python") and os.path.isfile(pythonExe):
+            multiprocessing.set_executable(pythonExe)
+
+    return True
+
+## ===================================================================================
+def ParseSurveys(jobList, iProcesses=None, iWindow=None):
+    # Generator that parses each survey area job (see ParseSurvey) and yields the results
+    # in the same order as jobList.
+    #
+    # iProcesses: number of worker processes. Defaults to one less than the number of cores.
+    #             With 1 process (or a single survey) the surveys are parsed in this process.
+    # iWindow:    maximum number of surveys parsed ahead of the writer. Limits memory use
+    #             when the writer is slower than the parsers.
+    #
+    if iProcesses is None:
+        iProcesses = max(1, multiprocessing.cpu_count() - 1)
+
+    if iProcesses < 2 or len(jobList) < 2:
+        for job in jobList:
+            yield ParseSurvey(job)
+
+        return
+
+    if iWindow is None:
+        iWindow = iProcesses * 2
+
+    SetPoolExecutable()
+    pool = multiprocessing.Pool(processes=iProcesses)
+
+    try:
+        jobIter = iter(jobList)
+        pending = deque()
+
+        for job in islice(jobIter, iWindow):
+            pending.append(pool.apply_async(ParseSurvey, (job,)))
+
+        while len(pending) > 0:
+            # Wait for the oldest survey so that results come back in their original order
+            result = pending.popleft().get()
+
+            for fileStats in result[2].values():
+                # Add any retries made by the worker process to the counters in this process
+                if "retries" in fileStats:
+                    dRetryStats["retries"] += fileStats["retries"]
+                    dRetryStats["wait"] += fileStats["retrywait"]
+                    dRetryStats["recovered"] += 1
+
+            for job in islice(jobIter, 1):
+                pending.append(pool.apply_async(ParseSurvey, (job,)))
+
+            yield result
+
+        pool.close()
+
+    finally:
+        pool.terminate()
+        pool.join()
+
+## ===================================================================================
+def ManifestPath(outputDB):
+    # Return the path to the import manifest for an output database
+    # eg. C:\gSSURGO\gSSURGO_NE.gdb -> C:\gSSURGO\gSSURGO_NE_manifest.json
+    #
+    return os.path.splitext(outputDB)[0] + "_manifest.json"
+
+## ===================================================================================
+def NewManifest(manifestPath):
+    # Start an empty import manifest, replacing any manifest left by a previous build
+    #
+    fh = open(manifestPath, "wb")
+    fh.close()
+
+    return True
+
+## ===================================================================================
+def WriteManifest(manifestPath, recordList):
+    # Append records to the import manifest and force them to disk, so that the manifest
+    # is still good after a crash or power failure. Each record is a dictionary written
+    # as one line of JSON.
+    #
+    fh = open(manifestPath, "a+b")
+
+    try:
+        # Start a new line if the last write was cut off
+        fh.seek(0, 2)
+
+        if fh.tell() > 0:
+            fh.seek(-1, 2)
+
+            if fh.read(1) != "\n":
+                fh.seek(0, 2)
+                fh.write("\n")
+
+        for record in recordList:
+            fh.write(json.dumps(record, sort_keys=True) + "\n")
+
+        fh.flush()
+        os.fsync(fh.fileno())
+
+    finally:
+        fh.close()
+
+    return True
+
+## ===================================================================================
+def ReadManifest(manifestPath):
+    # Replay the import manifest written by a previous run.
+    #
+    # Returns a tuple: (dSteps, dSurveys)
+    #   dSteps:   key = build step (eg. 'spatial', 'metadata'), value = record for that step
+    #   dSurveys: key = areasymbol, value = dictionary with 'status' ('started' or 'complete'),
+    #             'marks' and 'tables' (key = text file name, value = file statistics)
+    #
+    # A partial line from an interrupted write is ignored.
+    #
+    dSteps = dict()
+    dSurveys = dict()
+
+    if not os.path.isfile(manifestPath):
+        return (dSteps, dSurveys)
+
+    fh = open(manifestPath, "rb")
+
+    try:
+        for line in fh:
+            try:
+                record = json.loads(line)
+
+            except ValueError:
+                continue
+
+            if "step" in record:
+                dSteps[record["step"]] = record
+
+            elif "survey" in record:
+                areaSym = record["survey"]
+
+                if "table" in record:
+                    dSurveys[areaSym]["tables"][record["table"]] = record
+
+                elif record["status"] == "started":
+                    dSurveys[areaSym] = {"status":"started", "marks":record.get("marks", dict()), "tables":dict()}
+
+                else:
+                    dSurveys[areaSym]["status"] = record["status"]
+
+    finally:
+        fh.close()
+
+    return (dSteps, dSurveys)
+
+## ===================================================================================
+# Import system modules
+import sys, os, csv, mmap, multiprocessing, zipfile, hashlib, json, codecs, gc, time
+from collections import deque
+from itertools import chain, islice
+
+csv.field_size_limit(512000)
+
+if __name__ == "__main__":
+    # Check the text file parser against csv.reader: python SSURGO_TabularReader.py
+    CheckSplitBlock()
+    print "SplitBlock matches csv.reader"
@@ -115,14 +115,12 @@ def CheckWSS(missingList):
         dRequest["query"] = sQuery
         jData = json.dumps(dRequest)
 
-        # Send request to SDA Tabular service using urllib2 library
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        # Send request to SDA Tabular service
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         # Convert the returned JSON string into a Python dictionary.
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         # Find data section (key='Table')
         valList = list()
@@ -332,6 +330,7 @@ def ClipMupolygon(gdb, aoiLayer, aoiField, aoiValue, aliasName):
 # Import system modules
 import sys, string, os, locale, traceback, arcpy
 from arcpy import env
+import SSURGO_SDAClient
 
 # Create the Geoprocessor object
 try:
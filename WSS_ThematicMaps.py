@@ -99,11 +99,9 @@ def GetSaveRest(sdaURL, sQuery, totalAcres):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         if not "Table" in data:
             raise MyError, "Query failed to select anything: \n " + sQuery
@@ -1253,11 +1251,9 @@ def AttributeRequest(sdaURL, outputTable, sQuery, keyField):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         if not "Table" in data:
             raise MyError, "Query failed to select anything: \n " + sQuery
@@ -2241,6 +2237,7 @@ def UpdateMetadata_WorksMostly(outputWS, target, surveyInfo, description, remove
 
 # Import system modules
 import sys, string, os, arcpy, locale, traceback, json, csv,  urllib2, httplib
+import SSURGO_SDAClient
 from arcpy import env
 from copy import deepcopy
 import xml.etree.cElementTree as ET
@@ -86,6 +86,50 @@
 # 2017-08-14 Altered Unique values legend code to skip the map symbology section for very large layers
 #
 # 2018-06-30 Addressed issue with some Raster maps-classified had color ramp set backwards. Added new logic and layer files.
+#
+# 2026-10-18 AggregateHz_WTA_SUM, AggregateHz_WTA_WTA, AggregateHz_DCP_WTA and AggregateHz_MaxMin_* now read the
+# initial table into arrays and aggregate with the NumPy kernels in SSURGO_HorizonAggregation.py. Same ratings as before.
+# COMPPCT_R is now always the map unit's own value. WTA_SUM writes the total comppct_r, the same as WTA_WTA. DCP_WTA
+# writes the dominant comppct_r for a map unit where no dominant component has a rating. In both cases the old code
+# wrote whatever value was left in the loop variable from an earlier component or map unit.
+#
+# 2026-10-18 Batch mode for map series. ReadBatchTables reads MAPUNIT, COMPONENT and CHORIZON once for all of the
+# maps and BatchTable serves the ReadTable calls in CreateSoilMap from memory. Call ClearBatchTables when finished.
+#
+# 2026-10-18 Persistent column cache (SSURGO_ColumnCache.py) in a [database]_columns folder next to the geodatabase.
+# MAPUNIT, COMPONENT, CHORIZON and COINTERP columns are read with a cursor once and memory-mapped after that. The
+# cache is rebuilt when sacatalog.saverest or the table record count changes. Set bColumnCache = False to turn it off.
+#
+# 2026-10-18 Rating table cache in a [database]_ratings folder. The SDV_* table, outputValues and rating domain are
+# saved under a hash of the CreateSoilMap parameters, input areasymbols and database fingerprint, and restored in bulk
+# when the same map is made again. Set bRatingCache = False to turn it off.
+#
+# 2026-10-18 AggregateCo_DCP, AggregateCo_DCD, AggregateCo_DCD_Domain, AggregateCo_DCP_Domain and AggregateCo_Mo_*
+# no longer use an ORDER BY on the initial table. MapunitOrder groups the records by mukey and sorts each map unit.
+#
+# 2026-10-18 Horizon overlap matrix for the standard depth intervals (SSURGO_HorizonAggregation.standardDepths) is
+# saved with the column cache. The horizon aggregation kernels look up the thickness for a standard interval by CHKEY.
+#
+# 2026-10-18 COINTERP records for an interpretation are sliced from a RULEKEY key index in the column cache instead of
+# scanning the table. Text columns with fewer than 32767 distinct values are stored as int16 codes.
+#
+# 2026-10-18 CreateRatingTables makes the rating tables for a map series in a pool of worker processes, each with its
+# own scratch geodatabase, and saves them to the rating table cache. The map layers are still built one at a time in
+# ArcMap. Set ratingWorkers = 1 to turn it off.
+#
+# 2026-10-18 Stage profiler. Set bProfile = True to write a JSON trace per map with the wall time, rows processed and
+# memory (working set before and after, and the increase in peak memory) for GetSDVAtts, each table read,
+# CreateRatingTable*, the Aggregate* function, legend building, layer creation and UpdateMetadata.
+#
+# 2026-10-18 UpdateSoilMap re-aggregates only the map units whose component or horizon data changed and merges
+# them into the existing rating table. The legend range is extended when the new ratings fall outside of it.
+# gSSURGO_CreateSoilMaps runs it for the survey areas re-imported by an incremental database update (SurveyMukeys).
+#
+# 2026-10-18 The SDV_Data initial table is kept in memory and streamed to the aggregation functions in MUKEY order
+# instead of being written to the geodatabase and read back. Set bSaveInitialTable = True to write it out for debugging.
+#
+# 2026-10-18 CreateRatingTables leaves maps that are already in the rating table cache out of the pool, so that only the
+# main process writes to the input geodatabase. Column cache writes are serialized with SSURGO_ColumnCache.CacheLock.
 
 
 ## ===================================================================================
@@ -2116,13 +2160,21 @@ def ClassBreaksJSON(outputTbl, outputValues, ratingField, bFuzzy):
             cointerpTbl = os.path.join(gdb, "cointerp")
 
             #PrintMsg(" \nGetting poor fuzzy value from " + cointerpTbl, 1)
+            cachedValue = None
 
-            with arcpy.da.SearchCursor(cointerpTbl, ["interphr"], where_clause=whereClause) as cur:
-                for rec in cur:
-                    interphr = rec[0]
-                    break
+            if bColumnCache:
+                cachedValue = CachedInterpValue(ruleKey[2:-2].split("','"), firstClass, interphr)
+
+            if cachedValue is None:
+                with arcpy.da.SearchCursor(cointerpTbl, ["interphr"], where_clause=whereClause) as cur:
+                    for rec in cur:
+                        interphr = rec[0]
+                        break
+
+                    #PrintMsg(" \nInterp rating poor: " + str(interphr), 1)
 
-                #PrintMsg(" \nInterp rating poor: " + str(interphr), 1)
+            else:
+                interphr = cachedValue
 
             # check interphr (fuzzy value) for the 'poorest' rating. Default to a value of 1.0
 
@@ -3315,7 +3367,7 @@ def CreateRasterMapLayer(inputLayer, outputTbl, outputLayer, outputLayerFile, ou
             else:
                 # Get basic classified legend from data
                 # Need to round off max value
-                classBV, classBL = GetNumericLegend(outputValues)
+                classBV, classBL = ProfileCall(GetNumericLegend, outputValues)
 
                 
         envUser = arcpy.GetSystemEnvironment("USERNAME")
@@ -3485,6 +3537,9 @@ def ReadTable(tbl, flds, wc, level, sql):
         # Open table with cursor
         iCnt = 0
 
+        # Update mode, only read the records for the changed map units
+        wc = UpdateQuery(flds, wc)
+
         # ReadTable Diagnostics
         if bVerbose:
             if wc == "":
@@ -3518,278 +3573,1442 @@ def ReadTable(tbl, flds, wc, level, sql):
         return dict()
 
 ## ===================================================================================
-def ListMonths():
-    # return list of months
+def ReadBatchTables(inputLayer, mapSpecs, sRV):
+    # Batch mode for a series of soil maps (gSSURGO_CreateSoilMaps, gSSURGO_CreateSoilMapSet).
+    # Read the MAPUNIT, COMPONENT and CHORIZON tables once, using the union of the columns
+    # needed by all of the maps, and keep the records in dBatchTables. ReadTable calls in
+    # CreateSoilMap are then served from memory by BatchTable instead of rescanning each table.
+    #
+    # mapSpecs is a list of (sdvAtt, aggMethod, top, bot). The depth ranges are applied
+    # later by BatchTable, so all horizons are read here.
+    #
+    # When bColumnCache is set, the records come from the persistent column cache
+    # (see CachedColumns) instead of a cursor.
+    #
     try:
-        moList = ['NULL', 'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
-        return moList
+        global dBatchTables
+        dBatchTables = dict()
 
-    except:
-        errorMsg()
-        return []
+        desc = arcpy.Describe(inputLayer)
+        batchGDB = os.path.dirname(desc.catalogPath)
 
-## ===================================================================================
-def GetAreasymbols(gdb):
-    # return a dictionary for AREASYMBOL. Key = LKEY and Value = AREASYMBOL
-    #
-    try:
-        dAreasymbols = dict()
+        dBatchFlds = dict()
+        dBatchFlds["MAPUNIT"] = ["MUKEY", "MUSYM", "MUNAME", "LKEY"]
+        dBatchFlds["COMPONENT"] = ["MUKEY", "COKEY", "COMPNAME", "COMPPCT_R"]
+        dBatchFlds["CHORIZON"] = ["COKEY", "CHKEY", "HZDEPT_R", "HZDEPB_R"]
 
-        inputTbl = os.path.join(gdb, "LEGEND")
+        dBatchSQL = dict()
+        dBatchSQL["MAPUNIT"] = (None, "ORDER BY MUKEY ASC")
+        dBatchSQL["COMPONENT"] = (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC")
+        dBatchSQL["CHORIZON"] = (None, "ORDER BY COKEY ASC, HZDEPT_R ASC")
 
-        # Get list of areasymbols from input feature layer
-        #
-        # I should probably compare the count of the featureclass vs the count of the featurelayer. If they are the
-        # same, then just use the legend and skip this next part. I'm assuming that if the input featureclass name
-        # is NOT "MUPOLYGON" then this is a subset and will automatically get the list from the input layer.
-        #
-        #
-        if (fcCnt != polyCnt or os.path.basename(fc) != "MUPOLYGON") and dataType != "rasterlayer":
-            areasymbolList = list()  # new code
-            PrintMsg(" \nGetting list of areasymbols from the input soils layer", 1)
-            #sqlClause = ("DISTINCT", "ORDER BY AREASYMBOL")
-            sqlClause = ("DISTINCT", None)
+        # Same sort order for the column cache. (field, descending)
+        dBatchOrder = dict()
+        dBatchOrder["MAPUNIT"] = [("MUKEY", False)]
+        dBatchOrder["COMPONENT"] = [("MUKEY", False), ("COMPPCT_R", True)]
+        dBatchOrder["CHORIZON"] = [("COKEY", False), ("HZDEPT_R", False)]
 
-            with arcpy.da.SearchCursor(inputTbl, ["AREASYMBOL"], sql_clause=sqlClause) as cur:  # new code
-                for rec in cur:  # new code
-                    areasymbolList.append(rec[0].encode('ascii')) # new code
+        # Get the attribute column for each of the soil maps
+        sdvAtts = list()
 
-            areasymbolList.sort()
-            PrintMsg(" \nFinished getting list of areasymbols (" + Number_Format(len(areasymbolList), 0, True) + ") for the input soils layer", 1)
+        for spec in mapSpecs:
+            if not spec[0] in sdvAtts:
+                sdvAtts.append(spec[0])
 
-            # Now get associated mapunit-legend keys for use in other queries
-            #
-            if len(areasymbolList) == 1:
-                whereClause = "AREASYMBOL = '" + areasymbolList[0] + "'"
+        bHorizons = False
+        sdvattTable = os.path.join(batchGDB, "sdvattribute")
+        flds = ["attributename", "attributetablename", "attributecolumnname", "horzlevelattribflag"]
 
-            else:
-                whereClause = "AREASYMBOL IN " + str(tuple(areasymbolList))
+        with arcpy.da.SearchCursor(sdvattTable, flds) as cur:
+            for rec in cur:
+                attName, tblName, colName, hzFlag = rec
 
-            with arcpy.da.SearchCursor(inputTbl, ["LKEY", "AREASYMBOL"], where_clause=whereClause) as cur:
-                for rec in cur:
-                    if rec[1] in areasymbolList:  # dAreasymbol[lkey] = areasymbol
-                        dAreasymbols[rec[0]] = rec[1]
+                if not attName in sdvAtts:
+                    continue
 
-        else:
-            # For raster layers, get AREASYMBOL from legend table. Not ideal, but alternatives could be much slower.
-            # PrintMsg(" \nGetting list of areasymbols from " + inputTbl + "...", 1)
+                if hzFlag == 1 or tblName.upper() == "CHORIZON":
+                    bHorizons = True
 
-            with arcpy.da.SearchCursor(inputTbl, ["LKEY", "AREASYMBOL"], sql_clause=(None, "ORDER BY areasymbol ASC")) as cur:
-                for rec in cur:
-                    # This will fail if Null values exists in the legend table
-                    lkey = rec[0].encode('ascii')
-                    areasym = rec[1].encode('ascii')
-                    dAreasymbols[lkey] = str(areasym)
-                    #PrintMsg("\t" + lkey + "\t" + areasym, 1)
+                if tblName.upper() in dBatchFlds and not colName is None:
+                    # Same low and high column substitution as GetSDVAtts
+                    if colName.endswith("_r") and sRV == "Low":
+                        colName = colName.replace("_r", "_l")
 
-        #PrintMsg(" \ndAreasymbols: " + str(dAreasymbols), 1)
-        
-        return dAreasymbols
+                    elif colName.endswith("_r") and sRV == "High":
+                        colName = colName.replace("_r", "_h")
 
-    except:
-        errorMsg()
-        return dAreasymbols
+                    if not colName.upper() in dBatchFlds[tblName.upper()]:
+                        dBatchFlds[tblName.upper()].append(colName.upper())
 
-## ===================================================================================
-def GetSDVAtts(gdb, sdvAtt, aggMethod, tieBreaker, bFuzzy, sRV):
-    # Create a dictionary containing SDV attributes for the selected attribute fields
-    #
-    try:
-        # Open sdvattribute table and query for [attributename] = sdvAtt
-        dSDV = dict()  # dictionary that will store all sdvattribute data using column name as key
-        sdvattTable = os.path.join(gdb, "sdvattribute")
-        flds = [fld.name for fld in arcpy.ListFields(sdvattTable)]
-        sql1 = "attributename = '" + sdvAtt + "'"
+        if not bHorizons:
+            # None of these maps use horizon data
+            del dBatchFlds["CHORIZON"]
 
-        if bVerbose:
-            PrintMsg(" \nReading sdvattribute table into dSDV dictionary", 1)
+        if len(mapSpecs) > 1:
+            PrintMsg(" \nReading input data once for a series of " + str(len(mapSpecs)) + " soil maps", 0)
 
-        with arcpy.da.SearchCursor(sdvattTable, "*", where_clause=sql1) as cur:
-            rec = cur.next()  # just reading first record
-            i = 0
-            for val in rec:
-                dSDV[flds[i].lower()] = val
-                #PrintMsg(str(i) + ". " + flds[i] + ": " + str(val), 0)
-                i += 1
+        fingerprint = None
 
-        # Revise some attributes to accomodate fuzzy number mapping code
-        #
-        # Temporary workaround for NCCPI. Switch from rating class to fuzzy number
+        if bColumnCache:
+            fingerprint = CacheFingerprint(batchGDB)
 
-        if dSDV["interpnullsaszeroflag"]:
-            bZero = True
+        for tbl in ["MAPUNIT", "COMPONENT", "CHORIZON"]:
+            if not tbl in dBatchFlds:
+                continue
 
-        if dSDV["attributetype"].lower() == "interpretation" and (dSDV["effectivelogicaldatatype"].lower() == "float" or bFuzzy == True):
-            #PrintMsg(" \nOver-riding attributecolumnname for " + sdvAtt, 1)
-            dSDV["attributecolumnname"] = "INTERPHR"
+            arcpy.SetProgressorLabel("Reading input data (" + tbl.lower() +")")
+            start = time.time()
+            dColumns = None
 
-            # WHAT HAPPENS IF I SKIP THIS NEXT SECTION. DOES IT BREAK EVERYTHING ELSE WHEN THE USER SETS bFuzzy TO True?
-            # Test is ND035, Salinity Risk%
-            # Answer: It breaks my map legend.
+            if bColumnCache:
+                dColumns = CachedColumns(batchGDB, tbl, dBatchFlds[tbl], fingerprint)
 
-            if dSDV["attributetype"].lower() == "interpretation" and dSDV["attributelogicaldatatype"].lower() == "string" and dSDV["effectivelogicaldatatype"].lower() == "float":
-                #PrintMsg("\tIdentified " + sdvAtt + " as being an interp with a numeric rating", 1)
-                pass
+            if dColumns is not None:
+                index = SSURGO_ColumnCache.SortOrder([(dColumns[fld], bDesc) for fld, bDesc in dBatchOrder[tbl]])
+                rows = zip(*[SSURGO_ColumnCache.ColumnValues(dColumns[fld], index) for fld in dBatchFlds[tbl]])
+                del dColumns, index
 
             else:
-            #if dSDV["nasisrulename"][0:5] != "NCCPI":
-                # This comes into play when user selects option to create soil map using interp fuzzy values instead of rating classes.
-                dSDV["effectivelogicaldatatype"] = 'float'
-                dSDV["attributelogicaldatatype"] = 'float'
-                dSDV["maplegendkey"] = 3
-                dSDV["maplegendclasses"] = 5
-                dSDV["attributeprecision"] = 2
+                with arcpy.da.SearchCursor(os.path.join(batchGDB, tbl.lower()), dBatchFlds[tbl], sql_clause=dBatchSQL[tbl]) as cur:
+                    rows = list(cur)
 
+            dBatchTables[tbl] = (batchGDB, dBatchFlds[tbl], rows)
+            PrintMsg("\tRead " + Number_Format(len(rows), 0, True) + " " + tbl.lower() + " records in " + elapsedTime(start), 0)
 
-        #else:
-            # Diagnostic for batch mode NCCPI
-            #PrintMsg(" \n" + dSDV["attributetype"].lower() + "; " + dSDV["effectivelogicaldatatype"] + "; " + str(bFuzzy), 1)
+        return True
 
+    except:
+        errorMsg()
+        dBatchTables = dict()
+        return False
 
-        # Workaround for sql whereclause stored in sdvattribute table. File geodatabase is case sensitive.
-        if dSDV["sqlwhereclause"] is not None:
-            sqlParts = dSDV["sqlwhereclause"].split("=")
-            dSDV["sqlwhereclause"] = 'UPPER("' + sqlParts[0] + '") = ' + sqlParts[1].upper()
+## ===================================================================================
+def CacheFingerprint(batchGDB):
+    # Fingerprint for the persistent column cache (SSURGO_ColumnCache.py), using the
+    # survey versions in the sacatalog table. Any re-import of a survey changes it.
+    #
+    try:
+        items = list()
 
-        if dSDV["attributetype"].lower() == "interpretation" and bFuzzy == False and dSDV["notratedphrase"] is None:
-            # Add 'Not rated' to choice list
-            dSDV["notratedphrase"] = "Not rated" # should not have to do this, but this is not always set in Rule Manager
+        with arcpy.da.SearchCursor(os.path.join(batchGDB, "sacatalog"), ["AREASYMBOL", "SAVEREST"]) as cur:
+            for rec in cur:
+                items.append(str(rec[0]) + ":" + str(rec[1]))
 
-        if dSDV["secondaryconcolname"] is not None and dSDV["secondaryconcolname"].lower() == "yldunits":
-            # then this would be units for legend (component crop yield)
-            #PrintMsg(" \nSetting units of measure to: " + secCst, 1)
-            dSDV["attributeuomabbrev"] = secCst
+        return SSURGO_ColumnCache.Fingerprint(items)
 
-        if dSDV["attributecolumnname"].endswith("_r") and sRV in ["Low", "High"]:
-            # This functionality is not available with SDV or WSS. Does not work with interps.
-            #
-            if sRV == "Low":
-                dSDV["attributecolumnname"] = dSDV["attributecolumnname"].replace("_r", "_l")
+    except:
+        errorMsg()
+        return None
 
-            elif sRV == "High":
-                dSDV["attributecolumnname"] = dSDV["attributecolumnname"].replace("_r", "_h")
+## ===================================================================================
+def CachedColumns(batchGDB, tbl, flds, fingerprint):
+    # Return a dictionary of memory-mapped columns (key = field name) for a table from the
+    # persistent column cache. Columns that are not cached yet are read with one cursor
+    # and saved for the next map.
+    #
+    # Returns None if the cache cannot be used, so that the caller can read the table instead.
+    #
+    try:
+        if fingerprint is None:
+            return None
 
-            #PrintMsg(" \nUsing attribute column " + dSDV["attributecolumnname"], 1)
+        tblPath = os.path.join(batchGDB, tbl.lower())
+        dKinds = dict()
 
-        # Working with sdvattribute tiebreak attributes:
-        # tiebreakruleoptionflag (0=cannot change, 1=can change)
-        # tiebreaklowlabel - if null, defaults to 'Lower'
-        # tiebreaklowlabel - if null, defaults to 'Higher'
-        # tiebreakrule -1=use lower  1=use higher
-        if dSDV["tiebreaklowlabel"] is None:
-            dSDV["tiebreaklowlabel"] = "Lower"
+        for fld in arcpy.ListFields(tblPath):
+            if fld.type in ["String", "GUID", "GlobalID"]:
+                dKinds[fld.name.upper()] = "text"
 
-        if dSDV["tiebreakhighlabel"] is None:
-            dSDV["tiebreakhighlabel"] = "Higher"
+            elif fld.type in ["SmallInteger", "Integer", "OID"]:
+                dKinds[fld.name.upper()] = "int"
 
-        if tieBreaker == dSDV["tiebreakhighlabel"]:
-            #PrintMsg(" \nUpdating dAgg", 1)
-            dAgg["Minimum or Maximum"] = "Max"
+            elif fld.type in ["Single", "Double"]:
+                dKinds[fld.name.upper()] = "float"
 
-        else:
-            dAgg["Minimum or Maximum"] = "Min"
-            #PrintMsg(" \nUpdating dAgg", 1)
+        for fld in flds:
+            if not fld in dKinds:
+                # Date and other field types are not cached
+                return None
 
-        if aggMethod == "":
-            aggMethod = dSDV["algorithmname"]
+        recCnt = int(arcpy.GetCount_management(tblPath).getOutput(0))
+        dCached = SSURGO_ColumnCache.TableColumns(batchGDB, tbl, fingerprint, recCnt)
+        missing = list()
 
-        if dAgg[aggMethod] != "":
-            dSDV["resultcolumnname"] = dSDV["resultcolumnname"] + "_" + dAgg[aggMethod]
+        for fld in flds:
+            if not fld in dCached and not fld in missing:
+                missing.append(fld)
 
-        #PrintMsg(" \nSetting resultcolumn name to: '" + dSDV["resultcolumnname"] + "'", 1)
+        if len(missing) > 0:
+            # Only one process at a time adds columns. Another process (CreateRatingTables
+            # worker) may have saved some of them while this one waited for the lock.
+            with SSURGO_ColumnCache.CacheLock(batchGDB):
+                dCached = SSURGO_ColumnCache.TableColumns(batchGDB, tbl, fingerprint, recCnt)
+                missing = [fld for fld in missing if not fld in dCached]
 
+                if len(missing) > 0:
+                    # Read the new columns in OBJECTID order so that they line up with the cached columns
+                    arcpy.SetProgressorLabel("Adding " + tbl.lower() + " columns to the column cache")
+                    start = time.time()
+                    oidName = arcpy.Describe(tblPath).OIDFieldName
 
+                    with arcpy.da.SearchCursor(tblPath, missing, sql_clause=(None, "ORDER BY " + oidName)) as cur:
+                        columns = SSURGO_ColumnCache.BuildColumns(cur, [dKinds[fld] for fld in missing])
 
-        return dSDV
+                    if len(columns[0]["data"]) != recCnt:
+                        return None
+
+                    SSURGO_ColumnCache.SaveColumns(batchGDB, tbl, fingerprint, recCnt, missing, columns)
+                    PrintMsg("\tSaved " + Number_Format(len(missing), 0, True) + " " + tbl.lower() + " columns to the column cache in " + elapsedTime(start), 0)
+
+        dColumns = dict()
+
+        for fld in flds:
+            dColumns[fld] = SSURGO_ColumnCache.LoadColumn(batchGDB, tbl, fld, dKinds[fld])
+
+        return dColumns
 
     except:
-        errorMsg()
-        return dSDV
+        PrintMsg("\tUnable to use the column cache for " + tbl.lower() + ", reading the table instead", 1)
+        return None
 
 ## ===================================================================================
-def GetRuleKey(distinterpTbl, nasisrulename):
+def CachedInterpTable(tbl, flds, ruleKeys):
+    # Return the same dictionary as ReadTable for the COINTERP records with any of the
+    # rulekeys, using the column cache instead of a RULEKEY IN (...) query.
+    # The records for each rulekey are sliced from the RULEKEY key index, so only the
+    # rows for this interpretation are read.
+    # Returns None if the cache cannot be used.
+    #
+    try:
+        arcpy.SetProgressorLabel("Reading input data (" + tbl.lower() +")")
+        start = time.time()
 
-    # distinterpmd: rulekey, rulekey
-    # cointerp: mrulekey, mrulename, ruledepth=0
-    # Need to determine if there is always 1:1 for rulekey and rulename
+        dColumns = CachedColumns(gdb, tbl, flds + ["RULEKEY"], CacheFingerprint(gdb))
 
-    try:
-        #bVerbose = True
-        whereClause = "rulename = '" + nasisrulename + "'"
-        ruleKeys = list()
+        if dColumns is None:
+            return None
 
-        with arcpy.da.SearchCursor(distinterpTbl, ["rulekey"], where_clause=whereClause) as mCur:
-            for rec in mCur:
-                ruleKey = rec[0].encode('ascii')
+        keyIndex = SSURGO_ColumnCache.KeyIndex(gdb, tbl, "RULEKEY", dColumns["RULEKEY"])
+        index = SSURGO_ColumnCache.KeyRows(dColumns["RULEKEY"], keyIndex, ruleKeys)
+        columns = [SSURGO_ColumnCache.ColumnValues(dColumns[fld], index) for fld in flds]
+        dTbl = dict()
 
-                if not ruleKey in ruleKeys:
-                    ruleKeys.append(ruleKey)
+        # Update mode, only the records for the changed map units
+        updateKeys = dUpdateKeys.get(flds[0], None)
 
-        if len(ruleKeys) == 1:
-            keyString = "('" + ruleKeys[0] + "')"
+        for rec in zip(*columns):
+            if not updateKeys is None and not rec[0] in updateKeys:
+                continue
 
-        else:
-            keyString = "('" + "','".join(ruleKeys) + "')"
+            val = list(rec[1:])
 
-        #if len(ruleKeys) > 1:
-        #    PrintMsg("\tFound " + str(len(ruleKeys)) + " rulekey values for " + nasisrulename + ": " + str(ruleKeys), 1)
+            try:
+                dTbl[rec[0]].append(val)
 
-        #elif len(ruleKeys) == 0:
-        #    return None
+            except:
+                dTbl[rec[0]] = [val]
 
         if bVerbose:
-            PrintMsg("\tSQL for " + nasisrulename + ": " + keyString, 1)
-
-        return keyString
+            theMsg = " \nProcessed " + Number_Format(len(index), 0, True) + " " +tbl + " records in " + elapsedTime(start) + " (column cache)"
+            PrintMsg(theMsg, 0)
 
-    except MyError, e:
-        PrintMsg(str(e), 2)
-        return None
+        return dTbl
 
     except:
         errorMsg()
         return None
 
 ## ===================================================================================
-def GetRatingDomain(gdb):
-    # return list of tiebreak domain values for rating
-    # modify this function to use uppercase string version of values
+def CachedInterpValue(ruleKeys, interphrc, interphr):
+    # Return the fuzzy value (interphr) of the first COINTERP record for the rulekeys with
+    # the rating class interphrc, from the column cache. interphr is returned when there is
+    # no matching record. Returns None if the cache cannot be used.
     #
-    # The tiebreak domain name is not always used, even when there is a set
-    # of domain names for the attribute (eg Conservation Tree and Shrub Group)
-
     try:
+        fingerprint = CacheFingerprint(gdb)
+        dColumns = CachedColumns(gdb, "COINTERP", ["RULEKEY", "INTERPHRC", "INTERPHR"], fingerprint)
 
-        # Get possible result domain values from mdstattabcols and mdstatdomdet tables
-        mdcols = os.path.join(gdb, "mdstatdomdet")
-        domainName = dSDV["tiebreakdomainname"]
-        #PrintMsg(" \nUsing domain name: " + str(domainName), 1)
-        domainValues = list()
+        if dColumns is None:
+            return None
 
-        if dSDV["tiebreakdomainname"] is not None:
-            wc = "domainname = '" + dSDV["tiebreakdomainname"] + "' and choiceobsolete = 'No'"
+        keyIndex = SSURGO_ColumnCache.KeyIndex(gdb, "COINTERP", "RULEKEY", dColumns["RULEKEY"])
+        index = SSURGO_ColumnCache.KeyRows(dColumns["RULEKEY"], keyIndex, ruleKeys)
 
-            sc = (None, "ORDER BY choicesequence ASC")
+        for iRow, ratingClass in zip(index.tolist(), SSURGO_ColumnCache.ColumnValues(dColumns["INTERPHRC"], index)):
+            if ratingClass == interphrc:
+                return SSURGO_ColumnCache.ColumnValues(dColumns["INTERPHR"], [iRow])[0]
 
-            with arcpy.da.SearchCursor(mdcols, ["choice", "choicesequence"], where_clause=wc, sql_clause=sc) as cur:
-                for rec in cur:
-                    val = rec[0]
+        return interphr
 
-                    if not val in domainValues:
-                        domainValues.append(val)
+    except:
+        errorMsg()
+        return None
 
-            #if not None in domainValues:
-            #    domainValues.append(None)
-                
+## ===================================================================================
+def OverlapFields(initialTbl, top, bot):
+    # Return ["CHKEY"] when the horizon kernels can use the overlap matrix from the column
+    # cache for this depth range, otherwise an empty list
+    #
+    try:
+        if not bColumnCache or not (top, bot) in SSURGO_HorizonAggregation.standardDepths:
+            return []
 
-        return domainValues
+        if not "CHKEY" in InitialFields(initialTbl):
+            return []
+
+        return ["CHKEY"]
 
     except:
-        errorMsg()
         return []
 
 ## ===================================================================================
-def GetValuesFromLegend(dLegend):
+def AttachHorizonOverlap(dHz):
+    # Attach the chorizon overlap matrix for the standard depth intervals to the horizon
+    # arrays. The matrix is built from the cached CHORIZON depth columns the first time and
+    # saved in the column cache. Without it the kernels calculate the horizon thickness.
+    #
+    try:
+        if not "chkeys" in dHz:
+            return False
+
+        fingerprint = CacheFingerprint(gdb)
+        dColumns = CachedColumns(gdb, "CHORIZON", ["CHKEY", "HZDEPT_R", "HZDEPB_R"], fingerprint)
+
+        if dColumns is None:
+            return False
+
+        recCnt = len(dColumns["CHKEY"]["data"])
+        depths = SSURGO_HorizonAggregation.standardDepths
+        overlap = SSURGO_ColumnCache.LoadOverlap(gdb, "CHORIZON", fingerprint, recCnt, depths)
+
+        if overlap is None:
+            with SSURGO_ColumnCache.CacheLock(gdb):
+                # Another process may have saved the matrix while this one waited for the lock
+                overlap = SSURGO_ColumnCache.LoadOverlap(gdb, "CHORIZON", fingerprint, recCnt, depths)
+
+                if overlap is None:
+                    start = time.time()
+                    hzdept = SSURGO_ColumnCache.FloatValues(dColumns["HZDEPT_R"])
+                    hzdepb = SSURGO_ColumnCache.FloatValues(dColumns["HZDEPB_R"])
+                    overlap = SSURGO_HorizonAggregation.OverlapMatrix(hzdept, hzdepb, depths)
+                    SSURGO_ColumnCache.SaveOverlap(gdb, "CHORIZON", fingerprint, recCnt, overlap)
+                    PrintMsg("\tSaved chorizon overlap for " + str(len(depths)) + " standard depth intervals to the column cache in " + elapsedTime(start), 0)
+
+        hzRows = SSURGO_ColumnCache.ColumnRows(dColumns["CHKEY"], dHz["chkeys"])
+        SSURGO_HorizonAggregation.AttachOverlap(dHz, overlap, hzRows)
+
+        return True
+
+    except:
+        PrintMsg("\tUnable to use the horizon overlap matrix, calculating horizon thickness instead", 1)
+        return False
+
+## ===================================================================================
+def ClearBatchTables():
+    # Release the records read by ReadBatchTables at the end of a series of soil maps
+    #
+    try:
+        global dBatchTables
+        dBatchTables = dict()
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def BatchTable(tbl, flds, depths=None, cutOff=None, bNotcom=False):
+    # Batch mode replacement for ReadTable. Returns the same dictionary using the records
+    # already read by ReadBatchTables, with the where_clause applied in memory:
+    #
+    #   depths  - (top, bot) horizon filter, same as hzQuery in CreateSoilMap
+    #   cutOff  - COMPPCT_R >= cutOff
+    #   bNotcom - COMPNAME <> 'NOTCOM'
+    #
+    # Returns None when the table or one of the fields is not cached for this database so
+    # that the caller can fall back to ReadTable.
+    #
+    try:
+        if not tbl in dBatchTables:
+            return None
+
+        batchGDB, batchFlds, rows = dBatchTables[tbl]
+
+        if batchGDB != gdb:
+            return None
+
+        for fld in flds:
+            if not fld in batchFlds:
+                return None
+
+        arcpy.SetProgressorLabel("Reading input data (" + tbl.lower() +")")
+        start = time.time()
+
+        iKey = batchFlds.index(flds[0])
+        iVals = [batchFlds.index(fld) for fld in flds[1:]]
+
+        # Update mode, only the records for the changed map units
+        updateKeys = dUpdateKeys.get(flds[0], None)
+
+        if not depths is None:
+            # In SQL the comparisons are never true for a NULL depth
+            top, bot = depths
+            iTop = batchFlds.index("HZDEPT_R")
+            iBot = batchFlds.index("HZDEPB_R")
+
+            if (bot - top) == 1:
+                topVals = set([top])
+                botVals = set([bot])
+
+            else:
+                topVals = set(range(top, bot))
+                botVals = topVals
+
+        if not cutOff is None:
+            iPct = batchFlds.index("COMPPCT_R")
+            iName = batchFlds.index("COMPNAME")
+
+        dTbl = dict()
+        iCnt = 0
+
+        for rec in rows:
+            if not updateKeys is None and not rec[iKey] in updateKeys:
+                continue
+
+            if not depths is None:
+                hzTop = rec[iTop]
+                hzBot = rec[iBot]
+
+                if not (hzTop in topVals or hzBot in botVals or (not hzTop is None and not hzBot is None and hzTop <= top and hzBot >= bot)):
+                    continue
+
+            if not cutOff is None:
+                if rec[iPct] is None or rec[iPct] < cutOff:
+                    continue
+
+                if bNotcom and (rec[iName] is None or rec[iName] == "NOTCOM"):
+                    continue
+
+            val = [rec[i] for i in iVals]
+
+            try:
+                dTbl[rec[iKey]].append(val)
+
+            except:
+                dTbl[rec[iKey]] = [val]
+
+            iCnt += 1
+
+        if bVerbose:
+            theMsg = " \nProcessed " + Number_Format(iCnt, 0, True) + " " +tbl + " records in " + elapsedTime(start) + " (batch)"
+            PrintMsg(theMsg, 0)
+
+        return dTbl
+
+    except:
+        errorMsg()
+        return None
+
+## ===================================================================================
+def RatingCacheKey(params, fingerprint):
+    # Return the key for the rating table cache. params is the list of CreateSoilMap
+    # parameters plus the areasymbols covered by the input layer. fingerprint comes from
+    # CacheFingerprint, so a re-imported survey never gets an old rating table.
+    #
+    try:
+        if fingerprint is None:
+            return None
+
+        md5 = hashlib.md5()
+        md5.update("version:" + str(ratingCacheVersion) + "\n")
+        md5.update("database:" + fingerprint + "\n")
+
+        for param in params:
+            md5.update(unicode(param).encode("utf-8") + "\n")
+
+        return md5.hexdigest()
+
+    except:
+        errorMsg()
+        return None
+
+## ===================================================================================
+def RatingCachePath(ratingKey):
+    # Return the path to a cached rating table
+    # eg. C:\gSSURGO\gSSURGO_NE.gdb -> C:\gSSURGO\gSSURGO_NE_ratings\[ratingKey].pkl
+    #
+    return os.path.join(os.path.splitext(gdb)[0] + "_ratings", ratingKey + ".pkl")
+
+## ===================================================================================
+def ReadRatingCache(ratingKey):
+    # Return the cached rating table for this key, or None
+    #
+    try:
+        if ratingKey is None or not os.path.isfile(RatingCachePath(ratingKey)):
+            return None
+
+        fh = open(RatingCachePath(ratingKey), "rb")
+
+        try:
+            dRating = cPickle.load(fh)
+
+        finally:
+            fh.close()
+
+        return dRating
+
+    except:
+        # Unreadable cache file (interrupted write or older version). It will be replaced.
+        return None
+
+## ===================================================================================
+def SaveRatingCache(ratingKey, outputTbl, outputValues):
+    # Save the map unit rating table, outputValues and the rating domain (dValues, domainValues
+    # and domainValuesUp, which the aggregation functions may have added to) for this key
+    #
+    try:
+        if ratingKey is None or outputTbl == "" or not arcpy.Exists(outputTbl):
+            return False
+
+        fieldList = list()
+
+        for fld in arcpy.ListFields(outputTbl):
+            if fld.type in ["OID", "Geometry"]:
+                continue
+
+            fieldList.append((fld.name, fld.type, fld.precision, fld.scale, fld.length, fld.aliasName))
+
+        with arcpy.da.SearchCursor(outputTbl, [fld[0] for fld in fieldList]) as cur:
+            rows = list(cur)
+
+        dRating = dict()
+        dRating["tblName"] = os.path.basename(outputTbl)
+        dRating["fields"] = fieldList
+        dRating["rows"] = rows
+        dRating["outputValues"] = outputValues
+        dRating["dValues"] = dValues
+        dRating["domainValues"] = domainValues
+        dRating["domainValuesUp"] = domainValuesUp
+
+        cachePath = RatingCachePath(ratingKey)
+
+        if not os.path.isdir(os.path.dirname(cachePath)):
+            os.makedirs(os.path.dirname(cachePath))
+
+        # Write to a temporary file first so that an interrupted save is never read back
+        fh = open(cachePath + ".tmp", "wb")
+
+        try:
+            cPickle.dump(dRating, fh, 2)
+
+        finally:
+            fh.close()
+
+        if os.path.isfile(cachePath):
+            os.remove(cachePath)
+
+        os.rename(cachePath + ".tmp", cachePath)
+
+        return True
+
+    except:
+        PrintMsg("\tUnable to save " + os.path.basename(outputTbl) + " to the rating table cache", 1)
+        return False
+
+## ===================================================================================
+def RestoreRatingTable(dRating):
+    # Recreate the map unit rating table in outputGDB from the rating table cache.
+    # Returns outputTbl, outputValues the same as the aggregation functions.
+    #
+    try:
+        arcpy.SetProgressorLabel("Restoring rating table from the cache")
+        start = time.time()
+
+        outputTbl = os.path.join(outputGDB, dRating["tblName"])
+
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
+
+        arcpy.CreateTable_management(outputGDB, dRating["tblName"])
+
+        dFieldTypes = {"String":"TEXT", "SmallInteger":"SHORT", "Integer":"LONG", "Single":"FLOAT", "Double":"DOUBLE", "Date":"DATE", "GUID":"GUID"}
+
+        for fldName, fldType, fldPrecision, fldScale, fldLength, fldAlias in dRating["fields"]:
+            if fldType == "String":
+                arcpy.AddField_management(outputTbl, fldName, "TEXT", "", "", fldLength, fldAlias)
+
+            else:
+                arcpy.AddField_management(outputTbl, fldName, dFieldTypes[fldType], fldPrecision, fldScale, "", fldAlias)
+
+        with arcpy.da.InsertCursor(outputTbl, [fld[0] for fld in dRating["fields"]]) as cur:
+            for rec in dRating["rows"]:
+                cur.insertRow(rec)
+
+        arcpy.AddIndex_management(outputTbl, "MUKEY", "Indx" + os.path.basename(outputTbl))
+
+        PrintMsg(" \nRestored " + os.path.basename(outputTbl) + " (" + Number_Format(len(dRating["rows"]), 0, True) + " map units) from the rating table cache in " + elapsedTime(start), 0)
+
+        return outputTbl, dRating["outputValues"]
+
+    except:
+        errorMsg()
+        return "", None
+
+## ===================================================================================
+def SeriesRatingKey(fingerprint, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV):
+    # Return the rating table cache key for one map of a series (CreateRatingTables), using
+    # the same defaults from the sdvattribute table as CreateSoilMap applies before it looks
+    # in the cache. The gdb and dAreasymbols globals must be set first.
+    #
+    try:
+        dSDV = GetSDVAtts(gdb, sdvAtt, aggMethod, tieBreaker, bFuzzy, sRV)
+
+        if aggMethod == "":
+            aggMethod = dSDV["algorithmname"]
+
+        if tieBreaker == "":
+            if dSDV["tiebreakrule"] == -1:
+                tieBreaker = dSDV["tiebreaklowlabel"]
+
+                if tieBreaker is None or tieBreaker == "":
+                    tieBreaker = "Lower"
+
+            else:
+                tieBreaker = dSDV["tiebreakhighlabel"]
+
+                if tieBreaker is None:
+                    tieBreaker = "Higher"
+
+        if dSDV["interpnullsaszerooptionflag"]:
+            bZero = True
+
+        if (sdvAtt in ["Surface Texture"] or sdvAtt.endswith("(Surface)")) and not (top == 0 and bot == 1) and __name__ != "__main__":
+            top = 0
+            bot = 1
+
+        params = [sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV, sorted(dAreasymbols.items())]
+
+        return RatingCacheKey(params, fingerprint)
+
+    except:
+        return None
+
+## ===================================================================================
+def CreateRatingTables(inputLayer, mapArgs):
+    # Map series: make the rating tables for a list of soil maps in a pool of worker processes
+    # and save them to the rating table cache. Each worker runs CreateSoilMap with its own
+    # scratch geodatabase for SDV_Data and the SDV_* tables and stops before the map layer.
+    # The CreateSoilMap calls that follow restore each rating table from the cache and only
+    # build the map layer, which has to be done in the ArcMap process.
+    #
+    # Maps that are already in the rating table cache are left out of the pool, so that
+    # only this process restores rating tables into the input geodatabase.
+    #
+    # mapArgs is a list of the CreateSoilMap arguments that follow inputLayer:
+    # (sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV)
+    #
+    # Returns False when the pool is not used and the maps are made one at a time as before.
+    #
+    try:
+        if not bRatingCache or len(mapArgs) < 2:
+            return False
+
+        nWorkers = ratingWorkers
+
+        if nWorkers < 1:
+            nWorkers = multiprocessing.cpu_count() - 1
+
+        nWorkers = min(nWorkers, len(mapArgs))
+
+        if nWorkers < 2:
+            return False
+
+        layerDesc = arcpy.Describe(inputLayer)
+        inputFC = layerDesc.catalogPath
+
+        if not layerDesc.dataType.lower() in ["featurelayer", "featureclass"]:
+            return False
+
+        if int(arcpy.GetCount_management(inputLayer).getOutput(0)) != int(arcpy.GetCount_management(inputFC).getOutput(0)):
+            # The workers read the whole featureclass, so their rating tables would not match a selected set
+            PrintMsg(" \nInput layer has a selected set, soil maps will be created one at a time", 1)
+            return False
+
+        # Leave out the maps that are already in the rating table cache. The globals are the
+        # ones CreateSoilMap sets before it reads the cache.
+        global fc, gdb, dataType, polyCnt, fcCnt, dAreasymbols, bVerbose
+        bVerbose = False
+        fc = inputFC
+        gdb = os.path.dirname(inputFC)
+        dataType = layerDesc.dataType.lower()
+        polyCnt = int(arcpy.GetCount_management(inputFC).getOutput(0))
+        fcCnt = polyCnt
+        dAreasymbols = GetAreasymbols(gdb)
+        fingerprint = CacheFingerprint(gdb)
+
+        newArgs = [args for args in mapArgs if ReadRatingCache(SeriesRatingKey(fingerprint, *args)) is None]
+
+        if len(newArgs) < len(mapArgs):
+            PrintMsg(" \n" + str(len(mapArgs) - len(newArgs)) + " of " + str(len(mapArgs)) + " rating tables are already in the rating table cache", 0)
+
+        mapArgs = newArgs
+        nWorkers = min(nWorkers, len(mapArgs))
+
+        if nWorkers < 2:
+            return False
+
+        # Create the rating table cache folder before the workers try to
+        ratingFolder = os.path.splitext(os.path.dirname(inputFC))[0] + "_ratings"
+
+        if not os.path.isdir(ratingFolder):
+            os.makedirs(ratingFolder)
+
+        PrintMsg(" \nCreating " + str(len(mapArgs)) + " rating tables using " + str(nWorkers) + " processes", 0)
+        arcpy.SetProgressorLabel("Creating rating tables using " + str(nWorkers) + " processes")
+        start = time.time()
+
+        if not os.path.basename(sys.executable).lower().startswith("python"):
+            # Running inside ArcMap. The workers need the Python interpreter, not ArcMap.exe
+            multiprocessing.set_executable(os.path.join(sys.exec_prefix, "pythonw.exe"))
+
+        scratchFolder = tempfile.mkdtemp(prefix="sdv_pool_", dir=env.scratchFolder)
+        pool = multiprocessing.Pool(nWorkers, InitRatingWorker, (scratchFolder,))
+
+        try:
+            results = pool.map(RatingWorker, [(inputFC,) + tuple(args) for args in mapArgs], 1)
+            pool.close()
+
+        except:
+            pool.terminate()
+            raise
+
+        finally:
+            pool.join()
+            shutil.rmtree(scratchFolder, True)
+
+        iDone = len([status for status, seconds in results if status == 1])
+        PrintMsg("\tCreated " + str(iDone) + " of " + str(len(mapArgs)) + " rating tables in " + elapsedTime(start), 0)
+
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def InitRatingWorker(scratchFolder):
+    # Process pool initializer for CreateRatingTables. The worker makes rating tables only,
+    # in its own scratch geodatabase so that no two workers write to the same geodatabase.
+    #
+    global bRatingsOnly, ratingsGDB
+
+    bRatingsOnly = True
+    ratingsGDB = os.path.join(scratchFolder, "worker_" + str(os.getpid()) + ".gdb")
+
+    if not arcpy.Exists(ratingsGDB):
+        arcpy.CreateFileGDB_management(scratchFolder, os.path.basename(ratingsGDB))
+
+    env.overwriteOutput = True
+
+    return
+
+## ===================================================================================
+def RatingWorker(args):
+    # Make one rating table in a worker process. args are the CreateSoilMap arguments.
+    # Returns the CreateSoilMap status (1 = rating table saved) and the elapsed seconds.
+    #
+    start = time.time()
+
+    try:
+        status = CreateSoilMap(*args)
+
+    except:
+        status = 0
+
+    return status, time.time() - start
+
+## ===================================================================================
+def UpdateSoilMap(inputLayer, mukeys, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV, areasymbols=None):
+    # Update mode for an existing soil map. mukeys are the map units whose component, comonth
+    # or horizon data changed. Only those map units are read (UpdateKeys) and aggregated, in the scratch
+    # geodatabase, and their ratings replace the old ones in the existing rating table
+    # (MergeRatingTable). The map layer is then rebuilt the same as CreateSoilMap.
+    #
+    # areasymbols are the re-imported survey areas that mukeys came from (SurveyMukeys). The old
+    # ratings for these survey areas are removed as well, including map units that were dropped.
+    #
+    # Returns the CreateSoilMap status.
+    #
+    global updateMukeys, updateAreasymbols, dUpdateKeys
+
+    try:
+        updateMukeys = set([str(mukey) for mukey in mukeys])
+
+        if not areasymbols is None:
+            updateAreasymbols = set([str(areaSym).upper() for areaSym in areasymbols])
+
+        if len(updateMukeys) == 0:
+            PrintMsg(" \nNo map units to update", 1)
+            return 0
+
+        return CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV)
+
+    finally:
+        updateMukeys = None
+        updateAreasymbols = None
+        dUpdateKeys = dict()
+
+## ===================================================================================
+def UpdateMapunits(mCur):
+    # MAPUNIT records for the initial table. In update mode (UpdateSoilMap) only the
+    # changed map units are returned. MUKEY is the first field.
+    #
+    if updateMukeys is None:
+        return mCur
+
+    return (rec for rec in mCur if rec[0] in updateMukeys)
+
+## ===================================================================================
+def KeyQuery(fld, keys):
+    # Return a where_clause for fld IN (keys). Long key lists are split into several
+    # IN lists of up to 1000 keys.
+    #
+    keys = sorted(keys)
+    inLists = list()
+
+    for i in range(0, len(keys), 1000):
+        inLists.append(fld + " IN ('" + "','".join(keys[i:i + 1000]) + "')")
+
+    if len(inLists) == 1:
+        return inLists[0]
+
+    return "(" + " OR ".join(inLists) + ")"
+
+## ===================================================================================
+def UpdateKeys(gdb):
+    # Update mode (UpdateSoilMap). Return a dictionary with the MUKEY, COKEY and CHKEY values
+    # for the changed map units. ReadTable, BatchTable and CachedInterpTable use it to read
+    # only the records for these map units.
+    #
+    try:
+        dKeys = dict()
+        dKeys["MUKEY"] = set(updateMukeys)
+        dKeys["COKEY"] = set()
+        dKeys["CHKEY"] = set()
+
+        with arcpy.da.SearchCursor(os.path.join(gdb, "component"), ["COKEY"], where_clause=KeyQuery("MUKEY", dKeys["MUKEY"])) as cur:
+            for rec in cur:
+                dKeys["COKEY"].add(str(rec[0]))
+
+        if len(dKeys["COKEY"]) > 0:
+            with arcpy.da.SearchCursor(os.path.join(gdb, "chorizon"), ["CHKEY"], where_clause=KeyQuery("COKEY", dKeys["COKEY"])) as cur:
+                for rec in cur:
+                    dKeys["CHKEY"].add(str(rec[0]))
+
+        return dKeys
+
+    except:
+        errorMsg()
+        return dict()
+
+## ===================================================================================
+def SurveyMukeys(gdb, areasymbols):
+    # Return the list of mukeys for the survey areas that were re-imported by an incremental
+    # update of the database (SSURGO_Convert_to_Geodatabase). Used with UpdateSoilMap.
+    #
+    try:
+        areasymbols = [str(areaSym).upper() for areaSym in areasymbols]
+        lkeys = set()
+        mukeys = list()
+
+        with arcpy.da.SearchCursor(os.path.join(gdb, "legend"), ["LKEY"], where_clause=KeyQuery("AREASYMBOL", areasymbols)) as cur:
+            for rec in cur:
+                lkeys.add(str(rec[0]))
+
+        if len(lkeys) > 0:
+            with arcpy.da.SearchCursor(os.path.join(gdb, "mapunit"), ["MUKEY"], where_clause=KeyQuery("LKEY", lkeys)) as cur:
+                for rec in cur:
+                    mukeys.append(str(rec[0]))
+
+        return mukeys
+
+    except:
+        errorMsg()
+        return None
+
+## ===================================================================================
+def UpdateQuery(flds, wc):
+    # Update mode. Add the key filter from UpdateKeys to the where_clause for a ReadTable call.
+    # The key is the first field (MUKEY, COKEY or CHKEY). Other tables are not filtered.
+    #
+    if len(dUpdateKeys) == 0 or not flds[0] in dUpdateKeys:
+        return wc
+
+    keys = dUpdateKeys[flds[0]]
+
+    if len(keys) == 0:
+        # No records for the changed map units
+        keyQuery = "1 = 0"
+
+    else:
+        keyQuery = KeyQuery(flds[0], keys)
+
+    if wc is None or wc == "":
+        return keyQuery
+
+    return "(" + wc + ") AND " + keyQuery
+
+## ===================================================================================
+def MergeRatingTable(updateTbl, updateValues):
+    # Update mode (UpdateSoilMap). Replace the ratings for the changed map units in the existing
+    # rating table with the ones in updateTbl, which was aggregated in the scratch geodatabase.
+    # A changed map unit that no longer has a rating is removed from the table.
+    #
+    # Returns outputTbl, outputValues for the whole table the same as the aggregation functions.
+    # Numeric ratings get the min and max of the merged table, extended to updateValues (fuzzy
+    # values always cover 0 to 1). Class ratings get every class in the merged table.
+    #
+    try:
+        arcpy.SetProgressorLabel("Merging updated map units into the rating table")
+        start = time.time()
+
+        outputTbl = os.path.join(gdb, os.path.basename(updateTbl))
+        fieldList = [fld.name for fld in arcpy.ListFields(updateTbl) if not fld.type in ["OID", "Geometry"]]
+        dFldTypes = dict([(fld.name.upper(), fld.type) for fld in arcpy.ListFields(outputTbl)])
+
+        for fld in fieldList:
+            if not fld.upper() in dFldTypes:
+                raise MyError, "Field " + fld + " is missing from the existing " + os.path.basename(outputTbl) + " table. Recreate the map."
+
+        ratingFld = dSDV["resultcolumnname"].upper()
+
+        if not ratingFld in dFldTypes:
+            ratingFld = dSDV["attributecolumnname"].upper()
+
+        bNumeric = dFldTypes[ratingFld] in ["SmallInteger", "Integer", "Single", "Double"] and (dSDV["effectivelogicaldatatype"].lower() in ["float", "integer"] or bFuzzy)
+
+        # Remove the old ratings for the changed map units and for the re-imported survey areas
+        delCnt = 0
+
+        if not updateAreasymbols is None and "AREASYMBOL" in dFldTypes:
+            delFlds = ["MUKEY", "AREASYMBOL"]
+
+        else:
+            delFlds = ["MUKEY"]
+
+        with arcpy.da.UpdateCursor(outputTbl, delFlds) as cur:
+            for rec in cur:
+                if rec[0] in updateMukeys or (len(rec) == 2 and not rec[1] is None and rec[1].upper() in updateAreasymbols):
+                    cur.deleteRow()
+                    delCnt += 1
+
+        with arcpy.da.SearchCursor(updateTbl, fieldList) as inCur:
+            with arcpy.da.InsertCursor(outputTbl, fieldList) as outCur:
+                insCnt = 0
+
+                for rec in inCur:
+                    outCur.insertRow(rec)
+                    insCnt += 1
+
+        # outputValues for the merged table
+        ratings = set()
+
+        with arcpy.da.SearchCursor(outputTbl, [ratingFld]) as cur:
+            for rec in cur:
+                if not rec[0] is None and rec[0] != "":
+                    ratings.add(rec[0])
+
+        if bNumeric:
+            ratings.update([val for val in updateValues if not val is None])
+
+            if len(ratings) == 0:
+                outputValues = [0.0, 0.0]
+
+            else:
+                outputValues = [min(ratings), max(ratings)]
+
+        else:
+            outputValues = sorted(ratings)
+
+        if arcpy.Exists(updateTbl):
+            arcpy.Delete_management(updateTbl)
+
+        PrintMsg(" \nUpdated " + os.path.basename(outputTbl) + " (" + Number_Format(delCnt, 0, True) + " map units removed, " + Number_Format(insCnt, 0, True) + " added) in " + elapsedTime(start), 0)
+
+        return outputTbl, outputValues
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return "", None
+
+    except:
+        errorMsg()
+        return "", None
+
+## ===================================================================================
+def StartProfile(sdvAtt, aggMethod, top, bot):
+    # Start the stage profile trace for one soil map (bProfile)
+    #
+    global dProfile
+
+    dProfile = dict()
+    dProfile["sdvattribute"] = sdvAtt
+    dProfile["aggmethod"] = aggMethod
+    dProfile["top"] = top
+    dProfile["bottom"] = bot
+    dProfile["database"] = gdb
+    dProfile["started"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    dProfile["start"] = time.time()
+    dProfile["stages"] = list()
+
+    return
+
+## ===================================================================================
+def ProfileCall(function, *args, **kwargs):
+    # Call function and add a stage to the profile trace: wall time, rows processed and memory.
+    # The process peak only ever goes up, so each stage records the working set before and after
+    # the call and how much the call raised the peak. Just calls function unless bProfile is set.
+    #
+    if not bProfile or len(dProfile) == 0:
+        return function(*args, **kwargs)
+
+    memBefore, peakBefore = ProcessMemory()
+    start = time.time()
+    result = function(*args, **kwargs)
+    seconds = time.time() - start
+    memAfter, peakAfter = ProcessMemory()
+
+    if result is None:
+        # BatchTable has no records for this table and ReadTable is called instead
+        return result
+
+    try:
+        dStage = dict()
+        dStage["stage"] = function.__name__
+        dStage["seconds"] = round(seconds, 3)
+        dStage["rows"] = ProfileRows(function, args, result)
+        dStage["memory_before_mb"] = memBefore
+        dStage["memory_after_mb"] = memAfter
+
+        if not peakBefore is None and not peakAfter is None:
+            dStage["peakmemory_increase_mb"] = round(peakAfter - peakBefore, 1)
+
+        else:
+            dStage["peakmemory_increase_mb"] = None
+
+        if function.__name__ in ["ReadTable", "BatchTable", "CachedInterpTable"]:
+            dStage["table"] = args[0]
+
+        dProfile["stages"].append(dStage)
+
+    except:
+        pass
+
+    return result
+
+## ===================================================================================
+def ProfileRows(function, args, result):
+    # Number of rows processed by a profiled stage, or None
+    #
+    try:
+        if isinstance(result, (dict, list)):
+            # ReadTable, BatchTable, CachedInterpTable
+            return len(result)
+
+        if isinstance(result, tuple) and len(result) > 0 and isinstance(result[0], basestring) and arcpy.Exists(result[0]):
+            # Aggregate functions return outputTbl, outputValues
+            return int(arcpy.GetCount_management(result[0]).getOutput(0))
+
+        if function.__name__.startswith("CreateRating"):
+            # Records written to the initial table
+            for arg in args:
+                if isinstance(arg, basestring) and os.path.basename(arg) == "SDV_Data":
+                    return InitialCount(arg)
+
+        return None
+
+    except:
+        return None
+
+## ===================================================================================
+def PeakMemory():
+    # Peak memory used by this process in megabytes, or None
+    #
+    return ProcessMemory()[1]
+
+## ===================================================================================
+def ProcessMemory():
+    # Current and peak memory used by this process in megabytes: (workingSet, peak).
+    # Either one is None when it is not available.
+    #
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            import ctypes.wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", ctypes.wintypes.DWORD),
+                            ("PageFaultCount", ctypes.wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t),
+                            ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t),
+                            ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+
+            return round(counters.WorkingSetSize / 1048576.0, 1), round(counters.PeakWorkingSetSize / 1048576.0, 1)
+
+        else:
+            import resource
+            # ru_maxrss is in kilobytes on Linux
+            peak = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+            current = None
+
+            if os.path.isfile("/proc/self/statm"):
+                # Resident pages
+                fh = open("/proc/self/statm")
+
+                try:
+                    current = round(int(fh.read().split()[1]) * resource.getpagesize() / 1048576.0, 1)
+
+                finally:
+                    fh.close()
+
+            return current, peak
+
+    except:
+        return None, None
+
+## ===================================================================================
+def SaveProfile():
+    # Write the profile trace for this soil map to a JSON file in the [database]_profile folder
+    # eg. C:\gSSURGO\gSSURGO_NE.gdb -> C:\gSSURGO\gSSURGO_NE_profile\SDV_AWS0_100_20261018_101500.json
+    # Traces from the CreateRatingTables worker processes end with _worker.
+    #
+    try:
+        global dProfile
+
+        if len(dProfile) == 0:
+            return ""
+
+        dProfile["seconds"] = round(time.time() - dProfile["start"], 3)
+        dProfile["peakmemory_mb"] = PeakMemory()
+        del dProfile["start"]
+
+        profileFolder = os.path.splitext(dProfile["database"])[0] + "_profile"
+
+        if not os.path.isdir(profileFolder):
+            os.makedirs(profileFolder)
+
+        if "table" in dProfile:
+            traceName = dProfile["table"]
+
+        else:
+            traceName = "".join([c if c.isalnum() else "_" for c in dProfile["sdvattribute"]])
+
+        traceName = traceName + "_" + time.strftime("%Y%m%d_%H%M%S")
+
+        if bRatingsOnly:
+            traceName = traceName + "_worker"
+
+        traceFile = os.path.join(profileFolder, traceName + ".json")
+        fh = open(traceFile, "w")
+
+        try:
+            json.dump(dProfile, fh, indent=1)
+
+        finally:
+            fh.close()
+
+        dProfile = dict()
+
+        PrintMsg(" \nProfile trace saved to " + traceFile, 0)
+
+        return traceFile
+
+    except:
+        errorMsg()
+        return ""
+
+## ===================================================================================
+def ListMonths():
+    # return list of months
+    try:
+        moList = ['NULL', 'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
+        return moList
+
+    except:
+        errorMsg()
+        return []
+
+## ===================================================================================
+def GetAreasymbols(gdb):
+    # return a dictionary for AREASYMBOL. Key = LKEY and Value = AREASYMBOL
+    #
+    try:
+        dAreasymbols = dict()
+
+        inputTbl = os.path.join(gdb, "LEGEND")
+
+        # Get list of areasymbols from input feature layer
+        #
+        # I should probably compare the count of the featureclass vs the count of the featurelayer. If they are the
+        # same, then just use the legend and skip this next part. I'm assuming that if the input featureclass name
+        # is NOT "MUPOLYGON" then this is a subset and will automatically get the list from the input layer.
+        #
+        #
+        if (fcCnt != polyCnt or os.path.basename(fc) != "MUPOLYGON") and dataType != "rasterlayer":
+            areasymbolList = list()  # new code
+            PrintMsg(" \nGetting list of areasymbols from the input soils layer", 1)
+            #sqlClause = ("DISTINCT", "ORDER BY AREASYMBOL")
+            sqlClause = ("DISTINCT", None)
+
+            with arcpy.da.SearchCursor(inputTbl, ["AREASYMBOL"], sql_clause=sqlClause) as cur:  # new code
+                for rec in cur:  # new code
+                    areasymbolList.append(rec[0].encode('ascii')) # new code
+
+            areasymbolList.sort()
+            PrintMsg(" \nFinished getting list of areasymbols (" + Number_Format(len(areasymbolList), 0, True) + ") for the input soils layer", 1)
+
+            # Now get associated mapunit-legend keys for use in other queries
+            #
+            if len(areasymbolList) == 1:
+                whereClause = "AREASYMBOL = '" + areasymbolList[0] + "'"
+
+            else:
+                whereClause = "AREASYMBOL IN " + str(tuple(areasymbolList))
+
+            with arcpy.da.SearchCursor(inputTbl, ["LKEY", "AREASYMBOL"], where_clause=whereClause) as cur:
+                for rec in cur:
+                    if rec[1] in areasymbolList:  # dAreasymbol[lkey] = areasymbol
+                        dAreasymbols[rec[0]] = rec[1]
+
+        else:
+            # For raster layers, get AREASYMBOL from legend table. Not ideal, but alternatives could be much slower.
+            # PrintMsg(" \nGetting list of areasymbols from " + inputTbl + "...", 1)
+
+            with arcpy.da.SearchCursor(inputTbl, ["LKEY", "AREASYMBOL"], sql_clause=(None, "ORDER BY areasymbol ASC")) as cur:
+                for rec in cur:
+                    # This will fail if Null values exists in the legend table
+                    lkey = rec[0].encode('ascii')
+                    areasym = rec[1].encode('ascii')
+                    dAreasymbols[lkey] = str(areasym)
+                    #PrintMsg("\t" + lkey + "\t" + areasym, 1)
+
+        #PrintMsg(" \ndAreasymbols: " + str(dAreasymbols), 1)
+        
+        return dAreasymbols
+
+    except:
+        errorMsg()
+        return dAreasymbols
+
+## ===================================================================================
+def GetSDVAtts(gdb, sdvAtt, aggMethod, tieBreaker, bFuzzy, sRV):
+    # Create a dictionary containing SDV attributes for the selected attribute fields
+    #
+    try:
+        # Open sdvattribute table and query for [attributename] = sdvAtt
+        dSDV = dict()  # dictionary that will store all sdvattribute data using column name as key
+        sdvattTable = os.path.join(gdb, "sdvattribute")
+        flds = [fld.name for fld in arcpy.ListFields(sdvattTable)]
+        sql1 = "attributename = '" + sdvAtt + "'"
+
+        if bVerbose:
+            PrintMsg(" \nReading sdvattribute table into dSDV dictionary", 1)
+
+        with arcpy.da.SearchCursor(sdvattTable, "*", where_clause=sql1) as cur:
+            rec = cur.next()  # just reading first record
+            i = 0
+            for val in rec:
+                dSDV[flds[i].lower()] = val
+                #PrintMsg(str(i) + ". " + flds[i] + ": " + str(val), 0)
+                i += 1
+
+        # Revise some attributes to accomodate fuzzy number mapping code
+        #
+        # Temporary workaround for NCCPI. Switch from rating class to fuzzy number
+
+        if dSDV["interpnullsaszeroflag"]:
+            bZero = True
+
+        if dSDV["attributetype"].lower() == "interpretation" and (dSDV["effectivelogicaldatatype"].lower() == "float" or bFuzzy == True):
+            #PrintMsg(" \nOver-riding attributecolumnname for " + sdvAtt, 1)
+            dSDV["attributecolumnname"] = "INTERPHR"
+
+            # WHAT HAPPENS IF I SKIP THIS NEXT SECTION. DOES IT BREAK EVERYTHING ELSE WHEN THE USER SETS bFuzzy TO True?
+            # Test is ND035, Salinity Risk%
+            # Answer: It breaks my map legend.
+
+            if dSDV["attributetype"].lower() == "interpretation" and dSDV["attributelogicaldatatype"].lower() == "string" and dSDV["effectivelogicaldatatype"].lower() == "float":
+                #PrintMsg("\tIdentified " + sdvAtt + " as being an interp with a numeric rating", 1)
+                pass
+
+            else:
+            #if dSDV["nasisrulename"][0:5] != "NCCPI":
+                # This comes into play when user selects option to create soil map using interp fuzzy values instead of rating classes.
+                dSDV["effectivelogicaldatatype"] = 'float'
+                dSDV["attributelogicaldatatype"] = 'float'
+                dSDV["maplegendkey"] = 3
+                dSDV["maplegendclasses"] = 5
+                dSDV["attributeprecision"] = 2
+
+
+        #else:
+            # Diagnostic for batch mode NCCPI
+            #PrintMsg(" \n" + dSDV["attributetype"].lower() + "; " + dSDV["effectivelogicaldatatype"] + "; " + str(bFuzzy), 1)
+
+
+        # Workaround for sql whereclause stored in sdvattribute table. File geodatabase is case sensitive.
+        if dSDV["sqlwhereclause"] is not None:
+            sqlParts = dSDV["sqlwhereclause"].split("=")
+            dSDV["sqlwhereclause"] = 'UPPER("' + sqlParts[0] + '") = ' + sqlParts[1].upper()
+
+        if dSDV["attributetype"].lower() == "interpretation" and bFuzzy == False and dSDV["notratedphrase"] is None:
+            # Add 'Not rated' to choice list
+            dSDV["notratedphrase"] = "Not rated" # should not have to do this, but this is not always set in Rule Manager
+
+        if dSDV["secondaryconcolname"] is not None and dSDV["secondaryconcolname"].lower() == "yldunits":
+            # then this would be units for legend (component crop yield)
+            #PrintMsg(" \nSetting units of measure to: " + secCst, 1)
+            dSDV["attributeuomabbrev"] = secCst
+
+        if dSDV["attributecolumnname"].endswith("_r") and sRV in ["Low", "High"]:
+            # This functionality is not available with SDV or WSS. Does not work with interps.
+            #
+            if sRV == "Low":
+                dSDV["attributecolumnname"] = dSDV["attributecolumnname"].replace("_r", "_l")
+
+            elif sRV == "High":
+                dSDV["attributecolumnname"] = dSDV["attributecolumnname"].replace("_r", "_h")
+
+            #PrintMsg(" \nUsing attribute column " + dSDV["attributecolumnname"], 1)
+
+        # Working with sdvattribute tiebreak attributes:
+        # tiebreakruleoptionflag (0=cannot change, 1=can change)
+        # tiebreaklowlabel - if null, defaults to 'Lower'
+        # tiebreaklowlabel - if null, defaults to 'Higher'
+        # tiebreakrule -1=use lower  1=use higher
+        if dSDV["tiebreaklowlabel"] is None:
+            dSDV["tiebreaklowlabel"] = "Lower"
+
+        if dSDV["tiebreakhighlabel"] is None:
+            dSDV["tiebreakhighlabel"] = "Higher"
+
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            #PrintMsg(" \nUpdating dAgg", 1)
+            dAgg["Minimum or Maximum"] = "Max"
+
+        else:
+            dAgg["Minimum or Maximum"] = "Min"
+            #PrintMsg(" \nUpdating dAgg", 1)
+
+        if aggMethod == "":
+            aggMethod = dSDV["algorithmname"]
+
+        if dAgg[aggMethod] != "":
+            dSDV["resultcolumnname"] = dSDV["resultcolumnname"] + "_" + dAgg[aggMethod]
+
+        #PrintMsg(" \nSetting resultcolumn name to: '" + dSDV["resultcolumnname"] + "'", 1)
+
+
+
+        return dSDV
+
+    except:
+        errorMsg()
+        return dSDV
+
+## ===================================================================================
+def GetRuleKey(distinterpTbl, nasisrulename):
+
+    # distinterpmd: rulekey, rulekey
+    # cointerp: mrulekey, mrulename, ruledepth=0
+    # Need to determine if there is always 1:1 for rulekey and rulename
+
+    try:
+        #bVerbose = True
+        whereClause = "rulename = '" + nasisrulename + "'"
+        ruleKeys = list()
+
+        with arcpy.da.SearchCursor(distinterpTbl, ["rulekey"], where_clause=whereClause) as mCur:
+            for rec in mCur:
+                ruleKey = rec[0].encode('ascii')
+
+                if not ruleKey in ruleKeys:
+                    ruleKeys.append(ruleKey)
+
+        if len(ruleKeys) == 1:
+            keyString = "('" + ruleKeys[0] + "')"
+
+        else:
+            keyString = "('" + "','".join(ruleKeys) + "')"
+
+        #if len(ruleKeys) > 1:
+        #    PrintMsg("\tFound " + str(len(ruleKeys)) + " rulekey values for " + nasisrulename + ": " + str(ruleKeys), 1)
+
+        #elif len(ruleKeys) == 0:
+        #    return None
+
+        if bVerbose:
+            PrintMsg("\tSQL for " + nasisrulename + ": " + keyString, 1)
+
+        return keyString
+
+    except MyError, e:
+        PrintMsg(str(e), 2)
+        return None
+
+    except:
+        errorMsg()
+        return None
+
+## ===================================================================================
+def GetRatingDomain(gdb):
+    # return list of tiebreak domain values for rating
+    # modify this function to use uppercase string version of values
+    #
+    # The tiebreak domain name is not always used, even when there is a set
+    # of domain names for the attribute (eg Conservation Tree and Shrub Group)
+
+    try:
+
+        # Get possible result domain values from mdstattabcols and mdstatdomdet tables
+        mdcols = os.path.join(gdb, "mdstatdomdet")
+        domainName = dSDV["tiebreakdomainname"]
+        #PrintMsg(" \nUsing domain name: " + str(domainName), 1)
+        domainValues = list()
+
+        if dSDV["tiebreakdomainname"] is not None:
+            wc = "domainname = '" + dSDV["tiebreakdomainname"] + "' and choiceobsolete = 'No'"
+
+            sc = (None, "ORDER BY choicesequence ASC")
+
+            with arcpy.da.SearchCursor(mdcols, ["choice", "choicesequence"], where_clause=wc, sql_clause=sc) as cur:
+                for rec in cur:
+                    val = rec[0]
+
+                    if not val in domainValues:
+                        domainValues.append(val)
+
+            #if not None in domainValues:
+            #    domainValues.append(None)
+                
+
+        return domainValues
+
+    except:
+        errorMsg()
+        return []
+
+## ===================================================================================
+def GetValuesFromLegend(dLegend):
     # return list of legend values from dLegend (XML source)
     # modify this function to use uppercase string version of values
 
@@ -3860,7 +5079,14 @@ def CreateInitialTable(gdb, allFields, dFieldInfo):
         if arcpy.Exists(os.path.join(tblLoc, initialTbl)):
             arcpy.Delete_management(os.path.join(tblLoc, initialTbl))
 
-        arcpy.CreateTable_management(tblLoc, initialTbl)
+        dInitialTables.clear()
+
+        if not bSaveInitialTable:
+            # Keep the initial table in memory (InitialInsertCursor, InitialCursor)
+            dInitialTables[os.path.join(tblLoc, initialTbl)] = {"fields":list(), "rows":list(), "ordered":True, "lastkey":None}
+
+        else:
+            arcpy.CreateTable_management(tblLoc, initialTbl)
 
         iFlds = len(allFields)
         newField = dSDV["attributecolumnname"].title()
@@ -3877,6 +5103,15 @@ def CreateInitialTable(gdb, allFields, dFieldInfo):
             i += 1
             if fld != "LKEY":
                 if i == len(allFields):
+                    fieldDef = (fld.upper(), dFieldInfo[fld][0], dFieldInfo[fld][1], dSDV["resultcolumnname"].upper())
+
+                else:
+                    fieldDef = (fld.upper(), dFieldInfo[fld][0], dFieldInfo[fld][1], "")
+
+                if not bSaveInitialTable:
+                    dInitialTables[os.path.join(tblLoc, initialTbl)]["fields"].append(fieldDef)
+
+                elif i == len(allFields):
                     #PrintMsg("\tAdding last field " + fld + " to initialTbl as a " + dFieldInfo[fld][0], 1)
                     #PrintMsg("\tAdding last field RATING to initialTbl as a " + dFieldInfo[fld][0], 1)
                     arcpy.AddField_management(os.path.join(tblLoc, initialTbl), fld.upper(), dFieldInfo[fld][0], "", "", dFieldInfo[fld][1], dSDV["resultcolumnname"].upper())
@@ -3917,6 +5152,190 @@ def GetMapunitSymbols(gdb):
         errorMsg()
         return dSymbols
 
+## ===================================================================================
+class InitialInsertCursor(object):
+    # InsertCursor for the initial table. Records for an initial table kept in memory
+    # (bSaveInitialTable = False) are appended to dInitialTables instead of the geodatabase.
+    # The CreateRatingTable* functions write the map units in MUKEY order. If they ever
+    # don't, the table is flagged and InitialCursor sorts all of the map units.
+    #
+    def __init__(self, initialTbl, fields):
+        self.cur = None
+        self.dInitial = dInitialTables.get(initialTbl)
+
+        if self.dInitial is None:
+            self.cur = arcpy.da.InsertCursor(initialTbl, fields)
+            return
+
+        tblFields = [fld[0] for fld in self.dInitial["fields"]]
+        insFields = [fld.upper() for fld in fields]
+        self.index = [insFields.index(fld) if fld in insFields else None for fld in tblFields]
+        self.iMukey = tblFields.index("MUKEY")
+
+    def __enter__(self):
+        if not self.cur is None:
+            return self.cur.__enter__()
+
+        return self
+
+    def __exit__(self, *args):
+        if not self.cur is None:
+            return self.cur.__exit__(*args)
+
+        return False
+
+    def insertRow(self, rec):
+        rec = tuple([None if i is None else rec[i] for i in self.index])
+        mukey = rec[self.iMukey]
+
+        if not self.dInitial["lastkey"] is None and mukey < self.dInitial["lastkey"]:
+            self.dInitial["ordered"] = False
+
+        self.dInitial["lastkey"] = mukey
+        self.dInitial["rows"].append(rec)
+
+## ===================================================================================
+def InitialCursor(initialTbl, inFlds, where_clause=None, sql_clause=(None, None)):
+    # SearchCursor for the initial table. An initial table kept in memory is streamed to the
+    # aggregation function: where_clause is applied to each record and the ORDER BY in
+    # sql_clause is done one map unit at a time. See InitialRecords.
+    #
+    if not initialTbl in dInitialTables:
+        return arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=where_clause, sql_clause=sql_clause)
+
+    return contextlib.closing(InitialRecords(dInitialTables[initialTbl], inFlds, where_clause, sql_clause))
+
+## ===================================================================================
+def InitialRecords(dInitial, inFlds, whereClause, sqlClause):
+    # Generator for the records of an initial table kept in memory, with the inFlds columns.
+    # sqlClause is ORDER BY MUKEY ASC, [field] ASC|DESC, ... The records are already in MUKEY
+    # order, so only the records within each map unit are sorted. Null sorts ahead of any
+    # value and ties keep their table order, the same as MapunitOrder.
+    #
+    fields = [fld[0] for fld in dInitial["fields"]]
+    index = [fields.index(fld.upper()) for fld in inFlds]
+    rowTest = InitialFilter(fields, whereClause)
+    orderBy = list()
+
+    if not sqlClause is None and not sqlClause[1] is None and sqlClause[1].strip() != "":
+        for part in sqlClause[1].strip()[len("ORDER BY "):].split(","):
+            words = part.split()
+            orderBy.append((fields.index(words[0].upper()), len(words) > 1 and words[1].upper() == "DESC"))
+
+    if rowTest is None:
+        rows = dInitial["rows"]
+
+    else:
+        rows = (rec for rec in dInitial["rows"] if rowTest(rec))
+
+    if len(orderBy) == 0:
+        for rec in rows:
+            yield tuple([rec[i] for i in index])
+
+        return
+
+    if orderBy[0] != (fields.index("MUKEY"), False) or not dInitial["ordered"]:
+        # Not ordered by map unit first. Sort all of the records.
+        rows = list(rows)
+
+        for iFld, bDesc in reversed(orderBy):
+            rows.sort(key=lambda rec: (not rec[iFld] is None, rec[iFld]), reverse=bDesc)
+
+        for rec in rows:
+            yield tuple([rec[i] for i in index])
+
+        return
+
+    iMukey = orderBy[0][0]
+    recs = list()
+
+    for rec in rows:
+        if len(recs) > 0 and rec[iMukey] != recs[0][iMukey]:
+            for sortRec in InitialSort(recs, orderBy):
+                yield tuple([sortRec[i] for i in index])
+
+            recs = list()
+
+        recs.append(rec)
+
+    for sortRec in InitialSort(recs, orderBy):
+        yield tuple([sortRec[i] for i in index])
+
+## ===================================================================================
+def InitialSort(recs, orderBy):
+    # Sort the records for one map unit by the ORDER BY fields that follow MUKEY
+    #
+    if len(recs) > 1:
+        # Least significant sort field first
+        for iFld, bDesc in reversed(orderBy[1:]):
+            recs.sort(key=lambda rec: (not rec[iFld] is None, rec[iFld]), reverse=bDesc)
+
+    return recs
+
+## ===================================================================================
+def InitialFilter(fields, whereClause):
+    # Return a function that tests an initial table record against the where clauses used by
+    # the aggregation functions, eg. COMPPCT_R >= 15 AND [field] IS NOT NULL AND [field] != 0
+    # Null never passes a comparison, the same as in the geodatabase. Returns None for no where clause.
+    #
+    if whereClause is None or whereClause.strip() == "":
+        return None
+
+    dOperators = {">=":operator.ge, "<=":operator.le, ">":operator.gt, "<":operator.lt, "=":operator.eq, "!=":operator.ne, "<>":operator.ne}
+    tests = list()
+
+    for part in re.split(r"\s+AND\s+", whereClause.strip(), flags=re.IGNORECASE):
+        nullMatch = re.match(r"^(\w+)\s+IS\s+NOT\s+NULL$", part.strip(), re.IGNORECASE)
+
+        if nullMatch:
+            tests.append((fields.index(nullMatch.group(1).upper()), None, None))
+            continue
+
+        opMatch = re.match(r"^(\w+)\s*(>=|<=|!=|<>|=|>|<)\s*(.+)$", part.strip())
+
+        if opMatch is None:
+            raise MyError, "Unable to apply where clause to the initial table: " + whereClause
+
+        val = opMatch.group(3).strip()
+
+        if val.startswith("'") and val.endswith("'"):
+            val = val[1:-1]
+
+        else:
+            val = float(val)
+
+        tests.append((fields.index(opMatch.group(1).upper()), dOperators[opMatch.group(2)], val))
+
+    def rowTest(rec):
+        for i, op, val in tests:
+            if rec[i] is None:
+                return False
+
+            if not op is None and not op(rec[i], val):
+                return False
+
+        return True
+
+    return rowTest
+
+## ===================================================================================
+def InitialFields(initialTbl):
+    # Uppercase field names for the initial table
+    #
+    if initialTbl in dInitialTables:
+        return [fld[0] for fld in dInitialTables[initialTbl]["fields"]]
+
+    return [fld.name.upper() for fld in arcpy.ListFields(initialTbl)]
+
+## ===================================================================================
+def InitialCount(initialTbl):
+    # Record count for the initial table
+    #
+    if initialTbl in dInitialTables:
+        return len(dInitialTables[initialTbl]["rows"])
+
+    return int(arcpy.GetCount_management(initialTbl).getOutput(0))
+
 ## ===================================================================================
 def CreateOutputTable(initialTbl, outputTbl, dFieldInfo):
     # Create the initial output table that will contain key fields from all levels plus the input rating field
@@ -3935,27 +5354,46 @@ def CreateOutputTable(initialTbl, outputTbl, dFieldInfo):
         if arcpy.Exists(outputTbl):
             arcpy.Delete_management(outputTbl)
 
-        # Create the final output table using initialTbl as a template
-        try:
-            arcpy.CreateTable_management(os.path.dirname(outputTbl), os.path.basename(outputTbl), initialTbl)
-
-        except:
-            raise MyError, "Unable to create table: " + outputTbl
+        # Fields from initialTbl that are not in the output table
+        dropFields = [dSDV["attributecolumnname"].upper(), "MUSYM", "COMPNAME", "COKEY", "CHKEY", "HZDEPT_R", "HZDEPB_R", "COMONTHKEY", "LKEY"]
 
-        # Drop the last column which should be 'attributecolumname' and replace with 'resultcolumname'
-        #lastFld = dSDV["attributecolumnname"]
-        arcpy.DeleteField_management(outputTbl, dSDV["attributecolumnname"])
-        arcpy.DeleteField_management(outputTbl, "MUSYM")
-        arcpy.DeleteField_management(outputTbl, "COMPNAME")
         if dSDV["resultcolumnname"].upper() != "MUNAME":
-            arcpy.DeleteField_management(outputTbl, "MUNAME")
+            dropFields.append("MUNAME")
+
+        if initialTbl in dInitialTables:
+            # Initial table is in memory. Add the fields that are kept.
+            try:
+                arcpy.CreateTable_management(os.path.dirname(outputTbl), os.path.basename(outputTbl))
+
+            except:
+                raise MyError, "Unable to create table: " + outputTbl
+
+            for fldName, fldType, fldLength, fldAlias in dInitialTables[initialTbl]["fields"]:
+                if not fldName in dropFields:
+                    arcpy.AddField_management(outputTbl, fldName, fldType, "", "", fldLength, fldAlias)
+
+        else:
+            # Create the final output table using initialTbl as a template
+            try:
+                arcpy.CreateTable_management(os.path.dirname(outputTbl), os.path.basename(outputTbl), initialTbl)
+
+            except:
+                raise MyError, "Unable to create table: " + outputTbl
+
+            # Drop the last column which should be 'attributecolumname' and replace with 'resultcolumname'
+            #lastFld = dSDV["attributecolumnname"]
+            arcpy.DeleteField_management(outputTbl, dSDV["attributecolumnname"])
+            arcpy.DeleteField_management(outputTbl, "MUSYM")
+            arcpy.DeleteField_management(outputTbl, "COMPNAME")
+            if dSDV["resultcolumnname"].upper() != "MUNAME":
+                arcpy.DeleteField_management(outputTbl, "MUNAME")
 
-        # Drop COKEY and CHKEY if present
-        fldList = arcpy.Describe(outputTbl).fields
+            # Drop COKEY and CHKEY if present
+            fldList = arcpy.Describe(outputTbl).fields
 
-        for fld in fldList:
-            if fld.name.upper() in ["COKEY", "CHKEY", "HZDEPT_R", "HZDEPB_R", "COMONTHKEY", "LKEY"]:
-                arcpy.DeleteField_management(outputTbl, fld.name)
+            for fld in fldList:
+                if fld.name.upper() in ["COKEY", "CHKEY", "HZDEPT_R", "HZDEPB_R", "COMONTHKEY", "LKEY"]:
+                    arcpy.DeleteField_management(outputTbl, fld.name)
 
         #fieldName = dSDV[resultcolumn]
         theType = dFieldInfo[dSDV["resultcolumnname"].upper()][0]
@@ -3998,9 +5436,9 @@ def CreateRatingTable1(tblList, sdvTbl, initialTbl, dAreasymbols):
         with arcpy.da.SearchCursor(os.path.join(gdb, "mapunit"), dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
 
             # MUNAME is rating field
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
+            with InitialInsertCursor(initialTbl, allFields) as ocur:
                 if len(dFields["MAPUNIT"]) == 4:
-                    for rec in mCur:
+                    for rec in UpdateMapunits(mCur):
                         mukey, musym, muname, lkey = rec
 
                         #if lkey in dAreasymbols: # new code
@@ -4014,7 +5452,7 @@ def CreateRatingTable1(tblList, sdvTbl, initialTbl, dAreasymbols):
 
                 elif len(dFields["MAPUNIT"]) == 5:
                 # rating field is not MUNAME
-                    for rec in mCur:
+                    for rec in UpdateMapunits(mCur):
                         mukey, musym, muname, lkey, rating = rec
 
                         try: # new code
@@ -4047,8 +5485,8 @@ def CreateRatingTable1S(tblList, sdvTbl, dTbl, initialTbl, dAreasymbols):
         allFields.remove("LKEY")
 
         with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
+            with InitialInsertCursor(initialTbl, allFields) as ocur:
+                for rec in UpdateMapunits(mCur):
                     mukey, musym, muname, lkey = rec
                     #PrintMsg("\t" + str(rec), 1)
 
@@ -4098,8 +5536,8 @@ def CreateRatingTable3(tblList, sdvTbl, dComponent, dHorizon, initialTbl):
         #PrintMsg(" \nCreateRatingTable3 using SQL: " + str(dSQL["MAPUNIT"]), 1)
 
         with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
+            with InitialInsertCursor(initialTbl, allFields) as ocur:
+                for rec in UpdateMapunits(mCur):
                     mukey, musym, muname, lkey = rec
 
                     #if lkey in dAreasymbols: # new code
@@ -4178,8 +5616,8 @@ def CreateRatingTable2(tblList, sdvTbl, dComponent, initialTbl):
             PrintMsg(80 * "=", 1)
 
         with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
+            with InitialInsertCursor(initialTbl, allFields) as ocur:
+                for rec in UpdateMapunits(mCur):
                     mukey, musym, muname, lkey = rec
                     #if lkey in dAreasymbols: # new code
                     try:
@@ -4231,8 +5669,8 @@ def CreateRatingTable2S(tblList, sdvTbl, dComponent, dTbl, initialTbl):
         sqlClause = (None, "ORDER BY " + dSDV["resultcolumnname"].upper() + " DESC")  # original
 
         with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
+            with InitialInsertCursor(initialTbl, allFields) as ocur:
+                for rec in UpdateMapunits(mCur):
                     mukey, musym, muname, lkey = rec
 
                     try:
@@ -4308,8 +5746,8 @@ def CreateRatingInterps(tblList, sdvTbl, dComponent, dTbl, initialTbl):
 
         with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
 
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
+            with InitialInsertCursor(initialTbl, allFields) as ocur:
+                for rec in UpdateMapunits(mCur):
                     mukey, musym, muname, lkey = rec
 
                     try:
@@ -4376,9 +5814,9 @@ def CreateRatingTable3S(tblList, sdvTbl, dComponent, dHorizon, dTbl, initialTbl,
         #    raise MyError, "CreateRatingTable3S cannot handle " + sdvAtt + " option"
 
         with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
+            with InitialInsertCursor(initialTbl, allFields) as ocur:
 
-                for rec in mCur:
+                for rec in UpdateMapunits(mCur):
                     mukey, musym, muname, lkey = rec
 
                     try:
@@ -4460,8 +5898,8 @@ def CreateRatingTable4S(tblList, sdvTbl, dComponent, dHorizon, dTbl, initialTbl)
         allFields.remove("LKEY")
 
         with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
+            with InitialInsertCursor(initialTbl, allFields) as ocur:
+                for rec in UpdateMapunits(mCur):
                     mukey, musym, muname, lkey = rec
 
                     try:
@@ -4539,8 +5977,8 @@ def CreateSoilMoistureTable(tblList, sdvTbl, dComponent, dMonth, dTbl, initialTb
         allFields.remove("LKEY")
 
         with arcpy.da.SearchCursor("MAPUNIT", dFields["MAPUNIT"], sql_clause=dSQL["MAPUNIT"]) as mCur:
-            with arcpy.da.InsertCursor(initialTbl, allFields) as ocur:
-                for rec in mCur:
+            with InitialInsertCursor(initialTbl, allFields) as ocur:
+                for rec in UpdateMapunits(mCur):
                     mukey, musym, muname, lkey = rec
 
                     try:
@@ -4644,7 +6082,7 @@ def Aggregate1(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker):
             iMax = -999999999
             iMin = 999999999
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds) as cur:
+            with InitialCursor(initialTbl, inFlds) as cur:
                 with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
                     for rec in cur:
                         mukey, areasym, val = rec
@@ -4671,7 +6109,7 @@ def Aggregate1(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker):
 
         else:
             # populate sdv_initial table and create a list of unique values
-            with arcpy.da.SearchCursor(initialTbl, inFlds) as cur:
+            with InitialCursor(initialTbl, inFlds) as cur:
                 with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
                     for rec in cur:
                         mukey, areasym, val = rec
@@ -4695,6 +6133,48 @@ def Aggregate1(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker):
         errorMsg()
         return outputTbl, outputValues
 
+## ===================================================================================
+def MapunitOrder(rows, inFlds, sqlClause):
+    # Return the initial table records in the order given by sqlClause, eg.
+    # ORDER BY MUKEY ASC, COMPPCT_R DESC, [attributecolumnname] ASC|DESC
+    # without asking the geodatabase to sort the whole table.
+    #
+    # Records are grouped by mukey in a dictionary and only the few records within each
+    # map unit are sorted. Python sorts are stable, so records that tie on every sort field
+    # keep their table order, and Null sorts ahead of any value just as it does in the
+    # geodatabase. The tiebreak rules that rely on the rating sort direction
+    # (tiebreaklowlabel = ASC, tiebreakhighlabel = DESC) pick the same component as before.
+    #
+    orderBy = list()
+
+    for part in sqlClause[1].strip()[len("ORDER BY "):].split(","):
+        words = part.split()
+        orderBy.append((inFlds.index(words[0].upper()), len(words) > 1 and words[1].upper() == "DESC"))
+
+    iMukey = orderBy[0][0]
+    dGroups = dict()
+
+    for rec in rows:
+        try:
+            dGroups[rec[iMukey]].append(rec)
+
+        except:
+            dGroups[rec[iMukey]] = [rec]
+
+    sortedRows = list()
+
+    for mukey in sorted(dGroups):
+        recs = dGroups.pop(mukey)
+
+        if len(recs) > 1:
+            # Least significant sort field first
+            for iFld, bDesc in reversed(orderBy[1:]):
+                recs.sort(key=lambda rec: (not rec[iFld] is None, rec[iFld]), reverse=bDesc)
+
+        sortedRows.extend(recs)
+
+    return sortedRows
+
 ## ===================================================================================
 def AggregateCo_DCP(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker, bZero):
     # Aggregate mapunit-component data to the map unit level using dominant component
@@ -4746,7 +6226,8 @@ def AggregateCo_DCP(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker,
             iMin = 999999999.0
             fldPrecision = max(0, dSDV["attributeprecision"])
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause) as cur:
+            with InitialCursor(initialTbl, inFlds) as cur:
+                cur = MapunitOrder(cur, inFlds, sqlClause)
 
                 with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
                     for rec in cur:
@@ -4779,7 +6260,8 @@ def AggregateCo_DCP(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker,
             #PrintMsg(" \ndValues: " + str(dValues), 1)
             #PrintMsg(" \noutputValues: " + str(outputValues), 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause) as cur:
+            with InitialCursor(initialTbl, inFlds) as cur:
+                cur = MapunitOrder(cur, inFlds, sqlClause)
 
                 if len(dValues) > 0:
                     # Text, has domain values or values in the maplegendxml
@@ -4941,7 +6423,7 @@ def AggregateCo_Limiting(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBre
             # Save the rating for each component along with a list of components for each mapunit
             #
             try:
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                with InitialCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
                     # inFlds: 0 mukey, 1 cokey, 2 comppct, 3 rating
 
                     for rec in cur:
@@ -5202,7 +6684,7 @@ def AggregateCo_MaxMin(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreak
             # PrintMsg(" \ndomainValues for " + sdvAtt + ": " + str(domainValues), 1)
 
             try:
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                with InitialCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
                     # inFlds: 0 mukey, 1 cokey, 2 comppct, 3 rating
 
                     for rec in cur:
@@ -5231,7 +6713,7 @@ def AggregateCo_MaxMin(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreak
         else:
             # 2. No Domain Values, read data from initial table. Use alpha sort for tiebreaker.
             #
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with InitialCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
                 for rec in cur:
                     mukey, areasym, cokey, comppct, rating = rec
@@ -5528,7 +7010,8 @@ def AggregateCo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker,
 
             # PrintMsg("dValues: " + str(dValues), 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                cur = MapunitOrder(cur, inFlds, sqlClause)
                 # Use tiebreak rules and rating index values
 
                 for rec in cur:
@@ -5565,7 +7048,8 @@ def AggregateCo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker,
             # 2 Read initial table (no domain values, must use alpha sort for tiebreaker)
             # Issue noted by ?? that without tiebreaking method, inconsistent results may occur
             #
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                cur = MapunitOrder(cur, inFlds, sqlClause)
                 #
                 # numeric values
                 if dSDV["effectivelogicaldatatype"].lower() in ['integer', 'float']:
@@ -5819,9 +7303,9 @@ def AggregateCo_DCP_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBre
 
         dMapunit = dict()
         dAreasym = dict()
-        dataCnt = int(arcpy.GetCount_management(initialTbl).getOutput(0))
+        dataCnt = InitialCount(initialTbl)
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        with InitialCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
             #cnt = 0
             #PrintMsg(" \nReading input table " + os.path.basename(initialTbl) + "...", 1)
             arcpy.SetProgressor("step", "Reading input table " + os.path.basename(initialTbl) + "...", 0, dataCnt, 1 )
@@ -5907,7 +7391,7 @@ def AggregateCo_DCD_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBre
         dCoRating = dict()
         dAreasym = dict()
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        with InitialCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
             # MUKEY,COKEY , COMPPCT_R, attribcolumn
             for rec in cur:
@@ -6044,7 +7528,8 @@ def AggregateCo_Mo_MaxMin(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBr
         #PrintMsg(" \nSQL: " + whereClause, 1)
         #PrintMsg("Fields: " + str(inFlds), 1)
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+            cur = MapunitOrder(cur, inFlds, sqlClause)
 
             # MUKEY,COKEY , COMPPCT_R, attribcolumn
             for rec in cur:
@@ -6220,7 +7705,8 @@ def AggregateCo_Mo_DCD(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreak
         #PrintMsg(" \nSQL: " + whereClause, 1)
         #PrintMsg("Fields: " + str(inFlds), 1)
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+            cur = MapunitOrder(cur, inFlds, sqlClause)
 
             # MUKEY,COKEY , COMPPCT_R, attribcolumn
             for rec in cur:
@@ -6353,7 +7839,8 @@ def AggregateCo_Mo_DCP_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, t
         if dSDV["attributelogicaldatatype"].lower() == "string":
             PrintMsg(" \n*dValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(dValues), 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                cur = MapunitOrder(cur, inFlds, sqlClause)
 
                 for rec in cur:
                     dAreasym[rec[0]] = rec[4]
@@ -6380,7 +7867,8 @@ def AggregateCo_Mo_DCP_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, t
 
             PrintMsg(" \n**dValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(dValues), 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                cur = MapunitOrder(cur, inFlds, sqlClause)
 
                 for rec in cur:
                     dAreasym[rec[0]] = rec[4]
@@ -6603,7 +8091,8 @@ def AggregateCo_Mo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, t
                 PrintMsg("domainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues), 1)
                 PrintMsg((40 * '*'), 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                cur = MapunitOrder(cur, inFlds, sqlClause)
 
                 if bVerbose:
                     PrintMsg(" \nReading initial data...", 1)
@@ -6644,7 +8133,8 @@ def AggregateCo_Mo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, t
                 # 
                 PrintMsg(" \nNo domain name for this property", 1)
 
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                    cur = MapunitOrder(cur, inFlds, sqlClause)
 
                     if bVerbose:
                         PrintMsg(" \nReading initial data...", 1)
@@ -6733,7 +8223,8 @@ def AggregateCo_Mo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, t
 
                 if tieBreaker == dSDV["tiebreakhighlabel"]:
                     
-                    with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                    with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                        cur = MapunitOrder(cur, inFlds, sqlClause)
                         if bVerbose:
                             PrintMsg(" \nReading initial data from " + initialTbl + "...", 1)
 
@@ -6779,7 +8270,8 @@ def AggregateCo_Mo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, t
                                     
                 elif tieBreaker == dSDV["tiebreaklowlabel"]:
 
-                    with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                    with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                        cur = MapunitOrder(cur, inFlds, sqlClause)
                         if bVerbose:
                             PrintMsg(" \nReading initial data from " + initialTbl + "...", 1)
 
@@ -7006,7 +8498,7 @@ def AggregateCo_Mo_DCD_DomainBak(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff
                 PrintMsg("domainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues), 1)
                 PrintMsg((40 * '*'), 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with InitialCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
                 if bVerbose:
                     PrintMsg(" \nReading initial data...", 1)
@@ -7046,7 +8538,7 @@ def AggregateCo_Mo_DCD_DomainBak(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff
                 #
                 PrintMsg(" \nNo domain name for this property", 1)
 
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                with InitialCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
                     if bVerbose:
                         PrintMsg(" \nReading initial data...", 1)
@@ -7128,7 +8620,7 @@ def AggregateCo_Mo_DCD_DomainBak(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff
                 # New code
                 PrintMsg(" \nDomain name for this property: '" + dSDV["tiebreakdomainname"] + "'", 1)
 
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                with InitialCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
                     if bVerbose:
                         PrintMsg(" \nReading initial data from " + initialTbl + "...", 1)
 
@@ -7384,7 +8876,8 @@ def AggregateCo_Mo_WTA(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreak
         #PrintMsg(" \nSQL: " + whereClause, 1)
         #PrintMsg("Fields: " + str(inFlds), 1)
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+            cur = MapunitOrder(cur, inFlds, sqlClause)
 
             # MUKEY,COKEY , COMPPCT_R, attribcolumn
             for rec in cur:
@@ -7516,7 +9009,7 @@ def AggregateCo_WTA_DTWT(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBre
         dCoRating = dict()
         dAreasym = dict()
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+        with InitialCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
 
             # MUKEY,COKEY , COMPPCT_R, attribcolumn
             for rec in cur:
@@ -7686,7 +9179,7 @@ def AggregateCo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieB
         if bVerbose:
             PrintMsg(" \nReading initial data...", 1)
             PrintMsg(whereClause, 1)
-            initCnt = int(arcpy.GetCount_management(initialTbl).getOutput(0))
+            initCnt = InitialCount(initialTbl)
             PrintMsg("\nInput table contains " + Number_Format(initCnt, 0, True) + " records", 1)
             PrintMsg("Data is from " + dSDV["attributecolumnname"].upper() + " column", 1)
             PrintMsg(dSDV["attributetype"] + " attribute logical data type: " + dSDV["attributelogicaldatatype"].lower(), 1)
@@ -7700,7 +9193,8 @@ def AggregateCo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieB
                 PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues), 1)
 
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                cur = MapunitOrder(cur, inFlds, sqlClause)
 
                 for rec in cur:
                     # "MUKEY", "COKEY", "COMPPCT_R", RATING
@@ -7749,7 +9243,8 @@ def AggregateCo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieB
                 # There are no domain values.
                 # We must make sure that the legend values are the same as the output values.
                 #
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                    cur = MapunitOrder(cur, inFlds, sqlClause)
 
                     for rec in cur:
                         mukey, cokey, compPct, rating, areasym = rec
@@ -7825,7 +9320,8 @@ def AggregateCo_DCD_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieB
             else:
                 # New code for property or interps with domain values
 
-                with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+                with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                    cur = MapunitOrder(cur, inFlds, sqlClause)
 
                     for rec in cur:
                         mukey, cokey, compPct, rating, areasym = rec
@@ -8075,7 +9571,8 @@ def AggregateCo_DCP_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieB
         if dSDV["attributelogicaldatatype"].lower() == "string":
             # PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"].lower() + "-type values : " + str(domainValues), 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                cur = MapunitOrder(cur, inFlds, sqlClause)
 
                 for rec in cur:
                     dAreasym[rec[0]] = rec[4]
@@ -8099,7 +9596,8 @@ def AggregateCo_DCP_Domain(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieB
         elif dSDV["attributelogicaldatatype"].lower() in ["float", "integer", "choice"]:
             # PrintMsg(" \ndomainValues for " + dSDV["attributelogicaldatatype"] + " values: " + str(domainValues), 1)
 
-            with arcpy.da.SearchCursor(initialTbl, inFlds, sql_clause=sqlClause, where_clause=whereClause) as cur:
+            with InitialCursor(initialTbl, inFlds, where_clause=whereClause) as cur:
+                cur = MapunitOrder(cur, inFlds, sqlClause)
 
                 for rec in cur:
                     dAreasym[rec[0]] = rec[4]
@@ -8307,7 +9805,7 @@ def AggregateCo_WTA(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker,
 
         if bVerbose:
             PrintMsg(" \nSQL: " + whereClause, 1)
-            PrintMsg("Input table (" + initialTbl + ") has " + str(int(arcpy.GetCount_management(initialTbl).getOutput(0))) + " records", 1)
+            PrintMsg("Input table (" + initialTbl + ") has " + str(InitialCount(initialTbl)) + " records", 1)
 
         outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
         outputValues = list()
@@ -8328,7 +9826,7 @@ def AggregateCo_WTA(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker,
         dPct = dict()  # sum of comppct_r for each map unit
         dMapunit = dict()
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+        with InitialCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
             with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
                 for rec in cur:
                     recCnt += 1
@@ -8518,7 +10016,7 @@ def AggregateCo_WTA_Old(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBrea
 
         if bVerbose:
             PrintMsg(" \nSQL: " + whereClause, 1)
-            PrintMsg("Input table has " + str(int(arcpy.GetCount_management(initialTbl).getOutput(0))), 1)
+            PrintMsg("Input table has " + str(InitialCount(initialTbl)), 1)
 
         outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
         outputValues = list()
@@ -8539,7 +10037,7 @@ def AggregateCo_WTA_Old(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBrea
         dPct = dict()  # sum of comppct_r for each map unit
         #dMapunit = dict()
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+        with InitialCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
             with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
                 for rec in cur:
                     recCnt += 1
@@ -8686,7 +10184,7 @@ def AggregateCo_PP_SUM(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreak
         if bVerbose:
             PrintMsg(" \nReading " + initialTbl + " and writing to " + outputTbl, 1)
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+        with InitialCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
             with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
                 for rec in cur:
                     mukey, areasym, comppct, val= rec
@@ -8733,171 +10231,71 @@ def AggregateCo_PP_SUM(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreak
 ## ===================================================================================
 def AggregateHz_WTA_SUM(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero):
     # Aggregate mapunit-component-horizon data to the map unit level using a weighted average
-    #
-    # This version uses SUM for horizon data as in AWS
-    # Added areasymbol to output
-    #
-    try:
-        import decimal
-
-        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
-        #
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        if bVerbose:
-            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
-
-        outputTbl = os.path.join(gdb, tblName)
-        #attribcolumn = dSDV["attributecolumnname"].upper()
-        #resultcolumn = dSDV["resultcolumnname"].upper()
-        fldPrecision = max(0, dSDV["attributeprecision"])
-
-        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
-        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
-
-        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
-
-        if bZero == False:
-            # ignore any null values
-            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
-
-        else:
-            # retrieve null values and convert to zeros during the iteration process
-            whereClause = "COMPPCT_R >=  " + str(cutOff)
-
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
-
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-
-        if outputTbl == "":
-            return outputTbl, outputValues
-
-        dPct = dict()  # sum of comppct_r for each map unit
-        dComp = dict() # component level information
-        dMu = dict()
-
-        # reset variables for cursor
-        sumPct = 0
-        sumProd = 0
-        meanVal = 0
-        #prec = dSDV["attributeprecision"]
-        roundOff = 2
-
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                #arcpy.SetProgressor("step", "Reading initial query table ...",  0, iCnt, 1)
-
-                for rec in cur:
-                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
-                    # top = hzdept
-                    # bot = hzdepb
-                    # td = top of range
-                    # bd = bottom of range
-                    if val is None and bZero:
-                        val = 0
-
-                    if val is not None:
-
-                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
-                        try:
-                            hzT = min(hzdepb, bot) - max(hzdept, top)   # Getting a None error here.usable thickness from this horizon
-
-                        except:
-                            hzT = 0
-
-                        if hzT > 0:
-                            aws = float(hzT) * val
-                            #PrintMsg("\t" + str(aws), 1)
-
-                            if not cokey in dComp:
-                                # Create initial entry for this component using the first horiozon CHK
-                                dComp[cokey] = [mukey, comppct, hzT, aws, areasym]
-
-                                try:
-                                    dPct[mukey] = dPct[mukey] + comppct
-
-                                except:
-                                    dPct[mukey] = comppct
-
-                            else:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, comppct, dHzT, dAWS, areasym = dComp[cokey]
-                                dAWS = dAWS + aws
-                                dHzT = dHzT + hzT
-                                dComp[cokey] = [mukey, comppct, dHzT, dAWS, areasym]
-
-                        #arcpy.SetProgressorPosition()
-
-                # get the total number of major components from the dictionary count
-                iComp = len(dComp)
-
-                # Read through the component-level data and summarize to the mapunit level
+    #
+    # This version uses SUM for horizon data as in AWS
+    # Added areasymbol to output
+    #
+    try:
+        import decimal
 
-                if iComp > 0:
-                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
+        arcpy.SetProgressorLabel("Aggregating rating information to the map unit level")
+        #
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
+        if bVerbose:
+            PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
-                    for cokey, dRec in dComp.items():
-                        # get component level data  CHK
-                        mukey, comppct, hzT, val, areasym = dRec
+        outputTbl = os.path.join(gdb, tblName)
+        #attribcolumn = dSDV["attributecolumnname"].upper()
+        #resultcolumn = dSDV["resultcolumnname"].upper()
+        fldPrecision = max(0, dSDV["attributeprecision"])
 
-                        # get sum of component percent for the mapunit  CHK
-                        try:
-                            sumCompPct = float(dPct[mukey])
+        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
+        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
 
-                        except:
-                            # set the component percent to zero if it is not found in the
-                            # dictionary. This is probably a 'Miscellaneous area' not included in the  CHK
-                            # data or it has no horizon information.
-                            sumCompPct = 0
+        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
 
-                        #PrintMsg(areasym + ", " + mukey + ", " + cokey + ", " + str(comppct) + ", " + str(sumCompPct) + ", " + str(hzT) + ", " + str(val), 1)  # These look good
+        if bZero == False:
+            # ignore any null values
+            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
 
+        else:
+            # retrieve null values and convert to zeros during the iteration process
+            whereClause = "COMPPCT_R >=  " + str(cutOff)
 
-                        # calculate component percentage adjustment
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
 
-                        if sumCompPct > 0:
-                            # If there is no data for any of the component horizons, could end up with 0 for
-                            # sum of comppct_r
-                            adjCompPct = float(comppct) / sumCompPct   # WSS method
+        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
 
-                            # adjust the rating value down by the component percentage and by the sum of the
-                            # usable horizon thickness for this component
-                            aws = adjCompPct * val
-                            hzT = hzT * adjCompPct    # Adjust component share of horizon thickness by comppct
+        if outputTbl == "":
+            return outputTbl, outputValues
 
-                            # Update component values in component dictionary
-                            dComp[cokey] = mukey, comppct, hzT, aws, areasym
+        # Read the initial table into arrays once, in the same sort order, and aggregate the
+        # horizon data using the NumPy kernels in SSURGO_HorizonAggregation.py
+        with InitialCursor(initialTbl, inFlds + OverlapFields(initialTbl, top, bot), where_clause=whereClause, sql_clause=sqlClause) as cur:
+            dHz = SSURGO_HorizonAggregation.HorizonArrays(cur, bZero)
 
-                            # Populate dMu dictionary
-                            if mukey in dMu:
-                                val1, val3, areasym = dMu[mukey]
-                                comppct = comppct + val1
-                                aws = aws + val3
+        # Horizon thickness for a standard depth interval from the overlap matrix
+        AttachHorizonOverlap(dHz)
 
-                            dMu[mukey] = [comppct, aws, areasym]
+        muCodes, muPcts, muValues = SSURGO_HorizonAggregation.WeightedSum(dHz, top, bot)
 
-                # Write out map unit aggregated AWS
-                #
-                murec = list()
-                outputValues= [999999999, -999999999]
+        # Write out map unit aggregated AWS
+        #
+        outputValues= [999999999, -999999999]
 
-                for mukey, val in dMu.items():
-                    compPct, aws, areasym = val
-                    aws = round(aws, fldPrecision) # Test temporary removal of rounding
-                    #aws = decimal.Decimal(str(aws)).quantize(decimal.Decimal("0.01"), decimal.ROUND_HALF_UP)
-                    murec = [mukey, comppct, aws, areasym]
-                    ocur.insertRow(murec)
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+            for muCode, compPct, aws in zip(muCodes.tolist(), muPcts.tolist(), muValues.tolist()):
+                aws = round(aws, fldPrecision)
+                murec = [dHz["mukeys"][muCode], int(compPct), aws, dHz["areasymbols"][muCode]]
+                ocur.insertRow(murec)
 
-                    # save max-min values
-                    if not aws is None:
-                        outputValues[0] = min(aws, outputValues[0])
-                        outputValues[1] = max(aws, outputValues[1])
+                # save max-min values
+                outputValues[0] = min(aws, outputValues[0])
+                outputValues[1] = max(aws, outputValues[1])
 
         outputValues.sort()
 
-        #if (bZero and outputValues ==  [0.0, 0.0]):
-            #PrintMsg(" \n2. No data for " + sdvAtt, 1)
-
         return outputTbl, outputValues
 
     except MyError, e:
@@ -8945,116 +10343,32 @@ def AggregateHz_WTA_WTA(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBrea
         if outputTbl == "":
             return outputTbl,[]
 
-        dPct = dict()  # sum of comppct_r for each map unit
-        dComp = dict() # component level information
-        dMu = dict()
-
-        # reset variables for cursor
-        sumPct = 0
-        sumProd = 0
-        meanVal = 0
-
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                #arcpy.SetProgressor("step", "Reading initial query table ...",  0, iCnt, 1)
-
-                for rec in cur:
-                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
-                    # top = hzdept
-                    # bot = hzdepb
-                    # td = top of range
-                    # bd = bottom of range
-                    if val is None and bZero:
-                        val = 0
-
-                    if val is not None and hzdept is not None and hzdepb is not None:
-
-                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
-                        try:
-                            hzT = min(hzdepb, bot) - max(hzdept, top)   # usable thickness from this horizon
-
-                        except:
-                            hzT = 0
-
-                        if hzT > 0:
-                            aws = float(hzT) * val * comppct
-
-                            if not cokey in dComp:
-                                # Create initial entry for this component using the first horiozon CHK
-                                dComp[cokey] = [mukey, comppct, hzT, aws, areasym]
-                                try:
-                                    dPct[mukey] = dPct[mukey] + comppct
-
-                                except:
-                                    dPct[mukey] = comppct
-
-                            else:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, comppct, dHzT, dAWS, areasym = dComp[cokey]
-                                dAWS = dAWS + aws
-                                dHzT = dHzT + hzT
-                                dComp[cokey] = [mukey, comppct, dHzT, dAWS, areasym]
-
-                        #else:
-                        #    PrintMsg("\tFound horizon for mapunit (" + mukey + ":" + cokey + " with hzthickness of " + str(hzT), 1)
-
-                    #else:
-                    #    PrintMsg("\tFound horizon with no data for mapunit (" + mukey + ":" + cokey + " with hzthickness of " + str(hzT), 1)
-
-                # get the total number of major components from the dictionary count
-                iComp = len(dComp)
-
-                # Read through the component-level data and summarize to the mapunit level
-
-                if iComp > 0:
-                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
-                    #arcpy.SetProgressor("step", "Saving map unit and component AWS data...",  0, iComp, 1)
-
-                    for cokey, vals in dComp.items():
-
-                        # get component level data
-                        mukey, comppct, hzT, cval, areasym = vals
-
-                        # get sum of comppct for mapunit
-                        sumPct = dPct[mukey]
-
-                        # calculate component weighted values
-                        # get weighted layer thickness
-                        divisor = sumPct * hzT
+        # Read the initial table into arrays once, in the same sort order, and aggregate the
+        # horizon data using the NumPy kernels in SSURGO_HorizonAggregation.py
+        with InitialCursor(initialTbl, inFlds + OverlapFields(initialTbl, top, bot), where_clause=whereClause, sql_clause=sqlClause) as cur:
+            dHz = SSURGO_HorizonAggregation.HorizonArrays(cur, bZero)
 
-                        if divisor > 0:
-                            newval = float(cval) / divisor
+        # Horizon thickness for a standard depth interval from the overlap matrix
+        AttachHorizonOverlap(dHz)
 
-                        else:
-                            newval = 0.0
-
-                        if mukey in dMu:
-                            pct, mval, areasym = dMu[mukey]
-                            newval = newval + mval
+        muCodes, muPcts, muValues = SSURGO_HorizonAggregation.WeightedAverage(dHz, top, bot)
 
-                        dMu[mukey] = [sumPct, newval, areasym]
+        # Write out map unit aggregated rating
+        #
+        outputValues= [999999999, -999999999]
 
-                # Write out map unit aggregated AWS
-                #
-                murec = list()
-                outputValues= [999999999, -999999999]
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+            for muCode, sumPct, val in zip(muCodes.tolist(), muPcts.tolist(), muValues.tolist()):
+                aws = round(val, fldPrecision)
+                murec = [dHz["mukeys"][muCode], int(sumPct), aws, dHz["areasymbols"][muCode]]
+                ocur.insertRow(murec)
 
-                for mukey, vals in dMu.items():
-                    sumPct, val, areasym = vals
-                    aws = round(val, fldPrecision)
-                    murec = [mukey, sumPct, aws, areasym]
-                    ocur.insertRow(murec)
-                    # save max-min values
-                    if not aws is None:
-                        outputValues[0] = min(aws, outputValues[0])
-                        outputValues[1] = max(aws, outputValues[1])
+                # save max-min values
+                outputValues[0] = min(aws, outputValues[0])
+                outputValues[1] = max(aws, outputValues[1])
 
         outputValues.sort()
 
-        #if (bZero and outputValues ==  [0.0, 0.0]):
-        #    PrintMsg(" \nNo data for " + sdvAtt, 1)
-
-
         return outputTbl, outputValues
 
     except MyError, e:
@@ -9112,7 +10426,7 @@ def AggregateHz_DCP_WTA_Old(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tie
         sumProd = 0
         meanVal = 0
 
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+        with InitialCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
             with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
                 #arcpy.SetProgressor("step", "Reading initial query table ...",  0, iCnt, 1)
 
@@ -9276,210 +10590,38 @@ def AggregateHz_DCP_WTA(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieBrea
         if outputTbl == "":
             raise MyError,""
 
-        dPct = dict()  # sum of comppct_r for each map unit
-        dHorizon = dict()
-        dComp = dict() # component level information
-        dMu = dict()
-        dCompList = dict()
-
-        # reset variables for cursor
-        sumPct = 0
-        sumProd = 0
-        meanVal = 0
-
-        #testMu = '676909'  # STATSGO mapunit with inconsistencies in horizon calculations for dominant component
-
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-                #arcpy.SetProgressor("step", "Reading initial query table ...",  0, iCnt, 1)
-
-                for rec in cur:
-                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
-                    # top = hzdept
-                    # bot = hzdepb
-                    # td = top of range
-                    # bd = bottom of range
-
-                    #if mukey == testMu:
-                    #    PrintMsg("\tRaw: " + str(rec), 1)
-
-                    if not cokey in dHorizon:
-                        if not mukey in dPct:
-                            # Problem:
-                            # This statement above is only getting the first component and ignoring any ties based upon component percent
-                            # It also may be skipping the dominant component when the value is Null. Is this what I really want?
-                            #
-                            dCompList[mukey] = [cokey]  # initialize list of components for this mapunit
-
-                            dPct[mukey] = comppct  # cursor is sorted on comppct_r descending, so this should be dominant component percent.
-
-                            if val is not None and hzdept is not None and hzdepb is not None:
-                                # Normal component with horizon data
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = float(hzT) * val
-                                newrec = [mukey, comppct, hzT, aws, areasym]
-                                dHorizon[cokey] = newrec
-                                
-                                #if mukey == testMu:
-                                #    PrintMsg("\t1. " + str(newrec), 1)
-
-                            elif hzdept is not None and hzdepb is not None:
-                                # new code to capture components where the rating value is Null
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = None
-                                newrec = [mukey, comppct, hzT, aws, areasym]
-                                dHorizon[cokey] = newrec
-                                
-                                #if mukey == testMu:
-                                #    PrintMsg("\t1 For NULL. " + str(newrec), 1)
-                                
-
-                        elif comppct >= dPct[mukey]:
-                            # This should be a mapunit that has more than one dominant component
-                            dCompList[mukey].append(cokey)
-
-                            if val is not None and hzdept is not None and hzdepb is not None:
-                                # Normal component with horizon data
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = float(hzT) * val
-                                newrec = [mukey, comppct, hzT, aws, areasym]
-                                dHorizon[cokey] = newrec
-                                
-                                #if mukey == testMu:
-                                #    PrintMsg("\t2. " + str(newrec), 1)
-
-                            elif hzdept is not None and hzdepb is not None:
-                                # new code to capture components where the rating value is Null
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = None
-                                newrec = [mukey, comppct, hzT, aws, areasym]
-                                dHorizon[cokey] = newrec
-                                
-                                #if mukey == testMu:
-                                #    PrintMsg("\t2 For NULL. " + str(newrec), 1)
-
-                            else:
-                                # Component with no data for this horizon
-                                newrec = [mukey, comppct, None, None, areasym]
-                                dHorizon[cokey] = newrec
-
-                                #if mukey == testMu:
-                                #    PrintMsg("\t3. " + str(newrec), 1)
-
-
-                    else:
-                        try:
-                            # For dominant component:
-                            # accumulate total thickness and total rating value by adding to existing component values  CHK
-
-                            mukey, comppct, dHzT, dAWS, areasym = dHorizon[cokey]
-
-                            if val is not None and hzdept is not None and hzdepb is not None:
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = float(hzT) * val
-                                dAWS = max(0, dAWS) + aws
-                                dHzT = max(0, dHzT) + hzT
-                                newrec = [mukey, comppct, dHzT, dAWS, areasym]
-                                dHorizon[cokey] = newrec
-
-                                #if mukey == testMu:
-                                #    PrintMsg("\t4. " + str(newrec), 1)
-                                
-                            elif hzdept is not None and hzdepb is not None:
-                                hzT = min(hzdepb, bot) - max(hzdept, top)
-                                aws = 0
-                                dAWS = max(0, dAWS) + aws
-                                dHzT = max(0, dHzT) + hzT
-                                newrec = [mukey, comppct, dHzT, dAWS, areasym]
-                                dHorizon[cokey] = newrec
-
-                                #if mukey == testMu:
-                                #    PrintMsg("\t4 For Null. " + str(newrec), 1)
-                                    
-                        except KeyError:
-                            # Hopefully this is a component other than dominant
-                            #if mukey == testMu:
-                            #    PrintMsg("\t5. Skipped because of dHorizon KeyError for cokey: " + cokey, 1)
-                            pass
-
-                        except:
-                            errorMsg()
-
-
-                # get the total number of major components from the dictionary count
-                iComp = len(dHorizon)
-
-                # Read through the component-level data and summarize to the mapunit level
-
-                if iComp > 0:
-
-                    for cokey, vals in dHorizon.items():
-
-                        # get component level data
-                        mukey, pct, hzT, cval, areasym = vals
+        # Read the initial table into arrays once, in the same sort order, and aggregate the
+        # horizon data using the NumPy kernels in SSURGO_HorizonAggregation.py
+        with InitialCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
+            dHz = SSURGO_HorizonAggregation.HorizonArrays(cur)
 
-                        # calculate mean value for entire depth range
-                        if not cval is None and hzT > 0:
-                            newval = float(cval) / hzT
-
-                        else:
-                            newval = None
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            bHigh = True
 
-                        if cokey in dComp:
-                            pct, mval, areasym = dComp[cokey]
-                            newval = newval + mval
+        else:
+            bHigh = False
 
-                        dComp[cokey] = [pct, newval, areasym]
+        # Tiebreaker picks the higher or lower rating when there is more than one dominant component.
+        # COMPPCT_R is the dominant comppct_r, also for a map unit without a rating (the old loop
+        # wrote the pct left over from the previous map unit).
+        muCodes, muPcts, muValues = SSURGO_HorizonAggregation.DominantAverage(dHz, top, bot, bHigh)
 
-                # Test iteration through dCompList?? and replace dMu
-                if tieBreaker == dSDV["tiebreakhighlabel"]:
-                    bRev = True
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+            for muCode, pct, val in zip(muCodes.tolist(), muPcts.tolist(), muValues.tolist()):
+                if math.isnan(val):
+                    # no rating for the dominant component(s)
+                    val = None
 
                 else:
-                    bRev = False
-
-                for mukey, cokeys in dCompList.items():
-                    if len(cokeys) > 0:
-                        # find component with value according to tiebreaker rule
-                        # assign that set of values to dMu
-                        valList = list()
-
-                        for cokey in cokeys:
-                            try:
-                                pct, newval, areasym = dComp[cokey]
-
-                                if not newval is None:
-                                    valList.append(newval)
-
-                            except:
-                                #PrintMsg("\tNo data for cokey: " + cokey, 1)
-                                pass
-
-                        if len(valList):
-                            valList.sort(reverse=bRev)
-                            val = valList[0]
-
-                            if not val is None:
-                                val = round(val, fldPrecision)
-
-                            outputValues[0] = min(valList[0], outputValues[0])
-                            outputValues[1] = max(valList[0], outputValues[1])
-
-                        else:
-                            val = None
-
-
-                        murec =  mukey, pct, val, areasym
-                        #dMu[mukey] = newrec
-                        ocur.insertRow(murec)
-                        #PrintMsg("\tMapunit: " + mukey + "; " + str(pct) + "%; " + str(val), 1)
+                    outputValues[0] = min(val, outputValues[0])
+                    outputValues[1] = max(val, outputValues[1])
+                    val = round(val, fldPrecision)
 
+                murec = [dHz["mukeys"][muCode], int(pct), val, dHz["areasymbols"][muCode]]
+                ocur.insertRow(murec)
 
         outputValues.sort()
 
-        #if (bZero and outputValues ==  [0.0, 0.0]):
-        #    PrintMsg("No data for " + sdvAtt, 1)
-
         return outputTbl, outputValues
 
     except MyError, e:
@@ -9502,140 +10644,60 @@ def AggregateHz_MaxMin_WTA(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieB
         if bVerbose:
             PrintMsg(" \nCurrent function : " + sys._getframe().f_code.co_name, 1)
 
-        # Create final output table with MUKEY, COMPPCT_R and sdvFld
-        outputTbl = os.path.join(gdb, tblName)
-        fldPrecision = max(0, dSDV["attributeprecision"])
-
-        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
-        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
-
-        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
-
-        if bZero == False:
-            # ignore any null values
-            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
-
-        else:
-            # retrieve null values and convert to zeros during the iteration process
-            whereClause = "COMPPCT_R >=  " + str(cutOff)
-
-        if arcpy.Exists(outputTbl):
-            arcpy.Delete_management(outputTbl)
-
-        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
-
-        if outputTbl == "":
-            return outputTbl,[]
-
-        dPct = dict()  # sum of comppct_r for each map unit
-        dComp = dict() # component level information
-        dMu = dict()
-
-        # reset variables for cursor
-        sumPct = 0
-        sumProd = 0
-        meanVal = 0
-
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-
-                for rec in cur:
-                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
-                    # top = hzdept
-                    # bot = hzdepb
-                    # td = top of range
-                    # bd = bottom of range
-                    if val is None and bZero:
-                        val = 0
-
-                    if val is not None and hzdept is not None and hzdepb is not None:
-
-                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
-                        try:
-                            hzT = min(hzdepb, bot) - max(hzdept, top)   # usable thickness from this horizon
-
-                        except:
-                            hzT = 0
-
-                        if hzT > 0:
-                            rating = float(hzT) * val   # Not working for KFactor WTA
-                            #rating = float(hzT) * float(val)   # Try floating the KFactor to see if that will work. Won't it still have to be rounded to standard KFactor index value?
-
-                            #PrintMsg("\t" + str(aws), 1)
-
-                            if not cokey in dComp:
-                                # Create initial entry for this component using the first horiozon CHK
-                                dComp[cokey] = [mukey, comppct, hzT, rating, areasym]
-
-                            else:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, comppct, dHzT, dRating, areasym = dComp[cokey]
-                                dRating += rating
-                                dHzT += hzT
-                                dComp[cokey] = [mukey, comppct, dHzT, dRating, areasym]
+        # Create final output table with MUKEY, COMPPCT_R and sdvFld
+        outputTbl = os.path.join(gdb, tblName)
+        fldPrecision = max(0, dSDV["attributeprecision"])
 
-                # get the total number of major components from the dictionary count
-                iComp = len(dComp)
+        inFlds = ["MUKEY", "COKEY", "COMPPCT_R", "HZDEPT_R", "HZDEPB_R", dSDV["attributecolumnname"].upper(), "AREASYMBOL"]
+        outFlds = ["MUKEY", "COMPPCT_R", dSDV["resultcolumnname"].upper(), "AREASYMBOL"]
 
-                # Read through the component-level data and summarize to the mapunit level
+        sqlClause =  (None, "ORDER BY MUKEY ASC, COMPPCT_R DESC, HZDEPT_R ASC")
 
-                if iComp > 0:
-                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
+        if bZero == False:
+            # ignore any null values
+            whereClause = "COMPPCT_R >=  " + str(cutOff) + " AND " + dSDV["attributecolumnname"].upper() + " IS NOT NULL"
 
-                    for cokey, vals in dComp.items():
+        else:
+            # retrieve null values and convert to zeros during the iteration process
+            whereClause = "COMPPCT_R >=  " + str(cutOff)
 
-                        # get component level data
-                        mukey, comppct, hzT, cval, areasym = vals
-                        if not cval is None and hzT > 0:
-                            rating = cval / hzT  # final horizon weighted average for this component
+        if arcpy.Exists(outputTbl):
+            arcpy.Delete_management(outputTbl)
 
-                        else:
-                            rating = None
+        outputTbl = CreateOutputTable(initialTbl, outputTbl, dFieldInfo)
 
-                        #PrintMsg("\t" + mukey + ", " + cokey + ", " + str(round(rating, 1)), 1)
+        if outputTbl == "":
+            return outputTbl,[]
 
-                        try:
-                            # append component weighted average rating to the mapunit dictionary
-                            dMu[mukey].append([comppct, rating, areasym])
+        # Read the initial table into arrays once, in the same sort order, and aggregate the
+        # horizon data using the NumPy kernels in SSURGO_HorizonAggregation.py
+        with InitialCursor(initialTbl, inFlds + OverlapFields(initialTbl, top, bot), where_clause=whereClause, sql_clause=sqlClause) as cur:
+            dHz = SSURGO_HorizonAggregation.HorizonArrays(cur, bZero)
 
-                        except:
-                            # create a new mapunit record in the dictionary
-                            dMu[mukey] = [[comppct, rating, areasym]]
+        # Horizon thickness for a standard depth interval from the overlap matrix
+        AttachHorizonOverlap(dHz)
 
-                # Write out map unit aggregated rating
-                #
-                #murec = list()
-                outputValues = [999999999, -999999999]
+        if tieBreaker == dSDV["tiebreakhighlabel"]:
+            bHigh = True
 
-                if tieBreaker == dSDV["tiebreakhighlabel"]:
-                    for mukey, muVals in dMu.items():
-                        muVal = SortData(muVals, 1, 0, True, True)
-                        pct, val, areasym = muVal
-                        rating = round(val, fldPrecision)
-                        murec = [mukey, pct, rating, areasym]
-                        ocur.insertRow(murec)
+        else:
+            bHigh = False
 
-                        if not rating is None:
-                            # save overall max-min values
-                            outputValues[0] = min(rating, outputValues[0])
-                            outputValues[1] = max(rating, outputValues[1])
+        muCodes, muPcts, muValues = SSURGO_HorizonAggregation.MaxMinAverage(dHz, top, bot, bHigh)
 
-                else:
-                    # Lower
-                    for mukey, muVals in dMu.items():
-                        muVal = SortData(muVals, 1, 0, False, True)
-                        pct, val, areasym = muVal
-                        rating = round(val, fldPrecision)
-                        murec = [mukey, pct, rating, areasym]
-                        ocur.insertRow(murec)
+        # Write out map unit aggregated rating
+        #
+        outputValues = [999999999, -999999999]
 
-                        if not rating is None:
-                            # save overall max-min values
-                            outputValues[0] = min(rating, outputValues[0])
-                            outputValues[1] = max(rating, outputValues[1])
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+            for muCode, pct, val in zip(muCodes.tolist(), muPcts.tolist(), muValues.tolist()):
+                rating = round(val, fldPrecision)
+                murec = [dHz["mukeys"][muCode], int(pct), rating, dHz["areasymbols"][muCode]]
+                ocur.insertRow(murec)
 
-        #if (bZero and outputValues ==  [0.0, 0.0]):
-        #    PrintMsg(" \n7. No data for " + sdvAtt, 1)
+                # save overall max-min values
+                outputValues[0] = min(rating, outputValues[0])
+                outputValues[1] = max(rating, outputValues[1])
 
         return outputTbl, outputValues
 
@@ -9683,107 +10745,32 @@ def AggregateHz_MaxMin_DCD(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieB
         if outputTbl == "":
             return outputTbl,[]
 
-        dPct = dict()  # sum of comppct_r for each map unit
-        dComp = dict() # component level information
-        dMu = dict()
-
-        # reset variables for cursor
-        sumPct = 0
-        sumProd = 0
-        meanVal = 0
-
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-
-                for rec in cur:
-                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
-                    # top = hzdept
-                    # bot = hzdepb
-                    # td = top of range
-                    # bd = bottom of range
-
-                    if val is not None and hzdept is not None and hzdepb is not None:
-
-                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
-                        try:
-                            hzT = min(hzdepb, bot) - max(hzdept, top)   # usable thickness from this horizon
-
-                        except:
-                            hzT = 0
-
-                        if hzT > 0:
-                            ratingIndx = domainValues.index(val)   # Change KFactor to an index based upon domain order
+        # Read the initial table into arrays once, in the same sort order, and aggregate the
+        # horizon data using the NumPy kernels in SSURGO_HorizonAggregation.py
+        with InitialCursor(initialTbl, inFlds + OverlapFields(initialTbl, top, bot), where_clause=whereClause, sql_clause=sqlClause) as cur:
+            dHz = SSURGO_HorizonAggregation.HorizonArrays(cur, False, domainValues)
 
-                            #PrintMsg("\t" + str(aws), 1)
+        # Horizon thickness for a standard depth interval from the overlap matrix
+        AttachHorizonOverlap(dHz)
 
-                            if not cokey in dComp:
-                                # Create initial entry for this component using the first horiozon CHK
-                                ratingList = [ratingIndx]
-                                dComp[cokey] = [mukey, comppct, ratingList, areasym]
+        # Change KFactor to an index based upon domain order and get the highest index from
+        # all horizons for the component with the highest comppct_r
+        muCodes, muPcts, muIndexes = SSURGO_HorizonAggregation.MaxIndexDCD(dHz, top, bot)
 
-                            else:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, comppct, ratingList, areasym = dComp[cokey]
-                                
-                                if not ratingIndx in ratingList:
-                                    ratingList.append(ratingIndx)
-                                    dComp[cokey] = [mukey, comppct, ratingList, areasym]
-
-                # get the total number of major components from the dictionary count
-                iComp = len(dComp)
-
-                # Read through the component-level data and summarize to the mapunit level
-
-                if iComp > 0:
-                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
-
-                    for cokey, vals in dComp.items():
-
-                        # get component level data
-                        mukey, comppct, ratingList, areasym = vals
-                        
-                        ratingIndx = max(ratingList)  # get highest K Factor from all horizons for this component
-                        #PrintMsg("\t" + mukey + ", " + cokey + ", " + str(round(rating, 1)), 1)
-
-                        try:
-                            # append component weighted average rating to the mapunit dictionary
-                            dMu[mukey].append([comppct, ratingIndx, areasym])
-
-                        except:
-                            # create a new mapunit record in the dictionary
-                            dMu[mukey] = [[comppct, ratingIndx, areasym]]
-
-                # Write out map unit aggregated rating
-                #
-                outputValues = [domainValues[0], domainValues[-1]]
-
-                #if tieBreaker == dSDV["tiebreakhighlabel"]:
-                oid = 0
-                
-                for mukey, muVals in dMu.items():
-                    oid += 1
-                    #muVal = SortData(muVals, 1, 0, True, True)
-                    muVal = SortData(muVals, 0, 0, True, True)
-                    pct, ratingIndx, areasym = muVal
-                    rating = domainValues[ratingIndx]
-                    murec = [mukey, pct, rating, areasym]
+        # Write out map unit aggregated rating
+        #
+        outputValues = [domainValues[0], domainValues[-1]]
 
-                    
-                    #if mukey == "1427104":
-                    #if mukey == "1380525":
-                    #    PrintMsg(" \nOutput Table: " + outputTbl, 1)
-                    #    PrintMsg("\t" + str(muVals), 1)
-                    #    PrintMsg("\t" + str(muVal), 1)
-                    #    PrintMsg("\t" + rating, 1)
-                    #    PrintMsg("\t" + str(oid) + ", " + str(murec), 1)
-                        
-                    
-                    ocur.insertRow(murec)
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+            for muCode, pct, ratingIndx in zip(muCodes.tolist(), muPcts.tolist(), muIndexes.tolist()):
+                rating = domainValues[ratingIndx]
+                murec = [dHz["mukeys"][muCode], int(pct), rating, dHz["areasymbols"][muCode]]
+                ocur.insertRow(murec)
 
-                    if not rating is None:
-                    #    # save overall max-min values
-                        outputValues[0] = min(rating, outputValues[0])
-                        outputValues[1] = max(rating, outputValues[1])
+                if not rating is None:
+                    # save overall max-min values
+                    outputValues[0] = min(rating, outputValues[0])
+                    outputValues[1] = max(rating, outputValues[1])
 
         return outputTbl, outputValues
 
@@ -9832,104 +10819,32 @@ def AggregateHz_MaxMin_DCP(gdb, sdvAtt, sdvFld, initialTbl, bNulls, cutOff, tieB
         if outputTbl == "":
             return outputTbl,[]
 
-        dPct = dict()  # sum of comppct_r for each map unit
-        dComp = dict() # component level information
-        dMu = dict()
-
-        # reset variables for cursor
-        sumPct = 0
-        sumProd = 0
-        meanVal = 0
-
-        with arcpy.da.SearchCursor(initialTbl, inFlds, where_clause=whereClause, sql_clause=sqlClause) as cur:
-            with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
-
-                for rec in cur:
-                    mukey, cokey, comppct, hzdept, hzdepb, val, areasym = rec
-                    # top = hzdept
-                    # bot = hzdepb
-                    # td = top of range
-                    # bd = bottom of range
-
-                    if val is not None and hzdept is not None and hzdepb is not None:
-
-                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
-                        try:
-                            hzT = min(hzdepb, bot) - max(hzdept, top)   # usable thickness from this horizon
-
-                        except:
-                            hzT = 0
-
-                        if hzT > 0:
-                            ratingIndx = domainValues.index(val)   # Change KFactor to an index based upon domain order
-
-                            #PrintMsg("\t" + str(aws), 1)
-
-                            if not cokey in dComp:
-                                if not mukey in dMu:
-                                    dMu[mukey] = cokey
-
-                                    # Create initial entry for this component using the first horiozon CHK
-                                    ratingList = [ratingIndx]
-                                    dComp[cokey] = [mukey, comppct, ratingList, areasym]
-
-                            elif cokey == dMu[mukey]:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, comppct, ratingList, areasym = dComp[cokey]
-                                
-                                if not ratingIndx in ratingList:
-                                    ratingList.append(ratingIndx)
-                                    dComp[cokey] = [mukey, comppct, ratingList, areasym]
-
-                # get the total number of major components from the dictionary count
-                iComp = len(dComp)
-
-                # Read through the component-level data and summarize to the mapunit level
-
-                if iComp > 0:
-                    #PrintMsg("\t" + str(top) + " - " + str(bot) + "cm (" + Number_Format(iComp, 0, True) + " components)"  , 0)
-
-                    for cokey, vals in dComp.items():
-
-                        # get component level data
-                        mukey, comppct, ratingList, areasym = vals
-                        
-                        ratingIndx = max(ratingList)  # get highest K Factor from all horizons for this component
-                        #PrintMsg("\t" + mukey + ", " + cokey + ", " + str(round(rating, 1)), 1)
+        # Read the initial table into arrays once, in the same sort order, and aggregate the
+        # horizon data using the NumPy kernels in SSURGO_HorizonAggregation.py
+        with InitialCursor(initialTbl, inFlds + OverlapFields(initialTbl, top, bot), where_clause=whereClause, sql_clause=sqlClause) as cur:
+            dHz = SSURGO_HorizonAggregation.HorizonArrays(cur, False, domainValues)
 
-                        try:
-                            # append component weighted average rating to the mapunit dictionary
-                            dMu[mukey].append([comppct, ratingIndx, areasym])
+        # Horizon thickness for a standard depth interval from the overlap matrix
+        AttachHorizonOverlap(dHz)
 
-                        except:
-                            # create a new mapunit record in the dictionary
-                            dMu[mukey] = [[comppct, ratingIndx, areasym]]
+        # Change KFactor to an index based upon domain order and get the highest index from
+        # all horizons for the dominant component
+        muCodes, muPcts, muIndexes = SSURGO_HorizonAggregation.MaxIndexDCP(dHz, top, bot)
 
-                # Write out map unit aggregated rating
-                #
-                outputValues = [domainValues[0], domainValues[-1]]
+        # Write out map unit aggregated rating
+        #
+        outputValues = [domainValues[0], domainValues[-1]]
 
-                #if tieBreaker == dSDV["tiebreakhighlabel"]:
-                oid = 0
-                
-                for mukey, muVals in dMu.items():
-                    oid += 1
-                    muVal = SortData(muVals, 1, 0, True, True)              
-                    pct, ratingIndx, areasym = muVal
-                    rating = domainValues[ratingIndx]
-                    murec = [mukey, pct, rating, areasym]
-                    #if mukey == "1427104":
-                    #    PrintMsg(" \nOutput Table: " + outputTbl, 1)
-                    #    PrintMsg("\t" + str(muVals), 1)
-                    #    PrintMsg("\t" + str(muVal), 1)
-                    #    PrintMsg("\t" + rating, 1)
-                    #    PrintMsg("\t" + str(oid) + ", " + str(murec), 1)
-                    ocur.insertRow(murec)
+        with arcpy.da.InsertCursor(outputTbl, outFlds) as ocur:
+            for muCode, pct, ratingIndx in zip(muCodes.tolist(), muPcts.tolist(), muIndexes.tolist()):
+                rating = domainValues[ratingIndx]
+                murec = [dHz["mukeys"][muCode], int(pct), rating, dHz["areasymbols"][muCode]]
+                ocur.insertRow(murec)
 
-                    if not rating is None:
-                    #    # save overall max-min values
-                        outputValues[0] = min(rating, outputValues[0])
-                        outputValues[1] = max(rating, outputValues[1])
+                if not rating is None:
+                    # save overall max-min values
+                    outputValues[0] = min(rating, outputValues[0])
+                    outputValues[1] = max(rating, outputValues[1])
 
         return outputTbl, outputValues
 
@@ -10144,6 +11059,8 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         bVerbose = False   # hard-coded boolean to print diagnostic messages
         # bVerbose = True
 
+        bSingleBatch = False  # set when this map reads its own batch tables from the column cache
+
         # Value cache is a global variable used for fact function which is called by ColorRamp
         global fact_cache
         fact_cache = {}
@@ -10168,9 +11085,33 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         env.workspace = gdb
         env.overwriteOutput = True
 
+        if bProfile:
+            StartProfile(sdvAtt, aggMethod, top, bot)
+
+        # SDV_Data and the rating table are written to outputGDB. A worker process in the
+        # rating table pool has its own geodatabase (see CreateRatingTables).
+        global outputGDB
+
+        if bRatingsOnly:
+            outputGDB = ratingsGDB
+
+        else:
+            outputGDB = gdb
+
         # get scratchGDB
         scratchGDB = env.scratchGDB
 
+        if not updateMukeys is None:
+            # Update mode. The changed map units are aggregated in the scratch geodatabase
+            # and then merged into the existing rating table (MergeRatingTable).
+            outputGDB = scratchGDB
+
+            global dUpdateKeys
+            dUpdateKeys = UpdateKeys(gdb)
+
+            if len(dUpdateKeys) == 0:
+                raise MyError, "Unable to get the component and horizon keys for the updated map units"
+
         # Get dictionary of MUSYM values (optional function for use during development)
         dSymbols = GetMapunitSymbols(gdb)
 
@@ -10181,10 +11122,17 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         #
         # Get map document object
         global mxd, df
-        mxd = arcpy.mapping.MapDocument("CURRENT")
 
-        # Get active data frame object
-        df = mxd.activeDataFrame
+        if bRatingsOnly:
+            # Worker process, no map document
+            mxd = None
+            df = None
+
+        else:
+            mxd = arcpy.mapping.MapDocument("CURRENT")
+
+            # Get active data frame object
+            df = mxd.activeDataFrame
 
         # Create a dictionary based upon domainValues or legendValues.
         # This dictionary will use an uppercase-string version of the original value as the key
@@ -10210,7 +11158,7 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         # if aggMethod is not already set, get the default method from the sdvattribute table
         global dSDV
 
-        dSDV = GetSDVAtts(gdb, sdvAtt, aggMethod, tieBreaker, bFuzzy, sRV)  # In batch mode, bFuzzy is set to False. This does not work for interps like NCCPI.
+        dSDV = ProfileCall(GetSDVAtts, gdb, sdvAtt, aggMethod, tieBreaker, bFuzzy, sRV)  # In batch mode, bFuzzy is set to False. This does not work for interps like NCCPI.
 
         if aggMethod == "":
             aggMethod = dSDV["algorithmname"]
@@ -10389,7 +11337,7 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         #
         global dLegend
 
-        dLegend = GetMapLegend(dSDV, bFuzzy)    # dictionary containing all maplegendxml properties
+        dLegend = ProfileCall(GetMapLegend, dSDV, bFuzzy)    # dictionary containing all maplegendxml properties
         #PrintMsg(" \nChecking dLegend values to see if rgb is text:  " + str(dLegend), 1)
 
         global dLabels
@@ -10599,28 +11547,67 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
             else:
                 PrintMsg(" \nCreating map of '" + outputLayer + "' using " + os.path.basename(gdb), 0)
 
-        # Check to see if the layer already exists and delete if necessary
-        layers = arcpy.mapping.ListLayers(mxd, outputLayer, df)
+        tableViews = list()
+
+        if not bRatingsOnly:
+            # Check to see if the layer already exists and delete if necessary
+            layers = arcpy.mapping.ListLayers(mxd, outputLayer, df)
 
-        if len(layers) == 1:
-            arcpy.mapping.RemoveLayer(df, layers[0])
+            if len(layers) == 1:
+                arcpy.mapping.RemoveLayer(df, layers[0])
 
-        # Create list of tables in the ArcMap TOC. Later check to see if a table
-        # involved in queries needs to be removed from the TOC.
-        tableViews = arcpy.mapping.ListTableViews(mxd, "*", df)
-        mainTables = ['mapunit', 'component', 'chorizon']
+            # Create list of tables in the ArcMap TOC. Later check to see if a table
+            # involved in queries needs to be removed from the TOC.
+            tableViews = arcpy.mapping.ListTableViews(mxd, "*", df)
+            mainTables = ['mapunit', 'component', 'chorizon']
 
-        for tv in tableViews:
-            if tv.datasetName.lower() in mainTables:
-                # Remove this table view from ArcMap that might cause a conflict with queries
-                arcpy.mapping.RemoveTableView(df, tv)
+            for tv in tableViews:
+                if tv.datasetName.lower() in mainTables:
+                    # Remove this table view from ArcMap that might cause a conflict with queries
+                    arcpy.mapping.RemoveTableView(df, tv)
+
+            tableViews = arcpy.mapping.ListTableViews(mxd, "*", df)   # any other table views...
 
-        tableViews = arcpy.mapping.ListTableViews(mxd, "*", df)   # any other table views...
         rtabphyname = "XXXXX"
         mdSQL = "RTABPHYNAME = '" + dSDV["attributetablename"].lower() + "'"  # initial whereclause for mdstatrshipdet
 
+        # Create dictionary for areasymbol
+        #PrintMsg(" \nGetting polygon count...", 1)
+        global polyCnt, fcCnt
+        polyCnt = int(arcpy.GetCount_management(inputLayer).getOutput(0))  # featurelayer polygon count
+        fcCnt = int(arcpy.GetCount_management(fc).getOutput(0))            # featureclass polygon count
+        #PrintMsg(" \nGot polygon count of " + Number_Format(polyCnt, 0, True), 1)
+
+        # Getting Areasymbols and legendkeys is a bottleneck (Thursday Aug 18). Any room for improvement?
+        #
+        #PrintMsg(" \nGetting areasymbols...", 1)
+        global dAreasymbols
+        dAreasymbols = GetAreasymbols(gdb)
+
+        if len(dAreasymbols) == 0:
+            raise MyError, "xxx dAreasymbols is not populated"
+
+        # Rating table cache. When the same map was already made from this version of the
+        # database, the rating table is restored instead of reading and aggregating the data.
+        ratingKey = None
+        dRating = None
+
+        if bRatingCache:
+            params = [sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV, sorted(dAreasymbols.items())]
+            ratingKey = RatingCacheKey(params, CacheFingerprint(gdb))
+
+            if updateMukeys is None:
+                dRating = ReadRatingCache(ratingKey)
+
+        bRatingHit = dRating is not None
+
+        # Not part of a map series. Use the column cache for the big 3 tables as well.
+        # Not in update mode, where ReadTable only reads the changed map units.
+        if bColumnCache and not bRatingHit and updateMukeys is None and len([batchTbl for batchTbl in dBatchTables.values() if batchTbl[0] == gdb]) == 0:
+            bSingleBatch = ReadBatchTables(inputLayer, [(sdvAtt, aggMethod, top, bot)], sRV)
+
         # Setup initial queries
-        while rtabphyname != "MAPUNIT":
+        while rtabphyname != "MAPUNIT" and not bRatingHit:
             level += 1
 
             with arcpy.da.SearchCursor(mdTable, mdFlds, where_clause=mdSQL) as cur:
@@ -10788,8 +11775,13 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                             if rtabphyname == "MAPUNIT" and aggMethod != "No Aggregation Necessary":
                                 # No aggregation necessary?
                                 PrintMsg(" \n" + sdvAtt + " aggregation method set to: " + aggMethod, 1)
-                                
-                                dMapunit = ReadTable(rtabphyname, flds, primSQL, level, sql)
+                                dMapunit = None
+
+                                if primSQL == "":
+                                    dMapunit = ProfileCall(BatchTable, rtabphyname, flds)
+
+                                if dMapunit is None:
+                                    dMapunit = ProfileCall(ReadTable, rtabphyname, flds, primSQL, level, sql)
 
                                 if len(dMapunit) == 0:
                                     raise MyError, ""
@@ -10798,7 +11790,7 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                                 # No aggregation necessary?
                                 #dMapunit = ReadTable(rtabphyname, flds, primSQL, level, sql)
                                 primSQL = dSDV["sqlwhereclause"]
-                                dTbl = ReadTable(rtabphyname, flds, primSQL, level, sql)
+                                dTbl = ProfileCall(ReadTable, rtabphyname, flds, primSQL, level, sql)
 
                                 #if len(dTbl) == 0:
                                 #    raise MyError, ""
@@ -10821,8 +11813,13 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
 
 
                                 #PrintMsg(" \nPopulating dictionary from component table", 1)
+                                dComponent = None
+
+                                if dSDV["sqlwhereclause"] is None and cutOff is not None:
+                                    dComponent = ProfileCall(BatchTable, rtabphyname, flds, cutOff=cutOff, bNotcom=True)
 
-                                dComponent = ReadTable(rtabphyname, flds, primSQL, level, sql)
+                                if dComponent is None:
+                                    dComponent = ProfileCall(ReadTable, rtabphyname, flds, primSQL, level, sql)
 
                                 if len(dComponent) == 0:
                                     raise MyError, "No component data for " + sdvAtt
@@ -10830,7 +11827,10 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                             elif rtabphyname == "CHORIZON":
                                 #primSQL = "(CHORIZON.HZDEPT_R between " + str(top) + " and " + str(bot) + " or CHORIZON.HZDEPB_R between " + str(top) + " and " + str(bot + 1) + ")"
                                 #PrintMsg(" \nCHORIZON hzQuery: " + hzQuery, 1)
-                                dHorizon = ReadTable(rtabphyname, flds, hzQuery, level, sql)
+                                dHorizon = ProfileCall(BatchTable, rtabphyname, flds, depths=(top, bot))
+
+                                if dHorizon is None:
+                                    dHorizon = ProfileCall(ReadTable, rtabphyname, flds, hzQuery, level, sql)
 
                                 if len(dHorizon) == 0:
                                     raise MyError, "No horizon data for " + sdvAtt
@@ -10844,7 +11844,14 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                                 #PrintMsg(" \nReading " + dSDV["attributetablename"] + " table, using " + ", ".join(flds), 1)
                                 #PrintMsg("Using primSQL: " + str(primSQL) + ";  " + " sql: " + str(sql), 1)
 
-                                dTbl = ReadTable(dSDV["attributetablename"].upper(), flds, primSQL, level, sql)
+                                dTbl = None
+
+                                if bColumnCache and dSDV["attributetablename"].upper() == "COINTERP" and primSQL == interpSQL:
+                                    # Only the rulekey query, which can be answered from the column cache
+                                    dTbl = ProfileCall(CachedInterpTable, dSDV["attributetablename"].upper(), flds, ruleKey[2:-2].split("','"))
+
+                                if dTbl is None:
+                                    dTbl = ProfileCall(ReadTable, dSDV["attributetablename"].upper(), flds, primSQL, level, sql)
 
                                 if len(dTbl) == 0:
                                     raise MyError, "No " + dSDV["attributetablename"] + " data for " + sdvAtt
@@ -10868,7 +11875,10 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                             #PrintMsg(" \n\tReading intermediate table: " + rtabphyname + "   sql: " + str(sql), 1)
 
                             if rtabphyname == "MAPUNIT":
-                                dMapunit = ReadTable(rtabphyname, flds, primSQL, level, sql)
+                                dMapunit = ProfileCall(BatchTable, rtabphyname, flds)
+
+                                if dMapunit is None:
+                                    dMapunit = ProfileCall(ReadTable, rtabphyname, flds, primSQL, level, sql)
 
                                 if len(dMapunit) == 0:
                                     raise MyError, ""
@@ -10877,8 +11887,13 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                                 primSQL = "COMPPCT_R >= " + str(cutOff)
 
                                 #PrintMsg(" \nPopulating dictionary from component table", 1)
+                                dComponent = None
 
-                                dComponent = ReadTable(rtabphyname, flds, primSQL, level, sql)
+                                if cutOff is not None:
+                                    dComponent = ProfileCall(BatchTable, rtabphyname, flds, cutOff=cutOff)
+
+                                if dComponent is None:
+                                    dComponent = ProfileCall(ReadTable, rtabphyname, flds, primSQL, level, sql)
 
                                 if len(dComponent) == 0:
                                     raise MyError, ""
@@ -10898,7 +11913,10 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                                     hzQuery = "((" + tf + " in " + rng + " or " + bf + " in " + rng + ") or ( " + tf + " <= " + str(top) + " and " + bf + " >= " + str(bot) + " ) )"
 
                                 #PrintMsg(" \nSetting primSQL for when rtabphyname = 'CHORIZON' to: " + hzQuery, 1)
-                                dHorizon = ReadTable(rtabphyname, flds, hzQuery, level, sql)
+                                dHorizon = ProfileCall(BatchTable, rtabphyname, flds, depths=(top, bot))
+
+                                if dHorizon is None:
+                                    dHorizon = ProfileCall(ReadTable, rtabphyname, flds, hzQuery, level, sql)
 
                                 if len(dHorizon) == 0:
                                     raise MyError, ""
@@ -10914,7 +11932,7 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                                     primSQL = "(MONTHSEQ IN " + str(tuple(range(moList.index(begMo), (moList.index(endMo) + 1 )))) + ")"
 
                                 #PrintMsg(" \nIntermediate SQL: " + primSQL, 1)
-                                dMonth = ReadTable(rtabphyname, flds, primSQL, level, sql)
+                                dMonth = ProfileCall(ReadTable, rtabphyname, flds, primSQL, level, sql)
 
                                 if len(dMonth) == 0:
                                     raise MyError, "No comonth data for " + sdvAtt + " \n "
@@ -10929,150 +11947,138 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                 raise MyError, "Failed to get table relationships"
 
 
-        # Create a list of all fields needed for the initial output table. This
-        # one will include primary keys that won't be in the final output table.
+        # Build the initial query table and map unit ratings, unless the rating table
+        # is coming from the cache
         #
-        if len(tblList) == 0:
-            # No Aggregation Necessary, append field to mapunit list
-            tblList = ["MAPUNIT"]
+        if not bRatingHit:
+            # Create a list of all fields needed for the initial output table. This
+            # one will include primary keys that won't be in the final output table.
+            #
+            if len(tblList) == 0:
+                # No Aggregation Necessary, append field to mapunit list
+                tblList = ["MAPUNIT"]
 
-            if dSDV["attributecolumnname"].upper() in dFields["MAPUNIT"]:
-                PrintMsg(" \nSkipping addition of field "  + dSDV["attributecolumnname"].upper(), 1)
+                if dSDV["attributecolumnname"].upper() in dFields["MAPUNIT"]:
+                    PrintMsg(" \nSkipping addition of field "  + dSDV["attributecolumnname"].upper(), 1)
 
-            else:
-                dFields["MAPUNIT"].append(dSDV["attributecolumnname"].upper())
+                else:
+                    dFields["MAPUNIT"].append(dSDV["attributecolumnname"].upper())
 
-        tblList.reverse()  # Set order of the tables so that mapunit is on top
+            tblList.reverse()  # Set order of the tables so that mapunit is on top
 
-        if bVerbose:
-            PrintMsg(" \nUsing these tables: " + ", ".join(tblList), 1)
+            if bVerbose:
+                PrintMsg(" \nUsing these tables: " + ", ".join(tblList), 1)
 
-        # Create a list of all fields to be used
-        global allFields
-        allFields = ["AREASYMBOL"]
-        allFields.extend(dFields["MAPUNIT"])  # always include the selected set of fields from mapunit table
-        #PrintMsg(" \nallFields 1: " + ", ".join(allFields), 1)
+            # Create a list of all fields to be used
+            global allFields
+            allFields = ["AREASYMBOL"]
+            allFields.extend(dFields["MAPUNIT"])  # always include the selected set of fields from mapunit table
+            #PrintMsg(" \nallFields 1: " + ", ".join(allFields), 1)
 
-        # Substitute resultcolumname for last field in allFields
-        for tbl in tblList:
-            tFields = dFields[tbl]
-            for fld in tFields:
-                if not fld.upper() in allFields:
-                    #PrintMsg("\tAdding " + tbl + "." + fld.upper(), 1)
-                    allFields.append(fld.upper())
+            # Substitute resultcolumname for last field in allFields
+            for tbl in tblList:
+                tFields = dFields[tbl]
+                for fld in tFields:
+                    if not fld.upper() in allFields:
+                        #PrintMsg("\tAdding " + tbl + "." + fld.upper(), 1)
+                        allFields.append(fld.upper())
 
-        if not dSDV["attributecolumnname"].upper() in allFields:
-            allFields.append(dSDV["attributecolumnname"].upper())
+            if not dSDV["attributecolumnname"].upper() in allFields:
+                allFields.append(dSDV["attributecolumnname"].upper())
 
-        #PrintMsg(" \nallFields 3: " + ", ".join(allFields), 1)
+            #PrintMsg(" \nallFields 3: " + ", ".join(allFields), 1)
 
-        # Create initial output table (one-to-many)
-        # Now created with resultcolumnname
-        #
-        initialTbl = CreateInitialTable(gdb, allFields, dFieldInfo)
+            # Create initial output table (one-to-many)
+            # Now created with resultcolumnname
+            #
+            initialTbl = CreateInitialTable(outputGDB, allFields, dFieldInfo)
 
-        if initialTbl is None:
-            raise MyError, "Failed to create initial query table"
+            if initialTbl is None:
+                raise MyError, "Failed to create initial query table"
 
-        # Create dictionary for areasymbol
-        #PrintMsg(" \nGetting polygon count...", 1)
-        global polyCnt, fcCnt
-        polyCnt = int(arcpy.GetCount_management(inputLayer).getOutput(0))  # featurelayer polygon count
-        fcCnt = int(arcpy.GetCount_management(fc).getOutput(0))            # featureclass polygon count
-        #PrintMsg(" \nGot polygon count of " + Number_Format(polyCnt, 0, True), 1)
+            # Made changes in the table relates code that creates tblList. List now has MAPUNIT in first position
+            #
 
-        # Getting Areasymbols and legendkeys is a bottleneck (Thursday Aug 18). Any room for improvement?
-        #
-        #PrintMsg(" \nGetting areasymbols...", 1)
-        global dAreasymbols
-        dAreasymbols = GetAreasymbols(gdb)
+            if tblList == ['MAPUNIT']:
+                # No aggregation needed
+                if ProfileCall(CreateRatingTable1, tblList, dSDV["attributetablename"].upper(), initialTbl, dAreasymbols) == False:
+                    raise MyError, "xxx CreateRatingTable failed"
 
-        if len(dAreasymbols) == 0:
-            raise MyError, "xxx dAreasymbols is not populated"
+            elif tblList == ['MAPUNIT', 'COMPONENT']:
+                if ProfileCall(CreateRatingTable2, tblList, dSDV["attributetablename"].upper(), dComponent, initialTbl) == False:
+                    raise MyError, "xxx CreateRatingTable failed"
+                del dComponent
 
-        # Made changes in the table relates code that creates tblList. List now has MAPUNIT in first position
-        #
+            elif tblList == ['MAPUNIT', 'COMPONENT', 'CHORIZON']:
+                if ProfileCall(CreateRatingTable3, tblList, dSDV["attributetablename"].upper(), dComponent, dHorizon, initialTbl) == False:
+                    raise MyError, "xxx CreateRatingTable failed"
+                del dComponent, dHorizon
 
-        if tblList == ['MAPUNIT']:
-            # No aggregation needed
-            if CreateRatingTable1(tblList, dSDV["attributetablename"].upper(), initialTbl, dAreasymbols) == False:
-                raise MyError, "xxx CreateRatingTable failed"
-
-        elif tblList == ['MAPUNIT', 'COMPONENT']:
-            if CreateRatingTable2(tblList, dSDV["attributetablename"].upper(), dComponent, initialTbl) == False:
-                raise MyError, "xxx CreateRatingTable failed"
-            del dComponent
-
-        elif tblList == ['MAPUNIT', 'COMPONENT', 'CHORIZON']:
-            if CreateRatingTable3(tblList, dSDV["attributetablename"].upper(), dComponent, dHorizon, initialTbl) == False:
-                raise MyError, "xxx CreateRatingTable failed"
-            del dComponent, dHorizon
-
-        elif tblList == ['MAPUNIT', 'COMPONENT', 'CHORIZON', dSDV["attributetablename"].upper()]:
-            # COMPONENT, CHORIZON, CHTEXTUREGRP
-            if CreateRatingTable3S(tblList, dSDV["attributetablename"].upper(), dComponent, dHorizon, dTbl, initialTbl, sdvAtt) == False:
-                raise MyError, "xxx CreateRatingTable failed"
-            del dComponent, dHorizon
-
-        elif tblList in [['MAPUNIT', "MUAGGATT"], ['MAPUNIT', "MUCROPYLD"], ['MAPUNIT', 'MUTEXT']]:
-            if CreateRatingTable1S(tblList, dSDV["attributetablename"].upper(), dTbl, initialTbl, dAreasymbols) == False:
-                raise MyError, "xxx CreateRatingTable failed"
-
-        elif tblList == ['MAPUNIT', 'COMPONENT', dSDV["attributetablename"].upper()]:
-            if dSDV["attributetablename"].upper() == "COINTERP":
-                if CreateRatingInterps(tblList, dSDV["attributetablename"].upper(), dComponent, dTbl, initialTbl) == False:
+            elif tblList == ['MAPUNIT', 'COMPONENT', 'CHORIZON', dSDV["attributetablename"].upper()]:
+                # COMPONENT, CHORIZON, CHTEXTUREGRP
+                if ProfileCall(CreateRatingTable3S, tblList, dSDV["attributetablename"].upper(), dComponent, dHorizon, dTbl, initialTbl, sdvAtt) == False:
                     raise MyError, "xxx CreateRatingTable failed"
-                del dComponent
+                del dComponent, dHorizon
 
-            else:
-                if CreateRatingTable2S(tblList, dSDV["attributetablename"].upper(), dComponent, dTbl, initialTbl) == False:
+            elif tblList in [['MAPUNIT', "MUAGGATT"], ['MAPUNIT', "MUCROPYLD"], ['MAPUNIT', 'MUTEXT']]:
+                if ProfileCall(CreateRatingTable1S, tblList, dSDV["attributetablename"].upper(), dTbl, initialTbl, dAreasymbols) == False:
                     raise MyError, "xxx CreateRatingTable failed"
 
-        elif tblList == ['MAPUNIT', 'COMPONENT', 'COMONTH', 'COSOILMOIST']:
-            if dSDV["attributetablename"].upper() == "COSOILMOIST":
+            elif tblList == ['MAPUNIT', 'COMPONENT', dSDV["attributetablename"].upper()]:
+                if dSDV["attributetablename"].upper() == "COINTERP":
+                    if ProfileCall(CreateRatingInterps, tblList, dSDV["attributetablename"].upper(), dComponent, dTbl, initialTbl) == False:
+                        raise MyError, "xxx CreateRatingTable failed"
+                    del dComponent
 
-                #PrintMsg(" \ndMissing values before CreateSoilMoistureTable: " + str(dMissing))
+                else:
+                    if ProfileCall(CreateRatingTable2S, tblList, dSDV["attributetablename"].upper(), dComponent, dTbl, initialTbl) == False:
+                        raise MyError, "xxx CreateRatingTable failed"
 
-                if CreateSoilMoistureTable(tblList, dSDV["attributetablename"].upper(), dComponent, dMonth, dTbl, initialTbl, begMo, endMo) == False:
-                    raise MyError, "xxx CreateRatingTable failed"
-                del dMonth, dComponent # trying to lower memory usage
+            elif tblList == ['MAPUNIT', 'COMPONENT', 'COMONTH', 'COSOILMOIST']:
+                if dSDV["attributetablename"].upper() == "COSOILMOIST":
 
-            else:
-                PrintMsg(" \nCannot handle table:" + dSDV["attributetablename"].upper(), 1)
-                raise MyError, "Tables Bad Combo: " + str(tblList)
+                    #PrintMsg(" \ndMissing values before CreateSoilMoistureTable: " + str(dMissing))
 
-        else:
-            # Need to add ['COMPONENT', 'COMONTH', 'COSOILMOIST']
-            raise MyError, "Problem with list of input tables: " + str(tblList)
+                    if CreateSoilMoistureTable(tblList, dSDV["attributetablename"].upper(), dComponent, dMonth, dTbl, initialTbl, begMo, endMo) == False:
+                        raise MyError, "xxx CreateRatingTable failed"
+                    del dMonth, dComponent # trying to lower memory usage
 
-        # **************************************************************************
-        # Look at attribflags and apply the appropriate aggregation function
+                else:
+                    PrintMsg(" \nCannot handle table:" + dSDV["attributetablename"].upper(), 1)
+                    raise MyError, "Tables Bad Combo: " + str(tblList)
 
-        if not arcpy.Exists(initialTbl):
-            # Output table was not created. Exit program.
-            raise MyError, "xxx Failed to create output table"
+            else:
+                # Need to add ['COMPONENT', 'COMONTH', 'COSOILMOIST']
+                raise MyError, "Problem with list of input tables: " + str(tblList)
 
-        #PrintMsg(" \ninitialTbl has " + arcpy.GetCount_management(initialTbl).getOutput(0) + " records", 1)
+            # **************************************************************************
+            # Look at attribflags and apply the appropriate aggregation function
 
-        if int(arcpy.GetCount_management(initialTbl).getOutput(0)) == 0:
-            #
-            raise MyError, "Failed to populate query table"
+            if not initialTbl in dInitialTables and not arcpy.Exists(initialTbl):
+                # Output table was not created. Exit program.
+                raise MyError, "xxx Failed to create output table"
 
-        # Proceed with aggregation if the intermediate table has data.
-        # Add result column to fields list
-        iFlds = len(allFields)
-        newField = dSDV["resultcolumnname"].upper()
+            #PrintMsg(" \ninitialTbl has " + arcpy.GetCount_management(initialTbl).getOutput(0) + " records", 1)
 
-        #PrintMsg(" \nallFields: " + ", ".join(allFields), 1)
-        allFields[len(allFields) - 1] = newField
-        rmFields = ["MUSYM", "COMPNAME", "LKEY"]
+            if InitialCount(initialTbl) == 0:
+                #
+                raise MyError, "Failed to populate query table"
+
+            # Proceed with aggregation if the intermediate table has data.
+            # Add result column to fields list
+            iFlds = len(allFields)
+            newField = dSDV["resultcolumnname"].upper()
 
-        for fld in rmFields:
-            if fld in allFields:
-                allFields.remove(fld)
+            #PrintMsg(" \nallFields: " + ", ".join(allFields), 1)
+            allFields[len(allFields) - 1] = newField
+            rmFields = ["MUSYM", "COMPNAME", "LKEY"]
 
-        if newField == "MUNAME":
-            allFields.remove("MUNAME")
+            for fld in rmFields:
+                if fld in allFields:
+                    allFields.remove(fld)
+
+            if newField == "MUNAME":
+                allFields.remove("MUNAME")
 
         #PrintMsg(" \nallFields: " + ", ".join(allFields), 1)
 
@@ -11125,6 +12131,12 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
 
         tblName = newName
 
+        if bProfile:
+            dProfile["table"] = tblName
+
+        if not updateMukeys is None and not arcpy.Exists(os.path.join(gdb, tblName)):
+            raise MyError, "Unable to update " + tblName + ", the table does not exist in " + os.path.basename(gdb) + ". Create the map first."
+
         #PrintMsg(" \nOutput table name = " + tblName, 1)
 
         # **************************************************************************
@@ -11134,7 +12146,18 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         #
         # This is where outputValues is set
         #
-        if dSDV["attributetype"] == "Property":
+        if bRatingHit:
+            outputTbl, outputValues = ProfileCall(RestoreRatingTable, dRating)
+
+            if outputTbl == "":
+                raise MyError, "Failed to restore " + tblName + " from the rating table cache"
+
+            # Rating domain as it was after the original aggregation
+            dValues = dRating["dValues"]
+            domainValues = dRating["domainValues"]
+            domainValuesUp = dRating["domainValuesUp"]
+
+        elif dSDV["attributetype"] == "Property":
             # These are all Soil Properties
             # Added addtional logic for Minnesota Crop Index. It has a problem in that mapunitlevelattribflag is set to zero.
 
@@ -11143,7 +12166,7 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                 and dSDV["cmonthlevelattribflag"] == 0 and dSDV["horzlevelattribflag"] == 0 ) :
                 # This is a Map unit Level Soil Property or it is Minnesota Crop Index in the MUTEXT table
                 #PrintMsg("Map unit level, no aggregation neccessary", 1)
-                outputTbl, outputValues = Aggregate1(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                outputTbl, outputValues = ProfileCall(Aggregate1, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
             elif dSDV["complevelattribflag"] == 1:
 
@@ -11156,10 +12179,10 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
 
                         if aggMethod == "Dominant Component":
                             #PrintMsg(" \n1. domainValues: " + ", ".join(domainValues), 1)
-                            outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateCo_DCP, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                         elif aggMethod == "Minimum or Maximum":
-                            outputTbl, outputValues = AggregateCo_MaxMin(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateCo_MaxMin, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                         elif aggMethod == "Dominant Condition":
                             if bVerbose:
@@ -11169,7 +12192,7 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                                 if bVerbose:
                                     PrintMsg(" \n1. aggMethod = " + aggMethod + " and domainValues = " + str(domainValues), 1)
 
-                                outputTbl, outputValues = AggregateCo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                                outputTbl, outputValues = ProfileCall(AggregateCo_DCD_Domain, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                                 if bVerbose:
                                     PrintMsg(" \nOuputValues: " + str(outputValues), 1)
@@ -11178,21 +12201,21 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                                 if bVerbose:
                                     PrintMsg(" \n2. aggMethod = " + aggMethod + " and no domainValues", 1)
 
-                                outputTbl, outputValues = AggregateCo_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                                outputTbl, outputValues = ProfileCall(AggregateCo_DCD, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                         elif aggMethod == "Minimum or Maximum":
                             #
-                            outputTbl, outputValues = AggregateCo_MaxMin(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateCo_MaxMin, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                         elif aggMethod == "Weighted Average" and dSDV["attributetype"].lower() == "property":
                             # Using NCCPI for any numeric component level value?
                             # This doesn't seem to be working for Range Prod 2016-01-28
                             #
-                            outputTbl, outputValues = AggregateCo_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateCo_WTA, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                         elif aggMethod == "Percent Present":
                             # This is Hydric?
-                            outputTbl, outputValues = AggregateCo_PP_SUM(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                            outputTbl, outputValues = ProfileCall(AggregateCo_PP_SUM, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                         else:
                             # Don't know what kind of interp this is
@@ -11207,18 +12230,18 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                             #PrintMsg(" \nThis is Depth to Water Table (" + dSDV["resultcolumnname"] + ")", 1)
 
                             if aggMethod == "Dominant Component":
-                                outputTbl, outputValues = AggregateCo_DCP_DTWT(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                                outputTbl, outputValues = ProfileCall(AggregateCo_DCP_DTWT, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                             elif aggMethod == "Dominant Condition":
-                                outputTbl, outputValues = AggregateCo_Mo_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                                outputTbl, outputValues = ProfileCall(AggregateCo_Mo_DCD, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
                                 #raise MyError, "EARLY OUT"
 
                             elif aggMethod == "Weighted Average":
-                                outputTbl, outputValues = AggregateCo_WTA_DTWT(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                                outputTbl, outputValues = ProfileCall(AggregateCo_WTA_DTWT, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                             else:
                                 # Component-Month such as depth to water table - Minimum or Maximum
-                                outputTbl, outputValues = AggregateCo_Mo_MaxMin(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                                outputTbl, outputValues = ProfileCall(AggregateCo_Mo_MaxMin, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
                                 #raise MyError, "5. Component-comonth aggregation method has not yet been developed "
 
                         else:
@@ -11229,18 +12252,18 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                             #
                             if aggMethod == "Dominant Component":
                                 # Problem with this aggregation method (AggregateCo_DCP). The CompPct sum is 12X because of the months.
-                                outputTbl, outputValues = AggregateCo_Mo_DCP_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                                outputTbl, outputValues = ProfileCall(AggregateCo_Mo_DCP_Domain, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                             elif aggMethod == "Dominant Condition":
                                 # Problem with this aggregation method (AggregateCo_DCP_Domain). The CompPct sum is 12X because of the months.
-                                outputTbl, outputValues = AggregateCo_Mo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker) # Orig
+                                outputTbl, outputValues = ProfileCall(AggregateCo_Mo_DCD_Domain, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker) # Orig
                                 #PrintMsg(" \noutputValues: " + ", ".join(outputValues), 1)
 
                             elif aggMethod == "Minimum or Maximum":
-                                outputTbl, outputValues = AggregateCo_Mo_MaxMin(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                                outputTbl, outputValues = ProfileCall(AggregateCo_Mo_MaxMin, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                             elif aggMethod == "Weighted Average":
-                              outputTbl, outputValues = AggregateCo_Mo_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                              outputTbl, outputValues = ProfileCall(AggregateCo_Mo_WTA, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                             else:
                                 raise MyError, "Aggregation method: " + aggMethod + "; attibute " + dSDV["attributecolumnname"].upper()
@@ -11254,10 +12277,10 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                     if sdvAtt.startswith("K Factor"):
                         # Need to figure out aggregation method for horizon level  max-min
                         if aggMethod == "Dominant Condition":
-                            outputTbl, outputValues = AggregateHz_MaxMin_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateHz_MaxMin_DCD, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
 
                         elif aggMethod == "Dominant Component":
-                            outputTbl, outputValues = AggregateHz_MaxMin_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateHz_MaxMin_DCP, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
 
                     elif aggMethod == "Weighted Average":
                         # component aggregation is weighted average
@@ -11266,11 +12289,11 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                             # Just making sure that these are numeric values, not indexes
                             if dSDV["horzaggmeth"] == "Weighted Average":
                                 # Use weighted average for horizon data (works for AWC)
-                                outputTbl, outputValues = AggregateHz_WTA_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
+                                outputTbl, outputValues = ProfileCall(AggregateHz_WTA_WTA, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
 
                             elif dSDV["horzaggmeth"] == "Weighted Sum":
                                 # Calculate sum for horizon data (egs. AWS)
-                                outputTbl, outputValues = AggregateHz_WTA_SUM(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
+                                outputTbl, outputValues = ProfileCall(AggregateHz_WTA_SUM, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
 
                         else:
                             raise MyError, "12. Weighted Average not appropriate for " + dataType
@@ -11282,16 +12305,16 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                             #
                             # I just added this on Monday to fix problem with Surface Texture DCP
                             # Need to test
-                            outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateCo_DCP, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                         elif dSDV["effectivelogicaldatatype"].lower() == "choice":
                             # Indexed value such as kFactor, cannot use weighted average
                             # for horizon properties.
-                            outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt,dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateCo_DCP, outputGDB, sdvAtt,dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                         elif dSDV["horzaggmeth"] == "Weighted Average":
                             #PrintMsg(" \nHorizon aggregation method = WTA and attributelogical datatype = " + dSDV["attributelogicaldatatype"].lower(), 1)
-                            outputTbl, outputValues = AggregateHz_DCP_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateHz_DCP_WTA, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
 
                         else:
                             raise MyError, "9. Aggregation method has not yet been developed (" + dSDV["algorithmname"] + ", " + dSDV["horzaggmeth"] + ")"
@@ -11302,20 +12325,20 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                             if dSDV["effectivelogicaldatatype"].lower() == "choice":
                                 if bVerbose:
                                     PrintMsg(" \nDominant condition for surface-level attribute", 1)
-                                outputTbl, outputValues = AggregateCo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                                outputTbl, outputValues = ProfileCall(AggregateCo_DCD_Domain, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                             else:
-                                outputTbl, outputValues = AggregateCo_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                                outputTbl, outputValues = ProfileCall(AggregateCo_DCD, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
 
                         elif dSDV["effectivelogicaldatatype"].lower() in ("float", "integer"):
                             # Dominant condition for a horizon level numeric value is probably not a good idea
-                            outputTbl, outputValues = AggregateCo_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateCo_DCD, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                         elif dSDV["effectivelogicaldatatype"].lower() == "choice" and dSDV["tiebreakdomainname"] is not None:
                             # KFactor (Indexed values)
                             #PrintMsg(" \nDominant condition for choice type", 1)
-                            outputTbl, outputValues = AggregateCo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                            outputTbl, outputValues = ProfileCall(AggregateCo_DCD_Domain, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                         else:
                             raise MyError, "No aggregation calculation selected for DCD"
@@ -11324,10 +12347,10 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                         # Need to figure out aggregation method for horizon level  max-min
                         if dSDV["effectivelogicaldatatype"].lower() == "choice":
                             # PrintMsg("\tRunning AggregateCo_MaxMin for " + sdvAtt, 1)
-                            outputTbl, outputValues = AggregateCo_MaxMin(gdb, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateCo_MaxMin, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(),  initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                         else:  # These should be numeric, probably need to test here.
-                            outputTbl, outputValues = AggregateHz_MaxMin_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
+                            outputTbl, outputValues = ProfileCall(AggregateHz_MaxMin_WTA, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, top, bot, bZero)
 
                     else:
                         raise MyError, "'" + aggMethod + "' aggregation method for " + sdvAtt + " has not been developed"
@@ -11360,18 +12383,18 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                 # This is a Soil Interpretation for Limitations or Risk
 
                 if aggMethod == "Dominant Component":
-                    outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                    outputTbl, outputValues = ProfileCall(AggregateCo_DCP, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                 elif aggMethod == "Dominant Condition":
                     #PrintMsg(" \nInterpretation; aggMethod = " + aggMethod, 1)
-                    outputTbl, outputValues = AggregateCo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                    outputTbl, outputValues = ProfileCall(AggregateCo_DCD_Domain, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                 elif aggMethod in ['Least Limiting', 'Most Limiting']:
-                    outputTbl, outputValues = AggregateCo_Limiting(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                    outputTbl, outputValues = ProfileCall(AggregateCo_Limiting, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                 elif aggMethod == "Weighted Average":
                     # This is an interp that has been set to use fuzzy values
-                    outputTbl, outputValues = AggregateCo_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                    outputTbl, outputValues = ProfileCall(AggregateCo_WTA, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
                     outputValues = [0.0, 1.0]
 
                 else:
@@ -11384,22 +12407,22 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                 # This is a Soil Interpretation for Suitability
 
                 if aggMethod == "Dominant Component":
-                    outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                    outputTbl, outputValues = ProfileCall(AggregateCo_DCP, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                 elif aggMethod == "Dominant Condition":
-                    outputTbl, outputValues = AggregateCo_DCD_Domain(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)  # changed this for Sand Suitability
+                    outputTbl, outputValues = ProfileCall(AggregateCo_DCD_Domain, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)  # changed this for Sand Suitability
 
                 elif bFuzzy or (aggMethod == "Weighted Average" and dSDV["effectivelogicaldatatype"].lower() == 'float'):
                     # This is NCCPI
                     #PrintMsg(" \nA Aggregate2_NCCPI", 1)
                     #outputTbl, outputValues = Aggregate2_NCCPI(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
                     # PrintMsg(" \nNCCPI 3", 1)
-                    outputTbl, outputValues = AggregateCo_WTA(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                    outputTbl, outputValues = ProfileCall(AggregateCo_WTA, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
                     outputValues = [0.0, 1.0]
 
                 elif aggMethod in ['Least Limiting', 'Most Limiting']:
                     # Least Limiting or Most Limiting Interp
-                    outputTbl, outputValues = AggregateCo_Limiting(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                    outputTbl, outputValues = ProfileCall(AggregateCo_Limiting, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                 else:
                     # Don't know what kind of interp this is
@@ -11414,15 +12437,15 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                 # Such as MO- Pasture hayland; MT-Conservation Tree Shrub Groups; CA- Revised Storie Index
 
                 if aggMethod == "Dominant Component":
-                    outputTbl, outputValues = AggregateCo_DCP(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                    outputTbl, outputValues = ProfileCall(AggregateCo_DCP, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                 elif aggMethod == "Dominant Condition":
-                    outputTbl, outputValues = AggregateCo_DCD(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
+                    outputTbl, outputValues = ProfileCall(AggregateCo_DCD, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker, bZero)
 
                 elif aggMethod in ['Least Limiting', 'Most Limiting']:
                     #PrintMsg(" \nNot sure about aggregation method for ruledesign = 3", 1)
                     # Least Limiting or Most Limiting Interp
-                    outputTbl, outputValues = AggregateCo_Limiting(gdb, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
+                    outputTbl, outputValues = ProfileCall(AggregateCo_Limiting, outputGDB, sdvAtt, dSDV["attributecolumnname"].upper(), initialTbl, bNulls, cutOff, tieBreaker)
 
                 else:
                     # Don't know what kind of interp this is
@@ -11441,6 +12464,15 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         else:
             raise MyError, "Invalid SDV AttributeType: " + str(dSDV["attributetype"])
 
+        # Release the in-memory initial table
+        dInitialTables.clear()
+
+        if not updateMukeys is None and not outputValues is None:
+            outputTbl, outputValues = ProfileCall(MergeRatingTable, outputTbl, outputValues)
+
+        if bRatingCache and not bRatingHit and not outputValues is None:
+            SaveRatingCache(ratingKey, outputTbl, outputValues)
+
         # quit if no data is available for selected property or interp
         if outputValues is None:
             return -1
@@ -11473,6 +12505,11 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         if dSDV["effectivelogicaldatatype"] == 'float' and len(outputValues) == 2:
             outputValues = [round(outputValues[0], dSDV["attributeprecision"]), round(outputValues[1], dSDV["attributeprecision"])]
 
+        if bRatingsOnly:
+            # Worker process. The rating table is in the rating table cache and the
+            # map layer is made by the main process.
+            return 1
+
         #
         # End of Aggregation Logic and Data Processing
         # **************************************************************************
@@ -11625,7 +12662,7 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
 
                 global dLayerDefinition  # ??? why global here???
                 #PrintMsg(" \nNo labels in dLegend. Could we use ClassBreaksJSON here?", 1)
-                dLayerDefinition = CreateJSONLegend(dLegend, outputTbl, outputValues, dSDV["resultcolumnname"], sdvAtt, bFuzzy)
+                dLayerDefinition = ProfileCall(CreateJSONLegend, dLegend, outputTbl, outputValues, dSDV["resultcolumnname"], sdvAtt, bFuzzy)
 
 
             elif dLegend["name"] == "Random" and dLegend["type"] == "0" and "labels" in dLegend:
@@ -11633,10 +12670,10 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                 if bVerbose:
                     PrintMsg(" \nOn the new Cability Subclass track", 1)
 
-                dLayerDefinition = CreateJSONLegend(dLegend, outputTbl, outputValues, dSDV["resultcolumnname"], sdvAtt, bFuzzy)
+                dLayerDefinition = ProfileCall(CreateJSONLegend, dLegend, outputTbl, outputValues, dSDV["resultcolumnname"], sdvAtt, bFuzzy)
 
             elif dLegend["name"] == "Defined" and dLegend["type"] == 2:
-                dLayerDefinition = CreateJSONLegend(dLegend, outputTbl, outputValues, dSDV["resultcolumnname"], sdvAtt, bFuzzy)
+                dLayerDefinition = ProfileCall(CreateJSONLegend, dLegend, outputTbl, outputValues, dSDV["resultcolumnname"], sdvAtt, bFuzzy)
 
             else:
                 # Create empty legend dictionary so that CreateMapLayer function will run for Random Color legend
@@ -11718,14 +12755,14 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                     arcpy.Delete_management(outputLayerFile)
 
                 surveyInfo = ["This is dummy survey data"]
-                bMetadata = UpdateMetadata(gdb, outputTbl, parameterString, creditsString, aggMethod, sdvAtt, toDay)
+                bMetadata = ProfileCall(UpdateMetadata, gdb, outputTbl, parameterString, creditsString, aggMethod, sdvAtt, toDay)
 
                 if bMetadata == False:
                     PrintMsg(" \nFailed to update layer and table metadata", 1)
 
                 if muDesc.dataType.lower() == "featurelayer":
                     #PrintMsg(" \ndLayerDefinition has " + str(len(dLayerDefinition)) + " items", 1)
-                    bMapLayer = CreateMapLayer(inputLayer, outputTbl, outputLayer, outputLayerFile, outputValues, parameterString, creditsString, dLayerDefinition, bFuzzy)  # missing dLayerDefinition
+                    bMapLayer = ProfileCall(CreateMapLayer, inputLayer, outputTbl, outputLayer, outputLayerFile, outputValues, parameterString, creditsString, dLayerDefinition, bFuzzy)  # missing dLayerDefinition
                     #PrintMsg(" \nFinished '" + sdvAtt + "' (" + aggMethod.lower() + ") for " + os.path.basename(gdb) + " \n ", 0)
 
                 elif muDesc.dataType.lower() == "rasterlayer":
@@ -11735,7 +12772,7 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
                     # Do I need to run DefinedBreaksJSON for Hydric?
                     #PrintMsg("\tlegendList and minValue: " + str(legendList) + ";  " + str(minValue), 1)
                     #dLayerDefinition = DefinedBreaksJSON(legendList, minValue, outputTbl, ratingField)
-                    bMapLayer = CreateRasterMapLayer(inputLayer, outputTbl, outputLayer, outputLayerFile, outputValues, parameterString, creditsString, dLayerDefinition)
+                    bMapLayer = ProfileCall(CreateRasterMapLayer, inputLayer, outputTbl, outputLayer, outputLayerFile, outputValues, parameterString, creditsString, dLayerDefinition)
 
                 if bMapLayer == False:
                     PrintMsg("\tFailed to create soil map layer ", 0)
@@ -11850,6 +12887,18 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
         return 0
 
     finally:
+        try:
+            if bSingleBatch:
+                ClearBatchTables()
+
+        except:
+            pass
+
+        if bProfile:
+            SaveProfile()
+
+        dInitialTables.clear()
+
         try:
             del mxd, df
 
@@ -11861,13 +12910,54 @@ def CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begM
 ## ===================================================================================
 
 # Import system modules
-import arcpy, sys, string, os, traceback, locale,  operator, json, math, random, time
+import arcpy, sys, string, os, traceback, locale,  operator, json, math, random, time, hashlib, cPickle
+import multiprocessing, tempfile, shutil, re, contextlib
+import SSURGO_HorizonAggregation, SSURGO_ColumnCache
 import xml.etree.cElementTree as ET
 #from datetime import datetime
 
 # Create the environment
 from arcpy import env
 
+# Records read once by ReadBatchTables for a series of soil maps
+dBatchTables = dict()
+
+# Use the persistent column cache next to the geodatabase (SSURGO_ColumnCache.py)
+bColumnCache = True
+
+# Reuse rating tables saved in the [database]_ratings folder for identical maps.
+# Change ratingCacheVersion when the aggregation code changes the ratings.
+bRatingCache = True
+ratingCacheVersion = 1
+
+# Number of worker processes used by CreateRatingTables for a map series.
+# 0 = one less than the number of processors, 1 = no process pool.
+ratingWorkers = 0
+
+# Set in the worker processes. CreateSoilMap writes the rating table to ratingsGDB
+# and returns before the map layer is created.
+bRatingsOnly = False
+ratingsGDB = ""
+
+# Stage profiler. When set, CreateSoilMap writes a JSON trace of the wall time, rows processed
+# and peak memory for each stage to the [database]_profile folder.
+bProfile = False
+dProfile = dict()
+
+# Set by UpdateSoilMap to the map units that are re-aggregated and merged into the
+# existing rating table. None = create the whole rating table.
+updateMukeys = None
+updateAreasymbols = None
+
+# Set in update mode to the MUKEY, COKEY and CHKEY values for the changed map units (UpdateKeys).
+# ReadTable adds them to the where_clause.
+dUpdateKeys = dict()
+
+# The SDV_Data initial table is kept in memory (dInitialTables) and streamed to the
+# aggregation functions. Set to True to write it to the geodatabase for debugging.
+bSaveInitialTable = False
+dInitialTables = dict()
+
 try:
     if __name__ == "__main__":
         inputLayer = arcpy.GetParameterAsText(0)      # Input mapunit polygon layer
@@ -238,10 +238,12 @@ try:
         #sRV = arcpy.GetParameter(15)                  # flag to switch from standard RV attributes to low or high
 
 
+        bZero = False
         cutOff = None
         bFuzzy = False
         bNulls = True
         sRV = "Representative"
+        badList = list()
 
         import gSSURGO_CreateSoilMap
         
@@ -249,6 +251,23 @@ try:
         rangeList.sort(reverse=True)
         #PrintMsg(" \n" + str(rangeList), 1)
 
+        # Read the mapunit, component and horizon tables once for all of the depth ranges
+        mapSpecs = list()
+
+        for i in range(len(rangeList) - 1):
+            mapSpecs.append((sdvAtt, aggMethod, rangeList[i + 1], rangeList[i]))
+
+        gSSURGO_CreateSoilMap.ReadBatchTables(inputLayer, mapSpecs, sRV)
+
+        # Make the rating tables in a pool of worker processes. Each map below is then
+        # restored from the rating table cache.
+        mapArgs = list()
+
+        for sdvAtt, aggMethod, top, bot in mapSpecs:
+            mapArgs.append((sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV))
+
+        gSSURGO_CreateSoilMap.CreateRatingTables(inputLayer, mapArgs)
+
         for i in range(len(rangeList) - 1):
             top = rangeList[i + 1]
             bot = rangeList[i]
@@ -275,3 +294,11 @@ except:
     PrintMsg(" \nFinal error gSSURGO_CreateSoilMap", 0)
     errorMsg()
 
+finally:
+    if __name__ == "__main__":
+        try:
+            gSSURGO_CreateSoilMap.ClearBatchTables()
+
+        except:
+            pass
+
@@ -2,6 +2,9 @@
 #
 # Batch-mode. Creates Soil Data Viewer-type maps using only the default settings. Designed to run in batch-mode.
 # Cannot be used to generate maps for layers that require a primary or secondary constraint (ex. Ecological Site Name)
+#
+# 2026-10-18 Optional list of updated survey areas (areasymbols re-imported by an incremental update of the database).
+# When it is set, the existing maps are updated for the map units in those survey areas only (UpdateSoilMap).
 
 ## ===================================================================================
 class MyError(Exception):
@@ -133,137 +136,239 @@ import arcpy, sys, string, os, traceback, locale, time, sqlite3
 from arcpy import env
 
 try:
+    if __name__ == "__main__":
+        inputLayer = arcpy.GetParameterAsText(0)       # Input mapunit polygon layer
+        sdvAtts = arcpy.GetParameter(1)                # SDV Attribute
+        depthList = arcpy.GetParameterAsText(2)        # space-delimited list of depths
+
+        if arcpy.GetArgumentCount() > 3:
+            updateList = arcpy.GetParameterAsText(3)   # optional space-delimited list of updated areasymbols
 
-    inputLayer = arcpy.GetParameterAsText(0)       # Input mapunit polygon layer
-    sdvAtts = arcpy.GetParameter(1)                # SDV Attribute
-    depthList = arcpy.GetParameterAsText(2)        # space-delimited list of depths
+        else:
+            updateList = ""
     
-    #top = arcpy.GetParameter(2)                    # Top Depth, default = 0
-    #bot = arcpy.GetParameter(3)                     # Bottom Depth, default = 1
-
-    num = 0
-    badList = list()
-    PrintMsg(" \n", 0)
-    import gSSURGO_CreateSoilMap
-
-    # Turn off display of the inputLayer to reduce potential screen redraws
-    mxd = arcpy.mapping.MapDocument("CURRENT")
-    df = mxd.activeDataFrame
-    layers = arcpy.mapping.ListLayers(mxd, inputLayer, df)
+        #top = arcpy.GetParameter(2)                    # Top Depth, default = 0
+        #bot = arcpy.GetParameter(3)                     # Bottom Depth, default = 1
+
+        num = 0
+        badList = list()
+        PrintMsg(" \n", 0)
+        import gSSURGO_CreateSoilMap
+
+        # Turn off display of the inputLayer to reduce potential screen redraws
+        mxd = arcpy.mapping.MapDocument("CURRENT")
+        df = mxd.activeDataFrame
+        layers = arcpy.mapping.ListLayers(mxd, inputLayer, df)
     
-    if len(layers) == 1:
-        soilLayer = layers[0]
-        soilLayer.visible = False
-        del soilLayer
+        if len(layers) == 1:
+            soilLayer = layers[0]
+            soilLayer.visible = False
+            del soilLayer
 
-    del mxd, df, layers
+        del mxd, df, layers
 
-    # Get gSSURGO DB behind inputLayer
-    desc = arcpy.Describe(inputLayer)
+        # Get gSSURGO DB behind inputLayer
+        desc = arcpy.Describe(inputLayer)
     
-    if desc.dataType.lower() == "featurelayer":
-        fc = desc.featureclass.catalogPath
-        gdb = os.path.dirname(fc)
-
-    elif desc.dataType.lower() == "rasterlayer":
-        gdb = os.path.dirname(desc.catalogPath)
-
-    aggMethod = ""
-    primCst = ""
-    secCst = ""
-    begMo = "January"
-    endMo = "December"
-    bZero = True
-    cutOff = 0
-    bFuzzy = False
-    bNulls = True
-    tieBreaker = ""
-    sRV = "Representative"
-
-    # Set up depth ranges using space delimited list of break values from parameter string
-    # ex. 0 10 25 ...
-    depthRanges = list()
-    d1 = depthList.split(" ")
-    d2 = [int(x) for x in d1]
-
-    for i in range(len(d2) - 1):
-        depthRanges.append((d2[i], d2[i + 1]))
-
-    depthRanges.reverse()
-    newAtts = list()
+        if desc.dataType.lower() == "featurelayer":
+            fc = desc.featureclass.catalogPath
+            gdb = os.path.dirname(fc)
+
+        elif desc.dataType.lower() == "rasterlayer":
+            gdb = os.path.dirname(desc.catalogPath)
+
+        aggMethod = ""
+        primCst = ""
+        secCst = ""
+        begMo = "January"
+        endMo = "December"
+        bZero = True
+        cutOff = 0
+        bFuzzy = False
+        bNulls = True
+        tieBreaker = ""
+        sRV = "Representative"
+
+        # Set up depth ranges using space delimited list of break values from parameter string
+        # ex. 0 10 25 ...
+        depthRanges = list()
+        d1 = depthList.split(" ")
+        d2 = [int(x) for x in d1]
+
+        for i in range(len(d2) - 1):
+            depthRanges.append((d2[i], d2[i + 1]))
+
+        depthRanges.reverse()
+        newAtts = list()
     
-    for sdvAtt in sdvAtts:
-        # Choice list in menu was modified to include folder names and tabbed attributenames. Need
-        # to clean up the list before processing.
-        if not sdvAtt.startswith("* "):
-            newAtts.append(sdvAtt.strip())
+        for sdvAtt in sdvAtts:
+            # Choice list in menu was modified to include folder names and tabbed attributenames. Need
+            # to clean up the list before processing.
+            if not sdvAtt.startswith("* "):
+                newAtts.append(sdvAtt.strip())
 
-    # Create list of soil maps that use horizon-level attributes
-    #
-    flds3 = ["attributename", "depthqualifiermode"]
-    sql2 = "attributetablename = 'chorizon'"
-    #sql2 = "attributetablename = 'chorizon' and not depthqualifiermode = 'Surface Layer'"
-    hzAtts = list()
-    surfaceAtts = list()
-    sdvTbl = os.path.join(gdb, "sdvattribute")
+        # Create list of soil maps that use horizon-level attributes
+        #
+        flds3 = ["attributename", "depthqualifiermode"]
+        sql2 = "attributetablename = 'chorizon'"
+        #sql2 = "attributetablename = 'chorizon' and not depthqualifiermode = 'Surface Layer'"
+        hzAtts = list()
+        surfaceAtts = list()
+        sdvTbl = os.path.join(gdb, "sdvattribute")
+
+        with arcpy.da.SearchCursor(sdvTbl, flds3, where_clause=sql2) as aCur:
+            # populate list of sdv attribute names
+
+            for rec in aCur:
+                att = rec[0]
+                dq = rec[1]
+
+                if att in newAtts and not att in hzAtts and dq != 'Surface Layer':
+                    hzAtts.append(att) # accumulate sdv attribute names that use horizon data
+
+                if att in newAtts and dq == 'Surface Layer':
+                    surfaceAtts.append(att)
+
+        hzAtts.sort()
+
+        # Calculate the number of new map layers that will be created:
+        hzMaps = (len(hzAtts) * len(depthRanges) )
+        individualMaps = (len(newAtts) - len(hzAtts))
+        mapCnt = hzMaps + individualMaps
+
+        if hzMaps > 0:
+            PrintMsg(" \nCreating a series of " + str(mapCnt) + " soil maps (" + str(individualMaps) + " individual maps plus a series of " + str(hzMaps) + " horizon-level property maps)", 0)
+
+        else:
+            PrintMsg(" \nCreating a series of " + str(mapCnt) + " soil maps", 0)
+
+        # Update mode. Only the map units in the re-imported survey areas are aggregated and
+        # merged into the existing rating tables.
+        updateAreas = None
+        updateMukeys = None
+
+        if updateList.strip() != "":
+            updateAreas = [areaSym.strip().upper() for areaSym in updateList.replace(",", " ").split()]
+            updateMukeys = gSSURGO_CreateSoilMap.SurveyMukeys(gdb, updateAreas)
 
-    with arcpy.da.SearchCursor(sdvTbl, flds3, where_clause=sql2) as aCur:
-        # populate list of sdv attribute names
+            if updateMukeys is None:
+                raise MyError, "Unable to get the map units for the updated survey areas"
 
-        for rec in aCur:
-            att = rec[0]
-            dq = rec[1]
+            if len(updateMukeys) == 0:
+                raise MyError, "No map units found for the updated survey areas: " + ", ".join(updateAreas)
 
-            if att in newAtts and not att in hzAtts and dq != 'Surface Layer':
-                hzAtts.append(att) # accumulate sdv attribute names that use horizon data
+            PrintMsg(" \nUpdating the existing soil maps for " + Number_Format(len(updateMukeys), 0, True) + " map units in " + str(len(updateAreas)) + " survey areas", 0)
 
-            if att in newAtts and dq == 'Surface Layer':
-                surfaceAtts.append(att)
+        # Read the mapunit, component and horizon tables once for the whole series
+        # instead of once per map.
+        #
+        mapSpecs = list()
+
+        for sdvAtt in newAtts:
+            if sdvAtt in hzAtts:
+                for top, bot in depthRanges:
+                    mapSpecs.append((sdvAtt, aggMethod, top, bot))
+
+            else:
+                mapSpecs.append((sdvAtt, aggMethod, 0, 1))
 
-    hzAtts.sort()
+        if updateMukeys is None:
+            gSSURGO_CreateSoilMap.ReadBatchTables(inputLayer, mapSpecs, sRV)
 
-    # Calculate the number of new map layers that will be created:
-    hzMaps = (len(hzAtts) * len(depthRanges) )
-    individualMaps = (len(newAtts) - len(hzAtts))
-    mapCnt = hzMaps + individualMaps
+            # Make the rating tables in a pool of worker processes. Each map below is then
+            # restored from the rating table cache.
+            mapArgs = list()
 
-    if hzMaps > 0:
-        PrintMsg(" \nCreating a series of " + str(mapCnt) + " soil maps (" + str(individualMaps) + " individual maps plus a series of " + str(hzMaps) + " horizon-level property maps)", 0)
+            for sdvAtt, aggMethod, top, bot in mapSpecs:
+                mapArgs.append((sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV))
 
-    else:
-        PrintMsg(" \nCreating a series of " + str(mapCnt) + " soil maps", 0)
+            gSSURGO_CreateSoilMap.CreateRatingTables(inputLayer, mapArgs)
 
-    arcpy.SetProgressor("step", "Creating series of soil maps...", 0, mapCnt, 1)
-    num = 0
+        arcpy.SetProgressor("step", "Creating series of soil maps...", 0, mapCnt, 1)
+        num = 0
     
-    for sdvAtt in newAtts:
+        for sdvAtt in newAtts:
         
-        if sdvAtt in hzAtts:
-
-            # This will only process data when there is a set of depth ranges specified
-            #
-            # I need to handle this differently when no depths are entered
-            #
-            for depths in depthRanges:
-                top, bot = depths
-                num += 1
-                msg = "Creating map number " + str(num) + ":  " + sdvAtt + " " + str(top) + " to " + str(bot) + "cm"
+            if sdvAtt in hzAtts:
+
+                # This will only process data when there is a set of depth ranges specified
+                #
+                # I need to handle this differently when no depths are entered
+                #
+                for depths in depthRanges:
+                    top, bot = depths
+                    num += 1
+                    msg = "Creating map number " + str(num) + ":  " + sdvAtt + " " + str(top) + " to " + str(bot) + "cm"
                     
+                    arcpy.SetProgressorLabel(msg)
+                    PrintMsg(" \n" + msg, 0)
+                    time.sleep(2)
+
+                    # Trying here to enter default values for most parameters and to modify CreateSoilMap.CreateSoilMap to use default aggregation method (aggMethod) when it is passed an empty string
+                    if updateMukeys is None:
+                        bSoilMap = gSSURGO_CreateSoilMap.CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV) # external script
+
+                    else:
+                        bSoilMap = gSSURGO_CreateSoilMap.UpdateSoilMap(inputLayer, updateMukeys, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV, updateAreas)
+
+                    arcpy.SetProgressorPosition()
+                
+                    if bSoilMap == -2:
+                        if bot > 0:
+                            badList.append(sdvAtt + " " + str(top) + " to " + str(bot) + "cm'")
+
+                        else:
+                            badList.append(sdvAtt)
+                
+                    elif bSoilMap == -1:
+                        # No data
+                        #PrintMsg("\tbSoilMap returned 0", 0)
+                        badList.append(sdvAtt)
+
+                    elif bSoilMap == 0:
+                        raise MyError, "Map series halted"
+
+                    elif bSoilMap == 1:
+                        # Success.
+                        pass
+
+            else:
+                top, bot = (0, 1)  # this should cover the surface properties such as Texture
+                num += 1
+
+                if sdvAtt in surfaceAtts:
+                    msg = "Creating map number " + str(num) + ":  " + sdvAtt + " (surface)"
+
+                else:     
+                    msg = "Creating map number " + str(num) + ":  " + sdvAtt
+      
                 arcpy.SetProgressorLabel(msg)
                 PrintMsg(" \n" + msg, 0)
                 time.sleep(2)
 
                 # Trying here to enter default values for most parameters and to modify CreateSoilMap.CreateSoilMap to use default aggregation method (aggMethod) when it is passed an empty string
-                bSoilMap = gSSURGO_CreateSoilMap.CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV) # external script
+                if updateMukeys is None:
+                    bSoilMap = gSSURGO_CreateSoilMap.CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV) # external script
+
+                else:
+                    bSoilMap = gSSURGO_CreateSoilMap.UpdateSoilMap(inputLayer, updateMukeys, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV, updateAreas)
+
                 arcpy.SetProgressorPosition()
-                
+
+                # Return values will control how the rest of the maps will be handled
+                #
+                #  1 Successful
+                # -1 No data
+                # -2 raised error
+                #  0 Error
+            
                 if bSoilMap == -2:
                     if bot > 0:
                         badList.append(sdvAtt + " " + str(top) + " to " + str(bot) + "cm'")
 
                     else:
                         badList.append(sdvAtt)
-                
+            
                 elif bSoilMap == -1:
                     # No data
                     #PrintMsg("\tbSoilMap returned 0", 0)
@@ -275,65 +380,21 @@ try:
                 elif bSoilMap == 1:
                     # Success.
                     pass
-
-        else:
-            top, bot = (0, 1)  # this should cover the surface properties such as Texture
-            num += 1
-
-            if sdvAtt in surfaceAtts:
-                msg = "Creating map number " + str(num) + ":  " + sdvAtt + " (surface)"
-
-            else:     
-                msg = "Creating map number " + str(num) + ":  " + sdvAtt
-      
-            arcpy.SetProgressorLabel(msg)
-            PrintMsg(" \n" + msg, 0)
-            time.sleep(2)
-
-            # Trying here to enter default values for most parameters and to modify CreateSoilMap.CreateSoilMap to use default aggregation method (aggMethod) when it is passed an empty string
-            bSoilMap = gSSURGO_CreateSoilMap.CreateSoilMap(inputLayer, sdvAtt, aggMethod, primCst, secCst, top, bot, begMo, endMo, tieBreaker, bZero, cutOff, bFuzzy, bNulls, sRV) # external script
-            arcpy.SetProgressorPosition()
-
-            # Return values will control how the rest of the maps will be handled
-            #
-            #  1 Successful
-            # -1 No data
-            # -2 raised error
-            #  0 Error
-            
-            if bSoilMap == -2:
-                if bot > 0:
-                    badList.append(sdvAtt + " " + str(top) + " to " + str(bot) + "cm'")
-
-                else:
-                    badList.append(sdvAtt)
-            
-            elif bSoilMap == -1:
-                # No data
-                #PrintMsg("\tbSoilMap returned 0", 0)
-                badList.append(sdvAtt)
-
-            elif bSoilMap == 0:
-                raise MyError, "Map series halted"
-
-            elif bSoilMap == 1:
-                # Success.
-                pass
                     
-    arcpy.RefreshActiveView()
+        arcpy.RefreshActiveView()
     
-    if len(badList) > 0:
+        if len(badList) > 0:
  
-        if len(badList) == 1:
-            PrintMsg(" \nUnable to create the following soil map layer: '" + badList[0] + "' \n ", 1)
+            if len(badList) == 1:
+                PrintMsg(" \nUnable to create the following soil map layer: '" + badList[0] + "' \n ", 1)
 
-        else:
-            PrintMsg(" \nUnable to create the following soil map layers: '" + "', '".join(badList) + "' \n ", 1)
+            else:
+                PrintMsg(" \nUnable to create the following soil map layers: '" + "', '".join(badList) + "' \n ", 1)
 
-    else:
-        PrintMsg(" \nCreateSoilMaps finished \n ", 0)
+        else:
+            PrintMsg(" \nCreateSoilMaps finished \n ", 0)
 
-    del badList
+        del badList
     
 except MyError, e:
     PrintMsg(str(e), 2)
@@ -342,8 +403,10 @@ except:
     errorMsg()
 
 finally:
-    try:
-        del mxd, df
+    if __name__ == "__main__":
+        try:
+            gSSURGO_CreateSoilMap.ClearBatchTables()
+            del mxd, df
 
-    except:
-        pass
+        except:
+            pass
@@ -133,13 +133,11 @@ def GetSdvFolderAtts(theURL):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(theURL, jData)
-        resp = urllib2.urlopen(req)
-        jsonString = resp.read()
+        jsonString = SSURGO_SDAClient.PostRequest(theURL, jData)
 
         #PrintMsg(" \njsonString: " + str(jsonString), 1)
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         if not "Table" in data:
             raise MyError, "Query failed to select anything: \n " + sdvQuery
@@ -379,6 +377,7 @@ def Number_Format(num, places=0, bCommas=True):
 ## ====================================== Main Body ==================================
 # Import modules
 import sys, string, os, locale, arcpy, traceback, urllib2, httplib, json
+import SSURGO_SDAClient
 import xml.etree.cElementTree as ET
 from arcpy import env
 from random import randint
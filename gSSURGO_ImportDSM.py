@@ -202,18 +202,14 @@ def GetSDMInfo(theURL, tblName):
         jData = json.dumps(dRequest)
 
         # Send request to SDA Tabular service
-        req = urllib2.Request(url, jData)
-        resp = urllib2.urlopen(req)
+        jsonString = SSURGO_SDAClient.PostRequest(url, jData)
 
         #PrintMsg(" \nImporting attribute data...", 0)
         #PrintMsg(" \nGot back requested data...", 0)
 
-        # Read the response from SDA into a string
-        jsonString = resp.read()
-
         #PrintMsg(" \njsonString: " + str(jsonString), 1)
         data = json.loads(jsonString)
-        del jsonString, resp, req
+        del jsonString
 
         if not "Table" in data:
             raise MyError, "Query failed to select anything: \n " + sQuery
@@ -2478,6 +2474,7 @@ import xml.etree.cElementTree as ET
 #from xml.dom import minidom
 from arcpy import env
 from arcpy.sa import *
+import SSURGO_SDAClient
 
 try:
     if __name__ == "__main__":
@@ -1499,6 +1499,18 @@ def CalcAWS(inputDB, outputDB, theCompTable, theMuTable, dPct, depthList):
 
         PrintMsg(" \n\tCalculating standard available water supply for:", 0)
 
+        # Read the query table once for all of the depth ranges. The horizon thickness within
+        # each range comes from a sparse horizon-by-range overlap matrix, so each range only
+        # visits the horizons that overlap it. Horizons are still added in cursor order.
+        sqlClause = (None, "order by mukey, comppct_r DESC, cokey, hzdept_r ASC")
+        hzSQL = "hzdept_r is not null"  # prevent divide-by-zero errors by skipping components with no horizons
+        arcpy.SetProgressorLabel("Reading QueryTable_HZ ...")
+
+        with arcpy.da.SearchCursor(queryTbl, qFieldNames, where_clause=hzSQL, sql_clause=sqlClause) as inCur:
+            hzRecs = [rec for rec in inCur if rec[3] is not None]
+
+        overlap = SSURGO_HorizonAggregation.OverlapMatrix([rec[4] for rec in hzRecs], [rec[5] for rec in hzRecs], depthList)
+
         for rng in depthList:
             # Calculating and updating just one AWS column at a time
             #
@@ -1531,42 +1543,29 @@ def CalcAWS(inputDB, outputDB, theCompTable, theMuTable, dPct, depthList):
                 # MUKEY, AWS
                 coCursor = arcpy.da.UpdateCursor(theCompTable, coFieldNames)
 
-                # Process query table using a searchcursor, write out horizon data for each component
+                # Process the horizons with a positive thickness in this range, write out horizon data for each component
                 # At this time, almost all components are being used! There is no filter.
-                sqlClause = (None, "order by mukey, comppct_r DESC, cokey, hzdept_r ASC")
-                #hzSQL = "compkind is not null and hzdept_r is not null"  # prevent divide-by-zero errors
-                hzSQL = "hzdept_r is not null"  # prevent divide-by-zero errors by skipping components with no horizons
-
-                iCnt = int(arcpy.GetCount_management(queryTbl).getOutput(0))
-                inCur = arcpy.da.SearchCursor(queryTbl, qFieldNames, where_clause=hzSQL, sql_clause=sqlClause)
-
-                arcpy.SetProgressor("step", "Reading QueryTable_HZ ...",  0, iCnt, 1)
+                hzRows, hzThickness = SSURGO_HorizonAggregation.OverlapColumn(overlap, td, bd)
 
-                for rec in inCur:
+                for iRec, hzT in zip(hzRows.tolist(), hzThickness.tolist()):
                     # read each horizon-level input record from the query table ...
 
-                    mukey, cokey, compPct, awc, top, bot = rec
-
-                    if awc is not None:
-
-                        # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
-                        hzT = min(bot, bd) - max(top, td)   # usable thickness from this horizon
-
-                        if hzT > 0:
-                            aws = float(hzT) * float(awc) * 10
+                    mukey, cokey, compPct, awc, top, bot = hzRecs[iRec]
 
-                            if not cokey in dComp:
-                                # Create initial entry for this component using the first horiozon CHK
-                                dComp[cokey] = (mukey, compPct, hzT, aws)
+                    # Calculate sum of horizon thickness and sum of component ratings for all horizons above bottom
+                    # hzT is the usable thickness from this horizon, min(bot, bd) - max(top, td)
+                    aws = float(hzT) * float(awc) * 10
 
-                            else:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, compName, dHzT, dAWS = dComp[cokey]
-                                dAWS = dAWS + aws
-                                dHzT = dHzT + hzT
-                                dComp[cokey] = (mukey, compPct, dHzT, dAWS)
+                    if not cokey in dComp:
+                        # Create initial entry for this component using the first horiozon CHK
+                        dComp[cokey] = (mukey, compPct, hzT, aws)
 
-                    arcpy.SetProgressorPosition()
+                    else:
+                        # accumulate total thickness and total rating value by adding to existing component values  CHK
+                        mukey, compName, dHzT, dAWS = dComp[cokey]
+                        dAWS = dAWS + aws
+                        dHzT = dHzT + hzT
+                        dComp[cokey] = (mukey, compPct, dHzT, dAWS)
 
                 # get the total number of major components from the dictionary count
                 iComp = len(dComp)
@@ -1699,6 +1698,35 @@ def CalcSOC(inputDB, outputDB, theCompTable, theMuTable, dPct, dFrags, depthList
 
         PrintMsg(" \n\tCalculating soil organic carbon for:", 0)
 
+        # Read the query table once for all of the depth ranges, as in CalcAWS. The bottom of
+        # each horizon is cut off at the component restriction depth before the overlap matrix
+        # is built, so the matrix has the usable thickness below any restrictive layer.
+        hzSQL = "hzdept_r is not null"  # prevent divide-by-zero errors by skipping components with no horizons
+        sqlClause = (None, "order by mukey, comppct_r DESC, cokey, hzdept_r ASC")
+        arcpy.SetProgressorLabel("Reading QueryTable_HZ ...")
+        hzRecs = list()
+        hzBots = list()
+
+        with arcpy.da.SearchCursor(queryTbl, qFieldNames, where_clause=hzSQL, sql_clause=sqlClause) as inCur:
+            for rec in inCur:
+                mukey, cokey, compPct, compName, localPhase, chkey, om, db3, top, bot = rec
+                sumCompPct = float(dPct[mukey][0])
+
+                if om is not None and db3 is not None:
+                    try:
+                        rz, resKind = dRestrictions[cokey]
+
+                    except:
+                        rz = maxD
+                        resKind = ""
+
+                    # Do not calculate SOC past root zone restrictive layers
+                    hzRecs.append(rec)
+                    hzBots.append(min(bot, rz))
+
+        overlap = SSURGO_HorizonAggregation.OverlapMatrix([rec[8] for rec in hzRecs], hzBots, depthList)
+        del hzBots
+
         for rng in depthList:
             # Calculating and updating just one SOC column at a time
             #
@@ -1734,81 +1762,43 @@ def CalcSOC(inputDB, outputDB, theCompTable, theMuTable, dPct, dFrags, depthList
                 coFieldNames = ["COKEY", "SOC" + str(td) + "_" + str(bd), "TK" + str(td) + "_" + str(bd) + "S"]
                 coCursor = arcpy.da.UpdateCursor(theCompTable, coFieldNames)
 
-                # Process query table using a searchcursor, write out horizon data for each component
+                # Process the horizons with a positive usable thickness in this range, write out horizon data for each component
                 # At this time, almost all components are being used! There is no filter.
-                hzSQL = "hzdept_r is not null"  # prevent divide-by-zero errors by skipping components with no horizons
-                sqlClause = (None, "order by mukey, comppct_r DESC, cokey, hzdept_r ASC")
-
-                iCnt = int(arcpy.GetCount_management(queryTbl).getOutput(0))
-                inCur = arcpy.da.SearchCursor(queryTbl, qFieldNames, where_clause=hzSQL, sql_clause=sqlClause)
-                arcpy.SetProgressor("step", "Reading QueryTable_HZ ...",  0, iCnt, 1)
+                hzRows, hzThickness = SSURGO_HorizonAggregation.OverlapColumn(overlap, td, bd)
 
-                for rec in inCur:
+                for iRec, hzT in zip(hzRows.tolist(), hzThickness.tolist()):
                     # read each horizon-level input record from the query table ...
 
-                    mukey, cokey, compPct, compName, localPhase, chkey, om, db3, top, bot = rec
-                    sumCompPct = float(dPct[mukey][0])
+                    mukey, cokey, compPct, compName, localPhase, chkey, om, db3, top, bot = hzRecs[iRec]
 
-                    if om is not None and db3 is not None:
-                        # Calculate sum of horizon thickness and sum of component ratings for
-                        # that portion of the horizon that is with in the td-bd range
-                        top = max(top, td)
-                        bot = min(bot, bd)
-                        om = round(om, 3)
-
-                        try:
-                            rz, resKind = dRestrictions[cokey]
+                    # Usable horizon thickness for that portion of the horizon that is within the td-bd range
+                    # and above any restriction: min(bot, bd, rz) - max(top, td)
+                    om = round(om, 3)
 
-                        except:
-                            rz = maxD
-                            resKind = ""
-
-                        # Now check for horizon restrictions within this range. Do not calculate SOC past
-                        # root zone restrictive layers.
-                        #
-                        if top < rz < bot:
-                            # restriction found in this horizon, use it to set a new depth
-                            #PrintMsg("\t\t" + resKind + " restriction for " + mukey + ":" + cokey + " at " + str(rz) + "cm", 1)
-                            cBot = rz
+                    # get horizon fragment volume
+                    try:
+                        fragvol = dFrags[chkey]
 
-                        else:
-                            cBot = min(rz, bot)
+                    except:
+                        fragvol = 0.0
+                        pass
 
-                        # Calculate initial usable horizon thickness
-                        hzT = cBot - top
+                    # Calculate SOC using horizon thickness, OM, BD, FragVol, CompPct.
+                    # changed the OM to carbon conversion from * 0.58 to / 1.724 after running FY2017 value table
+                    db3 = round(db3, 2)
 
-                        if hzT > 0 and top < cBot:
-                            # get horizon fragment volume
-                            try:
-                                fragvol = dFrags[chkey]
+                    soc =  ( (hzT * ( ( om / 1.724 ) * db3 )) / 100.0 ) * ((100.0 - fragvol) / 100.0) * ( compPct * 100 )
 
-                            except:
-                                fragvol = 0.0
-                                pass
-
-                            # Calculate SOC using horizon thickness, OM, BD, FragVol, CompPct.
-                            # changed the OM to carbon conversion from * 0.58 to / 1.724 after running FY2017 value table
-                            db3 = round(db3, 2)
-                                 
-                            soc =  ( (hzT * ( ( om / 1.724 ) * db3 )) / 100.0 ) * ((100.0 - fragvol) / 100.0) * ( compPct * 100 )
-
-                            #if td == 0 and bd == 5.0:
-                                # Everything here matches the other script
-                            #    test = [mukey, cokey, compPct, compName, localPhase, chkey, om, db3, top, bot, hzT, fragvol, round(soc, 2)]
-                                #PrintMsg(str(test), 1)
-
-                            if not cokey in dComp:
-                                # Create initial entry for this component using the first horizon CHK
-                                dComp[cokey] = (mukey, compPct, hzT, soc)
-
-                            else:
-                                # accumulate total thickness and total rating value by adding to existing component values  CHK
-                                mukey, compName, dHzT, dSOC = dComp[cokey]
-                                dSOC = dSOC + soc
-                                dHzT = dHzT + hzT
-                                dComp[cokey] = (mukey, compPct, dHzT, dSOC)
+                    if not cokey in dComp:
+                        # Create initial entry for this component using the first horizon CHK
+                        dComp[cokey] = (mukey, compPct, hzT, soc)
 
-                    arcpy.SetProgressorPosition()
+                    else:
+                        # accumulate total thickness and total rating value by adding to existing component values  CHK
+                        mukey, compName, dHzT, dSOC = dComp[cokey]
+                        dSOC = dSOC + soc
+                        dHzT = dHzT + hzT
+                        dComp[cokey] = (mukey, compPct, dHzT, dSOC)
 
                 # get the total number of major components from the dictionary count
                 iComp = len(dComp)
@@ -3203,6 +3193,7 @@ def CreateValuTable(inputDB):
 ## ====================================== Main Body ==================================
 # Import modules
 import os, sys, string, re, locale, arcpy, traceback, collections
+import SSURGO_HorizonAggregation
 from operator import itemgetter, attrgetter
 import xml.etree.cElementTree as ET
 from datetime import datetime